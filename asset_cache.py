@@ -0,0 +1,198 @@
+import os
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+import sprite_pack
+from settings import ASSET_CACHE_BUDGET_BYTES
+
+
+class AssetCache:
+    """Process-wide cache of decoded Surfaces and Sounds.
+
+    Images are keyed by (path, scaled size, convert mode) and sounds by path,
+    so every Zombie / Player / level that asks for the same sprite gets the
+    same Surface back instead of decoding the PNG again.
+
+    Entries passed an ``owner`` are refcounted: the reference is dropped
+    automatically when the owner is garbage collected.  Unreferenced entries
+    stay around for reuse until the total size exceeds the byte budget, at
+    which point the least recently used ones are evicted.
+
+    Shared assets must be treated as read-only by callers.
+    """
+
+    def __init__(self, budget_bytes=ASSET_CACHE_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.prefetcher = None  # set by prefetch.Prefetcher; hands over assets decoded in the background
+        self._entries = OrderedDict()  # key -> [asset, nbytes, refcount]
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ---------------------- Public API ----------------------
+    def image(self, path, size=None, convert='alpha', owner=None, fit=None):
+        """Return a shared Surface for ``path`` scaled to ``size``.
+
+        ``fit`` instead smooth-scales the image down, keeping its aspect
+        ratio, until it fits in that (width, height).  ``convert`` is
+        'alpha' (convert_alpha), 'opaque' (convert) or None.  Raises the
+        same pygame.error / FileNotFoundError as image.load.
+        """
+        key = image_key(path, size, convert, fit)
+        entry = self._lookup(key)
+        if entry is None:
+            surf = self._claim(key)
+            if surf is None:
+                surf = decode_image(path, size, fit)
+            if convert == 'alpha':
+                surf = surf.convert_alpha()
+            elif convert == 'opaque':
+                surf = surf.convert()
+            entry = self._insert(key, surf, surf.get_pitch() * surf.get_height())
+        self._retain(key, entry, owner)
+        return entry[0]
+
+    def sound(self, path, volume=None, owner=None):
+        """Return a shared Sound for ``path``.
+
+        When ``volume`` is given it is (re)applied on every call, so one
+        caller changing the volume does not leak into the next scene.
+        """
+        key = sound_key(path)
+        entry = self._lookup(key)
+        if entry is None:
+            snd = self._claim(key) or pygame.mixer.Sound(path)
+            entry = self._insert(key, snd, _sound_bytes(snd))
+        if volume is not None:
+            entry[0].set_volume(volume)
+        self._retain(key, entry, owner)
+        return entry[0]
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def clear(self):
+        """Drop every unreferenced entry."""
+        for key in [k for k, e in self._entries.items() if e[2] == 0]:
+            self._evict(key)
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+            'budget': self.budget_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    # ---------------------- Internals ----------------------
+    def _claim(self, key):
+        return self.prefetcher.claim(key) if self.prefetcher is not None else None
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def _insert(self, key, asset, nbytes):
+        entry = [asset, nbytes, 0]
+        self._entries[key] = entry
+        self.total_bytes += nbytes
+        self._trim()
+        return entry
+
+    def _retain(self, key, entry, owner):
+        if owner is None:
+            return
+        entry[2] += 1
+        weakref.finalize(owner, self._release, key)
+
+    def _release(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and entry[2] > 0:
+            entry[2] -= 1
+            if entry[2] == 0:
+                self._trim()
+
+    def _trim(self):
+        if self.total_bytes <= self.budget_bytes:
+            return
+        # Oldest first; referenced entries are never evicted
+        for key in [k for k, e in self._entries.items() if e[2] == 0]:
+            if self.total_bytes <= self.budget_bytes:
+                break
+            self._evict(key)
+
+    def _evict(self, key):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry[1]
+        self.evictions += 1
+
+
+def image_key(path, size=None, convert='alpha', fit=None):
+    return ('image', os.path.abspath(path), tuple(size) if size else None, convert,
+            tuple(fit) if fit else None)
+
+
+def sound_key(path):
+    return ('sound', os.path.abspath(path))
+
+
+def decode_image(path, size=None, fit=None):
+    """Load ``path`` and scale it, without touching the display.
+
+    This is the slow part of image(); it is safe to run off the main
+    thread, leaving only the display-format conversion to image().
+    Pre-scaled pixels from the sprite pack are used when it has them.
+    """
+    surf = sprite_pack.pack.surface(path, size, fit)
+    if surf is None:
+        surf = decode_png(path, size, fit)
+    return surf
+
+
+def decode_png(path, size=None, fit=None):
+    """decode_image() straight from the PNG (what the sprite pack stores)."""
+    surf = pygame.image.load(path)
+    if size:
+        surf = pygame.transform.scale(surf, size)
+    elif fit:
+        w, h = surf.get_size()
+        ratio = min(fit[0] / w, fit[1] / h)
+        if ratio < 1:
+            if surf.get_bitsize() < 24:
+                # smoothscale needs 24/32-bit pixels; convert() would need the display
+                full = pygame.Surface((w, h), pygame.SRCALPHA, 32)
+                full.blit(surf, (0, 0))
+                surf = full
+            surf = pygame.transform.smoothscale(surf, (int(w * ratio), int(h * ratio)))
+    return surf
+
+
+def _sound_bytes(sound):
+    """Approximate size of the decoded PCM buffer held by ``sound``."""
+    init = pygame.mixer.get_init()
+    if not init:
+        return 0
+    freq, size, channels = init
+    return int(sound.get_length() * freq * channels * abs(size) // 8)
+
+
+# Shared instance used by every entity and level
+cache = AssetCache()
+
+
+def load_image(path, size=None, convert='alpha', owner=None, fit=None):
+    return cache.image(path, size, convert, owner, fit)
+
+
+def load_sound(path, volume=None, owner=None):
+    return cache.sound(path, volume, owner)
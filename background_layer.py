@@ -0,0 +1,118 @@
+from collections import OrderedDict
+
+import pygame
+
+from settings import TILE_SIZE, BACKGROUND_LAYER_CACHE_SIZE
+
+
+class BackgroundLayer:
+    """Static scenery pre-rendered into one display-format Surface.
+
+    ``draw_base(surface)`` paints everything that is not a map tile (floor
+    colour, grid lines, props) and ``draw_tile(surface, x, y, cell)`` paints
+    a single tile of ``map_data``.  Both run once up front; afterwards a
+    frame is a single blit.
+
+    The layer keeps a snapshot of the map rows and compares it on every
+    blit, so a tile changed in ``map_data`` is repainted on its own.  Other
+    changes (props that are not tiles) are signalled with invalidate_rect.
+    Repaints are clipped to the dirty area and include the neighbouring
+    tiles, so sprites that overhang their cell (tree leaves) stay intact.
+
+    With ``colorkey`` the layer only holds tiles and is blitted over
+    whatever was drawn below it.  For a map larger than the screen, blit()
+    takes the camera's view as ``area`` and copies just that part.
+    """
+
+    def __init__(self, map_data=None, draw_tile=None, draw_base=None, size=None, colorkey=None):
+        self.map_data = map_data
+        self.draw_tile = draw_tile
+        self.draw_base = draw_base
+        self.colorkey = colorkey
+        if size is None:
+            size = (len(map_data[0]) * TILE_SIZE, len(map_data) * TILE_SIZE)
+        surface = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        if colorkey is not None:
+            surface.set_colorkey(colorkey)
+        self.surface = surface
+        self._snapshot = [row[:] for row in map_data] if map_data is not None else None
+        self._dirty = []
+        self.repaints = 0
+        self._paint(surface.get_rect())
+
+    # ---------------------- Public API ----------------------
+    def invalidate_tile(self, col, row):
+        # Half a tile of margin covers cells that draw over their neighbours
+        rect = pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        self._dirty.append(rect.inflate(TILE_SIZE, TILE_SIZE))
+
+    def invalidate_rect(self, rect):
+        self._dirty.append(pygame.Rect(rect))
+
+    def blit(self, screen, dest=(0, 0), area=None):
+        self.sync()
+        screen.blit(self.surface, dest, area)
+
+    def sync(self):
+        """Repaint tiles that changed in map_data and any invalidated areas."""
+        if self._snapshot is not None:
+            snapshot = self._snapshot
+            for y, row in enumerate(self.map_data):
+                if snapshot[y] != row:
+                    for x, cell in enumerate(row):
+                        if snapshot[y][x] != cell:
+                            self.invalidate_tile(x, y)
+                    snapshot[y] = row[:]
+        if self._dirty:
+            for rect in self._dirty:
+                self._paint(rect.clip(self.surface.get_rect()))
+            self._dirty.clear()
+
+    # ---------------------- Internals ----------------------
+    def _paint(self, rect):
+        if not rect.width or not rect.height:
+            return
+        surface = self.surface
+        surface.set_clip(rect)
+        if self.colorkey is not None:
+            surface.fill(self.colorkey, rect)
+        if self.draw_base:
+            self.draw_base(surface)
+        if self.map_data is not None and self.draw_tile:
+            # Row-major like the original per-frame loops so overlaps match
+            rows = len(self.map_data)
+            y0 = max(0, rect.top // TILE_SIZE - 1)
+            y1 = min(rows, (rect.bottom - 1) // TILE_SIZE + 2)
+            x0 = max(0, rect.left // TILE_SIZE - 1)
+            x1 = (rect.right - 1) // TILE_SIZE + 2
+            for y in range(y0, y1):
+                row = self.map_data[y]
+                for x in range(x0, min(len(row), x1)):
+                    self.draw_tile(surface, x, y, row[x])
+        surface.set_clip(None)
+        self.repaints += 1
+
+
+# id(owner) -> (owner, layer), most recently used last
+_layers = OrderedDict()
+
+
+def get_layer(owner, build):
+    """Return the cached layer for ``owner`` (a map list or a scene name).
+
+    ``build()`` creates the layer on a miss.  Only the most recently used
+    BACKGROUND_LAYER_CACHE_SIZE layers are kept.
+    """
+    key = id(owner)
+    entry = _layers.get(key)
+    if entry is not None and entry[0] is owner:
+        _layers.move_to_end(key)
+        return entry[1]
+    layer = build()
+    _layers[key] = (owner, layer)
+    _layers.move_to_end(key)
+    while len(_layers) > BACKGROUND_LAYER_CACHE_SIZE:
+        _layers.popitem(last=False)
+    return layer
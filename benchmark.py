@@ -0,0 +1,510 @@
+"""Frame-time benchmarks for canonical combat scenarios.
+
+Each scenario builds its entities from the real game classes with a fixed
+seed, then runs frames of one simulation step (update) followed by one
+draw, timing the two halves separately.  Results are p50/p95/p99/max in
+milliseconds plus what each frame allocates, in a separate pass so the
+counting does not skew the timings: the tracemalloc peak in KiB, and
+the Surfaces made per frame as the F3 overlay counts them (tracemalloc
+never sees SDL's pixel buffers, so a surface churn shows up only there).
+
+    python benchmark.py                       # run everything, print a table
+    python benchmark.py --save baseline.json  # store a baseline
+    python benchmark.py --compare baseline.json --threshold 0.15
+
+--compare exits with status 1 if any p50/p95/p99 frame time got slower
+than the baseline by more than the threshold.
+
+Runs inside a headless.HeadlessSession, so no window, audio or dialogue
+is involved.
+"""
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pygame
+
+import headless
+import perf_hud
+from projectiles import Projectiles, PLAYER, ENEMY, BULLET, ORB
+from settings import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, SIM_HZ, BULLET_SPEED, TILE_SIZE, PYTHON_HEALTH,
+    PYTHON_ENRAGE_HEALTH_THRESHOLD, POISON_PUDDLE_DPS,
+)
+
+PERCENTILES = (50, 95, 99)
+WARMUP_FRAMES = 30
+
+
+# ---------------------- Scenarios ----------------------
+class Scenario:
+    """One reproducible fight; subclasses build it in setup()."""
+
+    name = 'scenario'
+
+    def setup(self):
+        pass
+
+    def update(self, dt, now):
+        pass
+
+    def draw(self, screen):
+        pass
+
+
+# Projectiles may leave the screen by this much before they are dropped
+_MARGIN_BOUNDS = (-50, -50, SCREEN_WIDTH + 50, SCREEN_HEIGHT + 50)
+
+
+def _step_projectiles(projectiles, dt, player):
+    """Shared projectile step: move, drop off-screen, drop enemy shots on player contact."""
+    projectiles.update(dt, bounds=_MARGIN_BOUNDS)
+    projectiles.kill(projectiles.hits_circle(player.x, player.y, player.radius, ENEMY))
+    projectiles.compact()
+
+
+class EndlessHorde(Scenario):
+    """Endless mode crowd of ``count`` zombies, topped up every step, with the
+    player spraying bullets into it."""
+
+    def __init__(self, count):
+        self.count = count
+        self.name = f'endless_horde_{count}'
+
+    def setup(self):
+        from camera import Camera
+        from horde import Horde
+        from levels.endless_mode import _generate_empty_map, _create_lava_surface
+        from player import Player
+        from tile_map import compile_map
+        game_map = _generate_empty_map()
+        self.camera = Camera.for_map(game_map)
+        self.player = Player()
+        self.player.x, self.player.y = self.camera.world_width // 2, self.camera.world_height // 2
+        self.tiles = compile_map(game_map)
+        self.horde = Horde()
+        self.horde.spawn_random(self.count, self.tiles, self.player.x, self.player.y)
+        self.lava = _create_lava_surface()
+        self.projectiles = Projectiles()
+        self.frame = 0
+
+    def update(self, dt, now):
+        p, horde, proj = self.player, self.horde, self.projectiles
+        self.frame += 1
+        if self.frame % 6 == 0:
+            proj.spawn_many(p.x, p.y, [random.uniform(0, 2 * math.pi) for _ in range(8)], BULLET_SPEED,
+                            kind=BULLET, owner=PLAYER)
+        horde.update(p.x, p.y, self.tiles, dt, now)
+        horde.contact(p.x, p.y, p.radius, now, 1000)
+        proj.update(dt, bounds=(0, 0, self.camera.world_width, self.camera.world_height))
+        shots = proj.alive(PLAYER)
+        if len(shots):
+            # Swept against the crowd in one batch, like the level does
+            hits = horde.query_segments(proj.prev_x[shots], proj.prev_y[shots], proj.x[shots], proj.y[shots])
+            for i, candidates in zip(shots.tolist(), hits):
+                for z in candidates:
+                    if horde.health[z] > 0:
+                        horde.damage(z, float(proj.damage[i]))
+                        proj.hit(i)
+                        break
+        proj.compact()
+        horde.compact()
+        if len(horde) < self.count:
+            horde.spawn_random(self.count - len(horde), self.tiles, p.x, p.y, now)
+
+    def draw(self, screen):
+        camera = self.camera
+        camera.follow(self.player.x, self.player.y)
+        screen.blit(self.lava, (0, 0))
+        self.projectiles.draw(screen, 1.0, camera)
+        with camera.applied([self.player]):
+            self.player.draw(screen)
+        self.horde.draw(screen, 1.0, camera)
+
+
+class ScrollingMap(Scenario):
+    """The outside area's map at ``screens`` screens per side, with a crowd
+    spawned at the same density everywhere and the player walking a loop so
+    the camera scrolls.  The crowd routes after the player along the flow
+    field, which the loop keeps re-rooting, so ``update`` shows what the
+    simulation costs per map size; drawing should cost the same at every
+    size, though the crowd slowly gathers on screen as the run goes on."""
+
+    PER_SCREEN = 60  # zombies per screen's worth of map
+    RADIUS = 300     # of the player's loop, in pixels
+
+    def __init__(self, screens):
+        self.screens = screens
+        self.name = f'scrolling_map_{screens}x'
+
+    def setup(self):
+        from camera import Camera
+        from horde import Horde
+        from levels.lab_scene import create_outside_environment
+        from player import Player
+        from tile_map import compile_map
+        k = self.screens
+        self.map = create_outside_environment(SCREEN_WIDTH // TILE_SIZE * k, SCREEN_HEIGHT // TILE_SIZE * k)
+        self.camera = Camera.for_map(self.map)
+        self.player = Player()
+        self.horde = Horde()
+        self.tiles = compile_map(self.map)
+        self.horde.spawn_random(self.PER_SCREEN * k * k, self.tiles, -1000, -1000)
+        self.frame = 0
+
+    def update(self, dt, now):
+        self.frame += 1
+        a = self.frame * dt
+        cam = self.camera
+        self.player.x = cam.world_width / 2 + math.cos(a) * self.RADIUS
+        self.player.y = cam.world_height / 2 + math.sin(a) * self.RADIUS
+        self.horde.update(self.player.x, self.player.y, self.tiles, dt, now)
+
+    def draw(self, screen):
+        from levels.lab_scene import draw_outside_environment
+        camera = self.camera
+        camera.follow(self.player.x, self.player.y)
+        draw_outside_environment(screen, self.map, camera)
+        with camera.applied([self.player]):
+            self.player.draw(screen)
+        self.horde.draw(screen, 1.0, camera)
+
+
+class PythonBossEnraged(Scenario):
+    """Enraged python on the boss map trailing a full 20 s of poison puddles."""
+
+    name = 'python_boss_enraged'
+
+    def setup(self):
+        import main
+        from python_boss import PythonBoss
+        from player import Player
+        main.game_map = main.boss_level_map
+        main.player = self.player = Player()
+        self.player.x, self.player.y = 16 * TILE_SIZE, 9 * TILE_SIZE
+        self.boss = PythonBoss()
+        self.boss.max_trail_duration = 20.0
+        self.boss.health = PYTHON_HEALTH * PYTHON_ENRAGE_HEALTH_THRESHOLD - 1
+        self.map = main.boss_level_map
+        # 20 s of puddles at the level's one-per-0.4 s rate, oldest nearly dry
+        for i in range(50):
+            a = i * 0.35
+            self.boss.poison_trail.add(SCREEN_WIDTH / 2 + math.cos(a) * (100 + 4 * i),
+                                       SCREEN_HEIGHT / 2 + math.sin(a) * (60 + 3 * i),
+                                       POISON_PUDDLE_DPS, 20.0 - i * 0.4)
+        self.poison_timer = 0.0
+
+    def update(self, dt, now):
+        boss, p = self.boss, self.player
+        boss.update(p.x, p.y, self.map, dt)
+        self.poison_timer -= dt
+        if self.poison_timer <= 0:
+            boss.drop_puddle()
+            self.poison_timer = 0.4
+        self.in_poison = boss.poison_trail.damage_at(p.x, p.y)
+
+    def draw(self, screen):
+        import main
+        screen.fill(main.BG_COLOR)
+        main.draw_map()
+        self.player.draw(screen)
+        self.boss.draw(screen)
+
+
+class KratosStorm(Scenario):
+    """Divine Arena phase 3: Kratos below 20% HP with weapon arcs every 150 ms."""
+
+    name = 'kratos_weapon_storm'
+    WEAPONS = ('blade', 'axe', 'fist')
+
+    def setup(self):
+        from levels.divine_arena import KratosBoss, _draw_arena_floor
+        from background_layer import BackgroundLayer, get_layer
+        from player import Player
+        self.player = Player()
+        self.player.x, self.player.y = SCREEN_WIDTH // 2, SCREEN_HEIGHT - 120
+        self.boss = KratosBoss(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)
+        self.boss.health = self.boss.max_health * 0.15
+        self.boss._ultimate_used = True
+        self.floor = get_layer('divine_arena', lambda: BackgroundLayer(size=(SCREEN_WIDTH, SCREEN_HEIGHT),
+                                                                      draw_base=_draw_arena_floor))
+        self.projectiles = Projectiles()
+        self.next_arc = 0
+        self.arcs = 0
+
+    def update(self, dt, now):
+        acts = self.boss.update(self.player, now, dt)
+        if now >= self.next_arc:
+            self.boss._emit_weapon_arc(acts, self.WEAPONS[self.arcs % 3], 12, 1.2)
+            self.arcs += 1
+            self.next_arc = now + 150
+        for a in acts:
+            if a.get('type') == 'volley':
+                self.projectiles.spawn_volley(a)
+        _step_projectiles(self.projectiles, dt, self.player)
+
+    def draw(self, screen):
+        self.floor.blit(screen)
+        self.boss.draw(screen)
+        self.projectiles.draw(screen)
+        self.player.draw(screen)
+
+
+class DragonWalls(Scenario):
+    """Ruined Sanctuary phase 3: the dragon's corner-blast walls from rotating edges every 200 ms."""
+
+    name = 'dragon_wall_barrage'
+    EDGES = ('left', 'top', 'right', 'bottom')
+
+    def setup(self):
+        from levels.ruined_sanctuary import DragonBoss, _draw_sanctuary_floor
+        from background_layer import BackgroundLayer, get_layer
+        from player import Player
+        self.player = Player()
+        self.player.x, self.player.y = SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2
+        self.boss = DragonBoss(SCREEN_WIDTH * 0.75, SCREEN_HEIGHT // 2)
+        self.boss.health = self.boss.max_health * 0.15
+        self.floor = get_layer('ruined_sanctuary', lambda: BackgroundLayer(size=(SCREEN_WIDTH, SCREEN_HEIGHT),
+                                                                          draw_base=_draw_sanctuary_floor))
+        self.projectiles = Projectiles()
+        self.next_wall = 0
+        self.walls = 0
+
+    def update(self, dt, now):
+        act = self.boss.update(self.player, now, dt)
+        acts = act if isinstance(act, list) else [act] if act else []
+        if now >= self.next_wall:
+            self.boss._emit_wall(acts, self.EDGES[self.walls % 4])
+            self.walls += 1
+            self.next_wall = now + 200
+        for a in acts:
+            if a.get('type') == 'volley':
+                self.projectiles.spawn_volley(a)
+        _step_projectiles(self.projectiles, dt, self.player)
+
+    def draw(self, screen):
+        self.floor.blit(screen)
+        self.boss.draw(screen)
+        self.projectiles.draw(screen)
+        self.player.draw(screen)
+
+
+class BulletHell(Scenario):
+    """``count`` enemy orbs on screen at once: four emitters fire rotating
+    rings and every orb lives long enough to cross the screen."""
+
+    RING = 40
+
+    def __init__(self, count):
+        self.count = count
+        self.name = f'bullet_hell_{count}'
+
+    def setup(self):
+        from player import Player
+        self.player = Player()
+        self.player.x, self.player.y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+        self.projectiles = Projectiles(capacity=self.count)
+        self.emitters = [(SCREEN_WIDTH * fx, SCREEN_HEIGHT * fy) for fx, fy in
+                         ((0.2, 0.25), (0.8, 0.25), (0.2, 0.75), (0.8, 0.75))]
+        self.turn = 0.0
+
+    def update(self, dt, now):
+        proj = self.projectiles
+        # Top up with whole rings until the pool holds ``count`` orbs
+        while len(proj) + self.RING <= self.count:
+            x, y = self.emitters[int(self.turn * 7) % len(self.emitters)]
+            angles = self.turn + np.arange(self.RING) * (2 * math.pi / self.RING)
+            proj.spawn_many(x, y, angles, random.uniform(60, 140), kind=ORB, owner=ENEMY,
+                            lifetime=random.uniform(4.0, 8.0))
+            self.turn += 0.13
+        _step_projectiles(proj, dt, self.player)
+
+    def draw(self, screen):
+        screen.fill((10, 0, 20))
+        self.projectiles.draw(screen)
+        self.player.draw(screen)
+
+
+class ParticleStorm(Scenario):
+    """``count`` live particles: every frame the engine is topped back up
+    with dust, sparks and collect bursts at random points plus the endless
+    mode ember stream."""
+
+    BURSTS = ('dust', 'sparks', 'collect')
+
+    def __init__(self, count):
+        self.count = count
+        self.name = f'particle_storm_{count}'
+
+    def setup(self):
+        from particle_engine import ParticleEngine
+        self.engine = ParticleEngine(capacity=self.count)
+
+    def update(self, dt, now):
+        engine = self.engine
+        engine.stream('ember', 36, dt, SCREEN_WIDTH / 2, SCREEN_HEIGHT)
+        while len(engine) < self.count:
+            x, y = random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT)
+            engine.emit(random.choice(self.BURSTS), x, y)
+        engine.update(dt)
+
+    def draw(self, screen):
+        screen.fill((10, 0, 20))
+        self.engine.draw(screen)
+
+
+SCENARIOS = {s.name: s for s in (
+    EndlessHorde(50), EndlessHorde(200), EndlessHorde(1000),
+    PythonBossEnraged(), KratosStorm(), DragonWalls(), BulletHell(3000),
+    ParticleStorm(20000), ScrollingMap(1), ScrollingMap(2), ScrollingMap(4),
+)}
+
+
+# ---------------------- Running ----------------------
+def _frames(scenario, frames, seed, on_frame):
+    """Set up ``scenario`` fresh and call on_frame(update, draw) for each frame."""
+    random.seed(seed)
+    np.random.seed(seed)
+    scenario.setup()
+    screen = pygame.display.get_surface()
+    dt = 1.0 / SIM_HZ
+    now = 0
+    for i in range(frames):
+        now = int(i * dt * 1000)
+        on_frame(lambda: scenario.update(dt, now), lambda: scenario.draw(screen))
+
+
+def run_scenario(scenario, frames=600, seed=0, measure_alloc=True):
+    """Time ``frames`` frames of ``scenario`` (after a warm-up); returns a stats dict."""
+    update_ms, draw_ms, alloc_kib, surfaces = [], [], [], []
+    clock = time.perf_counter
+
+    def timed(update, draw):
+        t0 = clock()
+        update()
+        t1 = clock()
+        draw()
+        t2 = clock()
+        update_ms.append((t1 - t0) * 1000.0)
+        draw_ms.append((t2 - t1) * 1000.0)
+
+    # A HUD of our own, never drawn, just for its Surface counters
+    counter = perf_hud.PerfHUD()
+
+    def traced(update, draw):
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        update()
+        draw()
+        alloc_kib.append((tracemalloc.get_traced_memory()[1] - start) / 1024.0)
+        counter.end_frame()
+        surfaces.append(counter.counters['surfaces'])
+
+    with headless.HeadlessSession(seed=seed):
+        _frames(scenario, frames + WARMUP_FRAMES, seed, timed)
+        if measure_alloc:
+            tracemalloc.start()
+            counter.toggle()
+            try:
+                _frames(scenario, min(frames, 120) + WARMUP_FRAMES, seed, traced)
+            finally:
+                counter.toggle()
+                tracemalloc.stop()
+
+    update_ms, draw_ms = np.array(update_ms[WARMUP_FRAMES:]), np.array(draw_ms[WARMUP_FRAMES:])
+    result = {
+        'frames': frames,
+        'update': _summary(update_ms),
+        'draw': _summary(draw_ms),
+        'frame': _summary(update_ms + draw_ms),
+    }
+    if alloc_kib:
+        result['alloc_kib'] = _summary(np.array(alloc_kib[WARMUP_FRAMES:]))
+        result['surfaces'] = _summary(np.array(surfaces[WARMUP_FRAMES:]))
+    return result
+
+
+def _summary(values):
+    stats = {f'p{p}': round(float(np.percentile(values, p)), 3) for p in PERCENTILES}
+    stats['max'] = round(float(values.max()), 3)
+    return stats
+
+
+def run_all(names=None, frames=600, seed=0, measure_alloc=True):
+    return {name: run_scenario(SCENARIOS[name], frames, seed, measure_alloc)
+            for name in (names or SCENARIOS)}
+
+
+def compare(results, baseline, threshold=0.15):
+    """List (scenario, metric, baseline_ms, current_ms) for frame times more
+    than ``threshold`` (fraction) slower than ``baseline``."""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key in (f'p{p}' for p in PERCENTILES):
+            old, new = base['frame'][key], current['frame'][key]
+            if new > old * (1 + threshold):
+                regressions.append((name, f'frame {key}', old, new))
+    return regressions
+
+
+def _print_table(results):
+    print(f"{'scenario':<22} {'update p50/p95':>16} {'draw p50/p95':>16} "
+          f"{'frame p50/p95/p99/max':>28} {'alloc KiB p50':>14} {'surfaces p50/max':>17}")
+    for name, r in results.items():
+        u, d, f = r['update'], r['draw'], r['frame']
+        alloc = f"{r['alloc_kib']['p50']:.1f}" if 'alloc_kib' in r else '-'
+        made = f"{r['surfaces']['p50']:.0f}/{r['surfaces']['max']:.0f}" if 'surfaces' in r else '-'
+        print(f"{name:<22} {u['p50']:>7.2f}/{u['p95']:<8.2f} {d['p50']:>7.2f}/{d['p95']:<8.2f} "
+              f"{f['p50']:>6.2f}/{f['p95']:.2f}/{f['p99']:.2f}/{f['max']:<9.2f} {alloc:>14} {made:>17}")
+
+
+def _cli(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark canonical combat scenarios.")
+    parser.add_argument('scenarios', nargs='*', help=f"any of {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-alloc', action='store_true', help="skip the tracemalloc and Surface-count pass")
+    parser.add_argument('--save', metavar='PATH', help="write results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a JSON baseline")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="allowed slowdown before flagging a regression (default 0.15 = 15%%)")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    headless.use_dummy_drivers()
+    import main  # levels import it at runtime
+    main.init()
+    results = run_all(args.scenarios, args.frames, args.seed, not args.no_alloc)
+    _print_table(results)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name} {metric}: {old:.2f} ms -> {new:.2f} ms")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    # Go through the importable modules so levels see the same session state
+    import benchmark
+    sys.exit(benchmark._cli())
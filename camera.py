@@ -0,0 +1,110 @@
+"""Scrolling view onto maps larger than the screen.
+
+Levels keep everything in world (map pixel) coordinates.  Each frame the
+camera centres on the player, clamped so it never shows past the map's
+edges, and drawing goes through it:
+
+* the background layer, floor stains and the NumPy pools (Horde,
+  Projectiles, the particle engine) take ``camera`` and draw only what
+  falls inside the view, shifted onto the screen;
+* objects that draw themselves at their own x/y (the player, Zombie and
+  its subclasses, pickups, blood splatters) are moved into screen
+  coordinates for the length of ``with camera.applied(items)``, the way
+  FixedStep.interpolated() moves them to their blended position.  Pass
+  only what sees() reports as on screen; the rest is culled.
+
+A frame therefore touches what is on screen and nothing else, and costs
+the same on a map ten screens wide as on one the size of the window.
+On a map no bigger than the screen the camera stays at (0, 0) and
+everything draws exactly as before.
+"""
+import pygame
+
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, CAMERA_CULL_MARGIN
+
+
+class Camera:
+    """Top-left corner (x, y) of the visible part of a ``world_size`` map, in whole pixels."""
+
+    def __init__(self, world_size, view_size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.world_width, self.world_height = world_size
+        self.width, self.height = view_size
+        self.x = 0
+        self.y = 0
+
+    @classmethod
+    def for_map(cls, map_data, view_size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        return cls((len(map_data[0]) * TILE_SIZE, len(map_data) * TILE_SIZE), view_size)
+
+    def follow(self, x, y):
+        """Centre the view on world point (x, y) without showing past the map."""
+        self.x = int(max(0, min(x - self.width // 2, self.world_width - self.width)))
+        self.y = int(max(0, min(y - self.height // 2, self.world_height - self.height)))
+
+    # ---------------------- Conversion ----------------------
+    def to_screen(self, x, y):
+        return x - self.x, y - self.y
+
+    def to_world(self, sx, sy):
+        return sx + self.x, sy + self.y
+
+    @property
+    def rect(self):
+        """The view as a world-space Rect."""
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    @property
+    def bounds(self):
+        """The view as (x0, y0, x1, y1), like Projectiles.update's ``bounds``."""
+        return (self.x, self.y, self.x + self.width, self.y + self.height)
+
+    # ---------------------- Culling ----------------------
+    def sees(self, x, y, margin=CAMERA_CULL_MARGIN):
+        """True when world point (x, y) is on screen or within ``margin`` of it."""
+        return (self.x - margin <= x < self.x + self.width + margin
+                and self.y - margin <= y < self.y + self.height + margin)
+
+    def visible(self, xs, ys, margin=CAMERA_CULL_MARGIN):
+        """sees() for arrays of world coordinates; returns a boolean mask."""
+        return ((xs >= self.x - margin) & (xs < self.x + self.width + margin)
+                & (ys >= self.y - margin) & (ys < self.y + self.height + margin))
+
+    def applied(self, items):
+        """Context manager moving ``items`` (objects or dicts with x/y) into screen coordinates."""
+        return _Applied(self, items)
+
+
+class _Applied:
+    def __init__(self, camera, items):
+        self.camera = camera
+        self.items = items
+        self._saved = []
+
+    def __enter__(self):
+        dx, dy = self.camera.x, self.camera.y
+        if not dx and not dy:
+            return self.camera
+        for e in self.items:
+            if isinstance(e, dict):
+                x, y = e['x'], e['y']
+                self._saved.append((e, x, y))
+                e['x'], e['y'] = x - dx, y - dy
+            else:
+                x, y = e.x, e.y
+                self._saved.append((e, x, y))
+                e.x, e.y = x - dx, y - dy
+        return self.camera
+
+    def __exit__(self, *exc):
+        for e, x, y in self._saved:
+            if isinstance(e, dict):
+                e['x'], e['y'] = x, y
+            else:
+                e.x, e.y = x, y
+        self._saved = []
+        return False
+
+
+def splatters_of(bodies):
+    """The blood splatters ``bodies`` draw at their own positions (for applied())."""
+    return [splat for body in bodies for splat in getattr(body, 'blood_splatters', ())]
@@ -0,0 +1,122 @@
+import pygame
+
+from settings import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, DECAL_MAX_RADIUS, DECAL_ALPHA_STEPS,
+    DECAL_FLOOR_ENABLED, DECAL_FLOOR_ALPHA
+)
+
+
+class StampPool:
+    """Pre-rendered blood splatter circles, one per (colour, radius, alpha step).
+
+    Splatters pick the nearest stamp instead of allocating and drawing a
+    fresh SRCALPHA Surface every frame.  Stamps for a colour are rendered
+    the first time that colour is used.
+    """
+
+    def __init__(self, max_radius=DECAL_MAX_RADIUS, alpha_steps=DECAL_ALPHA_STEPS):
+        self.max_radius = max_radius
+        self.alpha_steps = alpha_steps
+        self._stamps = {}  # rgb -> [radius][step] Surface
+
+    def stamp(self, color, radius, alpha):
+        """Return the stamp for ``color`` (rgb) closest to ``radius`` and ``alpha`` (0-255)."""
+        table = self._stamps.get(color)
+        if table is None:
+            table = self._stamps[color] = self._render(color)
+        radius = max(1, min(self.max_radius, int(radius)))
+        step = max(0, min(self.alpha_steps, round(alpha * self.alpha_steps / 255)))
+        return table[radius][step]
+
+    def _render(self, color):
+        table = [None]
+        for radius in range(1, self.max_radius + 1):
+            row = []
+            for step in range(self.alpha_steps + 1):
+                surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(surf, (*color, 255 * step // self.alpha_steps), (radius, radius), radius)
+                row.append(surf)
+            table.append(row)
+        return table
+
+
+class FloorLayer:
+    """Persistent stains that splatters are baked into once.
+
+    Only the area that has been stained is blitted, so levels without gore
+    pay nothing and a few stains do not cost a full-screen alpha blit.  On
+    a scrolling map the layer covers the whole map and draw() blits the
+    stained area inside the camera's view.
+    """
+
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.bounds = None  # Rect covering every stain so far
+
+    def bake(self, x, y, radius, color, alpha=DECAL_FLOOR_ALPHA):
+        surf = stamps.stamp(color, radius, alpha)
+        rect = self.surface.blit(surf, (x - surf.get_width() // 2, y - surf.get_height() // 2))
+        self.bounds = rect if self.bounds is None else self.bounds.union(rect)
+
+    def clear(self):
+        self.surface.fill((0, 0, 0, 0))
+        self.bounds = None
+
+    def draw(self, screen, camera=None):
+        if not self.bounds:
+            return
+        if camera is None:
+            screen.blit(self.surface, self.bounds.topleft, self.bounds)
+            return
+        area = self.bounds.clip(camera.rect)
+        if area:
+            screen.blit(self.surface, camera.to_screen(*area.topleft), area)
+
+
+stamps = StampPool()
+_floor = None
+_floor_size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+
+
+def draw_splatters(screen, splatters, color, lifetime, camera=None):
+    """Draw fading splatters ({'x','y','r','timer'}) in ``color`` (rgba).
+
+    With a ``camera`` the splatters are in world coordinates; those off
+    screen are skipped.
+    """
+    rgb, max_alpha = color[:3], color[3]
+    ox, oy = (camera.x, camera.y) if camera is not None else (0, 0)
+    for splat in splatters:
+        if camera is not None and not camera.sees(splat['x'], splat['y'], DECAL_MAX_RADIUS):
+            continue
+        surf = stamps.stamp(rgb, splat['r'], max_alpha * (splat['timer'] / lifetime))
+        half = surf.get_width() // 2
+        screen.blit(surf, (splat['x'] - half - ox, splat['y'] - half - oy))
+
+
+def bake(x, y, radius, color):
+    """Stain the floor layer, if enabled, with a splatter at (x, y)."""
+    global _floor
+    if not DECAL_FLOOR_ENABLED:
+        return
+    if _floor is None:
+        _floor = FloorLayer(_floor_size)
+    _floor.bake(x, y, radius, color[:3])
+
+
+def clear_floor(size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+    """Remove all stains; levels call this when they start.
+
+    Scrolling levels pass their map's size in pixels so stains can go
+    anywhere on it.
+    """
+    global _floor, _floor_size
+    if tuple(size) != _floor_size:
+        _floor, _floor_size = None, tuple(size)  # the next bake() makes one this size
+    elif _floor is not None:
+        _floor.clear()
+
+
+def draw_floor(screen, camera=None):
+    if _floor is not None:
+        _floor.draw(screen, camera)
@@ -0,0 +1,135 @@
+"""Small entity-component-system core for the level loops.
+
+An entity is an int id.  A component is any value stored under a name
+for that id: the game object itself ('body'), plain dicts of tuning data
+('contact', 'target') or callables ('loot').  A World holds one dict per
+component name and runs its systems in a fixed order of phases every
+step:
+
+    input -> movement -> collision -> damage -> lifetime
+
+and the 'render' phase from draw().  A level is then a World with a list
+of (phase, system) pairs plus the entities it spawns; the shared systems
+live in systems.py so a fix or optimisation there reaches every level
+that uses them.
+
+Shared per-level state that is not tied to one entity (the player, the
+projectile pool, the tile map) goes in ``world.resources``.  Systems talk
+back to the level with emit(); step() returns what was emitted so the
+loop can react (a kill that opens a door, a boss that died).
+"""
+
+import perf_hud
+
+PHASES = ('input', 'movement', 'collision', 'damage', 'lifetime', 'render')
+
+# perf_hud section each simulation phase is charged to
+_PHASE_SECTIONS = {'input': 'player', 'movement': 'zombies', 'collision': 'bullets',
+                   'damage': 'collisions', 'lifetime': 'collisions'}
+
+
+class World:
+    """Component stores, resources and the ordered systems of one level."""
+
+    def __init__(self, **resources):
+        self.resources = resources
+        self.stores = {}                      # component name -> {entity: value}
+        self.systems = {phase: [] for phase in PHASES}
+        self.step_events = []                 # pygame events for the current step
+        self._next_id = 0
+        self._bodies = {}                     # id(body) -> entity, for spatial-hash results
+        self._doomed = []
+        self._emitted = []
+
+    # ---------------------- Entities ----------------------
+    def spawn(self, **components):
+        """Create an entity with ``components``; returns its id."""
+        entity = self._next_id
+        self._next_id += 1
+        self.add(entity, **components)
+        return entity
+
+    def add(self, entity, **components):
+        for name, value in components.items():
+            self.stores.setdefault(name, {})[entity] = value
+            if name == 'body':
+                self._bodies[id(value)] = entity
+
+    def remove(self, entity, *names):
+        for name in names:
+            value = self.stores.get(name, {}).pop(entity, None)
+            if name == 'body' and value is not None:
+                self._bodies.pop(id(value), None)
+
+    def destroy(self, entity):
+        """Remove ``entity`` at the end of the current step, so systems
+        iterating a store are never disturbed."""
+        self._doomed.append(entity)
+
+    def get(self, entity, name, default=None):
+        return self.stores.get(name, {}).get(entity, default)
+
+    def has(self, entity, name):
+        return entity in self.stores.get(name, {})
+
+    def entity_of(self, body):
+        """Entity whose 'body' is ``body`` (None if it has none)."""
+        return self._bodies.get(id(body))
+
+    def store(self, name):
+        """The live {entity: value} dict for ``name`` (empty if unused)."""
+        return self.stores.setdefault(name, {})
+
+    def count(self, name):
+        return len(self.stores.get(name, ()))
+
+    def query(self, *names):
+        """Yield (entity, value, ...) for entities that have every component
+        in ``names``, in spawn order of the first store."""
+        stores = [self.stores.get(name, {}) for name in names]
+        first, rest = stores[0], stores[1:]
+        for entity, value in list(first.items()):
+            if all(entity in s for s in rest):
+                yield (entity, value, *(s[entity] for s in rest))
+
+    # ---------------------- Systems ----------------------
+    def add_system(self, phase, system, before=None):
+        """Run ``system(world, dt)`` every step in ``phase`` (render systems
+        get ``(world, screen, alpha)`` from draw()), after the systems
+        already there or just ahead of ``before``."""
+        systems = self.systems[phase]
+        if before is None:
+            systems.append(system)
+        else:
+            systems.insert(systems.index(before), system)
+
+    def add_systems(self, pairs):
+        for phase, system in pairs:
+            self.add_system(phase, system)
+
+    def emit(self, *event):
+        """Report something to the level loop, e.g. ('killed', entity, body)."""
+        self._emitted.append(event)
+
+    def step(self, dt, events=()):
+        """Run one simulation step; returns the events systems emitted."""
+        self.step_events = events
+        self._emitted = []
+        for phase in PHASES[:-1]:
+            for system in self.systems[phase]:
+                system(self, dt)
+            perf_hud.hud.mark(_PHASE_SECTIONS[phase])
+        self._flush()
+        return self._emitted
+
+    def draw(self, screen, alpha=1.0):
+        for system in self.systems['render']:
+            system(self, screen, alpha)
+
+    def _flush(self):
+        for entity in self._doomed:
+            for name, store in self.stores.items():
+                value = store.pop(entity, None)
+                if name == 'body' and value is not None:
+                    self._bodies.pop(id(value), None)
+        self._doomed = []
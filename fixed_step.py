@@ -0,0 +1,131 @@
+import pygame
+
+from settings import SIM_HZ, SIM_MAX_STEPS, RENDER_FPS_CAP
+
+
+class FixedStep:
+    """Fixed-rate simulation clock for the level loops.
+
+    Each rendered frame, steps() adds the real time that passed to an
+    accumulator and yields the constant step ``dt`` once per whole step
+    owed, so physics always advances in 1/SIM_HZ slices however fast or
+    slow frames are drawn.  After a long hitch at most ``max_steps`` run
+    and the remaining backlog is dropped instead of snowballing.
+
+    The leftover fraction of a step is ``alpha``; drawing inside
+    ``with sim.interpolated():`` moves every tracked entity to where it
+    was ``alpha`` of the way through the last step, then puts it back.
+
+        sim = FixedStep()
+        sim.track(lambda: [player, *zombies, *bullets])
+        while running:
+            events = pygame.event.get()
+            for dt, step_events in sim.steps(events):
+                handle_player_input(player, bullets, step_events)
+                ...update...
+            with sim.interpolated():
+                ...draw...
+    """
+
+    def __init__(self, hz=SIM_HZ, max_steps=SIM_MAX_STEPS, fps_cap=RENDER_FPS_CAP):
+        self.dt = 1.0 / hz
+        self.max_steps = max_steps
+        self.fps_cap = fps_cap
+        self.clock = pygame.time.Clock()
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.frame_dt = 0.0     # real seconds since the previous frame
+        self.dropped = 0.0      # simulated seconds skipped by the max_steps guard
+        self._pending = []      # input events waiting for the next step
+        self._tracked = None
+        self._prev = {}         # id(entity) -> (entity, x, y) before the last step
+
+    def track(self, entities):
+        """Interpolate whatever ``entities()`` returns: objects with x/y or dicts with 'x'/'y'."""
+        self._tracked = entities
+
+    def steps(self, events=(), frame_dt=None):
+        """Yield ``(dt, events)`` for each simulation step owed this frame.
+
+        ``frame_dt`` overrides the real clock (seconds).  Input events are
+        handed to the first step only; if no step runs this frame they wait
+        for the next one, so a key press is never lost or applied twice.
+        """
+        if frame_dt is None:
+            frame_dt = self.clock.tick(self.fps_cap) / 1000.0
+        self.frame_dt = frame_dt
+        self._pending.extend(events)
+        self.accumulator += frame_dt
+        count = int(self.accumulator / self.dt)
+        if count > self.max_steps:
+            self.dropped += self.accumulator - self.max_steps * self.dt
+            self.accumulator = self.max_steps * self.dt
+            count = self.max_steps
+        for i in range(count):
+            if i == count - 1:
+                self._capture()
+            self.accumulator -= self.dt
+            events, self._pending = self._pending, []
+            yield self.dt, events
+        self.alpha = min(1.0, max(0.0, self.accumulator / self.dt))
+
+    def reset(self):
+        """Forget the backlog, e.g. after a blocking dialogue or pause."""
+        self.clock.tick()
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self._pending = []
+        self._prev = {}
+
+    # ---------------------- Interpolation ----------------------
+    def interpolated(self):
+        return _Interpolated(self)
+
+    def _capture(self):
+        self._prev = {}
+        if self._tracked is None:
+            return
+        for e in self._tracked():
+            if isinstance(e, dict):
+                if 'x' in e and 'y' in e:
+                    self._prev[id(e)] = (e, e['x'], e['y'])
+            else:
+                self._prev[id(e)] = (e, e.x, e.y)
+
+
+class _Interpolated:
+    """Context manager that swaps tracked positions for blended ones while drawing."""
+
+    def __init__(self, sim):
+        self.sim = sim
+        self._saved = []
+
+    def __enter__(self):
+        sim = self.sim
+        a = sim.alpha
+        if sim._tracked is None or a >= 1.0:
+            return sim
+        prev = sim._prev
+        for e in sim._tracked():
+            entry = prev.get(id(e))
+            if entry is None or entry[0] is not e:
+                continue  # spawned during the last step
+            _, px, py = entry
+            if isinstance(e, dict):
+                x, y = e['x'], e['y']
+                self._saved.append((e, x, y))
+                e['x'], e['y'] = px + (x - px) * a, py + (y - py) * a
+            else:
+                x, y = e.x, e.y
+                self._saved.append((e, x, y))
+                e.x, e.y = px + (x - px) * a, py + (y - py) * a
+        return sim
+
+    def __exit__(self, *exc):
+        for e, x, y in self._saved:
+            if isinstance(e, dict):
+                e['x'], e['y'] = x, y
+            else:
+                e.x, e.y = x, y
+        self._saved = []
+        return False
@@ -0,0 +1,216 @@
+import math
+import weakref
+
+import numpy as np
+
+from settings import TILE_SIZE, FLOW_FIELD_PASSES_PER_UPDATE
+from tile_map import BLOCKS_WALKERS
+
+SQRT2 = math.sqrt(2)
+
+# (dcol, drow, cost) for the eight neighbours
+_NEIGHBOURS = ((1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+               (1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2))
+
+# Improvements smaller than this are float noise from the sweep offsets
+_EPSILON = 1e-6
+
+
+def _sweep_lines(open_):
+    """Index and offset arrays for sweeping ``open_`` along each neighbour direction.
+
+    Distance flows away from a neighbour (dc, dr), so each line runs
+    tile, tile - (dc, dr), tile - 2 (dc, dr), ... across the grid.  ``index``
+    holds every line's flat tile indices, padded with the dummy index
+    ``open_.size``.  ``offset`` is the step cost times the position along
+    the line plus a large constant per run of reachable steps, so that
+    ``minimum.accumulate(field - offset) + offset`` carries the cheapest
+    arrival down a run without leaking past the wall that ends it.
+    Also returns the finite stand-in for "unreached" the offsets rely on.
+    """
+    rows, cols = open_.shape
+    unreached = 2.0 ** math.ceil(math.log2(2 * SQRT2 * open_.size + 2))  # beyond any route
+    open_padded = np.pad(open_, 1, constant_values=False)
+    r_idx, c_idx = np.indices(open_.shape)
+    k = np.arange(max(rows, cols))
+    lines = []
+    for dc, dr, cost in _NEIGHBOURS:
+        ok = open_ & open_padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+        if dc and dr:
+            # No squeezing diagonally between two blocked tiles
+            ok &= (open_padded[1:1 + rows, 1 + dc:1 + dc + cols]
+                   & open_padded[1 + dr:1 + dr + rows, 1:1 + cols])
+        # Lines start where the neighbour they would come from is off the grid
+        first = ~((r_idx + dr >= 0) & (r_idx + dr < rows) & (c_idx + dc >= 0) & (c_idx + dc < cols))
+        line_r = r_idx[first][:, None] - dr * k
+        line_c = c_idx[first][:, None] - dc * k
+        inside = (line_r >= 0) & (line_r < rows) & (line_c >= 0) & (line_c < cols)
+        index = np.where(inside, line_r * cols + line_c, open_.size)
+        runs = np.cumsum(~np.append(ok.ravel(), False)[index], axis=1)
+        lines.append((index, cost * k + runs * (2 * unreached)))
+    return lines, unreached
+
+
+class FlowField:
+    """Shared route to the player over a compiled TileMap.
+
+    A shortest-path distance field (octile steps, no cutting past blocked
+    corners) is rooted at the player's tile and rebuilt only when the
+    player enters a new tile.  The rebuild sweeps every row, column and
+    diagonal of the grid at once, one direction per pass, until eight
+    passes in a row improve nothing; that is a round or two of passes per
+    turn in the longest route instead of a heap pop per tile.  Each open
+    tile then stores the heading to its best neighbour, so a zombie looks
+    up its direction in O(1) however many zombies there are.  Tiles whose
+    shortest route is as short as the straight line get no heading (NaN)
+    and their zombies walk straight at the player, as they always did.
+
+    A pass costs in proportion to the map's area, so update() runs at most
+    FLOW_FIELD_PASSES_PER_UPDATE of them per call and the old headings stay
+    in use until the new field has settled a few steps later.  Only the
+    very first field is built in one go.
+    """
+
+    def __init__(self, tiles, mask=BLOCKS_WALKERS):
+        self.tiles = tiles
+        self.open = ~tiles.layer(mask)
+        self.target = None     # tile the current headings lead to
+        self.building = None   # tile a new field is being swept towards, if any
+        self.distance = np.full(self.open.shape, np.inf)
+        self.angles = np.full(self.open.shape, np.nan)
+        self._angles = [math.nan] * self.open.size  # flat copy for scalar lookups
+        self.rebuilds = 0
+        self._lines, self._unreached = _sweep_lines(self.open)
+        self._flat = np.empty(self.open.size + 1)  # the field, plus the lines' dummy tile
+        self._next_line = 0
+        self._quiet = 0        # passes in a row that improved nothing
+
+    def update(self, x, y, passes=FLOW_FIELD_PASSES_PER_UPDATE):
+        """Re-root the field at pixel (x, y), sweeping at most ``passes`` times.
+
+        Returns True when a new field has just taken over.
+        """
+        tile = (int(x // TILE_SIZE), int(y // TILE_SIZE))
+        if tile != (self.building or self.target):
+            if tile == self.target:
+                # Back on the old tile before the new field settled
+                self.building = None
+                return False
+            if self.target is None:
+                self._rebuild(*tile)
+                return True
+            if not self._start(*tile):
+                return True
+        if self.building is None:
+            return False
+        for _ in range(passes):
+            if not self._sweep():
+                self._finish()
+                return True
+        return False
+
+    def angle_at(self, x, y):
+        """Heading for a walker at (x, y), or None to walk straight at the target."""
+        col, row = int(x // TILE_SIZE), int(y // TILE_SIZE)
+        rows, cols = self.open.shape
+        if 0 <= row < rows and 0 <= col < cols:
+            angle = self._angles[row * cols + col]
+            if angle == angle:  # not NaN
+                return angle
+        return None
+
+    def angles_at(self, xs, ys):
+        """Vectorised angle_at; NaN where walkers should head straight for the target."""
+        rows, cols = self.open.shape
+        col = (xs // TILE_SIZE).astype(np.int64)
+        row = (ys // TILE_SIZE).astype(np.int64)
+        inside = (row >= 0) & (row < rows) & (col >= 0) & (col < cols)
+        result = np.full(len(col), np.nan)
+        result[inside] = self.angles[row[inside], col[inside]]
+        return result
+
+    # ---------------------- Internals ----------------------
+    def _rebuild(self, col, row):
+        """Root a new field at tile (col, row) and settle it at once."""
+        if self._start(col, row):
+            while self._sweep():
+                pass
+            self._finish()
+
+    def _start(self, col, row):
+        """Begin sweeping towards (col, row); False if it is off the map or blocked."""
+        rows, cols = self.open.shape
+        self.rebuilds += 1
+        if not (0 <= row < rows and 0 <= col < cols) or not self.open[row, col]:
+            # Nowhere to route to: everyone walks straight at the target
+            self.target, self.building = (col, row), None
+            self.distance = np.full(self.open.shape, np.inf)
+            self.angles = np.full(self.open.shape, np.nan)
+            self._angles = [math.nan] * self.open.size
+            return False
+        self.building = (col, row)
+        self._flat.fill(self._unreached)
+        self._flat[row * cols + col] = 0.0
+        self._next_line = 0
+        self._quiet = 0
+        return True
+
+    def _sweep(self):
+        """Carry distances along the lines of one direction; False once the field has settled."""
+        index, offset = self._lines[self._next_line]
+        self._next_line = (self._next_line + 1) % len(self._lines)
+        flat = self._flat
+        field = flat[index]
+        arrival = np.minimum.accumulate(field - offset, axis=1) + offset
+        better = arrival < field - _EPSILON
+        if better.any():
+            flat[index[better]] = arrival[better]
+            self._quiet = 0
+        else:
+            self._quiet += 1
+        return self._quiet < len(self._lines)
+
+    def _finish(self):
+        """Turn the settled distances into headings and switch walkers over to them."""
+        rows, cols = self.open.shape
+        col, row = self.target = self.building
+        self.building = None
+        distance = self._flat[:-1].reshape(rows, cols).copy()
+        distance[distance >= self._unreached] = np.inf
+
+        # Best neighbour per tile, picked with shifted copies of the field
+        padded = np.pad(distance, 1, constant_values=np.inf)
+        open_padded = np.pad(self.open, 1, constant_values=False)
+        best = np.full(distance.shape, np.inf)
+        angles = np.full(distance.shape, np.nan)
+        for dc, dr, cost in _NEIGHBOURS:
+            candidate = padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols] + cost
+            if dc and dr:
+                corner_ok = (open_padded[1:1 + rows, 1 + dc:1 + dc + cols]
+                             & open_padded[1 + dr:1 + dr + rows, 1:1 + cols])
+                candidate = np.where(corner_ok, candidate, np.inf)
+            better = candidate < best - _EPSILON  # first direction wins a tie
+            best[better] = candidate[better]
+            angles[better] = math.atan2(dr, dc)
+
+        # Walk straight where no detour is needed (route as short as the octile line)
+        r_idx, c_idx = np.indices(distance.shape)
+        ax, ay = np.abs(c_idx - col), np.abs(r_idx - row)
+        octile = np.maximum(ax, ay) + (SQRT2 - 1) * np.minimum(ax, ay)
+        angles[(distance - octile < 0.5) | ~np.isfinite(distance)] = np.nan
+
+        self.distance = distance
+        self.angles = angles
+        self._angles = angles.ravel().tolist()
+
+
+# TileMap -> FlowField; dropped with the TileMap
+_fields = weakref.WeakKeyDictionary()
+
+
+def field_for(tiles):
+    """Return the shared FlowField for a TileMap, creating it on first use."""
+    field = _fields.get(tiles)
+    if field is None:
+        field = _fields[tiles] = FlowField(tiles)
+    return field
@@ -0,0 +1,139 @@
+import numpy as np
+import pygame
+
+from settings import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, HAZARD_CAPACITY, HAZARD_CELL_SIZE, HAZARD_ALPHA_STEPS,
+    POISON_TRAIL_COLOR, FLAME_TRAIL_COLOR
+)
+
+# Looks per kind: colour and drawn radius (the damage radius is per hazard)
+HAZARD_KINDS = (
+    {'name': 'poison', 'color': POISON_TRAIL_COLOR, 'draw_radius': TILE_SIZE * 0.55},
+    {'name': 'flame', 'color': FLAME_TRAIL_COLOR, 'draw_radius': TILE_SIZE * 0.7},
+)
+POISON, FLAME = range(len(HAZARD_KINDS))
+
+
+class HazardField:
+    """Timed ground hazards (poison puddles, flame trails) over a damage grid.
+
+    Hazards live in a fixed-capacity ring buffer; when it is full the oldest
+    one is overwritten.  Each hazard also adds its damage per second to every
+    cell of ``grid`` whose centre lies within its radius, so damage_at() is
+    a single lookup however many hazards are down.  update() advances the
+    field's clock and takes every hazard that ran out off the grid in one
+    vectorised pass.  Overlapping hazards stack, as separate puddles did.
+    """
+
+    FIELDS = (('x', np.float32), ('y', np.float32), ('radius', np.float32), ('dps', np.float64),
+              ('expires', np.float64), ('duration', np.float32), ('kind', np.int8), ('live', np.bool_),
+              ('col', np.int32), ('row', np.int32))
+
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, capacity=HAZARD_CAPACITY,
+                 cell=HAZARD_CELL_SIZE, kinds=HAZARD_KINDS):
+        self.cell = cell
+        self.kinds = kinds
+        self.capacity = capacity
+        self.grid = np.zeros((-(-height // cell), -(-width // cell)), dtype=np.float64)
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.now = 0.0
+        self._head = 0
+        self._footprints = {}  # radius -> (row offsets, col offsets)
+        self._sprites = {}     # kind -> faded Surfaces
+
+    def __len__(self):
+        return int(np.count_nonzero(self.live))
+
+    def clear(self):
+        self.grid.fill(0.0)
+        self.live[:] = False
+        self.now = 0.0
+        self._head = 0
+
+    # ---------------------- Adding ----------------------
+    def add(self, x, y, dps, duration, radius=TILE_SIZE, kind=POISON):
+        """Lay a hazard at (x, y) hurting ``dps`` per second within ``radius`` for ``duration`` s."""
+        i = self._head
+        self._head = (i + 1) % self.capacity
+        if self.live[i]:
+            self._stamp(np.array([i]), -1.0)
+        self.x[i], self.y[i] = x, y
+        self.radius[i] = radius
+        self.dps[i] = dps
+        self.expires[i] = self.now + duration
+        self.duration[i] = duration
+        self.kind[i] = kind
+        self.col[i] = int(x // self.cell)
+        self.row[i] = int(y // self.cell)
+        self.live[i] = True
+        self._stamp(np.array([i]), 1.0)
+
+    # ---------------------- Simulation ----------------------
+    def update(self, dt):
+        self.now += dt
+        done = np.flatnonzero(self.live & (self.expires <= self.now))
+        if len(done):
+            self.live[done] = False
+            self._stamp(done, -1.0)
+
+    def damage_at(self, x, y):
+        """Summed damage per second of the hazards covering (x, y)."""
+        row, col = int(y // self.cell), int(x // self.cell)
+        if 0 <= row < self.grid.shape[0] and 0 <= col < self.grid.shape[1]:
+            return float(self.grid[row, col])
+        return 0.0
+
+    def _stamp(self, idx, sign):
+        """Add (sign=1) or remove (sign=-1) the hazards ``idx`` from the grid."""
+        rows, cols = self.grid.shape
+        for radius in np.unique(self.radius[idx]).tolist():
+            group = idx[self.radius[idx] == radius]
+            dr, dc = self._footprint(radius)
+            r = (self.row[group, None] + dr).ravel()
+            c = (self.col[group, None] + dc).ravel()
+            dps = np.repeat(sign * self.dps[group], len(dr))
+            inside = (r >= 0) & (r < rows) & (c >= 0) & (c < cols)
+            np.add.at(self.grid, (r[inside], c[inside]), dps[inside])
+        if sign < 0:
+            # Wipe float residue so an empty cell reads exactly zero
+            self.grid[self.grid < 1e-6] = 0.0
+
+    def _footprint(self, radius):
+        footprint = self._footprints.get(radius)
+        if footprint is None:
+            reach = int(radius // self.cell) + 1
+            dr, dc = np.mgrid[-reach:reach + 1, -reach:reach + 1]
+            inside = (dr * self.cell) ** 2 + (dc * self.cell) ** 2 < radius * radius
+            footprint = self._footprints[radius] = (dr[inside], dc[inside])
+        return footprint
+
+    # ---------------------- Drawing ----------------------
+    def draw(self, screen, min_alpha=20, max_alpha=180):
+        """Blit every live hazard, fading from ``max_alpha`` to ``min_alpha`` as it runs out."""
+        idx = np.flatnonzero(self.live)
+        if not len(idx):
+            return
+        left = np.clip((self.expires[idx] - self.now) / self.duration[idx], 0.0, 1.0)
+        alpha = np.maximum(min_alpha, (max_alpha * left).astype(np.int32))
+        step = np.clip(np.rint(alpha * HAZARD_ALPHA_STEPS / 255), 0, HAZARD_ALPHA_STEPS).astype(np.int32)
+        kinds = self.kind[idx].tolist()
+        frames = [self._fades(kind)[s] for kind, s in zip(kinds, step.tolist())]
+        offset = [self.kinds[kind]['draw_radius'] for kind in kinds]
+        positions = zip((self.x[idx] - offset).tolist(), (self.y[idx] - offset).tolist())
+        screen.blits(zip(frames, positions), doreturn=False)
+
+    def _fades(self, kind):
+        frames = self._sprites.get(kind)
+        if frames is None:
+            spec = self.kinds[kind]
+            r = spec['draw_radius']
+            surface = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, spec['color'], (int(r), int(r)), int(r))
+            frames = []
+            for step in range(HAZARD_ALPHA_STEPS + 1):
+                frame = surface.copy()
+                frame.set_alpha(255 * step // HAZARD_ALPHA_STEPS)
+                frames.append(frame)
+            self._sprites[kind] = frames
+        return frames
@@ -0,0 +1,400 @@
+"""Run levels without a window, audio or a human at the keyboard.
+
+The level loops talk to pygame directly (display.flip, event.get,
+key.get_pressed, mouse.get_pos, time.Clock), so a HeadlessSession swaps
+those functions for the duration of a run:
+
+* input comes from an InputSource, frame by frame;
+* flip() only counts frames and stops the run when the budget is spent;
+* every Clock is a fast clock that never sleeps and reports a fixed frame
+  time, and get_ticks() follows that simulated time, so cooldowns and
+  waves behave as they would at full speed;
+* a Clock.tick() with no flip since the last one (a loop waiting for a
+  key without redrawing) counts as a frame, so it ends with the budget;
+* event.wait() (idle screens sleeping until input) lasts one frame, so
+  it advances the clock and counts towards the frame budget;
+* dialogue boxes return immediately and the mixer is shut down; the
+  mixer calls that would raise without it (mixer.stop() and friends)
+  do nothing;
+* with ``render=False`` the levels draw onto a 1x1 surface, so every
+  blit is clipped away and a frame costs little more than its update.
+
+    python headless.py endless boss --frames 5000 --seed 3
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, SIM_HZ
+
+_session = None
+
+
+def use_dummy_drivers():
+    """Select SDL's dummy video/audio drivers; call before pygame opens a display."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def active():
+    """True while a HeadlessSession is running; blocking UI checks this."""
+    return _session is not None
+
+
+class HeadlessStop(Exception):
+    """Raised from display.flip() once the session's frame budget is spent."""
+
+
+# ---------------------- Input sources ----------------------
+class InputSource:
+    """Per-frame input for a headless run; the default presses nothing."""
+
+    def events(self, frame):
+        return []
+
+    def pressed(self, frame):
+        """Key codes held down during ``frame``."""
+        return ()
+
+    def mouse_pos(self, frame):
+        return (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+
+    def mouse_buttons(self, frame):
+        return (False, False, False)
+
+
+class ScriptedInput(InputSource):
+    """Replays a fixed script.
+
+    ``taps`` maps a frame number to the keys pressed (KEYDOWN) on that
+    frame; ``hold`` and ``mouse`` are callables of the frame number that
+    return the held keys and the cursor position.
+    """
+
+    def __init__(self, taps=None, hold=None, mouse=None):
+        self.taps = taps or {}
+        self.hold = hold
+        self.mouse = mouse
+
+    def events(self, frame):
+        return [_key_event(k) for k in self.taps.get(frame, ())]
+
+    def pressed(self, frame):
+        return self.hold(frame) if self.hold else ()
+
+    def mouse_pos(self, frame):
+        return self.mouse(frame) if self.mouse else super().mouse_pos(frame)
+
+
+class BotInput(InputSource):
+    """Seeded random player for balance runs: wanders, aims, shoots and uses abilities."""
+
+    MOVES = ((), (pygame.K_w,), (pygame.K_s,), (pygame.K_a,), (pygame.K_d,),
+             (pygame.K_w, pygame.K_a), (pygame.K_w, pygame.K_d),
+             (pygame.K_s, pygame.K_a), (pygame.K_s, pygame.K_d))
+
+    def __init__(self, seed=0, fire_every=8, turn_every=60, confirm_every=120):
+        self.rng = random.Random(seed)
+        self.fire_every = fire_every
+        self.turn_every = turn_every
+        self.confirm_every = confirm_every  # ENTER, so "press ENTER to continue" screens move on
+        self._move = ()
+        self._aim = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        self._frame = -1
+
+    def _advance(self, frame):
+        if frame == self._frame:
+            return
+        self._frame = frame
+        if frame % self.turn_every == 0:
+            self._move = self.rng.choice(self.MOVES)
+            self._aim = (self.rng.randrange(SCREEN_WIDTH), self.rng.randrange(SCREEN_HEIGHT))
+
+    def events(self, frame):
+        self._advance(frame)
+        keys = []
+        if frame % self.fire_every == 0:
+            keys.append(pygame.K_SPACE)
+        if frame % self.confirm_every == self.confirm_every - 1:
+            keys.append(pygame.K_RETURN)
+        if self.rng.random() < 0.005:
+            keys.append(pygame.K_q)
+        if self.rng.random() < 0.01:
+            keys.append(pygame.K_r)
+        return [_key_event(k) for k in keys]
+
+    def pressed(self, frame):
+        self._advance(frame)
+        held = list(self._move)
+        if frame % 600 < 45:
+            held.append(pygame.K_f)  # charge and release a Ground Pound now and then
+        return held
+
+    def mouse_pos(self, frame):
+        self._advance(frame)
+        return self._aim
+
+
+def _key_event(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0)
+
+
+class _Keys:
+    """Stands in for the ScancodeWrapper returned by key.get_pressed()."""
+
+    def __init__(self, held):
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+    def __len__(self):
+        return 512
+
+
+# ---------------------- Session ----------------------
+class HeadlessSession:
+    """Context manager that points the pygame calls used by the levels at
+    ``input_source`` and a simulated clock.
+
+    ``frame_ms`` is the time every Clock.tick() reports; the default is
+    one simulation step, so FixedStep runs exactly one step per frame.
+    ``frames`` (optional) ends the run with HeadlessStop after that many
+    flips.
+    """
+
+    def __init__(self, input_source=None, frames=None, frame_ms=1000.0 / SIM_HZ, seed=None, render=True):
+        self.input = input_source or InputSource()
+        self.frames = frames
+        self.render = render
+        self.frame_ms = frame_ms
+        self.seed = seed
+        self.frame = 0
+        self.ticks = 0.0
+        self._saved = []
+        self._events_frame = -1
+        self._flipped = False  # a flip since the last Clock.tick()
+        self._pending = []  # rest of a frame's events after wait() / poll() took the first
+
+    def __enter__(self):
+        global _session
+        use_dummy_drivers()
+        if not pygame.display.get_init():
+            pygame.display.init()
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        if not pygame.font.get_init():
+            pygame.font.init()
+        if pygame.mixer.get_init():
+            pygame.mixer.quit()
+        self.ticks = self.start_ticks = float(pygame.time.get_ticks())
+        if self.seed is not None:
+            random.seed(self.seed)
+            np.random.seed(self.seed)
+
+        session = self
+
+        class FastClock:
+            def tick(self, framerate=0):
+                session._tick()
+                return session.frame_ms
+
+            tick_busy_loop = tick
+
+            def get_fps(self):
+                return 1000.0 / session.frame_ms
+
+            def get_time(self):
+                return session.frame_ms
+
+        self._patch(pygame.display, 'flip', self._flip)
+        self._patch(pygame.display, 'update', lambda *a, **k: self._flip())
+        self._patch(pygame.event, 'get', self._get_events)
+        self._patch(pygame.event, 'wait', self._wait_event)
+        self._patch(pygame.event, 'poll', self._poll_event)
+        self._patch(pygame.key, 'get_pressed', lambda: _Keys(self.input.pressed(self.frame)))
+        self._patch(pygame.mouse, 'get_pos', lambda: self.input.mouse_pos(self.frame))
+        self._patch(pygame.mouse, 'get_pressed', lambda *a, **k: self.input.mouse_buttons(self.frame))
+        self._patch(pygame.time, 'Clock', FastClock)
+        self._patch(pygame.time, 'get_ticks', lambda: int(self.ticks))
+        self._patch(pygame.time, 'wait', self._sleep)
+        self._patch(pygame.time, 'delay', self._sleep)
+        for owner in (pygame.mixer, pygame.mixer.music):
+            for name in ('stop', 'pause', 'unpause', 'fadeout'):
+                self._patch(owner, name, lambda *a, **k: None)
+            self._patch(owner, 'get_busy', lambda *a, **k: False)
+        main = sys.modules.get('main')
+        if main is not None and hasattr(main, 'clock'):
+            self._patch(main, 'clock', FastClock())
+        if not self.render:
+            canvas = pygame.Surface((1, 1))
+            self._patch(pygame.display, 'get_surface', lambda: canvas)
+            if main is not None and hasattr(main, 'screen'):
+                self._patch(main, 'screen', canvas)
+        _session = self
+        return self
+
+    def __exit__(self, *exc):
+        global _session
+        _session = None
+        for owner, name, value in reversed(self._saved):
+            setattr(owner, name, value)
+        self._saved = []
+        return False
+
+    def _patch(self, owner, name, value):
+        self._saved.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, value)
+
+    def _flip(self):
+        self.frame += 1
+        self._flipped = True
+        if self.frames is not None and self.frame >= self.frames:
+            raise HeadlessStop()
+
+    def _tick(self):
+        self.ticks += self.frame_ms
+        if not self._flipped:
+            self._flip()  # waiting without drawing still spends a frame
+        self._flipped = False
+
+    def _get_events(self, *args, **kwargs):
+        pygame.event.pump()
+        if self._pending:
+            events, self._pending = self._pending, []
+            return events
+        if self._events_frame == self.frame:
+            return []  # one batch per frame, even if a loop asks twice
+        self._events_frame = self.frame
+        return list(self.input.events(self.frame))
+
+    def _poll_event(self, *args, **kwargs):
+        events = self._get_events()
+        self._pending = events[1:]
+        return events[0] if events else pygame.event.Event(pygame.NOEVENT)
+
+    def _wait_event(self, *args, **kwargs):
+        if not self._pending:
+            # Nothing queued: sleeping until input takes a frame
+            self.ticks += self.frame_ms
+            self._flip()
+        return self._poll_event()
+
+    def _sleep(self, ms):
+        self.ticks += ms
+        return ms
+
+
+# ---------------------- Levels ----------------------
+def _endless():
+    from levels.endless_mode import run_endless_mode
+    from player import Player
+    return run_endless_mode({"player": Player(), "zombies": []})
+
+
+def _boss():
+    import main
+    main.zombies = []
+    return main.run_boss_level()
+
+
+def _tutorial():
+    import main
+    main.zombies = []
+    return main.run_tutorial()
+
+
+def _lab():
+    from levels.lab_scene import show_lab_scene
+    return show_lab_scene()
+
+
+def _arena():
+    from levels.divine_arena import run_divine_arena
+    return run_divine_arena()
+
+
+def _sanctuary():
+    from levels.ruined_sanctuary import run_ruined_sanctuary
+    from player import Player
+    return run_ruined_sanctuary({"player": Player()})
+
+
+def _outside():
+    from levels.lab_scene import create_outside_environment
+    from levels.outside_area import run_outside_area
+    from player import Player
+    from zombie import Zombie
+    return run_outside_area({"player": Player(), "zombies": [Zombie(200, 200)],
+                             "map": create_outside_environment()})
+
+
+LEVELS = {
+    'endless': _endless,
+    'boss': _boss,
+    'tutorial': _tutorial,
+    'arena': _arena,
+    'sanctuary': _sanctuary,
+    'lab': _lab,
+    'outside': _outside,
+}
+
+
+def run_level(level, frames=3600, input_source=None, seed=0, frame_ms=1000.0 / SIM_HZ, render=True):
+    """Run ``level`` (a LEVELS name or a callable) headless for up to ``frames`` frames.
+
+    Returns a dict with the frame count, wall time, frames per second and
+    the level's return value (None if the frame budget ran out first).
+    """
+    runner = LEVELS[level] if isinstance(level, str) else level
+    name = level if isinstance(level, str) else getattr(level, '__name__', 'level')
+    use_dummy_drivers()
+    import main  # levels import it at runtime; start it before patching
+    main.init()
+    if input_source is None:
+        input_source = BotInput(seed)
+    session = HeadlessSession(input_source, frames=frames, frame_ms=frame_ms, seed=seed, render=render)
+    result = None
+    start = time.perf_counter()
+    with session:
+        try:
+            result = runner()
+        except HeadlessStop:
+            pass
+    seconds = time.perf_counter() - start
+    return {
+        'level': name,
+        'frames': session.frame,
+        'seconds': seconds,
+        'fps': session.frame / seconds if seconds > 0 else 0.0,
+        'sim_seconds': (session.ticks - session.start_ticks) / 1000.0,
+        'result': result,
+    }
+
+
+def _cli(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run levels headless as fast as possible.")
+    parser.add_argument('levels', nargs='*', help=f"any of {', '.join(sorted(LEVELS))} (default: all)")
+    parser.add_argument('--frames', type=int, default=3600)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-render', action='store_true', help="draw onto a 1x1 surface")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.levels if name not in LEVELS]
+    if unknown:
+        parser.error(f"unknown level(s): {', '.join(unknown)}")
+    for level in args.levels or sorted(LEVELS):
+        r = run_level(level, frames=args.frames, seed=args.seed, render=not args.no_render)
+        print(f"{r['level']:>10}: {r['frames']} frames in {r['seconds']:.2f}s "
+              f"({r['fps']:.0f} fps, {r['sim_seconds']:.1f}s simulated) -> {r['result']}")
+
+
+if __name__ == '__main__':
+    # Go through the importable module so levels see the same session state
+    import headless
+    headless._cli()
@@ -0,0 +1,329 @@
+import math
+import random
+
+import numpy as np
+import pygame
+
+from asset_cache import load_image
+import sound_bank
+import decals
+from rotation_atlas import get_atlas
+from tile_map import BLOCKS_WALKERS, SPAWNABLE
+from flow_field import field_for
+from projectiles import volley, ACID, ENEMY
+from special_zombies import AcidSpitter, Juggernaut, ACID_SPITTER_SIZE, JUGGERNAUT_SIZE
+from settings import (
+    TILE_SIZE, ZOMBIE_HEALTH, ZOMBIE_SPEED, ZOMBIE_IMAGE_SIZE, ZOMBIE_COLOR,
+    ZOMBIE_BLOOD_COLOR, GROUND_POUND_RADIUS, GROUND_POUND_STUN, GROUND_POUND_KNOCKBACK,
+    ROTATION_BUCKETS
+)
+
+# Zombie / AcidSpitter / Juggernaut expressed as data.  ``spit_ms`` fires an
+# acid projectile on that cooldown, ``quake_ms`` a quake when next to the player.
+HORDE_KINDS = (
+    {'name': 'zombie', 'weight': 50, 'health': ZOMBIE_HEALTH, 'speed': ZOMBIE_SPEED,
+     'radius': ZOMBIE_IMAGE_SIZE // 2, 'sprite': 'assets/sprites/zombies.png', 'size': ZOMBIE_IMAGE_SIZE,
+     'attack_sound': 'zombie', 'damage_sound': 'zombie', 'spit_ms': 0, 'quake_ms': 0},
+    {'name': 'acid_spitter', 'weight': 30, 'health': int(ZOMBIE_HEALTH * 0.8), 'speed': ZOMBIE_SPEED * 1.1,
+     'radius': ACID_SPITTER_SIZE // 2, 'sprite': 'assets/sprites/acid_spitter.png', 'size': ACID_SPITTER_SIZE,
+     'attack_sound': 'acid', 'damage_sound': 'zombie', 'spit_ms': AcidSpitter.spit_cooldown_ms, 'quake_ms': 0},
+    {'name': 'juggernaut', 'weight': 20, 'health': int(ZOMBIE_HEALTH * 3), 'speed': ZOMBIE_SPEED * 0.6,
+     'radius': JUGGERNAUT_SIZE // 2, 'sprite': 'assets/sprites/juggernaut.png', 'size': JUGGERNAUT_SIZE,
+     'attack_sound': 'juggernaut', 'damage_sound': 'zombie', 'spit_ms': 0, 'quake_ms': Juggernaut.quake_cooldown_ms},
+)
+
+SPLATTER_LIFETIME = 0.4  # seconds, same as Zombie
+
+
+class Horde:
+    """Structure-of-arrays zombie store for large crowds.
+
+    Every live zombie is one slot in a set of NumPy arrays (position,
+    speed, health, stun, kind, cooldowns); update() moves and collides the
+    whole crowd with a handful of array operations instead of one Python
+    method call per zombie.  Slots ``[0, n)`` are live; dead zombies are
+    swapped out by compact() once per frame, so indices returned by the
+    queries stay valid until then.
+    """
+
+    FIELDS = (('x', np.float64), ('y', np.float64), ('angle', np.float64),
+              ('speed', np.float64), ('health', np.float64), ('radius', np.float64),
+              ('stun', np.float64), ('kind', np.int8), ('last_attack', np.int64),
+              ('next_action', np.int64), ('prev_x', np.float64), ('prev_y', np.float64))
+
+    def __init__(self, kinds=HORDE_KINDS, capacity=256):
+        self.kinds = kinds
+        self.n = 0
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.splatters = []  # fading blood, {'x','y','r','timer'}
+        self._spit_ms = np.array([k['spit_ms'] for k in kinds], dtype=np.int64)
+        self._quake_ms = np.array([k['quake_ms'] for k in kinds], dtype=np.int64)
+        self._surfaces = None  # kind * ROTATION_BUCKETS + bucket -> Surface
+        self._half = None
+        self._has_sprite = None
+
+    def __len__(self):
+        return self.n
+
+    def clear(self):
+        self.n = 0
+        self.splatters = []
+
+    # ---------------------- Spawning ----------------------
+    def spawn(self, kind, x, y, now=0, health_mult=1.0, speed_mult=1.0):
+        """Add one zombie of ``kind`` (index into kinds); returns its slot."""
+        if self.n == len(self.x):
+            self._grow()
+        i = self.n
+        k = self.kinds[kind]
+        self.x[i], self.y[i], self.angle[i] = x, y, 0.0
+        self.prev_x[i], self.prev_y[i] = x, y
+        self.speed[i] = k['speed'] * speed_mult
+        self.health[i] = int(k['health'] * health_mult)
+        self.radius[i] = k['radius']
+        self.stun[i] = 0.0
+        self.kind[i] = kind
+        self.last_attack[i] = 0
+        self.next_action[i] = now + (k['spit_ms'] or k['quake_ms'])
+        self.n += 1
+        return i
+
+    def spawn_random(self, count, tiles, avoid_x, avoid_y, now=0, health_mult=1.0, speed_mult=1.0):
+        """Spawn ``count`` random-kind zombies on SPAWNABLE tiles of ``tiles`` (a TileMap)
+        away from (avoid_x, avoid_y).
+
+        Uses the same rules as outside_area.spawn_zombie: at least two tiles
+        in from the border and more than 100 px from the player on both axes.
+        """
+        rows, cols = tiles.rows, tiles.cols
+        spawnable = tiles.layer(SPAWNABLE)
+        weights = [k['weight'] for k in self.kinds]
+        placed = 0
+        for _ in range(20):
+            need = count - placed
+            if need <= 0:
+                break
+            xs = np.random.uniform(2 * TILE_SIZE, (cols - 2) * TILE_SIZE, need * 2)
+            ys = np.random.uniform(2 * TILE_SIZE, (rows - 2) * TILE_SIZE, need * 2)
+            ok = (spawnable[(ys // TILE_SIZE).astype(int), (xs // TILE_SIZE).astype(int)]
+                  & (np.abs(xs - avoid_x) > 100) & (np.abs(ys - avoid_y) > 100))
+            xs, ys = xs[ok][:need], ys[ok][:need]
+            for kind, x, y in zip(random.choices(range(len(self.kinds)), weights, k=len(xs)), xs, ys):
+                self.spawn(kind, float(x), float(y), now, health_mult, speed_mult)
+            placed += len(xs)
+        return placed
+
+    # ---------------------- Simulation ----------------------
+    def update(self, player_x, player_y, tiles, dt, now):
+        """Move the crowd one step; returns Zombie.update-style info dicts.
+
+        Acid spits come back as one projectiles.volley() and Juggernaut
+        slams as {'quake': True, 'duration': 500}.
+        """
+        n = self.n
+        if not n:
+            return []
+        x, y, r = self.x[:n], self.y[:n], self.radius[:n]
+        kind = self.kind[:n]
+        info = []
+        # Where this step started, for interpolated drawing
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+
+        # Fade splatters
+        for splat in self.splatters:
+            splat['timer'] -= dt
+        self.splatters = [s for s in self.splatters if s['timer'] > 0]
+
+        dx, dy = player_x - x, player_y - y
+        dist = np.hypot(dx, dy)
+        in_range = dist < r * 2
+
+        # Attack clips; the sound bank throttles repeats per clip
+        for k in np.unique(kind[in_range]):
+            sound_bank.play(self.kinds[k]['attack_sound'])
+
+        # Seek toward the player along the shared flow field; stunned zombies hold still
+        angle = self.angle[:n]
+        np.arctan2(dy, dx, out=angle)
+        flow = field_for(tiles)
+        flow.update(player_x, player_y)
+        heading = flow.angles_at(x, y)
+        np.copyto(angle, heading, where=~np.isnan(heading))
+        stun = self.stun[:n]
+        np.subtract(stun, dt, out=stun)
+        np.maximum(stun, 0, out=stun)
+        step = np.where(stun > 0, 0.0, self.speed[:n] * dt)
+        self._move(x, y, x + np.cos(angle) * step, y, tiles)
+        self._move(x, y, x, y + np.sin(angle) * step, tiles)
+
+        # Ranged spit, one volley for every spitter that is due
+        due = self.next_action[:n] <= now
+        spitters = np.flatnonzero(due & (self._spit_ms[kind] > 0))
+        if len(spitters):
+            info.append(volley(x[spitters], y[spitters], np.arctan2(dy[spitters], dx[spitters]), 300,
+                               kind=ACID, owner=ENEMY, damage=10, radius=4))
+        self.next_action[spitters] = now + self._spit_ms[kind[spitters]]
+
+        # Quake slam when next to the player
+        slammers = np.flatnonzero(due & in_range & (self._quake_ms[kind] > 0))
+        if len(slammers):
+            sound_bank.play(self.kinds[kind[slammers[0]]]['attack_sound'])
+            self.next_action[slammers] = now + self._quake_ms[kind[slammers]]
+            info.append({'quake': True, 'duration': 500})
+        return info
+
+    def _move(self, x, y, new_x, new_y, tiles):
+        # Same per-axis rule as Zombie.update: step only onto walkable tiles
+        ok = (new_x >= 0) & (new_y >= 0) & ~tiles.blocked_cells(
+            (new_x // TILE_SIZE).astype(np.int64), (new_y // TILE_SIZE).astype(np.int64), BLOCKS_WALKERS)
+        np.copyto(x, new_x, where=ok)
+        np.copyto(y, new_y, where=ok)
+
+    def contact(self, player_x, player_y, player_radius, now, cooldown_ms):
+        """Count zombies touching the player whose attack cooldown has elapsed."""
+        n = self.n
+        touching = (np.hypot(player_x - self.x[:n], player_y - self.y[:n]) < player_radius + self.radius[:n])
+        hits = np.flatnonzero(touching & (now - self.last_attack[:n] > cooldown_ms) & (self.health[:n] > 0))
+        self.last_attack[hits] = now
+        return len(hits)
+
+    def ground_pound(self, player_x, player_y):
+        """Vectorised mechanics.apply_ground_pound for the whole crowd."""
+        n = self.n
+        dx, dy = self.x[:n] - player_x, self.y[:n] - player_y
+        dist = np.hypot(dx, dy)
+        hit = dist <= GROUND_POUND_RADIUS
+        self.stun[:n][hit] = GROUND_POUND_STUN
+        push = hit & (dist > 0)
+        self.x[:n][push] += dx[push] / dist[push] * GROUND_POUND_KNOCKBACK
+        self.y[:n][push] += dy[push] / dist[push] * GROUND_POUND_KNOCKBACK
+
+    # ---------------------- Damage ----------------------
+    def query_segments(self, x0, y0, x1, y1):
+        """Zombies touched by each segment, as one index array per segment.
+
+        All segments are tested against the whole crowd in one batch: a
+        bounding-box pass picks candidate pairs and only those get the exact
+        distance test.  Each array is ordered nearest to the segment start.
+        """
+        n = self.n
+        x0, y0 = np.asarray(x0, dtype=np.float64), np.asarray(y0, dtype=np.float64)
+        x1, y1 = np.asarray(x1, dtype=np.float64), np.asarray(y1, dtype=np.float64)
+        segments = len(x0)
+        if not n or not segments:
+            return [np.empty(0, dtype=np.int64) for _ in range(segments)]
+        x, y, r = self.x[:n], self.y[:n], self.radius[:n]
+        reach = r.max()
+        near = ((x >= np.minimum(x0, x1)[:, None] - reach) & (x <= np.maximum(x0, x1)[:, None] + reach)
+                & (y >= np.minimum(y0, y1)[:, None] - reach) & (y <= np.maximum(y0, y1)[:, None] + reach))
+        seg, idx = np.nonzero(near)
+
+        sx, sy = x1[seg] - x0[seg], y1[seg] - y0[seg]
+        px, py = x[idx] - x0[seg], y[idx] - y0[seg]
+        length_sq = sx * sx + sy * sy
+        t = np.clip((px * sx + py * sy) / np.where(length_sq > 0, length_sq, 1.0), 0.0, 1.0)
+        ex, ey = px - t * sx, py - t * sy
+        keep = (ex * ex + ey * ey < r[idx] ** 2) & (self.health[idx] > 0)
+        seg, idx, t = seg[keep], idx[keep], t[keep]
+
+        order = np.lexsort((idx, t, seg))
+        idx = idx[order]
+        return np.split(idx, np.cumsum(np.bincount(seg, minlength=segments))[:-1])
+
+    def damage(self, i, amount):
+        """Zombie.take_damage for slot ``i``; returns True if it just died."""
+        k = self.kinds[self.kind[i]]
+        sound_bank.play(k['damage_sound'])
+        radius = int(self.radius[i])
+        offset_angle = random.uniform(0, 2 * math.pi)
+        offset_dist = random.uniform(radius // 4, radius // 2)
+        bx = self.x[i] + math.cos(offset_angle) * offset_dist
+        by = self.y[i] + math.sin(offset_angle) * offset_dist
+        rad = random.randint(radius // 5, radius // 2)
+        self.splatters.append({'x': bx, 'y': by, 'r': rad, 'timer': SPLATTER_LIFETIME})
+        decals.bake(bx, by, rad, ZOMBIE_BLOOD_COLOR)
+
+        was_alive = self.health[i] > 0
+        self.health[i] = max(0, self.health[i] - amount)
+        return bool(was_alive and self.health[i] <= 0)
+
+    def compact(self):
+        """Drop dead zombies; returns how many were removed."""
+        n = self.n
+        alive = self.health[:n] > 0
+        live = int(np.count_nonzero(alive))
+        if live < n:
+            for name, _ in self.FIELDS:
+                arr = getattr(self, name)
+                arr[:live] = arr[:n][alive]
+            self.n = live
+        return n - live
+
+    # ---------------------- Drawing ----------------------
+    def draw(self, screen, alpha=1.0, camera=None):
+        """Draw the crowd ``alpha`` of the way from the last step's start to its end.
+
+        With a ``camera`` only the zombies in its view are drawn.
+        """
+        decals.draw_splatters(screen, self.splatters, ZOMBIE_BLOOD_COLOR, SPLATTER_LIFETIME, camera)
+        n = self.n
+        if not n:
+            return
+        self._load_frames()
+        x, y = self.x[:n], self.y[:n]
+        if alpha < 1.0:
+            x = self.prev_x[:n] + (x - self.prev_x[:n]) * alpha
+            y = self.prev_y[:n] + (y - self.prev_y[:n]) * alpha
+        kind, angle, radius = self.kind[:n], self.angle[:n], self.radius[:n]
+        if camera is not None:
+            seen = np.flatnonzero(camera.visible(x, y))
+            x, y = x[seen] - camera.x, y[seen] - camera.y
+            kind, angle, radius = kind[seen], angle[seen], radius[seen]
+        buckets = ROTATION_BUCKETS
+        kind = kind.astype(np.int64)
+        bucket = np.rint(angle / (2 * math.pi / buckets)).astype(np.int64) % buckets
+        frame = kind * buckets + bucket
+        has_sprite = self._has_sprite[kind]
+
+        # Kinds without a sprite fall back to a circle like Zombie.draw
+        for i in np.flatnonzero(~has_sprite):
+            pygame.draw.circle(screen, ZOMBIE_COLOR, (int(x[i]), int(y[i])), int(radius[i]))
+
+        # One blits() call for the crowd; positions are offset in bulk
+        frame = frame[has_sprite]
+        px = (x[has_sprite] - self._half[frame, 0]).tolist()
+        py = (y[has_sprite] - self._half[frame, 1]).tolist()
+        surfaces = list(map(self._surfaces.__getitem__, frame.tolist()))
+        screen.blits(zip(surfaces, zip(px, py)), doreturn=False)
+
+    def _load_frames(self):
+        """Flatten every kind's rotation atlas into one frame table."""
+        if self._surfaces is not None:
+            return
+        surfaces, half, has_sprite = [], [], []
+        for k in self.kinds:
+            image = None
+            # Special kinds fall back to the plain zombie sprite like their classes do
+            for path, size in ((k['sprite'], k['size']), ('assets/sprites/zombies.png', ZOMBIE_IMAGE_SIZE)):
+                try:
+                    image = load_image(path, (size, size), owner=self)
+                    break
+                except Exception:
+                    continue
+            frames = get_atlas(image, 90, ROTATION_BUCKETS).frames if image else [(None, 0, 0)] * ROTATION_BUCKETS
+            surfaces.extend(f[0] for f in frames)
+            half.extend((f[1], f[2]) for f in frames)
+            has_sprite.append(image is not None)
+        self._surfaces = surfaces
+        self._half = np.array(half, dtype=np.float64)
+        self._has_sprite = np.array(has_sprite, dtype=bool)
+
+    # ---------------------- Internals ----------------------
+    def _grow(self):
+        for name, _ in self.FIELDS:
+            arr = getattr(self, name)
+            grown = np.zeros(len(arr) * 2, dtype=arr.dtype)
+            grown[:len(arr)] = arr
+            setattr(self, name, grown)
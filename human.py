@@ -1,5 +1,6 @@
 import pygame
 import math
+from asset_cache import load_image
 from settings import TILE_SIZE, HUMAN_SPEED, HUMAN_SCARED_DISTANCE, HUMAN_COLOR
 
 class Human:
@@ -12,8 +13,7 @@ class Human:
         
         # Load human image
         try:
-            self.image = pygame.image.load('assets/sprites/human.png').convert_alpha()
-            self.image = pygame.transform.scale(self.image, (self.radius * 2, self.radius * 2))
+            self.image = load_image('assets/sprites/human.png', (self.radius * 2, self.radius * 2), owner=self)
             self.rect = self.image.get_rect(center=(self.x, self.y))
         except pygame.error as e:
             print(f"Warning: Could not load human image. Error: {e}")
@@ -0,0 +1,108 @@
+"""Event-driven drawing for screens that mostly sit still.
+
+Menus, dialogue boxes and game-over screens wait for the player, so
+instead of redrawing everything 60 times a second they draw once and
+sleep in pygame.event.wait().  When one of their few moving parts is due
+(a pulsing title, a hover highlight, a handful of particles) they wake up,
+redraw just the rectangles that changed and push only those to the
+display.
+"""
+import pygame
+
+from settings import IDLE_ANIMATION_FPS
+
+# Window events after which the whole screen has to be pushed again
+_EXPOSED = {pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED}
+
+
+def wait_events(timeout_ms=None):
+    """Sleep until input arrives (or ``timeout_ms`` passes); returns every pending event.
+
+    An empty list means the timeout ran out.
+    """
+    # pygame treats a timeout of 0 as "wait forever"
+    first = pygame.event.wait(max(1, int(timeout_ms)) if timeout_ms is not None else 0)
+    events = [] if first.type == pygame.NOEVENT else [first]
+    return events + pygame.event.get()
+
+
+def wait_for_key(keys=(pygame.K_RETURN,), on_quit=None):
+    """Block until one of ``keys`` is pressed; returns that key.
+
+    ``on_quit`` is called for a QUIT event (it is expected not to return).
+    """
+    while True:
+        for event in wait_events():
+            if event.type == pygame.QUIT and on_quit is not None:
+                on_quit()
+            if event.type == pygame.KEYDOWN and event.key in keys:
+                return event.key
+
+
+class IdleScreen:
+    """Redraw bookkeeping for one static screen.
+
+    ``draw(screen)`` paints the whole screen.  present() runs it once in
+    full and flips; after that only the areas passed to invalidate() are
+    redrawn (``draw`` runs clipped to their bounding box) and updated.
+    ``animation_fps`` caps how often animate() asks to be woken up.
+    """
+
+    def __init__(self, screen, draw, animation_fps=IDLE_ANIMATION_FPS):
+        self.screen = screen
+        self.draw = draw
+        self.frame_ms = 1000.0 / animation_fps
+        self._dirty = None     # Rect to redraw, None when clean
+        self._full = True
+        self._next_frame = None
+        self.frames = 0
+
+    def invalidate(self, *rects):
+        """Mark ``rects`` (all of the screen when none are given) for the next present()."""
+        if not rects:
+            self._full = True
+            return
+        for rect in rects:
+            if rect is None:
+                continue
+            self._dirty = pygame.Rect(rect) if self._dirty is None else self._dirty.union(rect)
+
+    def animate(self, now_ms):
+        """Ask to be woken up for the next animation frame; True when one is due now."""
+        if self._next_frame is None or now_ms >= self._next_frame:
+            self._next_frame = now_ms + self.frame_ms
+            return True
+        return False
+
+    def still(self):
+        """Nothing is animating any more; wait() may sleep until input."""
+        self._next_frame = None
+
+    def wait(self, deadline_ms=None):
+        """Events from sleeping until input, the next animation frame or ``deadline_ms`` (ticks)."""
+        wake = [t for t in (self._next_frame, deadline_ms) if t is not None]
+        timeout = max(0.0, min(wake) - pygame.time.get_ticks()) if wake else None
+        events = wait_events(timeout)
+        if any(event.type in _EXPOSED for event in events):
+            self._full = True
+        return events
+
+    def present(self):
+        """Redraw and push what changed since the last call."""
+        if self._full:
+            self.draw(self.screen)
+            pygame.display.flip()
+        elif self._dirty is not None:
+            area = self._dirty.clip(self.screen.get_rect())
+            if area.width and area.height:
+                self.screen.set_clip(area)
+                try:
+                    self.draw(self.screen)
+                finally:
+                    self.screen.set_clip(None)
+                pygame.display.update(area)
+        else:
+            return
+        self.frames += 1
+        self._full = False
+        self._dirty = None
@@ -1 +1,35 @@
-# This file makes the levels directory a Python package
+"""Level registry.
+
+main refers to levels by name and get() imports a level's module the
+first time it is asked for, so starting the game only pays for the menu.
+The time each first import took is kept in ``import_ms`` for the
+startup report (startup.py).
+"""
+import importlib
+import time
+
+# name -> (module, entry point)
+LEVELS = {
+    'endless': ('levels.endless_mode', 'run_endless_mode'),
+    'lab': ('levels.lab_scene', 'show_lab_scene'),
+    'revive_lab': ('levels.revive_lab_scene', 'show_lab_scene'),
+    'outside': ('levels.outside_area', 'run_outside_area'),
+    'sanctuary': ('levels.ruined_sanctuary', 'run_ruined_sanctuary'),
+    'arena': ('levels.divine_arena', 'run_divine_arena'),
+    'tutorial_death': ('levels.death_endings', 'show_tutorial_death_ending'),
+    'python_death': ('levels.death_endings', 'show_python_boss_death_ending'),
+}
+
+import_ms = {}  # module -> milliseconds its first import took
+
+
+def get(name):
+    """Entry point of level ``name``, importing its module on first use."""
+    module_name, entry = LEVELS[name]
+    if module_name not in import_ms:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        import_ms[module_name] = (time.perf_counter() - start) * 1000
+    else:
+        module = importlib.import_module(module_name)
+    return getattr(module, entry)
@@ -1,10 +1,12 @@
 import pygame
 import math
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, WHITE, BOSS_HEALTH_BAR_BG, BOSS_HEALTH_BAR_FG, MAX_HEALTH, BULLET_SPEED, PLAYER_BULLET_DAMAGE, PYTHON_DAMAGE, PYTHON_HEALTH
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, WHITE, BOSS_HEALTH_BAR_BG, BOSS_HEALTH_BAR_FG, MAX_HEALTH, PLAYER_BULLET_DAMAGE, PYTHON_DAMAGE, PYTHON_HEALTH
 from levels.death_endings import show_python_boss_death_ending
 from player import Player
 from python_boss import PythonBoss
 from mechanics import handle_player_input, update_player_state
+from tile_map import compile_map
+from projectiles import Projectiles, PLAYER
 from ui import draw_ui
 from levels.dialogue import show_dialogue
 
@@ -13,7 +15,7 @@ def run_boss_level():
     screen = pygame.display.get_surface()
     clock = pygame.time.Clock()
     
-    bullets = []
+    bullets = Projectiles()
 
     # Set up boss level map
     boss_room_map = [
@@ -66,9 +68,9 @@ def run_boss_level():
                     return "MENU"
                 elif event.key == pygame.K_SPACE:
                         # SPACE handled in handle_player_input too, but keep for responsiveness
-                    bullet = player.shoot()
-                    if bullet:
-                        bullets.append(bullet)
+                    shot = player.shoot()
+                    if shot:
+                        bullets.spawn_volley(shot)
         
         # Update game state
         if game_state == "BOSS_INTRO":
@@ -90,30 +92,21 @@ def run_boss_level():
             boss.update(player.x, player.y, boss_room_map, dt)
 
             # Update bullets and check for hits on boss
-            for bullet in bullets[:]:
-                bullet['x'] += math.cos(bullet['angle']) * BULLET_SPEED * dt
-                bullet['y'] += math.sin(bullet['angle']) * BULLET_SPEED * dt
-                
-                # Check for collision with walls
-                if (bullet['x'] < 0 or bullet['x'] > SCREEN_WIDTH or
-                    bullet['y'] < 0 or bullet['y'] > SCREEN_HEIGHT or
-                    boss_room_map[int(bullet['y'] / TILE_SIZE)][int(bullet['x'] / TILE_SIZE)] in ['W', 'P']):
-                    bullets.remove(bullet)
-                    continue
-
-                # Check for collision with boss
-                if boss.state in ['EMERGING', 'ATTACKING', 'ROAMING', 'TELEGRAPHING_CHARGE', 'CHARGING']:
-                    dist_to_head = math.hypot(boss.segments[0]['x'] - bullet['x'], boss.segments[0]['y'] - bullet['y'])
-                    if dist_to_head < TILE_SIZE // 2:
+            bullets.update(dt, compile_map(boss_room_map))
+            if boss.state in ['EMERGING', 'ATTACKING', 'ROAMING', 'TELEGRAPHING_CHARGE', 'CHARGING']:
+                head = boss.segments[0]
+                for i in bullets.hits_circle(head['x'], head['y'], TILE_SIZE // 2, PLAYER).tolist():
+                    if bullets.damage[i]:
                         boss.take_damage(PLAYER_BULLET_DAMAGE)
-                        bullets.remove(bullet)
-                        if not boss.is_alive:
-                            game_state = "BOSS_DEFEATED"
-                            show_dialogue([
-                                "Python Boss: Nooo! My beautiful indentation!",
-                                "Python Boss: You... you've won this time..."
-                            ])
-                            return "VICTORY"
+                    bullets.hit(i, recall=True)
+                    if not boss.is_alive:
+                        game_state = "BOSS_DEFEATED"
+                        show_dialogue([
+                            "Python Boss: Nooo! My beautiful indentation!",
+                            "Python Boss: You... you've won this time..."
+                        ])
+                        return "VICTORY"
+            bullets.compact()
 
             # Check for boss attacks
             if boss.state in ['ATTACKING', 'ROAMING', 'CHARGING']:
@@ -165,8 +158,7 @@ def draw_boss_level(screen, map_data, player, boss, game_state, bullets):
     player.draw(screen)
 
     # Draw bullets
-    for bullet in bullets:
-        pygame.draw.circle(screen, (255, 255, 0), (int(bullet['x']), int(bullet['y'])), 5)
+    bullets.draw(screen)
     
     # Draw UI
     draw_ui(screen, player, boss)
@@ -1,5 +1,6 @@
 import pygame
 import sys
+from asset_cache import load_image
 from settings import SCREEN_WIDTH, SCREEN_HEIGHT
 
 def _show_static_image(image_path: str):
@@ -12,7 +13,7 @@ def _show_static_image(image_path: str):
 
     # Load image (fallback to text on failure)
     try:
-        ending_img = pygame.image.load(image_path).convert_alpha()
+        ending_img = load_image(image_path, fit=(SCREEN_WIDTH, SCREEN_HEIGHT))
     except pygame.error as e:
         print(f"[death_endings] Could not load {image_path}: {e}")
         font = pygame.font.Font(None, 48)
@@ -21,14 +22,8 @@ def _show_static_image(image_path: str):
         _wait_loop(screen, clock, text_surface=text, text_rect=rect)
         return
 
-    # Scale if needed to fit screen
-    img_rect = ending_img.get_rect()
-    scale_ratio = min(SCREEN_WIDTH / img_rect.width, SCREEN_HEIGHT / img_rect.height)
-    if scale_ratio < 1:
-        new_size = (int(img_rect.width * scale_ratio), int(img_rect.height * scale_ratio))
-        ending_img = pygame.transform.smoothscale(ending_img, new_size)
-        img_rect = ending_img.get_rect()
-    img_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    # Already scaled to fit the screen (usually decoded by the prefetcher)
+    img_rect = ending_img.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
 
     # Fade-in variables
     fade_alpha = 0
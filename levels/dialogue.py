@@ -1,6 +1,8 @@
 import pygame
 import sys
 from settings import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE
+import headless
+from idle import wait_events
 
 def show_dialogue(lines, font_size=36, text_color=WHITE, bg_color=(0, 0, 0, 200)):
     """
@@ -12,8 +14,9 @@ def show_dialogue(lines, font_size=36, text_color=WHITE, bg_color=(0, 0, 0, 200)
         text_color: RGB tuple for text color
         bg_color: RGBA tuple for background color (includes alpha)
     """
+    if headless.active():
+        return  # nobody to press ENTER
     screen = pygame.display.get_surface()
-    clock = pygame.time.Clock()
     
     # Set up font
     try:
@@ -24,24 +27,9 @@ def show_dialogue(lines, font_size=36, text_color=WHITE, bg_color=(0, 0, 0, 200)
     # Calculate text dimensions
     padding = 20
     
-    # Process each line of dialogue
+    # Process each line of dialogue: draw it once, then sleep until input
     current_line = 0
     while current_line < len(lines):
-        # Handle events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_RETURN, pygame.K_SPACE, pygame.K_ESCAPE, pygame.K_e):
-                    current_line += 1
-                    if current_line >= len(lines):
-                        return
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                current_line += 1
-                if current_line >= len(lines):
-                    return
-        
         # Clear screen
         screen.fill((0, 0, 0))
         
@@ -73,7 +61,23 @@ def show_dialogue(lines, font_size=36, text_color=WHITE, bg_color=(0, 0, 0, 200)
             screen.blit(prompt, prompt_rect)
         
         pygame.display.flip()
-        clock.tick(60)
+
+        # Handle events
+        shown = current_line
+        while current_line == shown:
+            for event in wait_events():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                elif event.type == pygame.KEYDOWN:
+                    if event.key in (pygame.K_RETURN, pygame.K_SPACE, pygame.K_ESCAPE, pygame.K_e):
+                        current_line += 1
+                        if current_line >= len(lines):
+                            return
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    current_line += 1
+                    if current_line >= len(lines):
+                        return
 
 def show_god_dialogue(lines):
     """Special dialogue function for god dialogues with different styling."""
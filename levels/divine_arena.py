@@ -1,12 +1,26 @@
 import pygame, math, random
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, WHITE, MAX_HEALTH, BULLET_COLOR, BULLET_RADIUS
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, MAX_HEALTH
 from ui import draw_ui
+from asset_cache import load_image
 from levels.dialogue import show_dialogue
 
-from player import Player, shield_hit_sound
+from player import Player
+import music
+import decals
+import postfx
+import perf_hud
+from background_layer import BackgroundLayer, get_layer
 from zombie import Zombie
 from special_zombies import random_zombie
-from shield_bullet import update_shield_bullet, draw_shield_bullet
+from fixed_step import FixedStep
+from projectiles import Projectiles, volley
+from ecs import World
+import systems
+from tile_map import open_area_map
+
+# Arena zombies gnaw 1 HP per 60 fps frame of contact (the original per-frame rate),
+# as a rate so it does not depend on SIM_HZ; Player.take_damage handles the shield
+ZOMBIE_CONTACT = {'dps': 60}
 
 # ------------------------------------------------------------
 #  Kratos Boss – multi-phase encounter following God-of-War vibe
@@ -28,8 +42,7 @@ class KratosBoss:
         self.health = 1500
         self.max_health = 1500
         try:
-            img = pygame.image.load('assets/sprites/corrupted_god.png').convert_alpha()
-            self.image = pygame.transform.scale(img, (self.radius*2, self.radius*2))
+            self.image = load_image('assets/sprites/corrupted_god.png', (self.radius*2, self.radius*2), owner=self)
         except Exception:
             self.image = None
         # Timers / state trackers
@@ -50,18 +63,10 @@ class KratosBoss:
 
     # ---------------------- Utility helpers -------------------
     def _emit_weapon_arc(self, actions, weapon_type, count, speed_mul=1.0, damage=6):
-        """Emit radial arc of projectiles around Kratos"""
-        for i in range(count):
-            ang = i * (2*math.pi / count)
-            actions.append({
-                'type': weapon_type,
-                'x': self.x, 'y': self.y,
-                'angle': ang,
-                'speed': self.projectile_speed * speed_mul,
-                'radius': 9,
-                'damage': damage,
-                'color': (255, 120, 0)
-            })
+        """Emit radial arc of projectiles around Kratos (one volley; ``weapon_type`` is cosmetic)"""
+        angles = [i * (2*math.pi / count) for i in range(count)]
+        actions.append(volley(self.x, self.y, angles, self.projectile_speed * speed_mul,
+                              radius=9, damage=damage, color=(255, 120, 0)))
 
     # --------------------------- Main AI ----------------------
     def update(self, player, current_time: int, dt: float):
@@ -111,12 +116,9 @@ class KratosBoss:
             if phase == 1:
                 if roll < 0.4:  # Blades of Chaos 3-hit combo
                     base = math.atan2(player.y - self.y, player.x - self.x)
-                    for step, offset in enumerate((-0.5, 0, 0.5)):
-                        actions.append({'type': 'blade', 'x': self.x, 'y': self.y,
-                                        'angle': base + offset,
-                                        'speed': self.projectile_speed,
-                                        'radius': 9, 'damage': 6,
-                                        'color': (255, 100, 0)})
+                    actions.append(volley(self.x, self.y, [base - 0.5, base, base + 0.5],
+                                          self.projectile_speed, radius=9, damage=6,
+                                          color=(255, 100, 0)))
                 elif roll < 0.65:  # Shield Bash counter window
                     if current_time - self._bash_cooldown > 2000:
                         self._bash_cooldown = current_time
@@ -124,10 +126,8 @@ class KratosBoss:
                                          'radius': 60, 'damage': 8})
                 else:  # Leviathan Axe throw (boomerang)
                     base = math.atan2(player.y - self.y, player.x - self.x)
-                    actions.append({'type': 'axe', 'x': self.x, 'y': self.y,
-                                    'angle': base, 'speed': self.projectile_speed,
-                                    'radius': 12, 'damage': 8,
-                                    'color': (200, 200, 255), 'boomerang': True})
+                    actions.append(volley(self.x, self.y, base, self.projectile_speed,
+                                          radius=12, damage=8, color=(200, 200, 255)))
             # ------------------ PHASE 2 ------------------
             elif phase == 2:
                 if roll < 0.3:  # Ground Slam shockwaves
@@ -147,11 +147,8 @@ class KratosBoss:
             else:
                 if not self._ultimate_used and hp_pct < 0.2:
                     # Wrath of Olympus – one-time screen-wide lightning
-                    for x in range(80, SCREEN_WIDTH, 120):
-                        actions.append({'type': 'lightning', 'x': x, 'y': 0,
-                                        'angle': math.pi/2, 'speed': 0,
-                                        'radius': 14, 'damage': 10,
-                                        'color': (230, 230, 255)})
+                    actions.append(volley(list(range(80, SCREEN_WIDTH, 120)), 0, math.pi/2, 0,
+                                          radius=14, damage=10, color=(230, 230, 255)))
                     self._ultimate_used = True
                 if roll < 0.5:
                     # Weapon switch combo: choose random weapon
@@ -200,6 +197,15 @@ class KratosBoss:
 #                 Level Runner – Divine Arena
 # ------------------------------------------------------------
 
+def _draw_arena_floor(surface):
+    """Blood-red grid floor; pre-rendered once into a BackgroundLayer."""
+    surface.fill((20, 0, 0))
+    for y in range(0, SCREEN_HEIGHT, 40):
+        pygame.draw.line(surface, (50, 0, 0), (0, y), (SCREEN_WIDTH, y))
+    for x in range(0, SCREEN_WIDTH, 40):
+        pygame.draw.line(surface, (50, 0, 0), (x, 0), (x, SCREEN_HEIGHT))
+
+
 def show_ending():
     """Show the ending sequence with image and dialogue."""
     screen = pygame.display.get_surface()
@@ -207,7 +213,7 @@ def show_ending():
     
     try:
         # Load and scale the ending image to fit the screen
-        ending_img = pygame.image.load('assets/sprites/ending.png').convert_alpha()
+        ending_img = load_image('assets/sprites/ending.png')
         img_rect = ending_img.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
         
         # Create a semi-transparent overlay
@@ -281,291 +287,137 @@ def show_ending():
 def run_divine_arena():
     """Level 4 – Divine Arena boss fight against Kratos."""
     screen = pygame.display.get_surface()
-    clock = pygame.time.Clock()
 
     # --- Audio: play arena BGM ---
-    try:
-        pygame.mixer.music.load('assets/music/bgm.ogg')
-        pygame.mixer.music.set_volume(0.6)
-        pygame.mixer.music.play(-1)
-    except Exception:
-        pass  # fallback silently if file missing
+    music.jukebox.play('bgm.ogg', volume=0.6)
 
     # ---------------- Collectibles (medkits) -----------------
     COLLECTIBLE_SIZE = 20
-    collectibles = []
     try:
-        med_img_raw = pygame.image.load('assets/sprites/medkit.png').convert_alpha()
-        med_img = pygame.transform.scale(med_img_raw, (COLLECTIBLE_SIZE, COLLECTIBLE_SIZE))
+        med_img = load_image('assets/sprites/medkit.png', (COLLECTIBLE_SIZE, COLLECTIBLE_SIZE))
     except Exception:
         # Fallback: simple red square with white border
         med_img = pygame.Surface((COLLECTIBLE_SIZE, COLLECTIBLE_SIZE))
         med_img.fill((200, 0, 0))
         pygame.draw.rect(med_img, (255, 255, 255), med_img.get_rect(), 2)
 
-    def spawn_medkit(mx, my):
-        """Spawn a medkit at given coords if player's HP <=20%."""
-        if player.health <= player.max_health * 0.2:
-            collectibles.append({'x': mx, 'y': my, 'image': med_img})
-
     player = Player()
     player.x, player.y = SCREEN_WIDTH//2, SCREEN_HEIGHT-120
     player.is_invincible = True  # spawn invuln
     invul_end = pygame.time.get_ticks() + 2000
 
     boss = KratosBoss(SCREEN_WIDTH//2, SCREEN_HEIGHT//3)
-    bullets = []
-    player_bullets = []
-    zombies = []
+    projectiles = Projectiles()  # Kratos, spitters and the player share one pool
+    decals.clear_floor()
     # Timers for screen shake / flash visual effects triggered by abilities
-    shake_timer = 0
-    flash_timer = 0
+    postfx.fx.reset()
+
+    def kratos(world, dt):
+        """Kratos' attacks: shield bashes land at once, everything else is a volley."""
+        act = boss.update(player, pygame.time.get_ticks(), dt)
+        for a in act if isinstance(act, list) else [act] if act else []:
+            if a.get('type') == 'bash':
+                if math.hypot(player.x - a['x'], player.y - a['y']) < a.get('radius', 50) + player.radius:
+                    player.take_damage(6)  # Use player method to apply shield logic and play sound
+            # Ignore boss-triggered zombie spawns; waves handled separately
+            elif a.get('type') not in ('spawn_zombie', 'spawn_minion'):
+                projectiles.spawn_volley(a)
+
+    # Enemy shots may stray 50px off-screen before they are dropped; a raised shield soaks them for energy
+    world = World(player=player, projectiles=projectiles, game_map=open_area_map(), medkit_image=med_img,
+                  bounds=(-50, -50, SCREEN_WIDTH + 50, SCREEN_HEIGHT + 50), shot_shield_drain=5)
+    world.add_systems(systems.COMBAT)
+    world.add_system('movement', kratos, before=systems.move_projectiles)
+    # Boss, then every projectile in one batch, zombies, medkits and the player on top
+    world.add_systems((('render', systems.draw_layer(0)),
+                       ('render', systems.draw_projectiles),
+                       ('render', systems.draw_layer(1)),
+                       ('render', systems.draw_pickups),
+                       ('render', systems.draw_layer(2))))
+    # Shields fly home off Kratos instead of spamming damage
+    boss_entity = world.spawn(body=boss, target={'recall': True}, layer=0)
+    world.spawn(body=player, layer=2)
 
     show_dialogue([
         "The arena quakes as the Corrupted War God descends…",
         "Kratos: 'Spartan discipline shall crush you!'"
     ])
 
+    # World updates run in fixed steps; drawing blends between them
+    sim = FixedStep()
+    sim.track(lambda: list(world.store('body').values()))
+
     running = True
     while running:
-        dt = clock.tick(60) / 1000.0
-        t = pygame.time.get_ticks()
         events = pygame.event.get()
         for e in events:
             if e.type == pygame.QUIT:
                 return "MAIN_MENU"
             if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
                 return "MAIN_MENU"
+        perf_hud.hud.handle(events)
+
+        for dt, step_events in sim.steps(events):
+            t = pygame.time.get_ticks()
+            zombies_left = world.count('brain')
+            boss.shield_active = zombies_left > 0
+
+            # ---------------- Wave spawning logic -------------------
+            if not hasattr(run_divine_arena, '_wave_cleared'):
+                run_divine_arena._wave_cleared = True
+            if not hasattr(run_divine_arena, '_next_wave'):
+                run_divine_arena._next_wave = t + 3000  # first wave after 3s
+
+            # If no zombies left and cooldown passed, spawn next wave
+            if run_divine_arena._wave_cleared and not zombies_left and t >= run_divine_arena._next_wave:
+                wave_size = 10
+                for _ in range(wave_size):
+                    zx = random.randint(60, SCREEN_WIDTH-60)
+                    zy = random.randint(60, SCREEN_HEIGHT-160)
+                    # Spawn medkit if hero is in critical HP (<20%) when it dies
+                    world.spawn(body=random_zombie(zx, zy), brain=True, contact=dict(ZOMBIE_CONTACT),
+                                target={'recall': True}, loot=systems.medkit_loot, layer=1)
+                run_divine_arena._wave_cleared = False
+                # Shield becomes active automatically via shield_active update above
+            # Mark wave cleared when last zombie dies
+            if not zombies_left and not run_divine_arena._wave_cleared:
+                run_divine_arena._wave_cleared = True
+                # Next wave after delay depending on boss health (faster when low HP)
+                delay = 5000 if boss.health > boss.max_health*0.5 else 4000 if boss.health > boss.max_health*0.2 else 3000
+                run_divine_arena._next_wave = t + delay
+
+            for event in world.step(dt, step_events):
+                if event[:2] == ('killed', boss_entity):
+                    show_ending()
+                    return "VICTORY"
+            if player.health <= 0:
+                return "GAME_OVER"
 
-        # ---------------- Player movement & shooting ----------------
-        keys = pygame.key.get_pressed()
-        from mechanics import update_player_state, handle_player_input
-        if 'arena_map' not in locals():
-            arena_map = [[' ' for _ in range(SCREEN_WIDTH // TILE_SIZE + 1)] for _ in range(SCREEN_HEIGHT // TILE_SIZE + 1)]
-        update_player_state(player, keys, arena_map, dt)
-        handle_player_input(player, player_bullets, events)
+            # turn off spawn invulnerability
+            if player.is_invincible and t >= invul_end:
+                player.is_invincible = False
 
         # --- Decay visual timers ---
-        if shake_timer > 0:
-            shake_timer -= dt
-        if flash_timer > 0:
-            flash_timer -= dt
-
-        # ---- Ground Pound impact (player ability) ----
-        if player.gp_triggered:
-            player.gp_triggered = False
-            GP_RADIUS = 250  # pixels
-            for zb in zombies:
-                dist = math.hypot(zb.x - player.x, zb.y - player.y)
-                if dist <= GP_RADIUS:
-                    # Stun for 2 seconds
-                    zb.stun_timer = 2.0
-                    # Knock-back up to 60 px away from player
-                    if dist > 0:
-                        kx = (zb.x - player.x) / dist * 60
-                        ky = (zb.y - player.y) / dist * 60
-                        zb.x += kx
-                        zb.y += ky
-            # Trigger visual feedback
-            shake_timer = 0.4
-            flash_timer = 0.15
-
-        # ---------------- Update existing zombies -------------------
-        from special_zombies import random_zombie
-        boss.shield_active = any(z.is_alive for z in zombies)
-
-        # ---------------- Wave spawning logic -------------------
-        if not hasattr(run_divine_arena, '_wave_cleared'):
-            run_divine_arena._wave_cleared = True
-        if not hasattr(run_divine_arena, '_next_wave'):
-            run_divine_arena._next_wave = t + 3000  # first wave after 3s
-
-        # If no zombies left and cooldown passed, spawn next wave
-        if run_divine_arena._wave_cleared and not zombies and t >= run_divine_arena._next_wave:
-            wave_size = 10
-            for _ in range(wave_size):
-                zx = random.randint(60, SCREEN_WIDTH-60)
-                zy = random.randint(60, SCREEN_HEIGHT-160)
-                zombies.append(random_zombie(zx, zy))
-            run_divine_arena._wave_cleared = False
-            # Shield becomes active automatically via shield_active update above
-        # Mark wave cleared when last zombie dies
-        if not zombies and not run_divine_arena._wave_cleared:
-            run_divine_arena._wave_cleared = True
-            # Next wave after delay depending on boss health (faster when low HP)
-            delay = 5000 if boss.health > boss.max_health*0.5 else 4000 if boss.health > boss.max_health*0.2 else 3000
-            run_divine_arena._next_wave = t + delay
-        for z in zombies[:]:
-            z_info = z.update(player.x, player.y, arena_map, dt)
-            if isinstance(z_info, dict):
-                bullets.append(z_info)
-            if z.is_alive and math.hypot(player.x - z.x, player.y - z.y) < z.radius + player.radius:
-                if not player.is_invincible:
-                    player.take_damage(1)  # Use player method to apply shield logic and play sound
-                if player.health <= 0:
-                    return "GAME_OVER"
-            if not z.is_alive:
-                # Spawn medkit if hero is in critical HP (<20%)
-                spawn_medkit(z.x, z.y)
-                zombies.remove(z)
-
-        # ---------------- Boss update ------------------------------
-        act = boss.update(player, t, dt)
-        if act:
-            def process(a):
-                if a.get('type') == 'bash':
-                    if math.hypot(player.x - a['x'], player.y - a['y']) < a.get('radius', 50) + player.radius:
-                        player.take_damage(6)  # Use player method to apply shield logic and play sound
-                    return False
-                # Ignore boss-triggered zombie spawns; waves handled separately
-                if a.get('type') in ('spawn_zombie', 'spawn_minion'):
-                    return False
-                return True
-            if isinstance(act, list):
-                for a in act:
-                    if process(a):
-                        bullets.append(a)
-            else:
-                if process(act):
-                    bullets.append(act)
-
-        # Minion spawning removed as per request
-
-        # turn off spawn invulnerability
-        if player.is_invincible and t >= invul_end:
-            player.is_invincible = False
-
-        # ---------------- Update bullets ---------------------------
-        for b in bullets[:]:
-            # Skip if bullet doesn't have required position keys
-            if 'x' not in b or 'y' not in b:
-                bullets.remove(b)
-                continue
-                
-            if 'angle' in b and 'speed' in b:
-                b['x'] += math.cos(b['angle']) * b['speed'] * dt
-                b['y'] += math.sin(b['angle']) * b['speed'] * dt
-                
-            # Clean up off-screen bullets
-            if (b['y'] > SCREEN_HEIGHT+50 or b['x'] < -50 or b['x'] > SCREEN_WIDTH+50 or
-                b['y'] < -50):  # Also check top of screen
-                bullets.remove(b)
-                continue
-
-            # Collision with player
-            if math.hypot(player.x - b.get('x',0), player.y - b.get('y',0)) < b.get('radius',0) + player.radius:
-                if player.is_shielding and player.shield_energy > 0:
-                    player.shield_energy = max(0, player.shield_energy - 5)
-                    if shield_hit_sound:
-                        shield_hit_sound.play()
-                else:
-                    player.health -= b.get('damage',5)
-                    if player.health <= 0:
-                        return "GAME_OVER"
-                bullets.remove(b)
-                continue
-
-        # ---------------- Player bullets ---------------------------
-        for pb in player_bullets[:]:
-            speed = pb.get('speed', 350)
-            pb['x'] += math.cos(pb['angle']) * speed * dt
-            pb['y'] += math.sin(pb['angle']) * speed * dt
-            
-            # Handle shield boomerang behavior
-            if pb.get('type') == 'shield':
-                update_shield_bullet(pb, player_bullets, dt, arena_map, player, zombies=zombies)
-            
-            if pb['x'] < 0 or pb['x'] > SCREEN_WIDTH or pb['y'] < 0 or pb['y'] > SCREEN_HEIGHT:
-                if pb.get('type') == 'shield' and pb.get('owner'):
-                    pb['owner'].active_shield_throw = False
-                player_bullets.remove(pb)
-                continue
-
-            # Collision with boss
-            if math.hypot(boss.x - pb['x'], boss.y - pb['y']) < boss.radius + pb.get('radius', 4):
-                if boss.take_damage(pb.get('damage', 20)):
-                    show_ending()
-                    return "VICTORY"
-                if pb.get('type') == 'shield':
-                    pb['returning'] = True
-                    pb['damage'] = 0  # avoid repeated damage spam
-                elif pb in player_bullets:
-                    player_bullets.remove(pb)
-                continue
-
-            # Collision with zombies
-            hit_any = False
-            for z in zombies[:]:
-                if not z.is_alive:
-                    continue
-                if math.hypot(z.x - pb['x'], z.y - pb['y']) < z.radius + pb.get('radius', 4):
-                    if hasattr(z, 'take_damage'):
-                        if z.take_damage(pb.get('damage', 20)):
-                            # Spawn medkit when player in critical HP
-                            spawn_medkit(z.x, z.y)
-                            z.is_alive = False
-                            zombies.remove(z)
-                    hit_any = True
-                    break
-            if hit_any:
-                if pb.get('type') == 'shield':
-                    pb['returning'] = True
-                    pb['damage'] = 0
-                elif pb in player_bullets:
-                    player_bullets.remove(pb)
-
-        # ---------------- Collectible pickup ----------------
-        for c in collectibles[:]:
-            if math.hypot(player.x - c['x'], player.y - c['y']) < player.radius + COLLECTIBLE_SIZE//2:
-                player.health = min(player.max_health, player.health + player.max_health)  # heal fully
-                collectibles.remove(c)
-                # TODO: optional collect sound
+        dt = sim.frame_dt
+        postfx.fx.update(dt)
 
         # ---------------- Drawing ---------------------------
-        screen.fill((20, 0, 0))
-        for y in range(0, SCREEN_HEIGHT, 40):
-            pygame.draw.line(screen, (50, 0, 0), (0, y), (SCREEN_WIDTH, y))
-        for x in range(0, SCREEN_WIDTH, 40):
-            pygame.draw.line(screen, (50, 0, 0), (x, 0), (x, SCREEN_HEIGHT))
-
-        # Draw boss and enemy bullets
-        boss.draw(screen)
-        for b in bullets:
-            if 'x' in b and 'y' in b:
-                pygame.draw.circle(screen, b.get('color', (255, 50, 50)),
-                                (int(b['x']), int(b['y'])),
-                                b.get('radius', 5))
-        
-        # Draw player bullets and shield projectiles
-        for pb in player_bullets:
-            if pb.get('type') == 'shield':
-                draw_shield_bullet(screen, pb)
-            else:
-                pygame.draw.circle(screen, BULLET_COLOR, (int(pb['x']), int(pb['y'])), pb.get('radius', 4))
-        for z in zombies:
-            z.draw(screen)
-        # Draw collectibles
-        for c in collectibles:
-            screen.blit(c['image'], (c['x'] - COLLECTIBLE_SIZE//2, c['y'] - COLLECTIBLE_SIZE//2))
-
-        player.draw(screen)
+        get_layer('divine_arena', lambda: BackgroundLayer(size=(SCREEN_WIDTH, SCREEN_HEIGHT), draw_base=_draw_arena_floor)).blit(screen)
+        decals.draw_floor(screen)
+        perf_hud.hud.mark('map_draw')
+
+        with sim.interpolated():
+            world.draw(screen, sim.alpha)
+        perf_hud.hud.mark('entity_draw')
         draw_ui(screen, player)
 
-        # ---- Flash overlay ----
-        if flash_timer > 0:
-            flash_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            flash_surf.fill((255, 255, 255))
-            alpha = int(255 * (flash_timer / 0.15))
-            flash_surf.set_alpha(alpha)
-            screen.blit(flash_surf, (0, 0))
-
-        # ---- Apply screen shake ----
-        if shake_timer > 0:
-            offset = (random.randint(-6, 6), random.randint(-6, 6))
-            shake_frame = screen.copy()
-            screen.fill((0, 0, 0))
-            screen.blit(shake_frame, offset)
+        # Flash + shake composited in one pass
+        postfx.fx.apply(screen)
+        perf_hud.hud.mark('ui')
+        perf_hud.hud.count(entities=world.count('body'), projectiles=len(projectiles))
+        perf_hud.hud.draw(screen)
         pygame.display.flip()
+        perf_hud.hud.end_frame()
 
         # escape when boss dead handled in collision
 
@@ -1,26 +1,33 @@
 import pygame
 import random
 import math
-from shield_bullet import update_shield_bullet, draw_shield_bullet
 import os
 import sys
 from settings import (
-    TILE_SIZE, PLAYER_MAX_AMMO, MAX_HEALTH, PLAYER_BULLET_DAMAGE, HEALTH_BAR_FG, HEALTH_BAR_BG,
+    TILE_SIZE, PLAYER_MAX_AMMO, MAX_HEALTH, HEALTH_BAR_FG, HEALTH_BAR_BG,
     STAMINA_BAR_FG, STAMINA_BAR_BG, MAX_STAMINA, SHIELD_BAR_FG, SHIELD_BAR_BG,
     PLAYER_MAX_SHIELD_ENERGY, UI_PANEL_BG, WHITE, SCREEN_WIDTH, SCREEN_HEIGHT,
-    BG_COLOR, ZOMBIE_DAMAGE, BULLET_COLOR, BULLET_RADIUS, BULLET_SPEED, BLACK
+    BG_COLOR, ZOMBIE_DAMAGE, BLACK,
+    ENDLESS_HORDE_CAP, ENDLESS_MAP_WIDTH, ENDLESS_MAP_HEIGHT
 )
-from zombie import Zombie
-from special_zombies import random_zombie
+from fixed_step import FixedStep
+from camera import Camera
+from horde import Horde
+from projectiles import Projectiles, PLAYER, ENEMY
+from tile_map import compile_map
 from ui import draw_ui
+from asset_cache import load_image
+import sound_bank
+import music
+import idle
+import decals
+import postfx
+import particle_engine
+import perf_hud
 from mechanics import handle_player_input, update_player_state
-from levels.outside_area import spawn_zombie as spawn_zombie_out
 
 
 # ---------- HELPERS ----------
-ENDLESS_MAP_WIDTH = 32  # should match other maps
-ENDLESS_MAP_HEIGHT = 18
-
 def _generate_empty_map():
     """Generate a walled empty map suitable for free movement"""
     top_bottom = "W" * ENDLESS_MAP_WIDTH
@@ -47,11 +54,8 @@ def _save_highscore(path: str, score: int):
 
 
 # ---------- HELL VISUALS HELPERS ----------
-EMBER_COLOR_RANGE = [(255, 120, 0), (255, 180, 50), (255, 80, 0)]
-embers = []
-
-# Collectible particles/effects
-particles = []
+# Embers drifting up from the lava, per second
+EMBER_RATE = 36
 
 
 def _create_lava_surface():
@@ -75,76 +79,9 @@ lava_surface = None  # will be generated on first run
 LAVA_SCROLL_SPEED = 30  # pixels per second
 lava_scroll = 0
 
-# Load collect sound once
-try:
-    collect_sound = pygame.mixer.Sound('assets/music/reload.ogg')
-except Exception:
-    collect_sound = None
-
-
-def _spawn_ember():
-    return {
-        'x': random.uniform(0, SCREEN_WIDTH),
-        'y': SCREEN_HEIGHT + 10,
-        'vy': random.uniform(-50, -120),
-        'radius': random.randint(1, 3),
-        'color': random.choice(EMBER_COLOR_RANGE),
-        'life': random.uniform(1.5, 3.0)
-    }
-
-
-def _update_and_draw_embers(screen, dt):
-    # spawn
-    if random.random() < 0.6:  # increased density for fiery atmosphere
-        embers.append(_spawn_ember())
-
-    for ember in embers[:]:
-        ember['y'] += ember['vy'] * dt
-        ember['life'] -= dt
-        if ember['life'] <= 0 or ember['y'] < -10:
-            embers.remove(ember)
-            continue
-        pygame.draw.circle(screen, ember['color'], (int(ember['x']), int(ember['y'])), ember['radius'])
-
-
-# Music helper
-
-def _play_hell_music():
-    """Play looping hell track using pygame.mixer.music so it is isolated
-    from the normal sound-effect channels."""
-    try:
-        import pygame
-        pygame.mixer.music.load('assets/music/doom.ogg')
-        pygame.mixer.music.set_volume(0.7)
-        pygame.mixer.music.play(-1)  # loop indefinitely
-    except Exception as e:
-        print(f"Could not play hell music: {e}")
-
-
-# Helper functions for collectible particle effect
+# Size of the pickup sprite
 COLLECTIBLE_SIZE = 20
 
-def _create_collect_effect(x, y):
-    for _ in range(20):
-        particles.append({
-            'x': x,
-            'y': y,
-            'vx': random.uniform(-150, 150),
-            'vy': random.uniform(-150, 150),
-            'timer': random.uniform(0.2, 0.5),
-            'color': random.choice([(255,255,255), (255,215,0), (180,180,180)])
-        })
-
-def _update_and_draw_particles(screen, dt):
-    for p in particles[:]:
-        p['x'] += p['vx'] * dt
-        p['y'] += p['vy'] * dt
-        p['timer'] -= dt
-        if p['timer'] <= 0:
-            particles.remove(p)
-        else:
-            pygame.draw.rect(screen, p['color'], (p['x'], p['y'], 3, 3))
-
 # ---------- MAIN LOOP ----------
 
 def run_endless_mode(game_objects):
@@ -156,30 +93,33 @@ def run_endless_mode(game_objects):
     player.stamina = MAX_STAMINA
     player.ammo = PLAYER_MAX_AMMO
     player.shield_energy = PLAYER_MAX_SHIELD_ENERGY
-    player.x, player.y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+    player.x, player.y = ENDLESS_MAP_WIDTH * TILE_SIZE // 2, ENDLESS_MAP_HEIGHT * TILE_SIZE // 2
 
     # Ensure shotgun volume consistent
-    if getattr(player, 'shotgun_sound', None):
-        player.shotgun_sound.set_volume(0.6)
-
-    # Game specific vars
-    zombies = []
-    # Ground Pound visual timers
-    shake_timer = 0.0
-    flash_timer = 0.0
-    bullets = []
-    kill_count = 0
+    player.shotgun_volume = 0.6
+
+    # Game specific vars; the horde keeps every zombie in NumPy arrays
+    horde = Horde()
     game_map = _generate_empty_map()
+    tiles = compile_map(game_map)
+    # The arena is larger than the screen; the view follows the player and only what it sees is drawn
+    camera = Camera.for_map(game_map)
+    world_bounds = (0, 0, camera.world_width, camera.world_height)
+    decals.clear_floor((camera.world_width, camera.world_height))
+    # Ground Pound visual effects
+    postfx.fx.reset()
+    particle_engine.engine.clear()
+    projectiles = Projectiles()
+    kill_count = 0
 
     # Spawn collectible 5 somewhere random but open
     try:
-        collect5_img_raw = pygame.image.load('assets/sprites/collection5.png').convert_alpha()
-        collect5_img = pygame.transform.scale(collect5_img_raw, (COLLECTIBLE_SIZE, COLLECTIBLE_SIZE))
+        collect5_img = load_image('assets/sprites/collection5.png', (COLLECTIBLE_SIZE, COLLECTIBLE_SIZE))
     except pygame.error:
         collect5_img = None
     collectible = {
-        'x': random.randint(2 * TILE_SIZE, SCREEN_WIDTH - 2 * TILE_SIZE),
-        'y': random.randint(2 * TILE_SIZE, SCREEN_HEIGHT - 2 * TILE_SIZE),
+        'x': random.randint(2 * TILE_SIZE, camera.world_width - 2 * TILE_SIZE),
+        'y': random.randint(2 * TILE_SIZE, camera.world_height - 2 * TILE_SIZE),
         'image': collect5_img,
         'collected': False
     }
@@ -190,57 +130,19 @@ def run_endless_mode(game_objects):
 
     # Pygame handles
     screen = pygame.display.get_surface()
-    clock = pygame.time.Clock()
-
-    # Load sounds
-    try:
-        game_over_sfx = pygame.mixer.Sound("assets/music/game_over.ogg")
-        hurt_sfx = pygame.mixer.Sound("assets/music/player_hurt.ogg")
-        shield_hit_sfx = pygame.mixer.Sound("assets/music/shield_hit.ogg")
-    except Exception:
-        game_over_sfx = hurt_sfx = shield_hit_sfx = None
+    # Fixed-rate simulation; the player is drawn interpolated (the horde and projectiles blend themselves)
+    sim = FixedStep()
+    sim.track(lambda: [player])
 
     # Start hell background music
-    _play_hell_music()
-
-    # Reference to main's background_music dict for checking music state
-    try:
-        from main import background_music, play_music as _play_music_main
-    except Exception:
-        background_music = {}
-        _play_music_main = None
+    music.jukebox.play('doom.ogg', volume=0.7)
 
     # Dark DOOM-like colours
     BACKGROUND = (20, 0, 0)  # slightly brighter base red
 
-    # Timer to avoid checking music every single frame
-    music_check_timer = 0.0
-
     running = True
     while running:
-        dt = clock.tick(60) / 1000.0
-        # Decay Ground Pound visual timers
-        if shake_timer > 0:
-            shake_timer -= dt
-        if flash_timer > 0:
-            flash_timer -= dt
-
-        # Ensure background music keeps playing (check every 3 seconds)
-        if _play_music_main:
-            music_check_timer += dt
-            if music_check_timer >= 3.0:
-                music_check_timer = 0.0
-                if 0 not in background_music:
-                    _play_music_main("doom.ogg", channel=0, volume=0.7, loop=True)
-
-        # Draw collectible if not collected
-        if not collectible['collected'] and collectible['image']:
-            screen.blit(collectible['image'], (collectible['x'] - COLLECTIBLE_SIZE // 2, collectible['y'] - COLLECTIBLE_SIZE // 2))
-
-        # Particle updates
-        _update_and_draw_particles(screen, dt)
-
-        # -------- Event handling --------
+        # -------- Event handling (once per frame) --------
         events = pygame.event.get()
         for event in events:
             if event.type == pygame.QUIT:
@@ -248,166 +150,137 @@ def run_endless_mode(game_objects):
                 sys.exit()
             elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 running = False
+        perf_hud.hud.handle(events)
+
+        # -------- Simulation, in fixed steps --------
+        for dt, step_events in sim.steps(events):
+            # Handle player input (movement, shooting etc.)
+            handle_player_input(player, projectiles, step_events)
+
+            # Update player physics/state
+            keys = pygame.key.get_pressed()
+            update_player_state(player, keys, game_map, dt, camera)
+
+            # ---- Ground Pound impact ----
+            if player.gp_triggered:
+                player.gp_triggered = False
+                horde.ground_pound(player.x, player.y)
+                postfx.fx.ground_pound()
+                particle_engine.engine.emit('dust', player.x, player.y)
+            perf_hud.hud.mark('player')
+
+            # -------- Update zombies --------
+            current_time = pygame.time.get_ticks()
+            for info in horde.update(player.x, player.y, tiles, dt, current_time):
+                if info.get('quake'):
+                    postfx.fx.shake(info.get('duration', 500) / 1000.0)
+                else:
+                    projectiles.spawn_volley(info)
 
-        # Handle player input (movement, shooting etc.)
-        handle_player_input(player, bullets, events)
-
-        # Update player physics/state
-        keys = pygame.key.get_pressed()
-        update_player_state(player, keys, game_map, dt)
-
-        # ---- Ground Pound impact ----
-        if player.gp_triggered:
-            player.gp_triggered = False
-            GP_RADIUS = 250
-            for zb in zombies:
-                dist = math.hypot(zb.x - player.x, zb.y - player.y)
-                if dist <= GP_RADIUS:
-                    zb.stun_timer = 2.0
-                    if dist > 0:
-                        kx = (zb.x - player.x) / dist * 60
-                        ky = (zb.y - player.y) / dist * 60
-                        zb.x += kx
-                        zb.y += ky
-            shake_timer = 0.4
-            flash_timer = 0.15
-
-        # -------- Update zombies --------
-        for zombie in zombies[:]:
-            info = zombie.update(player.x, player.y, game_map, dt)
-            if info:
-                bullets.append(info)
-                
             # Damage to player when close
-            if zombie.is_alive:
-                dist = math.hypot(player.x - zombie.x, player.y - zombie.y)
-                if dist < player.radius + zombie.radius:
-                    current_time = pygame.time.get_ticks()
-                    attack_cooldown = 1000
-                    if current_time - zombie.last_attack_time > attack_cooldown:
-                        player.take_damage(ZOMBIE_DAMAGE)
-                        if hurt_sfx: hurt_sfx.play()
-                        zombie.last_attack_time = current_time
-
-            # Zombie death check
-            if not zombie.is_alive:
-                zombies.remove(zombie)
-                kill_count += 1
-        
-        # -------- Collectible pickup check --------
-        if not collectible['collected']:
-            dist_c = math.hypot(player.x - collectible['x'], player.y - collectible['y'])
-            if dist_c < player.radius + COLLECTIBLE_SIZE/2:
-                collectible['collected'] = True
-                _create_collect_effect(collectible['x'], collectible['y'])
-                if collect_sound:
-                    collect_sound.play()
-
-        # Player death check
-        if player.health <= 0:
-            running = False
-            break
+            for _ in range(horde.contact(player.x, player.y, player.radius, current_time, 1000)):
+                player.take_damage(ZOMBIE_DAMAGE)
+                sound_bank.play('player_hurt')
+            perf_hud.hud.mark('zombies')
+
+            # -------- Collectible pickup check --------
+            if not collectible['collected']:
+                dist_c = math.hypot(player.x - collectible['x'], player.y - collectible['y'])
+                if dist_c < player.radius + COLLECTIBLE_SIZE/2:
+                    collectible['collected'] = True
+                    particle_engine.engine.emit('collect', collectible['x'], collectible['y'])
+                    sound_bank.play('collect')
+
+            # Player death check
+            if player.health <= 0:
+                running = False
+                break
 
-        # -------- Spawn new zombies --------
-        # Dynamic difficulty scaling: more zombies as kill count rises
-        desired = min(50, 8 + kill_count // 2)  # cap at 50, ramp quicker
-        while len(zombies) < desired:
-            prev_len = len(zombies)
-            spawn_zombie_out(game_map, zombies, player)
-            if len(zombies) > prev_len:
-                # scale the newly added zombie(s)
+            # -------- Spawn new zombies --------
+            # Dynamic difficulty scaling: more zombies as kill count rises
+            desired = min(ENDLESS_HORDE_CAP, 8 + kill_count // 2)
+            if len(horde) < desired:
                 level = kill_count // 20  # every 20 kills raise level
-                for nz in zombies[prev_len:]:
-                    if not hasattr(nz, 'scaled_level') or nz.scaled_level < level:
-                        nz.health = int(nz.health * (1 + 0.3 * level))
-                        nz.speed *= (1 + 0.1 * level)
-                        nz.scaled_level = level
-
-        # -------- Update bullets --------
-        for bullet in bullets[:]:
-            # Skip or remove bullets that don't conform to expected dict structure
-            if not isinstance(bullet, dict) or 'x' not in bullet or 'y' not in bullet:
-                bullets.remove(bullet)
-                continue
-
-            # Standard bullet dict processing
-            bullet['x'] += math.cos(bullet['angle']) * BULLET_SPEED * dt
-            bullet['y'] += math.sin(bullet['angle']) * BULLET_SPEED * dt
-
-            # Shield boomerang behaviour
-            if bullet.get('type') == 'shield':
-                update_shield_bullet(bullet, bullets, dt, game_map, player, zombies)
-
-            off_screen = (bullet['x'] < 0 or bullet['x'] > SCREEN_WIDTH or
-                          bullet['y'] < 0 or bullet['y'] > SCREEN_HEIGHT)
-            if off_screen:
-                if bullet.get('type') == 'shield' and bullet.get('owner'):
-                    bullet['owner'].active_shield_throw = False
-                bullets.remove(bullet)
-                continue
-
-            # Collision with zombies
-            for zombie in zombies[:]:
-                if zombie.is_alive:
-                    dist = math.hypot(zombie.x - bullet['x'], zombie.y - bullet['y'])
-                    if dist < zombie.radius:
-                        if bullet.get('type') == 'shield':
-                            # bounce instead of disappearing
-                            bullet['angle'] = math.atan2(-math.sin(bullet['angle']), -math.cos(bullet['angle']))
-                            bullet['bounces'] = bullet.get('bounces', 0) + 1
-                            if bullet['bounces'] >= 4:
-                                bullet['returning'] = True
-                            zombie.take_damage(bullet.get('damage', PLAYER_BULLET_DAMAGE))
-                        else:
-                            zombie.take_damage(bullet.get('damage', PLAYER_BULLET_DAMAGE))
-                            if bullet in bullets:
-                                bullets.remove(bullet)
+                horde.spawn_random(desired - len(horde), tiles, player.x, player.y, current_time,
+                                   health_mult=1 + 0.3 * level, speed_mult=1 + 0.1 * level)
+
+            # -------- Update projectiles --------
+            projectiles.update(dt, tiles, world_bounds)
+
+            # Spit from acid zombies flies over the horde and hurts the player
+            hits = projectiles.hits_circle(player.x, player.y, player.radius, ENEMY)
+            for i in hits.tolist():
+                player.take_damage(float(projectiles.damage[i]))
+            projectiles.kill(hits)
+            perf_hud.hud.mark('bullets')
+
+            # Collision with zombies, all player shots swept against the horde at once
+            shots = projectiles.alive(PLAYER)
+            if len(shots):
+                hits = horde.query_segments(projectiles.prev_x[shots], projectiles.prev_y[shots],
+                                            projectiles.x[shots], projectiles.y[shots])
+                for i, candidates in zip(shots.tolist(), hits):
+                    for z in candidates:
+                        if horde.health[z] <= 0:
+                            continue  # killed by an earlier shot this step
+                        horde.damage(z, float(projectiles.damage[i]))
+                        particle_engine.engine.emit_against('sparks', projectiles.x[i], projectiles.y[i],
+                                                            projectiles.vx[i], projectiles.vy[i])
+                        projectiles.hit(i)  # shields bounce instead of disappearing
                         break
+            kill_count += horde.compact()
+            projectiles.compact()
+            perf_hud.hud.mark('collisions')
+        if not running:
+            break
+
+        # -------- Per-frame effects (real time) --------
+        dt = sim.frame_dt
+        # Decay Ground Pound visual timers
+        postfx.fx.update(dt)
 
-        # --- After bullet loop: reset shield flag if no projectile owned by player ---
-        if player.active_shield_throw and not any(b.get('type')=='shield' and b.get('owner')==player for b in bullets):
-            player.active_shield_throw = False
+        # Centre on where the player is drawn (blended), so they do not jitter against the floor
+        with sim.interpolated():
+            camera.follow(player.x, player.y)
+
+        # Draw collectible if not collected
+        if not collectible['collected'] and collectible['image'] and camera.sees(collectible['x'], collectible['y']):
+            cx, cy = camera.to_screen(collectible['x'], collectible['y'])
+            screen.blit(collectible['image'], (cx - COLLECTIBLE_SIZE // 2, cy - COLLECTIBLE_SIZE // 2))
 
         # -------- Drawing --------
         global lava_surface, lava_scroll
         if lava_surface is None:
             lava_surface = _create_lava_surface()
 
-        # Animate scrolling lava by vertical offset
+        # Animate scrolling lava by vertical offset; the screen-sized sheet
+        # repeats across the arena, so it is at most four partial blits
         lava_scroll = (lava_scroll + LAVA_SCROLL_SPEED * dt) % SCREEN_HEIGHT
-        screen.blit(lava_surface, (0, -lava_scroll))
-        screen.blit(lava_surface, (0, SCREEN_HEIGHT - lava_scroll))
+        lava_x = camera.x % SCREEN_WIDTH
+        lava_y = (camera.y + lava_scroll) % SCREEN_HEIGHT
+        for tile_x in (-lava_x, SCREEN_WIDTH - lava_x):
+            for tile_y in (-lava_y, SCREEN_HEIGHT - lava_y):
+                if tile_x < SCREEN_WIDTH and tile_y < SCREEN_HEIGHT:
+                    screen.blit(lava_surface, (tile_x, tile_y))
+        decals.draw_floor(screen, camera)
 
         # Dynamic red fog overlay with subtle flicker
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        flicker_alpha = random.randint(100, 140)
-        overlay.set_alpha(flicker_alpha)
-        overlay.fill((80, 0, 0))
-
-        # White flash overlay if active
-        if flash_timer > 0:
-            flash_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            flash_surf.fill(WHITE)
-            alpha = int(255 * (flash_timer / 0.15))
-            flash_surf.set_alpha(alpha)
-            screen.blit(flash_surf, (0,0))
-        screen.blit(overlay, (0, 0))
-
-        # Embers / fire sparks
-        _update_and_draw_embers(screen, dt)
-
-        # Draw player and entities
-        # Draw bullets
-        for bullet in bullets:
-            if bullet.get('type') == 'shield':
-                draw_shield_bullet(screen, bullet)
-            else:
-                pygame.draw.circle(screen, BULLET_COLOR, (int(bullet['x']), int(bullet['y'])), bullet.get('radius', BULLET_RADIUS))
-        player.draw(screen)
-        for z in zombies:
-            z.draw(screen)
-        for bullet in bullets:
-            pygame.draw.circle(screen, BULLET_COLOR, (int(bullet['x']), int(bullet['y'])), BULLET_RADIUS)
+        postfx.fx.draw_fog(screen, (80, 0, 0), random.randint(100, 140))
+
+        # Embers and pickup sparkles, one batch
+        particle_engine.engine.stream('ember', EMBER_RATE, dt, *camera.to_world(SCREEN_WIDTH / 2, SCREEN_HEIGHT + 10))
+        particle_engine.engine.update(dt, camera.bounds)
+        particle_engine.engine.draw(screen, camera)
+        perf_hud.hud.mark('map_draw')
+
+        # Draw player and entities, blended between simulation steps; the
+        # pools cull to the camera's view themselves
+        with sim.interpolated():
+            projectiles.draw(screen, sim.alpha, camera)
+            with camera.applied([player] + player.blood_splatters):
+                player.draw(screen)
+            horde.draw(screen, sim.alpha, camera)
+        perf_hud.hud.mark('entity_draw')
 
         # Draw UI + kill counters
         draw_ui(screen, player)
@@ -417,24 +290,20 @@ def run_endless_mode(game_objects):
         screen.blit(kills_surf, (20, 20))
         screen.blit(hs_surf, (20, 60))
 
-        # Apply screen shake by offsetting the final frame
-        if shake_timer > 0:
-            offset = (random.randint(-6, 6), random.randint(-6, 6))
-            frame_copy = screen.copy()
-            screen.fill((0, 0, 0))
-            screen.blit(frame_copy, offset)
+        # Flash + shake composited in one pass
+        postfx.fx.apply(screen)
+        perf_hud.hud.mark('ui')
+        perf_hud.hud.count(entities=len(horde) + 1, projectiles=len(projectiles), particles=len(particle_engine.engine))
+        perf_hud.hud.draw(screen)
 
         pygame.display.flip()
+        perf_hud.hud.end_frame()
 
     # ----- Exit sequence -----
     # Fade out background music when mode ends
-    try:
-        pygame.mixer.music.fadeout(1000)
-    except Exception:
-        pass
+    music.jukebox.stop(1000)
 
-    if game_over_sfx:
-        game_over_sfx.play()
+    if sound_bank.play('game_over'):
         # Wait for the sound to play before showing the game over screen
         pygame.time.wait(1000)  # 1 second delay to hear the sound
 
@@ -457,40 +326,44 @@ def _show_endless_game_over(screen, kills: int, record: int):
     button_width, button_height = 300, 70
     button_rect = pygame.Rect(SCREEN_WIDTH//2 - button_width//2, SCREEN_HEIGHT//2 + 100, button_width, button_height)
 
-    clock = pygame.time.Clock()
+    # Background dim, once over the last frame of the run
+    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    overlay.fill((0, 0, 0))
+    overlay.set_alpha(200)
+    backdrop = screen.copy()
+    backdrop.blit(overlay, (0, 0))
+
+    # Texts
+    title = title_font.render("YOU HAVE FALLEN", True, (220, 0, 0))
+    kills_txt = mid_font.render(f"Kills: {kills}", True, WHITE)
+    record_txt = mid_font.render(f"High Score: {record}", True, WHITE)
+    btn_text = small_font.render("MAIN MENU", True, WHITE)
+    is_hover = False
+
+    def draw(surface):
+        surface.blit(backdrop, (0, 0))
+        surface.blit(title, title.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 120)))
+        surface.blit(kills_txt, kills_txt.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 20)))
+        surface.blit(record_txt, record_txt.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 40)))
+
+        # Button
+        pygame.draw.rect(surface, (120,0,0) if is_hover else (80,0,0), button_rect, 0, 10)
+        pygame.draw.rect(surface, (200,0,0), button_rect, 3, 10)
+        surface.blit(btn_text, btn_text.get_rect(center=button_rect.center))
+
+    # Static apart from the button's hover highlight
+    view = idle.IdleScreen(screen, draw)
     while True:
-        dt = clock.tick(60) / 1000.0
-        mouse_pos = pygame.mouse.get_pos()
+        view.present()
 
-        for event in pygame.event.get():
+        for event in view.wait():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             if event.type == pygame.KEYDOWN and event.key in (pygame.K_RETURN, pygame.K_SPACE, pygame.K_m):
                 return  # back to caller
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and button_rect.collidepoint(mouse_pos):
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and button_rect.collidepoint(pygame.mouse.get_pos()):
                 return
-
-        # Background dim
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(200)
-        screen.blit(overlay, (0, 0))
-
-        # Texts
-        title = title_font.render("YOU HAVE FALLEN", True, (220, 0, 0))
-        kills_txt = mid_font.render(f"Kills: {kills}", True, WHITE)
-        record_txt = mid_font.render(f"High Score: {record}", True, WHITE)
-
-        screen.blit(title, title.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 120)))
-        screen.blit(kills_txt, kills_txt.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 20)))
-        screen.blit(record_txt, record_txt.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 40)))
-
-        # Button
-        is_hover = button_rect.collidepoint(mouse_pos)
-        pygame.draw.rect(screen, (120,0,0) if is_hover else (80,0,0), button_rect, 0, 10)
-        pygame.draw.rect(screen, (200,0,0), button_rect, 3, 10)
-        btn_text = small_font.render("MAIN MENU", True, WHITE)
-        screen.blit(btn_text, btn_text.get_rect(center=button_rect.center))
-
-        pygame.display.flip()
+            if event.type == pygame.MOUSEMOTION and button_rect.collidepoint(pygame.mouse.get_pos()) != is_hover:
+                is_hover = not is_hover
+                view.invalidate(button_rect)
@@ -1,6 +1,7 @@
 import pygame
 import sys
 
+from asset_cache import load_image
 from settings import SCREEN_WIDTH, SCREEN_HEIGHT
 
 def show_failure_ending():
@@ -21,21 +22,15 @@ def show_failure_ending():
 
     # ---- Load image ----
     try:
-        ending_img = pygame.image.load('assets/sprites/ending2.png').convert_alpha()
+        ending_img = load_image('assets/sprites/ending2.png', fit=(SCREEN_WIDTH, SCREEN_HEIGHT))
     except pygame.error as e:
         # If the graphic is missing, fall back to a simple text message.
         print(f"[failure_ending] Could not load ending2.png: {e}")
         _fallback_dialogue(screen, clock)
         return
 
-    # Scale the image to at most screen size while maintaining aspect ratio.
-    img_rect = ending_img.get_rect()
-    scale_ratio = min(SCREEN_WIDTH / img_rect.width, SCREEN_HEIGHT / img_rect.height)
-    if scale_ratio < 1:
-        new_size = (int(img_rect.width * scale_ratio), int(img_rect.height * scale_ratio))
-        ending_img = pygame.transform.smoothscale(ending_img, new_size)
-        img_rect = ending_img.get_rect()
-    img_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    # load_image already scaled it to at most screen size, keeping the aspect ratio.
+    img_rect = ending_img.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
 
     # ---- Fade-in variables ----
     fade_alpha = 0
@@ -6,6 +6,8 @@ from zombie import Zombie
 from special_zombies import random_zombie
 from levels.dialogue import show_dialogue
 from mechanics import handle_player_input
+from asset_cache import load_image
+from projectiles import Projectiles, volley, PLAYER, ENEMY
 
 class CorruptedGod:
     def __init__(self, x, y):
@@ -22,10 +24,9 @@ class CorruptedGod:
         
         # Load assets
         try:
-            self.image = pygame.image.load('assets/sprites/corrupted_god.png').convert_alpha()
             # Scale to 240x240 pixels (120 radius) for better visibility
+            self.image = load_image('assets/sprites/corrupted_god.png', (240, 240), owner=self)
             self.radius = 120
-            self.image = pygame.transform.scale(self.image, (self.radius*2, self.radius*2))
         except Exception as e:
             print(f"Error loading corrupted god sprite: {e}")
             self.image = None
@@ -51,15 +52,7 @@ class CorruptedGod:
     def _phase_one_attack(self, player):
         """First phase: Basic projectile attacks."""
         angle = math.atan2(player.y - self.y, player.x - self.x)
-        return {
-            'type': 'projectile',
-            'x': self.x,
-            'y': self.y,
-            'angle': angle,
-            'speed': 200,
-            'damage': 20,
-            'radius': 10
-        }
+        return volley(self.x, self.y, angle, 200, owner=ENEMY, damage=20, radius=10)
         
     def _phase_two_attack(self, player):
         """Second phase: Summon corrupted minions."""
@@ -109,8 +102,7 @@ def run_gods_temple():
     god = CorruptedGod(SCREEN_WIDTH * 3//4, SCREEN_HEIGHT // 2)
     
     # Initialize level state
-    bullets = []  # God projectiles
-    player_bullets = []  # Hero projectiles
+    projectiles = Projectiles()  # God and hero projectiles
     minions = []
     level_complete = False
     
@@ -145,45 +137,31 @@ def run_gods_temple():
         keys = pygame.key.get_pressed()
         player.update(keys, [], False, dt)  # No walls, not throne room
         # shooting / reload etc
-        handle_player_input(player, player_bullets, events)
+        handle_player_input(player, projectiles, events)
         
         # Update god
         god_action = god.update(player, current_time, dt)
         if god_action == "PHASE_CHANGE":
             show_dialogue(["The god's form shifts as corruption takes hold!", "'I can't hold it back much longer!'"])
-        elif god_action and god_action.get('type') == 'projectile':
-            bullets.append(god_action)
+        elif god_action and god_action.get('type') == 'volley':
+            projectiles.spawn_volley(god_action)
         elif god_action and god_action.get('type') == 'summon':
             minions.extend(god_action['minions'])
         
-        # -------- Update god projectiles --------
-        for b in bullets[:]:
-            b['x'] += math.cos(b['angle']) * b['speed'] * dt
-            b['y'] += math.sin(b['angle']) * b['speed'] * dt
-            # out of bounds
-            if b['x'] < 0 or b['x'] > SCREEN_WIDTH or b['y'] < 0 or b['y'] > SCREEN_HEIGHT:
-                bullets.remove(b)
-                continue
-            # collision with player
-            if math.hypot(player.x - b['x'], player.y - b['y']) < b['radius'] + getattr(player, 'radius', 15):
-                player.health -= b['damage']
-                bullets.remove(b)
-                if player.health <= 0:
-                    return "GAME_OVER"
-
-        # -------- Update player bullets --------
-        for pb in player_bullets[:]:
-            pb_speed = 350
-            pb['x'] += math.cos(pb['angle']) * pb_speed * dt
-            pb['y'] += math.sin(pb['angle']) * pb_speed * dt
-            if pb['x'] < 0 or pb['x'] > SCREEN_WIDTH or pb['y'] < 0 or pb['y'] > SCREEN_HEIGHT:
-                player_bullets.remove(pb)
-                continue
-            # collision with god
-            if math.hypot(god.x - pb['x'], god.y - pb['y']) < god.radius + 5:
-                god.take_damage(pb.get('damage', 20))
-                if pb in player_bullets:
-                    player_bullets.remove(pb)
+        # -------- Update projectiles --------
+        projectiles.update(dt)
+        # God projectiles hitting the player
+        hits = projectiles.hits_circle(player.x, player.y, getattr(player, 'radius', 15), ENEMY)
+        if len(hits):
+            player.health -= float(projectiles.damage[hits].sum())
+            projectiles.kill(hits)
+            if player.health <= 0:
+                return "GAME_OVER"
+        # Hero projectiles hitting the god
+        for i in projectiles.hits_circle(god.x, god.y, god.radius, PLAYER).tolist():
+            god.take_damage(float(projectiles.damage[i]))
+            projectiles.hit(i, recall=True)
+        projectiles.compact()
 
         
         # Check for player victory
@@ -208,10 +186,7 @@ def run_gods_temple():
         for m in minions:
             m.update(player.x, player.y, [], dt)
             m.draw(screen)
-        for b in bullets:
-            pygame.draw.circle(screen, (255, 50, 50), (int(b['x']), int(b['y'])), b['radius'])
-        for pb in player_bullets:
-            pygame.draw.circle(screen, (255, 255, 0), (int(pb['x']), int(pb['y'])), 4)
+        projectiles.draw(screen)
         player.draw(screen)
         
         pygame.display.flip()
@@ -1,19 +1,23 @@
 import pygame
 import random
 import math
-from shield_bullet import update_shield_bullet, draw_shield_bullet
 import sys
 from settings import (
     SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, WHITE, MAX_HEALTH, MAX_STAMINA,
     PLAYER_MAX_AMMO, PLAYER_MAX_SHIELD_ENERGY, HEALTH_BAR_BG, HEALTH_BAR_FG,
     STAMINA_BAR_BG, STAMINA_BAR_FG, SHIELD_BAR_BG, SHIELD_BAR_FG, UI_PANEL_BG,
-    BULLET_SPEED, ZOMBIE_DAMAGE, BULLET_COLOR, BULLET_RADIUS
+    ZOMBIE_DAMAGE, OUTSIDE_MAP_WIDTH, OUTSIDE_MAP_HEIGHT
 )
 from zombie import Zombie
 from player import Player
 from levels.dialogue import show_dialogue
 from ui import draw_ui
+from asset_cache import load_image
+import sound_bank
+from background_layer import BackgroundLayer, get_layer
 from mechanics import handle_player_input, update_player_state
+from tile_map import compile_map, open_area_map
+from projectiles import Projectiles, PLAYER
 
 # These will be set when the function is called
 fade_to_black = None
@@ -23,8 +27,8 @@ def show_lab_scene(revival_mode=False, revival_count=0):
     """Show the lab scene where the scientist revives the player."""
     global fade_to_black, fade_in_from_black
     
-    # Initialize bullets list for this scene
-    bullets = []
+    # Projectile pool for this scene
+    projectiles = Projectiles()
     
     # Import these here to avoid circular imports
     from main import fade_to_black as main_fade_to_black, fade_in_from_black as main_fade_in_from_black
@@ -46,13 +50,11 @@ def show_lab_scene(revival_mode=False, revival_count=0):
     # Load and resize sprites
     try:
         # Load and resize scientist
-        scientist_img = pygame.image.load('assets/sprites/scientist.png').convert_alpha()
-        scientist_img = pygame.transform.scale(scientist_img, (20, 20))
+        scientist_img = load_image('assets/sprites/scientist.png', (20, 20))
         scientist_rect = scientist_img.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
         
         # Load and resize collectible (initially hidden)
-        collectible_img = pygame.image.load('assets/sprites/collection3.png').convert_alpha()
-        collectible_img = pygame.transform.scale(collectible_img, (20, 20))
+        collectible_img = load_image('assets/sprites/collection3.png', (20, 20))
         collectible_rect = collectible_img.get_rect(center=(0, 0))  # Start hidden
         collectible_collected = False
         collectible_visible = False  # Will be set to True when pillar is broken
@@ -79,45 +81,60 @@ def show_lab_scene(revival_mode=False, revival_count=0):
         pillars = []
         broken_pillars = []
     
-    # Create a more detailed lab background
-    lab_bg = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    
-    # Draw lab background - dark blue-gray
-    lab_bg.fill((30, 30, 40, 255))
-    
-    # Draw floor tiles
-    for y in range(0, SCREEN_HEIGHT, 40):
-        for x in range(0, SCREEN_WIDTH, 40):
-            pygame.draw.rect(lab_bg, (40, 40, 50, 255), (x, y, 40, 40), 1)
-    
-    # Draw lab exit door at bottom center with more detail
+    # Lab exit door at bottom center
     exit_door_rect = pygame.Rect(SCREEN_WIDTH//2 - 40, SCREEN_HEIGHT - 120, 80, 40)
-    pygame.draw.rect(lab_bg, (100, 60, 30, 255), exit_door_rect)  # Brown door
-    pygame.draw.rect(lab_bg, (120, 80, 40, 255), exit_door_rect, 2)  # Door frame
-    
-    # Draw lab equipment and pillars
-    for i, (x, y, w, h, _, _) in enumerate(pillars):
-        if not broken_pillars[i]:
-            # Draw bullet / shield
-            pygame.draw.rect(lab_bg, (100, 100, 120), (x, y, w, h))
-            # Draw pillar details
-            pygame.draw.rect(lab_bg, (70, 70, 90), (x, y, w, h), 2)
-            pygame.draw.rect(lab_bg, (90, 90, 110), (x + 5, y + 5, w - 10, h - 10))
-    
-    # Position the scientist in the lab - no name tag needed
-    pygame.draw.rect(lab_bg, (70, 70, 80, 255), (100, 200, 300, 200))  # Main table
-    pygame.draw.rect(lab_bg, (120, 120, 130, 255), (100, 200, 300, 20))  # Table edge
-    
-    # Draw computer setup
-    pygame.draw.rect(lab_bg, (150, 150, 170, 255), (150, 150, 100, 50))  # Monitor
-    pygame.draw.rect(lab_bg, (180, 180, 200, 255), (160, 160, 80, 30))  # Screen
-    pygame.draw.rect(lab_bg, (100, 100, 120, 255), (180, 200, 40, 30))  # Keyboard
-    
-    # Draw cabinet with details
-    pygame.draw.rect(lab_bg, (200, 200, 200, 255), (350, 250, 100, 200))  # Cabinet
-    pygame.draw.rect(lab_bg, (180, 180, 180, 255), (350, 250, 100, 15))  # Top shelf
-    pygame.draw.rect(lab_bg, (180, 180, 180, 255), (350, 350, 100, 15))  # Middle shelf
-    
+
+    def draw_lab_background(surface):
+        """Paint the static lab; broken pillars are left out."""
+        # Draw lab background - dark blue-gray
+        surface.fill((30, 30, 40, 255))
+
+        # Draw floor tiles
+        for y in range(0, SCREEN_HEIGHT, 40):
+            for x in range(0, SCREEN_WIDTH, 40):
+                pygame.draw.rect(surface, (40, 40, 50, 255), (x, y, 40, 40), 1)
+
+        # Draw lab exit door at bottom center with more detail
+        pygame.draw.rect(surface, (100, 60, 30, 255), exit_door_rect)  # Brown door
+        pygame.draw.rect(surface, (120, 80, 40, 255), exit_door_rect, 2)  # Door frame
+
+        # Draw lab equipment and pillars
+        for i, (x, y, w, h, _, _) in enumerate(pillars):
+            if not broken_pillars[i]:
+                # Draw bullet / shield
+                pygame.draw.rect(surface, (100, 100, 120), (x, y, w, h))
+                # Draw pillar details
+                pygame.draw.rect(surface, (70, 70, 90), (x, y, w, h), 2)
+                pygame.draw.rect(surface, (90, 90, 110), (x + 5, y + 5, w - 10, h - 10))
+
+        # Position the scientist in the lab - no name tag needed
+        pygame.draw.rect(surface, (70, 70, 80, 255), (100, 200, 300, 200))  # Main table
+        pygame.draw.rect(surface, (120, 120, 130, 255), (100, 200, 300, 20))  # Table edge
+
+        # Draw computer setup
+        pygame.draw.rect(surface, (150, 150, 170, 255), (150, 150, 100, 50))  # Monitor
+        pygame.draw.rect(surface, (180, 180, 200, 255), (160, 160, 80, 30))  # Screen
+        pygame.draw.rect(surface, (100, 100, 120, 255), (180, 200, 40, 30))  # Keyboard
+
+        # Draw cabinet with details
+        pygame.draw.rect(surface, (200, 200, 200, 255), (350, 250, 100, 200))  # Cabinet
+        pygame.draw.rect(surface, (180, 180, 180, 255), (350, 250, 100, 15))  # Top shelf
+        pygame.draw.rect(surface, (180, 180, 180, 255), (350, 350, 100, 15))  # Middle shelf
+
+        # Draw lab equipment on the table
+        pygame.draw.rect(surface, (180, 180, 200, 255), (120, 220, 40, 40))  # Microscope
+        pygame.draw.ellipse(surface, (200, 200, 220, 255), (130, 220, 20, 15))  # Microscope head
+
+        # Draw test tubes in a rack
+        for i in range(3):
+            tube_rect = pygame.Rect(220 + i*30, 230, 15, 30)
+            pygame.draw.rect(surface, (200, 200, 255, 150), tube_rect)
+            pygame.draw.rect(surface, (180, 180, 200, 200), tube_rect, 1)  # Outline
+
+    # Create a more detailed lab background, rendered once. Breaking a pillar
+    # repaints just that pillar's area.
+    lab_bg = BackgroundLayer(size=(SCREEN_WIDTH, SCREEN_HEIGHT), draw_base=draw_lab_background)
+
     # ----------------- Interactive surprise objects -----------------
     cabinet_rect = pygame.Rect(350, 250, 100, 200)
     cabinet_broken = False  # Will turn True when player shoots the cabinet
@@ -125,19 +142,9 @@ def show_lab_scene(revival_mode=False, revival_count=0):
     healthpack_visible = False
     healthpack_collected = False
     
-    # Draw lab equipment on the table
-    pygame.draw.rect(lab_bg, (180, 180, 200, 255), (120, 220, 40, 40))  # Microscope
-    pygame.draw.ellipse(lab_bg, (200, 200, 220, 255), (130, 220, 20, 15))  # Microscope head
-    
-    # Draw test tubes in a rack
-    for i in range(3):
-        tube_rect = pygame.Rect(220 + i*30, 230, 15, 30)
-        pygame.draw.rect(lab_bg, (200, 200, 255, 150), tube_rect)
-        pygame.draw.rect(lab_bg, (180, 180, 200, 200), tube_rect, 1)  # Outline
-    
     if not revival_mode:
         # Add collectible to the global collectibles list
-        from main import collectibles, COLLECTIBLE_SIZE, collect_sound, create_collect_effect, update_and_draw_particles
+        from main import collectibles, COLLECTIBLE_SIZE, create_collect_effect, update_and_draw_particles
     
     # Clear any existing collectibles
     collectibles.clear()
@@ -153,11 +160,11 @@ def show_lab_scene(revival_mode=False, revival_count=0):
     
     # Fade in
     for alpha in range(0, 256, 5):
-        temp_surface = lab_bg.copy()
-        temp_surface.set_alpha(alpha)
-        screen.blit(temp_surface, (0, 0))
+        lab_bg.surface.set_alpha(alpha)
+        lab_bg.blit(screen)
         pygame.display.flip()
         pygame.time.delay(15)
+    lab_bg.surface.set_alpha(None)
 
     # Initialize player with normal stats
     player.x = SCREEN_WIDTH // 2
@@ -216,7 +223,7 @@ def show_lab_scene(revival_mode=False, revival_count=0):
     ]
     
     # Show the lab background, scientist, and player
-    screen.blit(lab_bg, (0, 0))
+    lab_bg.blit(screen)
     if scientist_img and scientist_rect:
         screen.blit(scientist_img, scientist_rect.topleft)
     else:
@@ -240,7 +247,7 @@ def show_lab_scene(revival_mode=False, revival_count=0):
         overlay.fill((0, 0, 0, 200))
         
         # Draw the lab scene in the background
-        screen.blit(lab_bg, (0, 0))
+        lab_bg.blit(screen)
         if not collectible_collected and collectible_rect and collectible_img:
             screen.blit(collectible_img, collectible_rect.topleft)
         if scientist_img and scientist_rect:
@@ -319,7 +326,7 @@ def show_lab_scene(revival_mode=False, revival_count=0):
     running = True
     
     # Flicker effect variables removed
-    game_map = [[' ' for _ in range(SCREEN_WIDTH // TILE_SIZE + 1)] for _ in range(SCREEN_HEIGHT // TILE_SIZE + 1)]
+    game_map = open_area_map()
 
     while running:
         dt = clock.tick(60) / 1000.0  # Delta time in seconds
@@ -333,60 +340,44 @@ def show_lab_scene(revival_mode=False, revival_count=0):
                 pygame.quit()
                 sys.exit()
         
-        handle_player_input(player, bullets, events)
+        handle_player_input(player, projectiles, events)
         update_player_state(player, keys, game_map, dt)
 
         # Keep player in bounds
         player.x = max(player.radius, min(SCREEN_WIDTH - player.radius, player.x))
         player.y = max(player.radius, min(SCREEN_HEIGHT - player.radius, player.y))
 
-        # Update bullets
-        for bullet in bullets[:]:
-            bullet['x'] += math.cos(bullet['angle']) * BULLET_SPEED * dt
-            bullet['y'] += math.sin(bullet['angle']) * BULLET_SPEED * dt
-            if bullet.get('type') == 'shield':
-                update_shield_bullet(bullet, bullets, dt, game_map, player, zombies=None)
-            
-            if not (0 < bullet['x'] < SCREEN_WIDTH and 0 < bullet['y'] < SCREEN_HEIGHT):
-                if bullet.get('type') == 'shield' and bullet.get('owner'):
-                    bullet['owner'].active_shield_throw = False
-                bullets.remove(bullet)
-                continue
-            
-            bullet_rect = pygame.Rect(bullet['x'] - 2, bullet['y'] - 2, 4, 4)
-            
+        # Update projectiles
+        projectiles.update(dt, compile_map(game_map))
+        for i in projectiles.alive(PLAYER).tolist():
+            bullet_rect = pygame.Rect(projectiles.x[i] - 2, projectiles.y[i] - 2, 4, 4)
+
             # Check for pillar collisions
-            for i, (x, y, w, h, is_breakable, has_collectible) in enumerate(pillars):
-                if not broken_pillars[i] and is_breakable and bullet_rect.colliderect(pygame.Rect(x, y, w, h)):
-                    if bullet in bullets:
-                        if bullet.get('type') == 'shield' and bullet.get('owner'):
-                            bullet['owner'].active_shield_throw = False
-                    bullets.remove(bullet)
-                    broken_pillars[i] = True
+            for j, (x, y, w, h, is_breakable, has_collectible) in enumerate(pillars):
+                if not broken_pillars[j] and is_breakable and bullet_rect.colliderect(pygame.Rect(x, y, w, h)):
+                    projectiles.kill(i)
+                    broken_pillars[j] = True
+                    lab_bg.invalidate_rect((x, y, w, h))
                     if has_collectible and not collectible_collected and not collectible_visible:
                         collectible_visible = True
                         if collectible_rect:
                             collectible_rect.center = (x + w//2, y + h//2)
                     break
-            
-            # Check for cabinet collision (hidden surprise)
-            if not cabinet_broken and bullet_rect.colliderect(cabinet_rect):
-                if bullet in bullets:
-                    if bullet.get('type') == 'shield' and bullet.get('owner'):
-                        bullet['owner'].active_shield_throw = False
-                bullets.remove(bullet)
-                cabinet_broken = True
-                healthpack_visible = True
-                create_collect_effect(cabinet_rect.centerx, cabinet_rect.centery)
-                continue
+            else:
+                # Check for cabinet collision (hidden surprise)
+                if not cabinet_broken and bullet_rect.colliderect(cabinet_rect):
+                    projectiles.kill(i)
+                    cabinet_broken = True
+                    healthpack_visible = True
+                    create_collect_effect(cabinet_rect.centerx, cabinet_rect.centery)
+        projectiles.compact()
         
         # Check collectible collision if visible
         if collectible_visible and not collectible_collected and collectible_rect:
             player_rect = pygame.Rect(player.x - player.radius, player.y - player.radius, player.radius * 2, player.radius * 2)
             if player_rect.colliderect(collectible_rect):
                 collectible_collected = True
-                if collect_sound:
-                    collect_sound.play()
+                sound_bank.play('collect')
                 if collectible_rect:
                     create_collect_effect(collectible_rect.centerx, collectible_rect.centery)
         
@@ -398,22 +389,17 @@ def show_lab_scene(revival_mode=False, revival_count=0):
                 healthpack_visible = False
                 player.health = min(MAX_HEALTH, player.health + 20)
                 create_collect_effect(healthpack_rect.centerx, healthpack_rect.centery)
-                if collect_sound:
-                    collect_sound.play()
+                sound_bank.play('collect')
         
         # Check if player reached the exit
         player_rect = pygame.Rect(player.x - 10, player.y - 10, 20, 20)
         if player_rect.colliderect(exit_door_rect):
-            try:
-                door_sound = pygame.mixer.Sound('assets/music/door.ogg')
-                door_sound.play()
-            except Exception as e:
-                print(f"Could not play door sound: {e}")
+            sound_bank.play('door')
             pygame.time.delay(500)
             running = False
 
         # Drawing
-        screen.blit(lab_bg, (0, 0))
+        lab_bg.blit(screen)
         
         # Flicker effect removed as requested
         pass
@@ -435,8 +421,7 @@ def show_lab_scene(revival_mode=False, revival_count=0):
         if scientist_img and scientist_rect:
             screen.blit(scientist_img, scientist_rect.topleft)
             
-        for bullet in bullets:
-            draw_shield_bullet(screen, bullet) if bullet.get('type') == 'shield' else pygame.draw.circle(screen, BULLET_COLOR, (int(bullet['x']), int(bullet['y'])), BULLET_RADIUS)
+        projectiles.draw(screen)
             
         player.draw(screen)
         
@@ -455,7 +440,7 @@ def show_lab_scene(revival_mode=False, revival_count=0):
     fade_surface.fill((0, 0, 0))
     for alpha in range(0, 256, 10):
         fade_surface.set_alpha(alpha)
-        screen.blit(lab_bg, (0, 0))
+        lab_bg.blit(screen)
         player.draw(screen)
         screen.blit(fade_surface, (0, 0))
         pygame.display.flip()
@@ -527,10 +512,9 @@ def show_outside_scene():
     # This will be used to set up the outside environment
     pass
 
-def create_outside_environment():
+def create_outside_environment(map_width=OUTSIDE_MAP_WIDTH, map_height=OUTSIDE_MAP_HEIGHT):
     """Create the outside environment with roads, flowers, and bushes."""
-    # Create a new map for the outside area (40x30 tiles)
-    map_width, map_height = 40, 30
+    # Create a new map for the outside area (40x30 tiles by default; the area scrolls)
     outside_map = [[' ' for _ in range(map_width)] for _ in range(map_height)]
     
     # Draw boundary walls
@@ -590,56 +574,61 @@ def create_outside_environment():
     
     return outside_map
 
-def draw_outside_environment(screen, map_data):
-    """Draw the outside environment with proper visuals for paths, walls, and obstacles."""
-    # Draw base grass first
+def _draw_outside_base(surface):
+    """Grass and its grid pattern under the outside map."""
     grass_color = (50, 120, 50)
-    screen.fill(grass_color)
-    
-    # Draw a grid pattern for the grass
-    for y in range(0, SCREEN_HEIGHT, 40):
-        pygame.draw.line(screen, (60, 110, 40), (0, y), (SCREEN_WIDTH, y), 1)
-    for x in range(0, SCREEN_WIDTH, 40):
-        pygame.draw.line(screen, (60, 110, 40), (x, 0), (x, SCREEN_HEIGHT), 1)
-    
-    # Draw map elements
-    for y, row in enumerate(map_data):
-        for x, cell in enumerate(row):
-            rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-            
-            if cell == 'W':  # Wall (stone wall)
-                pygame.draw.rect(screen, (100, 100, 100), rect)
-                # Add some texture to the wall
-                pygame.draw.rect(screen, (80, 80, 80), rect.inflate(-4, -4), 1)
-                
-            elif cell == 'p':  # Path (dirt)
-                path_color = (139, 119, 101)  # Dirt color
-                pygame.draw.rect(screen, path_color, rect)
-                # Add some texture to the path
-                if (x + y) % 2 == 0:
-                    pygame.draw.rect(screen, (129, 109, 91), rect.inflate(-2, -2))
-                
-            elif cell == 'T':  # Tree
-                # Tree trunk
-                trunk_rect = pygame.Rect(rect.centerx - 5, rect.centery - 5, 10, 20)
-                pygame.draw.rect(screen, (101, 67, 33), trunk_rect)
-                # Tree leaves (top part)
-                leaf_radius = TILE_SIZE
-                leaf_rect = pygame.Rect(rect.centerx - leaf_radius//2, rect.centery - leaf_radius + 10, 
-                                      leaf_radius, leaf_radius)
-                pygame.draw.ellipse(screen, (34, 139, 34), leaf_rect)
-                
-            elif cell == 'R':  # Rock
-                pygame.draw.ellipse(screen, (100, 100, 100), rect.inflate(-5, -5))
-                # Add some highlights
-                highlight = pygame.Rect(rect.left + 5, rect.top + 5, 
-                                      rect.width // 2, rect.height // 2)
-                pygame.draw.ellipse(screen, (150, 150, 150), highlight.inflate(-5, -5))
-                
-            elif cell == 'B':  # Bush
-                # Draw a simple bush shape
-                pygame.draw.ellipse(screen, (0, 100, 0), rect.inflate(-5, -5))
-                # Add some highlights
-                highlight = pygame.Rect(rect.left + 5, rect.top + 5, 
-                                     rect.width // 2, rect.height // 2)
-                pygame.draw.ellipse(screen, (0, 150, 0), highlight.inflate(-5, -5))
+    surface.fill(grass_color)
+    width, height = surface.get_size()
+    for y in range(0, height, 40):
+        pygame.draw.line(surface, (60, 110, 40), (0, y), (width, y), 1)
+    for x in range(0, width, 40):
+        pygame.draw.line(surface, (60, 110, 40), (x, 0), (x, height), 1)
+
+def _draw_outside_tile(surface, x, y, cell):
+    rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+
+    if cell == 'W':  # Wall (stone wall)
+        pygame.draw.rect(surface, (100, 100, 100), rect)
+        # Add some texture to the wall
+        pygame.draw.rect(surface, (80, 80, 80), rect.inflate(-4, -4), 1)
+
+    elif cell == 'p':  # Path (dirt)
+        path_color = (139, 119, 101)  # Dirt color
+        pygame.draw.rect(surface, path_color, rect)
+        # Add some texture to the path
+        if (x + y) % 2 == 0:
+            pygame.draw.rect(surface, (129, 109, 91), rect.inflate(-2, -2))
+
+    elif cell == 'T':  # Tree
+        # Tree trunk
+        trunk_rect = pygame.Rect(rect.centerx - 5, rect.centery - 5, 10, 20)
+        pygame.draw.rect(surface, (101, 67, 33), trunk_rect)
+        # Tree leaves (top part)
+        leaf_radius = TILE_SIZE
+        leaf_rect = pygame.Rect(rect.centerx - leaf_radius//2, rect.centery - leaf_radius + 10,
+                              leaf_radius, leaf_radius)
+        pygame.draw.ellipse(surface, (34, 139, 34), leaf_rect)
+
+    elif cell == 'R':  # Rock
+        pygame.draw.ellipse(surface, (100, 100, 100), rect.inflate(-5, -5))
+        # Add some highlights
+        highlight = pygame.Rect(rect.left + 5, rect.top + 5,
+                              rect.width // 2, rect.height // 2)
+        pygame.draw.ellipse(surface, (150, 150, 150), highlight.inflate(-5, -5))
+
+    elif cell == 'B':  # Bush
+        # Draw a simple bush shape
+        pygame.draw.ellipse(surface, (0, 100, 0), rect.inflate(-5, -5))
+        # Add some highlights
+        highlight = pygame.Rect(rect.left + 5, rect.top + 5,
+                             rect.width // 2, rect.height // 2)
+        pygame.draw.ellipse(surface, (0, 150, 0), highlight.inflate(-5, -5))
+
+def draw_outside_environment(screen, map_data, camera=None):
+    """Draw the outside environment with proper visuals for paths, walls, and obstacles.
+
+    With a ``camera`` only the part of the map in its view is drawn.
+    """
+    # Rendered once per map; tiles changed in map_data are repainted individually
+    layer = get_layer(map_data, lambda: BackgroundLayer(map_data, _draw_outside_tile, _draw_outside_base))
+    layer.blit(screen, (0, 0), camera.rect if camera is not None else None)
@@ -1,22 +1,35 @@
 import pygame
 import random
 import math
-from shield_bullet import update_shield_bullet, draw_shield_bullet
 import sys
 from settings import (
-    TILE_SIZE, PLAYER_MAX_AMMO, MAX_HEALTH, PLAYER_BULLET_DAMAGE, HEALTH_BAR_FG, HEALTH_BAR_BG,
+    TILE_SIZE, PLAYER_MAX_AMMO, MAX_HEALTH, HEALTH_BAR_FG, HEALTH_BAR_BG,
     STAMINA_BAR_FG, STAMINA_BAR_BG, MAX_STAMINA, SHIELD_BAR_FG, SHIELD_BAR_BG,
     PLAYER_MAX_SHIELD_ENERGY, UI_PANEL_BG, WHITE, SCREEN_WIDTH, SCREEN_HEIGHT,
-    BG_COLOR, ZOMBIE_DAMAGE, BULLET_COLOR, BULLET_RADIUS, BULLET_SPEED
+    BG_COLOR, ZOMBIE_DAMAGE
 )
 from zombie import Zombie
 from special_zombies import random_zombie
-from player import Player, shield_hit_sound
+from player import Player
+import decals
+import postfx
+import perf_hud
+import particle_engine
 from levels.dialogue import show_dialogue
 from levels.scientist_scenes import check_zombie_blood_quest
 from ui import draw_ui
+from asset_cache import load_image
 from levels.failure_ending import show_failure_ending
-from mechanics import handle_player_input, update_player_state
+from fixed_step import FixedStep
+from camera import Camera
+from ecs import World
+import systems
+from projectiles import Projectiles, PLAYER, SHIELD
+from tile_map import compile_map, SPAWNABLE
+
+# Outside zombies bite once a second; a raised shield soaks the bite for energy
+ZOMBIE_CONTACT = {'damage': 1, 'cooldown': 1000, 'shield_drain': 2}
+
 
 def run_outside_area(game_objects):
     """Run the outside area where the player fights zombies."""
@@ -25,10 +38,14 @@ def run_outside_area(game_objects):
     game_map = game_objects['map']
     
     screen = pygame.display.get_surface()
-    clock = pygame.time.Clock()
-    bullets = []
-    shake_timer = 0.0
-    flash_timer = 0.0  # white flash duration
+    projectiles = Projectiles()
+    # The map is larger than the screen; the view follows the player and only what it sees is drawn
+    camera = Camera.for_map(game_map)
+    world_size = (camera.world_width, camera.world_height)
+    world = World(player=player, projectiles=projectiles, game_map=game_map,
+                  camera=camera, bounds=(0, 0) + world_size)
+    postfx.fx.reset()  # Ground Pound flash / shake
+    decals.clear_floor(world_size)
     # ---------- ENVIRONMENT SETUP ----------
     # Load collect sound with channel management
     collect_sound = None
@@ -39,11 +56,11 @@ def run_outside_area(game_objects):
         print(f"Could not load collect sound: {e}")
     # Load hidden collectible image & crate
     try:
-        collection_img = pygame.image.load('assets/sprites/collection4.png').convert_alpha()
+        collection_img = load_image('assets/sprites/collection4.png')
     except pygame.error:
         collection_img = None
     try:
-        crate_img = pygame.image.load('assets/sprites/crate.png').convert_alpha()
+        crate_img = load_image('assets/sprites/crate.png')
     except pygame.error:
         crate_img = None
 
@@ -54,16 +71,17 @@ def run_outside_area(game_objects):
         'health': 60,
         'destroyed': False
     }
-    collectible = None  # Will appear after crate destroyed
     door_open = False  # Will become True after collecting 5 zombie blood samples
     door_rect = pygame.Rect(SCREEN_WIDTH//2 - 40, SCREEN_HEIGHT - 120, 80, 40)
 
     # Font for door interaction prompt
     instruction_font = pygame.font.SysFont(None, 28)  # default font size 28
     # Pre-generate decorative tree positions so they stay consistent each frame
+    # (25 per screen's worth of map)
+    tree_count = 25 * world_size[0] * world_size[1] // (SCREEN_WIDTH * SCREEN_HEIGHT)
     tree_positions = [
-        (random.randint(40, SCREEN_WIDTH - 40), random.randint(40, SCREEN_HEIGHT - 160))
-        for _ in range(25)
+        (random.randint(40, world_size[0] - 40), random.randint(40, world_size[1] - 160))
+        for _ in range(tree_count)
     ]
     
     # Initialize player stats if not already set
@@ -73,288 +91,181 @@ def run_outside_area(game_objects):
     # Show initial objective
     show_dialogue(["Objective: Collect 5 zombie blood samples.", "Return to the lab entrance when the quest is complete."])
     
-    # Helper to spawn particle effect like other collectibles
-    def create_collect_effect(x, y):
-        for _ in range(20):
-            particles.append({
-                'x': x,
-                'y': y,
-                'vx': random.uniform(-150, 150),
-                'vy': random.uniform(-150, 150),
-                'timer': random.uniform(0.2, 0.5),
-                'color': random.choice([WHITE, (255,215,0), (200,200,200)])
-            })
-
-    def update_and_draw_particles(dt):
-        for p in particles[:]:
-            p['x'] += p['vx'] * dt
-            p['y'] += p['vy'] * dt
-            p['timer'] -= dt
-            if p['timer'] <= 0:
-                particles.remove(p)
-            else:
-                pygame.draw.rect(screen, p['color'], (p['x'], p['y'], 3, 3))
-
-    # Initialize particles list
-    particles = []
-    
-    # Game loop for the outside area
+    particle_engine.engine.clear()
+
+    def collect_hidden_item(world, pickup):
+        particle_engine.engine.emit('collect', pickup['x'], pickup['y'])
+        if collect_sound:
+            collect_sound()  # Call the function to play the sound
+        # Further benefits/stat boosts can be added here
+
+    def crate_hits(world, dt):
+        """Player shots breaking the crate (shields pass over it); it leaves the hidden collectible."""
+        if crate['destroyed']:
+            return
+        for i in projectiles.hits_circle(crate['x'], crate['y'], crate['radius'], PLAYER).tolist():
+            if projectiles.kind[i] == SHIELD:
+                continue
+            crate['health'] -= float(projectiles.damage[i])
+            projectiles.kill(i)
+            if crate['health'] <= 0:
+                crate['destroyed'] = True
+                world.spawn(pickup={'x': crate['x'], 'y': crate['y'], 'image': collection_img or _fallback_item(),
+                                    'on_collect': collect_hidden_item})
+                break
+
+    # The outside area is the shared combat step plus the crate, which shots reach first
+    world.add_system('collision', crate_hits)
+    world.add_systems(systems.COMBAT)
+    world.add_systems((('render', systems.draw_pickups),
+                       ('render', systems.draw_layer(0)),
+                       ('render', systems.draw_projectiles)))
+    world.spawn(body=player, layer=0)
+    for zombie in zombies:
+        if zombie.is_alive:
+            _add_zombie(world, zombie)
+
+    # Game loop for the outside area; the world updates in fixed steps
+    sim = FixedStep()
+    sim.track(lambda: list(world.store('body').values()))
     running = True
     while running:
-        dt = clock.tick(60) / 1000.0
-        
         # Handle events
         events = pygame.event.get()
         for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
-        
-        handle_player_input(player, bullets, events)
-        
-        # Update player
-        keys = pygame.key.get_pressed()
-        update_player_state(player, keys, game_map, dt)
-
-        # ---- Ground Pound impact ----
-        if player.gp_triggered:
-            player.gp_triggered = False
-            # stun zombies for 2 seconds
-            GP_RADIUS = 250  # pixels
-            for zb in zombies:
-                dist = math.hypot(zb.x - player.x, zb.y - player.y)
-                if dist <= GP_RADIUS:
-                    zb.stun_timer = 2.0
-                    # Knockback 60 pixels proportionally
-                    if dist>0:
-                        kx = (zb.x - player.x)/dist * 60
-                        ky = (zb.y - player.y)/dist * 60
-                        zb.x += kx
-                        zb.y += ky
-            shake_timer = 0.4
-            flash_timer = 0.15
-        
-        # Update zombies
-        for zombie in zombies[:]:
-            info = zombie.update(player.x, player.y, game_map, dt)
-            if info:
-                if isinstance(info, dict) and info.get('quake'):
-                    shake_timer = info.get('duration',500)/1000.0
-                else:
-                    bullets.append(info)
-            
-            # Check for zombie attack with damage over time
-            if zombie.is_alive:
-                dist = math.hypot(player.x - zombie.x, player.y - zombie.y)
-                if dist < player.radius + zombie.radius:
-                    current_time = pygame.time.get_ticks()
-                    attack_cooldown = 1000  # 1 second between damage ticks
-                    
-                    if player.is_shielding and player.shield_energy > 0:
-                        # Shield blocks damage but drains energy
-                        if current_time - zombie.last_attack_time > attack_cooldown:
-                            player.shield_energy = max(0, player.shield_energy - 2)
-                            if shield_hit_sound:
-                                shield_hit_sound.play()
-                            zombie.last_attack_time = current_time
-                    elif current_time - zombie.last_attack_time > attack_cooldown:
-                        # Deal damage over time when not shielding
-                        player.take_damage(1)  # Small amount of damage per tick
-                        zombie.last_attack_time = current_time
-                        if player.health <= 0:
-                            player.health = 0
-
-            # Remove dead zombies from the list
-            if not zombie.is_alive:
-                zombies.remove(zombie)
-        
-        # Check for player death after handling all zombies
-        if player.health <= 0:
-            # Play alternate failure ending and propagate player's choice
-            result = show_failure_ending()
-            if result == "MAIN_MENU":
+        perf_hud.hud.handle(events)
+
+        for dt, step_events in sim.steps(events):
+            for event in world.step(dt, step_events):
+                if event[0] == 'killed':
+                    player.zombie_blood_collected += 1
+                    # Open lab door after collecting 5 zombie blood samples
+                    if player.zombie_blood_collected >= 5 and not door_open:
+                        door_open = True
+                        show_dialogue(["The lab door has opened!", "Return to the entrance to head back inside."])
+
+            # Check for player death after handling all zombies
+            if player.health <= 0:
+                # Play alternate failure ending and propagate player's choice
+                result = show_failure_ending()
+                if result == "MAIN_MENU":
+                    return "MAIN_MENU"
+                # Fallback
                 return "MAIN_MENU"
-            # Fallback
-            return "MAIN_MENU"
 
-        # Spawn new zombies if needed
-        if len(zombies) < 5:  # Keep 5 zombies in the area
-            spawn_zombie(game_map, zombies, player)
-        
+            # Spawn new zombies if needed
+            if world.count('brain') < 5:  # Keep 5 zombies in the area
+                spawn_zombie(game_map, world, player)
+
+            # Check if the player enters the open door
+            if door_open:
+                keys = pygame.key.get_pressed()
+                player_rect = pygame.Rect(player.x - player.radius, player.y - player.radius, player.radius * 2, player.radius * 2)
+                if player_rect.colliderect(door_rect) and keys[pygame.K_e]:
+                    # Check if player has collected enough zombie blood
+                    if hasattr(player, 'zombie_blood_collected') and player.zombie_blood_collected >= 5:
+                        # Complete the blood quest and show scientist dialogue
+                        next_state = check_zombie_blood_quest(player)
+                        if next_state == "BLOOD_QUEST_COMPLETE":
+                            return next_state
+                    # If not enough blood, just return to throne room
+                    return "THRONE_ROOM"
+            perf_hud.hud.mark('collisions')
+
+        dt = sim.frame_dt
+
         # Draw everything
         screen.fill((0, 0, 0))  # Clear screen
-        
+
         # Update shake / flash timers
-        if shake_timer>0:
-            shake_timer -= dt
-        if flash_timer>0:
-            flash_timer -= dt
-        
-        # White flash overlay
-        if flash_timer>0:
-            flash_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            flash_surf.fill(WHITE)
-            alpha = int(255 * (flash_timer/0.15))
-            flash_surf.set_alpha(alpha)
-            screen.blit(flash_surf,(0,0))
-        
+        postfx.fx.update(dt)
+
+        # Centre on where the player is drawn (blended), so they do not jitter against the map
+        with sim.interpolated():
+            camera.follow(player.x, player.y)
+
         # Draw environment (road, grass, decorations)
-        draw_outside_environment(screen, game_map)
+        draw_outside_environment(screen, game_map, camera)
+        decals.draw_floor(screen, camera)
         # ---------- Decorative elements ----------
         TREE_COLOR = (0, 100, 0)
         for tx, ty in tree_positions:
-            pygame.draw.circle(screen, TREE_COLOR, (tx, ty), 10)
-        
-        # ---------- Lab door rendering & interaction ----------
-        if door_open:
-            # Door body and frame
-            pygame.draw.rect(screen, (120, 80, 40), door_rect)
-            pygame.draw.rect(screen, (180, 150, 90), door_rect, 3)
-            # Highlight door when player is nearby
-            if math.hypot(player.x - door_rect.centerx, player.y - door_rect.centery) < 100:
-                pygame.draw.rect(screen, (255, 255, 100), door_rect.inflate(10, 10), 2)
-                # Draw on-screen prompt
-                prompt_text = instruction_font.render("Press  [E]  to  Enter", True, WHITE)
-                screen.blit(prompt_text, (door_rect.centerx - prompt_text.get_width() // 2,
-                                          door_rect.top - 30))
-        
-        # Check if the player enters the open door
-        if door_open:
-            player_rect = pygame.Rect(player.x - player.radius, player.y - player.radius, player.radius * 2, player.radius * 2)
-            if player_rect.colliderect(door_rect) and keys[pygame.K_e]:
-                # Check if player has collected enough zombie blood
-                if hasattr(player, 'zombie_blood_collected') and player.zombie_blood_collected >= 5:
-                    # Complete the blood quest and show scientist dialogue
-                    next_state = check_zombie_blood_quest(player)
-                    if next_state == "BLOOD_QUEST_COMPLETE":
-                        return next_state
-                # If not enough blood, just return to throne room
-                return "THRONE_ROOM"
-        
-        # Draw crate or collectible
-        if not crate['destroyed']:
+            if camera.sees(tx, ty):
+                pygame.draw.circle(screen, TREE_COLOR, camera.to_screen(tx, ty), 10)
+        perf_hud.hud.mark('map_draw')
+
+        with sim.interpolated():
+            # ---------- Lab door rendering ----------
+            if door_open:
+                door_on_screen = door_rect.move(-camera.x, -camera.y)
+                # Door body and frame
+                pygame.draw.rect(screen, (120, 80, 40), door_on_screen)
+                pygame.draw.rect(screen, (180, 150, 90), door_on_screen, 3)
+                # Highlight door when player is nearby
+                if math.hypot(player.x - door_rect.centerx, player.y - door_rect.centery) < 100:
+                    pygame.draw.rect(screen, (255, 255, 100), door_on_screen.inflate(10, 10), 2)
+                    # Draw on-screen prompt
+                    prompt_text = instruction_font.render("Press  [E]  to  Enter", True, WHITE)
+                    screen.blit(prompt_text, (door_on_screen.centerx - prompt_text.get_width() // 2,
+                                              door_on_screen.top - 30))
+
             # Draw crate box
-            if crate_img:
-                rect = crate_img.get_rect(center=(crate['x'], crate['y']))
-                screen.blit(crate_img, rect)
-            else:
-                pygame.draw.rect(screen, (120,90,60), (crate['x']-20, crate['y']-20, 40,40))
-        elif collectible and not collectible.get('collected'):
-            if collection_img:
-                rect = collection_img.get_rect(center=(collectible['x'], collectible['y']))
-                screen.blit(collection_img, rect)
-            else:
-                pygame.draw.circle(screen, (255,215,0), (collectible['x'], collectible['y']), 14)
-
-        # Draw player, zombies, and bullets
-        player.draw(screen)
-        for z in zombies:
-            z.draw(screen)
-        
-        # ---- Update and draw bullets ----
-        for bullet in bullets[:]:
-            # Move projectile
-            speed = bullet.get('speed', BULLET_SPEED)
-            bullet['x'] += math.cos(bullet['angle']) * speed * dt
-            bullet['y'] += math.sin(bullet['angle']) * speed * dt
-
-            # Special shield boomerang behaviour
-            if bullet.get('type') == 'shield':
-                update_shield_bullet(bullet, bullets, dt, game_map, player, zombies)
-
-            
-            # Remove bullets that go off screen or hit walls
-            if (bullet['x'] < 0 or bullet['x'] > SCREEN_WIDTH or
-                bullet['y'] < 0 or bullet['y'] > SCREEN_HEIGHT or
-                game_map[int(bullet['y'] / TILE_SIZE)][int(bullet['x'] / TILE_SIZE)] in ['W', 'P']):
-                if bullet.get('type') == 'shield' and bullet.get('owner'):
-                    bullet['owner'].active_shield_throw = False
-                if bullet in bullets:
-                    bullets.remove(bullet)
-                continue
-                
-            # Get bullet radius before any checks
-            radius = bullet.get('radius', BULLET_RADIUS)
-            
-            # Draw bullet / shield
-            if bullet.get('type') == 'shield':
-                draw_shield_bullet(screen, bullet)
-            else:
-                color = (0,255,0) if bullet.get('acid') else BULLET_COLOR
-                pygame.draw.circle(screen, color, (int(bullet['x']), int(bullet['y'])), radius)
-            
-            # Check bullet hit crate (skip for shield)
-            if not crate['destroyed'] and bullet.get('type') != 'shield':
-                dist_crate = math.hypot(crate['x'] - bullet['x'], crate['y'] - bullet['y'])
-                if dist_crate < crate['radius'] + radius:
-                    crate['health'] -= bullet.get('damage', PLAYER_BULLET_DAMAGE)
-                    if bullet in bullets:
-                        bullets.remove(bullet)
-                    if crate['health'] <= 0:
-                        crate['destroyed'] = True
-                        # spawn collectible
-                        collectible = {'x': crate['x'], 'y': crate['y'], 'collected': False}
-                    continue
-
-            # Check for zombie hits
-            for zombie in zombies[:]:
-                if zombie.is_alive:
-                    dist = math.hypot(zombie.x - bullet['x'], zombie.y - bullet['y'])
-                    if dist < zombie.radius:
-                        dmg = bullet.get('damage', PLAYER_BULLET_DAMAGE) if isinstance(bullet, dict) else PLAYER_BULLET_DAMAGE
-                        zombie_died = zombie.take_damage(dmg)
-                        if zombie_died:
-                            if hasattr(player, 'zombie_blood_collected'):
-                                player.zombie_blood_collected += 1
-                            # Open lab door after collecting 5 zombie blood samples
-                            if player.zombie_blood_collected >= 5 and not door_open:
-                                door_open = True
-                                show_dialogue(["The lab door has opened!", "Return to the entrance to head back inside."])
-                        if bullet in bullets:
-                            bullets.remove(bullet)
-                        break
-        
-        # Check player pick up collectible
-        if collectible and not collectible['collected']:
-            dist_pick = math.hypot(player.x - collectible['x'], player.y - collectible['y'])
-            if dist_pick < player.radius + 20:
-                collectible['collected'] = True
-                create_collect_effect(collectible['x'], collectible['y'])
-                if collect_sound:
-                    collect_sound()  # Call the function to play the sound
-                # Further benefits/stat boosts can be added here
+            if not crate['destroyed'] and camera.sees(crate['x'], crate['y']):
+                crate_x, crate_y = camera.to_screen(crate['x'], crate['y'])
+                if crate_img:
+                    rect = crate_img.get_rect(center=(crate_x, crate_y))
+                    screen.blit(crate_img, rect)
+                else:
+                    pygame.draw.rect(screen, (120,90,60), (crate_x-20, crate_y-20, 40,40))
+
+            # Hidden collectible, player, zombies and projectiles (those in view)
+            world.draw(screen, sim.alpha)
 
         # Update & draw particles
-        update_and_draw_particles(dt)
+        particle_engine.engine.update(dt, camera.bounds)
+        particle_engine.engine.draw(screen, camera)
+        perf_hud.hud.mark('entity_draw')
 
         # Draw UI
         draw_ui(screen, player, show_blood_counter=True)
-        
-        # Apply screen shake by offsetting the final frame
-        if shake_timer > 0:
-            offset = (random.randint(-6,6), random.randint(-6,6))
-            frame_copy = screen.copy()
-            screen.fill((0,0,0))
-            screen.blit(frame_copy, offset)
+
+        # Flash + shake composited in one pass
+        postfx.fx.apply(screen)
+        perf_hud.hud.mark('ui')
+        perf_hud.hud.count(entities=world.count('body'), projectiles=len(projectiles), particles=len(particle_engine.engine))
+        perf_hud.hud.draw(screen)
         pygame.display.flip()
-    
+        perf_hud.hud.end_frame()
+
     return "MAIN_MENU"
 
-def spawn_zombie(map_data, zombies, player):
+def _add_zombie(world, zombie):
+    return world.spawn(body=zombie, brain=True, contact=dict(ZOMBIE_CONTACT), target={}, layer=0)
+
+
+def _fallback_item():
+    surf = pygame.Surface((28, 28), pygame.SRCALPHA)
+    pygame.draw.circle(surf, (255, 215, 0), (14, 14), 14)
+    return surf
+
+
+def spawn_zombie(map_data, world, player):
     """Spawn a new zombie at a valid position."""
     while True:
         x = random.randint(2, len(map_data[0]) - 3) * TILE_SIZE
         y = random.randint(2, len(map_data) - 3) * TILE_SIZE
         
         # Check if position is walkable and far enough from player
-        map_x, map_y = int(x / TILE_SIZE), int(y / TILE_SIZE)
-        if (map_data[map_y][map_x] == ' ' and 
+        if (compile_map(map_data).has(int(x / TILE_SIZE), int(y / TILE_SIZE), SPAWNABLE) and
             abs(x - player.x) > 100 and abs(y - player.y) > 100):
-            zombies.append(random_zombie(x, y))
+            _add_zombie(world, random_zombie(x, y))
             break
 
 from levels.lab_scene import draw_outside_environment as detailed_draw_env
 
-def draw_outside_environment(screen, map_data):
+def draw_outside_environment(screen, map_data, camera=None):
     """Draw the richer outside environment reused from lab_scene."""
-    detailed_draw_env(screen, map_data)
+    detailed_draw_env(screen, map_data, camera)
@@ -1,48 +1,54 @@
 import pygame
 import math
 import random
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, WHITE, MAX_HEALTH, BULLET_COLOR
+from settings import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, WHITE, MAX_HEALTH, FLAME_TRAIL_DPS, FLAME_TRAIL_DURATION
+)
 from ui import draw_ui
+from asset_cache import load_image
 from levels.dialogue import show_dialogue
-from player import Player, shield_hit_sound
-from shield_bullet import update_shield_bullet, draw_shield_bullet
+from player import Player
+import sound_bank
+import music
+import decals
+import postfx
+import perf_hud
+from background_layer import BackgroundLayer, get_layer
+from fixed_step import FixedStep
+from projectiles import Projectiles, volley
+from hazard_field import HazardField, FLAME
+from ecs import World
+import systems
+from tile_map import open_area_map
 
 
 class DragonBoss:
     """Ancient Dragon – breathes corruption flames, orbs, and executes swift dives."""
-    def __init__(self, x, y):
+    def __init__(self, x, y, hazards=None):
         import random
         import math
         self.x, self.y = x, y
+        # Scorch marks left by dashes; the level hurts the player from the field
+        self.flame_trail = hazards if hazards is not None else HazardField()
         self.health = 1600 
         self.max_health = 1600
         self.radius = 70
         self.image = None
         try:
-            img = pygame.image.load('assets/sprites/dragon.png').convert_alpha()
-            self.image = pygame.transform.scale(img, (self.radius*2, self.radius*2))
+            self.image = load_image('assets/sprites/dragon.png', (self.radius*2, self.radius*2), owner=self)
         except Exception:
              pass
         
         # Phases: 1 (>=50%), 2 (>=20%), 3 (<20%)
         self.phase = 1
         
-        # Load core sounds with channel management
-        def _load(name, volume=0.7):
-            try:
-                sound = pygame.mixer.Sound(f"assets/music/{name}.ogg")
-                sound.set_volume(volume)
-                return sound
-            except Exception as e:
-                print(f"Could not load sound {name}: {e}")
-                return None
-                
+        # Sound bank clips used by each attack
         self.sfx = {
-            "roar": _load("dragon_roar", 0.8),
-            "fire": _load("fire_sweep", 0.6),
-            "wing": _load("wing_flap", 0.5),
-            "impact": _load("impact_hit", 0.7),
-            "explode": _load("explosion_big", 0.8)
+            "roar": "dragon_roar",
+            "fire": "fire_sweep",
+            "wing": "wing_flap",
+            "impact": "impact_hit",
+            "explode": "explosion_big"
         }
         self.sound_channels = {}  # To track active sound channels
         self.last_attack = 0
@@ -58,20 +64,15 @@ class DragonBoss:
         self._dash_time = 0
         self._last_pursuit_dash = 0  # cooldown timer
         # Play intro roar
-        if self.sfx["roar"]: self.sfx["roar"].play()
+        self._play_sound("roar")
 
     def _play_sound(self, sound_name):
-        """Play a sound with channel management to prevent cutoff"""
-        if sound_name in self.sfx and self.sfx[sound_name]:
-            try:
-                # Find an available channel
-                channel = pygame.mixer.find_channel(True)
-                if channel:
-                    channel.play(self.sfx[sound_name])
-                    # Store the channel if we need to reference it later
-                    self.sound_channels[sound_name] = channel
-            except Exception as e:
-                print(f"Error playing sound {sound_name}: {e}")
+        """Play a sound through the shared sound bank so attacks do not cut off the player's cues"""
+        if sound_name in self.sfx:
+            channel = sound_bank.play(self.sfx[sound_name])
+            if channel:
+                # Store the channel if we need to reference it later
+                self.sound_channels[sound_name] = channel
 
     def _update_phase(self, current_time):
         # Update phase based on health percentage
@@ -105,9 +106,8 @@ class DragonBoss:
                 self._last_trail_emit = 0
             if current_time - self._last_trail_emit > trail_interval*1000:
                 self._last_trail_emit = current_time
-                if 'flame_trail' not in globals():
-                    globals()['flame_trail'] = []
-                globals()['flame_trail'].append({'x': self.x, 'y': self.y, 'timer': 2})
+                self.flame_trail.add(self.x, self.y, FLAME_TRAIL_DPS, FLAME_TRAIL_DURATION,
+                                     radius=TILE_SIZE * 0.7, kind=FLAME)
             self.x += self._dash_vec[0] * dt
             self.y += self._dash_vec[1] * dt
             self._dash_time -= dt
@@ -131,8 +131,7 @@ class DragonBoss:
                 self._dash_vec = (vec_x/dist * dash_speed, vec_y/dist * dash_speed)
                 self._dash_time = min(0.6, dist / dash_speed)
                 # Start dash sound
-                if self.sfx.get("wing"):
-                    self.sfx["wing"].play()
+                self._play_sound("wing")
 
         actions = None
         if not self.is_dashing and current_time - self.last_attack > self.attack_delay:
@@ -151,44 +150,33 @@ class DragonBoss:
             # 0-radial,1-spread,2-flame,3-meteor,4-dash
             if idx==0:
                 # Radial/Claw Slam analogue
-                if self.sfx["impact"]: self.sfx["impact"].play()
-                actions = []
-                for i in range(12):
-                    ang = i*(2*math.pi/12)
-                    actions.append({'type':'projectile','x':self.x,'y':self.y,'angle':ang,'speed':self.projectile_speed*0.8,
-                                     'radius':6,'damage':14,'color':(230,60,230)})
+                self._play_sound("impact")
+                actions = [volley(self.x, self.y, [i*(2*math.pi/12) for i in range(12)], self.projectile_speed*0.8,
+                                  radius=6, damage=14, color=(230,60,230))]
             elif idx==1:
                 # Spread / Tail Whip
-                if self.sfx["impact"]: self.sfx["impact"].play()
-                actions = []
+                self._play_sound("impact")
                 base = math.atan2(player.y - self.y, player.x - self.x)
-                for offset in (-0.30,0,0.30):
-                    ang = base + offset
-                    actions.append({'type':'projectile','x':self.x,'y':self.y,'angle':ang,'speed':self.projectile_speed,
-                                     'radius':7,'damage':16,'color':(200,80,240)})
+                actions = [volley(self.x, self.y, [base - 0.30, base, base + 0.30], self.projectile_speed,
+                                  radius=7, damage=16, color=(200,80,240))]
             elif idx==2:
                 # Flame Breath sweep
-                if self.sfx["fire"]: self.sfx["fire"].play()
-                actions = []
+                self._play_sound("fire")
                 base = math.atan2(player.y - self.y, player.x - self.x)
-                for i in range(-4,5):
-                    ang = base + i*0.1
-                    actions.append({'type':'flame','x':self.x,'y':self.y,'angle':ang,'speed':self.projectile_speed*0.9,
-                                     'radius':5,'damage':10,'color':(255,120,40)})
+                actions = [volley(self.x, self.y, [base + i*0.1 for i in range(-4,5)], self.projectile_speed*0.9,
+                                  radius=5, damage=10, color=(255,120,40))]
             elif idx==3:
                 # Meteor / Aerial firebomb
                 summon = random.random() < (0.4 if self.phase==1 else 0.7)
-                if self.sfx["wing"]: self.sfx["wing"].play()
-                actions = []
-                for i in range(6):
-                    px = player.x + random.randint(-120,120)
-                    actions.append({'type':'meteor','x':px,'y':-50,'angle':math.pi/2,'speed':self.projectile_speed*1.2,
-                                     'radius':8,'damage':22,'color':(255,80,0)})
+                self._play_sound("wing")
+                xs = [player.x + random.randint(-120,120) for i in range(6)]
+                actions = [volley(xs, -50, math.pi/2, self.projectile_speed*1.2,
+                                  radius=8, damage=22, color=(255,80,0))]
                 if summon:
                     actions.append({'type':'spawn_minion','count':random.randint(2,3)})
             else:
                 # Dash / Inferno dash
-                if self.sfx["wing"]: self.sfx["wing"].play()
+                self._play_sound("wing")
                 self.is_dashing = True
                 dest_x = random.randint(100, SCREEN_WIDTH-100)
                 dest_y = random.randint(100, SCREEN_HEIGHT-100)
@@ -201,73 +189,43 @@ class DragonBoss:
             if roll < 0.25:
                 if actions is None:
                     actions = []
-                for i in range(12):
-                    ang = i * (2*math.pi/12)
-                    actions.append({'type':'projectile','x':self.x,'y':self.y,'angle':ang,'speed':self.projectile_speed*0.8,
-                                    'radius':6,'damage':14,'color':(230,60,230)})
+                actions.append(volley(self.x, self.y, [i * (2*math.pi/12) for i in range(12)], self.projectile_speed*0.8,
+                                      radius=6, damage=14, color=(230,60,230)))
             elif roll < 0.5:
                 # 3-shot spread towards player
-                actions = []
                 base = math.atan2(player.y - self.y, player.x - self.x)
-                for offset in (-0.30, 0, 0.30):
-                    ang = base + offset
-                    actions.append({'type':'projectile','x':self.x,'y':self.y,'angle':ang,'speed':self.projectile_speed,
-                                    'radius':7,'damage':16,'color':(200,80,240)})
+                actions = [volley(self.x, self.y, [base - 0.30, base, base + 0.30], self.projectile_speed,
+                                  radius=7, damage=16, color=(200,80,240))]
             elif roll < 0.65:
                 # Slow tracking orb (larger, slower)
                 angle = math.atan2(player.y - self.y, player.x - self.x)
-                actions = {'type':'projectile','x':self.x,'y':self.y,'angle':angle,'speed':self.projectile_speed*0.6,
-                           'radius':10,'damage':24,'color':(160,30,200)}
+                actions = volley(self.x, self.y, angle, self.projectile_speed*0.6,
+                                 radius=10, damage=24, color=(160,30,200))
             elif roll < 0.8:
                 # Flame-breath: spray 9 small fireballs in a narrow cone
-                actions = []
                 base = math.atan2(player.y - self.y, player.x - self.x)
-                for i in range(-4,5):
-                    ang = base + i*0.1
-                    actions.append({'type':'flame','x':self.x,'y':self.y,'angle':ang,'speed':self.projectile_speed*0.9,
-                                     'radius':5,'damage':10,'color':(255,120,40)})
+                actions = [volley(self.x, self.y, [base + i*0.1 for i in range(-4,5)], self.projectile_speed*0.9,
+                                  radius=5, damage=10, color=(255,120,40))]
             elif roll < 0.9:
                 # Meteor rain: spawn 6 downward fireballs around player
-                actions = []
-                for i in range(6):
-                    px = player.x + random.randint(-160, 160)
-                    actions.append({'type':'meteor','x':px,'y':-60,'angle':math.pi/2,'speed':self.projectile_speed*1.25,
-                                     'radius':9,'damage':26,'color':(255,80,0)})
+                xs = [player.x + random.randint(-160, 160) for i in range(6)]
+                actions = [volley(xs, -60, math.pi/2, self.projectile_speed*1.25,
+                                  radius=9, damage=26, color=(255,80,0))]
             elif roll < 0.97:
                 # Ring of Fire – full 24-shot flame circle around the boss
-                actions = []
-                if self.sfx.get("fire"):
-                    self.sfx["fire"].play()
-                for i in range(24):
-                    ang = i * (2*math.pi/24)
-                    actions.append({'type':'flame','x':self.x,'y':self.y,'angle':ang,'speed':self.projectile_speed*0.8,
-                                     'radius':6,'damage':15,'color':(255,120,40)})
+                self._play_sound("fire")
+                actions = [volley(self.x, self.y, [i * (2*math.pi/24) for i in range(24)], self.projectile_speed*0.8,
+                                  radius=6, damage=15, color=(255,120,40))]
             elif roll < 0.985:
                 # Tail swipe – semicircle 18-shot arc
-                actions = []
                 base = math.atan2(player.y - self.y, player.x - self.x)
                 start = base - math.pi/2
-                for i in range(18):
-                    ang = start + i*(math.pi/18)
-                    actions.append({'type':'tail','x':self.x,'y':self.y,'angle':ang,'speed':self.projectile_speed*0.7,
-                                     'radius':6,'damage':14,'color':(200,200,60)})
+                actions = [volley(self.x, self.y, [start + i*(math.pi/18) for i in range(18)], self.projectile_speed*0.7,
+                                  radius=6, damage=14, color=(200,200,60))]
             elif roll < 0.995:
                 # Corner blast – punish campers by firing a wall of projectiles from a screen edge
                 actions = []
-                edge = random.choice(['left','right','top','bottom'])
-                step = 40
-                if edge in ('left','right'):
-                    x = 0 if edge=='left' else SCREEN_WIDTH
-                    ang = 0 if edge=='left' else math.pi
-                    for y in range(0, SCREEN_HEIGHT+step, step):
-                        actions.append({'type':'wall','x':x,'y':y,'angle':ang,'speed':self.projectile_speed*0.9,
-                                         'radius':8,'damage':18,'color':(255,90,90)})
-                else:
-                    y = 0 if edge=='top' else SCREEN_HEIGHT
-                    ang = math.pi/2 if edge=='top' else -math.pi/2
-                    for x in range(0, SCREEN_WIDTH+step, step):
-                        actions.append({'type':'wall','x':x,'y':y,'angle':ang,'speed':self.projectile_speed*0.9,
-                                         'radius':8,'damage':18,'color':(255,90,90)})
+                self._emit_wall(actions, random.choice(['left','right','top','bottom']))
             else:
                 # Dive dash to new random location (no bullets)
                 self.is_dashing = True
@@ -283,10 +241,24 @@ class DragonBoss:
                 self._dash_time = length / speed
         return actions
 
+    def _emit_wall(self, actions, edge):
+        """Append a wall of projectiles fired inward from one screen ``edge``."""
+        step = 40
+        if edge in ('left','right'):
+            x = 0 if edge=='left' else SCREEN_WIDTH
+            y = list(range(0, SCREEN_HEIGHT+step, step))
+            ang = 0 if edge=='left' else math.pi
+        else:
+            x = list(range(0, SCREEN_WIDTH+step, step))
+            y = 0 if edge=='top' else SCREEN_HEIGHT
+            ang = math.pi/2 if edge=='top' else -math.pi/2
+        actions.append(volley(x, y, ang, self.projectile_speed*0.9,
+                              radius=8, damage=18, color=(255,90,90)))
+
     def take_damage(self, dmg):
         self.health -= dmg
-        if self.health<=0 and self.sfx["explode"]:
-            self.sfx["explode"].play()
+        if self.health<=0:
+            self._play_sound("explode")
         return self.health <= 0
 
     def draw(self, screen):
@@ -301,6 +273,15 @@ class DragonBoss:
         pygame.draw.rect(screen, (0,200,0), (self.x-bar_w//2, self.y-self.radius-20, bar_w*(self.health/self.max_health), 8))
 
 
+def _draw_sanctuary_floor(surface):
+    """Ruined floor tiles; pre-rendered once into a BackgroundLayer."""
+    surface.fill((40, 30, 40))
+    for i in range(0, SCREEN_WIDTH, 60):
+        pygame.draw.rect(surface, (60,50,60), (i,0,4,SCREEN_HEIGHT))
+    for j in range(0, SCREEN_HEIGHT, 60):
+        pygame.draw.rect(surface, (60,50,60), (0,j,SCREEN_WIDTH,4))
+
+
 def run_ruined_sanctuary(game_objects=None):
     import random
     """Level 3 – Ruined Sanctuary.
@@ -309,28 +290,45 @@ def run_ruined_sanctuary(game_objects=None):
     "GAME_OVER" if the player dies, and "MAIN_MENU" if they quit.
     """
     screen = pygame.display.get_surface()
-    clock = pygame.time.Clock()
 
     # Use existing player or create a new one
     player = game_objects.get("player") if isinstance(game_objects, dict) else Player()
     player.x, player.y = SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2
 
     # --- Audio: play BGM ---
-    try:
-        pygame.mixer.music.load('assets/music/bgm.ogg')
-        pygame.mixer.music.set_volume(0.6)
-        pygame.mixer.music.play(-1)
-    except Exception:
-        pass  # file missing
+    music.jukebox.play('bgm.ogg', volume=0.6)
 
     # Real boss
-    boss = DragonBoss(SCREEN_WIDTH*0.75, SCREEN_HEIGHT//2)
-    bullets = []  # boss bullets
-    minions = []
-    player_bullets = []
+    hazards = HazardField()
+    boss = DragonBoss(SCREEN_WIDTH*0.75, SCREEN_HEIGHT//2, hazards)
+    projectiles = Projectiles()  # dragon fire and player shots share one pool
+    decals.clear_floor()
     # Visual effect timers (ground-pound)
-    shake_timer = 0.0
-    flash_timer = 0.0
+    postfx.fx.reset()
+
+    def dragon(world, dt):
+        """The dragon's attacks; every one of them is a volley."""
+        act = boss.update(player, pygame.time.get_ticks(), dt)
+        for a in act if isinstance(act, list) else [act] if act else []:
+            if a.get('type') == 'spawn_minion':
+                # Minion spawning disabled for Dragon boss per updated design
+                continue
+            projectiles.spawn_volley(a)
+
+    # Ruined sanctuary uses an open area; a raised shield soaks dragon fire for energy
+    world = World(player=player, projectiles=projectiles, game_map=open_area_map(), shot_shield_drain=4,
+                  hazards=hazards)
+    world.add_systems(systems.COMBAT)
+    world.add_system('movement', dragon, before=systems.move_projectiles)
+    world.add_system('damage', systems.hazards)
+    # Scorch marks, the dragon, then its fire and the player's shots in one batch, then the player
+    world.add_systems((('render', systems.draw_hazards),
+                       ('render', systems.draw_layer(0)),
+                       ('render', systems.draw_projectiles),
+                       ('render', systems.draw_layer(1))))
+    # Shields fly home off the dragon instead of spamming damage
+    boss_entity = world.spawn(body=boss, target={'recall': True}, layer=0)
+    world.spawn(body=player, layer=1)
 
     # Intro dialogue
     show_dialogue([
@@ -340,154 +338,53 @@ def run_ruined_sanctuary(game_objects=None):
         "Dragon: 'Survive my fury if you can!'",
     ])
 
+    # World updates run in fixed steps; drawing blends between them
+    sim = FixedStep()
+    sim.track(lambda: list(world.store('body').values()))
+
     running = True
     while running:
-        dt = clock.tick(60)/1000.0
-        current_time = pygame.time.get_ticks()
         events = pygame.event.get()
         for e in events:
             if e.type == pygame.QUIT:
                 return "MAIN_MENU"
             if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
                 return "MAIN_MENU"
-        # Player input
-        keys = pygame.key.get_pressed()
-        from mechanics import update_player_state, handle_player_input
-        # Ruined sanctuary uses an open area; create a dummy empty map for collisions
-        if 'game_map' not in locals():
-            game_map = [[' ' for _ in range(SCREEN_WIDTH // TILE_SIZE + 1)] for _ in range(SCREEN_HEIGHT // TILE_SIZE + 1)]
-        update_player_state(player, keys, game_map, dt)
-        handle_player_input(player, player_bullets, events)
-
-        # --- Decay visual timers ---
-        if shake_timer > 0:
-            shake_timer -= dt
-        if flash_timer > 0:
-            flash_timer -= dt
-
-        # ---- Ground Pound impact (no damage to Dragon) ----
-        if player.gp_triggered:
-            player.gp_triggered = False
-            GP_RADIUS = 250
-            for m in minions:
-                dist = math.hypot(m.x - player.x, m.y - player.y)
-                if dist <= GP_RADIUS:
-                    m.stun_timer = 2.0
-                    if dist > 0:
-                        kx = (m.x - player.x)/dist * 60
-                        ky = (m.y - player.y)/dist * 60
-                        m.x += kx
-                        m.y += ky
-            shake_timer = 0.4
-            flash_timer = 0.15
-
-        # Boss update
-        act = boss.update(player, current_time, dt)
-        if act:
-            if isinstance(act, list):
-                for a in act:
-                    if a.get('type') == 'spawn_minion':
-                        # Minion spawning disabled for Dragon boss per updated design
-                        continue
-                    bullets.append(a)
-            else:
-                bullets.append(act)
-
-        # Update player bullets
-        for pb in player_bullets[:]:
-            speed = pb.get('speed', 350)
-            pb['x'] += math.cos(pb['angle'])*speed*dt
-            pb['y'] += math.sin(pb['angle'])*speed*dt
-            if pb.get('type') == 'shield':
-                update_shield_bullet(pb, player_bullets, dt, game_map, player, zombies=minions)
-            if pb['x']<0 or pb['x']>SCREEN_WIDTH or pb['y']<0 or pb['y']>SCREEN_HEIGHT:
-                player_bullets.remove(pb); continue
-            # hit boss
-
-            if math.hypot(boss.x-pb['x'], boss.y-pb['y']) < boss.radius+4:
-                if boss.take_damage(pb.get('damage',20)):
+        perf_hud.hud.handle(events)
+        for dt, step_events in sim.steps(events):
+            for event in world.step(dt, step_events):
+                if event[:2] == ('killed', boss_entity):
                     show_dialogue([
                         "The dragon collapses, smoke billowing from its scales…",
                         "Dragon: 'You… are stronger than the flames.'",
                     ])
                     return "VICTORY"
-                if pb.get('type') == 'shield':
-                    pb['returning'] = True
-                    pb['damage'] = 0
-                else:
-                    player_bullets.remove(pb)
-        # Update minions
-        for m in minions[:]:
-            m.update(player.x, player.y, game_map, dt)
-            if not m.is_alive:
-                minions.remove(m)
-            else:
-                # minion attacks (simple contact damage)
-                if math.hypot(player.x-m.x, player.y-m.y) < m.radius+player.radius:
-                    player.take_damage(8*dt)  # Respect shield and play sound
-                    if player.health<=0:
-                        return "GAME_OVER"
-        # Update boss bullets
-        for b in bullets[:]:
-            b['x'] += math.cos(b['angle'])*b['speed']*dt
-            b['y'] += math.sin(b['angle'])*b['speed']*dt
-            if b['x']<0 or b['x']>SCREEN_WIDTH or b['y']<0 or b['y']>SCREEN_HEIGHT:
-                bullets.remove(b); continue
-            if math.hypot(player.x-b['x'], player.y-b['y']) < b['radius']+player.radius:
-                if player.is_shielding and player.shield_energy>0:
-                    player.shield_energy = max(0, player.shield_energy - 4)
-                    if shield_hit_sound:
-                        shield_hit_sound.play()
-                else:
-                    player.health -= b['damage']
-                    if player.health<=0:
-                        return "GAME_OVER"
-                bullets.remove(b)
+            if player.health <= 0:
+                return "GAME_OVER"
 
+        # --- Decay visual timers ---
+        dt = sim.frame_dt
+        postfx.fx.update(dt)
 
         # Background ruined tiles
-        screen.fill((40, 30, 40))
-        for i in range(0, SCREEN_WIDTH, 60):
-            pygame.draw.rect(screen, (60,50,60), (i,0,4,SCREEN_HEIGHT))
-        for j in range(0, SCREEN_HEIGHT, 60):
-            pygame.draw.rect(screen, (60,50,60), (0,j,SCREEN_WIDTH,4))
+        get_layer('ruined_sanctuary', lambda: BackgroundLayer(size=(SCREEN_WIDTH, SCREEN_HEIGHT), draw_base=_draw_sanctuary_floor)).blit(screen)
+        decals.draw_floor(screen)
         # Debris
         for _ in range(6):
             pygame.draw.rect(screen,(70,60,70), (random.randint(0,SCREEN_WIDTH-20), random.randint(0,SCREEN_HEIGHT-20), random.randint(10,25),4))
-        # Draw minions
-        for m in minions:
-            m.draw(screen)
-        # Draw boss
-        boss.draw(screen)
-        # Draw enemy projectiles
-        for b in bullets:
-            pygame.draw.circle(screen, b.get('color',(200,50,200)), (int(b['x']), int(b['y'])), b['radius'])
-
-        # Draw player bullets (normal and shield)
-        for pb in player_bullets:
-            if pb.get('type') == 'shield':
-                draw_shield_bullet(screen, pb)
-            else:
-                pygame.draw.circle(screen, BULLET_COLOR, (int(pb['x']), int(pb['y'])), pb.get('radius', 4))
-        # Draw player & UI
-        player.draw(screen)
+        perf_hud.hud.mark('map_draw')
+        with sim.interpolated():
+            world.draw(screen, sim.alpha)
+        perf_hud.hud.mark('entity_draw')
         draw_ui(screen, player)
 
-        # ---- Flash overlay ----
-        if flash_timer > 0:
-            flash_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            flash_surf.fill((255, 255, 255))
-            alpha = int(255 * (flash_timer / 0.15))
-            flash_surf.set_alpha(alpha)
-            screen.blit(flash_surf, (0, 0))
-
-        # ---- Apply screen shake ----
-        if shake_timer > 0:
-            offset = (random.randint(-6, 6), random.randint(-6, 6))
-            shake_frame = screen.copy()
-            screen.fill((0, 0, 0))
-            screen.blit(shake_frame, offset)
+        # Flash + shake composited in one pass
+        postfx.fx.apply(screen)
+        perf_hud.hud.mark('ui')
+        perf_hud.hud.count(entities=world.count('body'), projectiles=len(projectiles))
+        perf_hud.hud.draw(screen)
         pygame.display.flip()
+        perf_hud.hud.end_frame()
 
 
 if __name__ == "__main__":
@@ -3,6 +3,8 @@ import sys
 from settings import TILE_SIZE, BG_COLOR, SCREEN_WIDTH, SCREEN_HEIGHT, WHITE
 from player import Player
 from mechanics import handle_player_input, update_player_state
+from projectiles import Projectiles
+from tile_map import compile_map
 from ui import draw_ui
 from levels.dialogue import show_dialogue
 
@@ -37,6 +39,7 @@ def run_tutorial():
     player = Player()
     player.x = 2 * TILE_SIZE
     player.y = 2 * TILE_SIZE
+    projectiles = Projectiles()
     
     # Tutorial state
     tutorial_state = "movement"
@@ -66,9 +69,11 @@ def run_tutorial():
                     return
         
         # Handle input consistently
-        handle_player_input(player, [], events)  # tutorial currently has no bullets list
+        handle_player_input(player, projectiles, events)
         keys = pygame.key.get_pressed()
         update_player_state(player, keys, tutorial_map, dt)
+        projectiles.update(dt, compile_map(tutorial_map))
+        projectiles.compact()
         
         # Check tutorial state
         if tutorial_state == "movement":
@@ -89,6 +94,7 @@ def run_tutorial():
         
                 # Draw player
         player.draw(screen)
+        projectiles.draw(screen)
 
         # Draw UI using shared HUD
         draw_ui(screen, player)
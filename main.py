@@ -1,38 +1,54 @@
+import sys
+
+if __name__ == '__main__':
+    # Levels do `from main import ...`; let that find this module instead of
+    # importing (and starting) a second copy of it
+    sys.modules.setdefault('main', sys.modules[__name__])
+
+import startup
 import pygame
 import math
-import sys
+import os
 import random
-import traceback
 from settings import (
     SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, GOD_GOLD, AURA_COLOR_GOLD,
     GOD_SILVER, AURA_COLOR_SILVER, GOD_BRONZE, AURA_COLOR_BRONZE,
     CARPET_COLOR, MAP_HEIGHT, WHITE, DIALOGUE_TEXT_COLOR, WALL_COLOR,
-    PILLAR_COLOR, GOD_EYE_COLOR, STAFF_COLOR, BULLET_COLOR, BULLET_RADIUS,
+    PILLAR_COLOR, GOD_EYE_COLOR, STAFF_COLOR,
     UI_PANEL_BG, PLAYER_MAX_SHIELD_ENERGY, SHIELD_BAR_BG, SHIELD_BAR_FG,
     MAX_HEALTH, HEALTH_BAR_BG, HEALTH_BAR_FG, MAX_STAMINA, STAMINA_BAR_BG,
     STAMINA_BAR_FG, PLAYER_MAX_AMMO, BG_COLOR, BLACK, GREY, ZOMBIE_DAMAGE,
-    BULLET_SPEED, MAP_WIDTH, PYTHON_DAMAGE, PYTHON_CHARGE_DAMAGE,
+    MAP_WIDTH, PYTHON_DAMAGE, PYTHON_CHARGE_DAMAGE,
     PLAYER_BULLET_DAMAGE, PYTHON_HEALTH, BOSS_HEALTH_BAR_BG,
-    BOSS_HEALTH_BAR_FG, THRONE_ROOM_END_POS, END_LEVEL_RADIUS
+    BOSS_HEALTH_BAR_FG, THRONE_ROOM_END_POS, END_LEVEL_RADIUS, MAP_LAYER_COLORKEY
 )
 from player import Player
 from zombie import Zombie
 from human import Human
 from python_boss import PythonBoss
-from levels.outside_area import run_outside_area
-from levels.lab_scene import show_lab_scene
+from asset_cache import load_image, sound_key
+import sound_bank
+import music
+import idle
+from background_layer import BackgroundLayer, get_layer
+import decals
+import postfx
+import perf_hud
+import particle_engine
+import headless
+import prefetch
+import levels
 from ui import draw_ui
-from levels.endless_mode import run_endless_mode
 
+from fixed_step import FixedStep
+from ecs import World
+import systems
+from projectiles import Projectiles, PLAYER
 from mechanics import handle_player_input, update_player_state
 
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init()
-pygame.mixer.set_reserved(1)  
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Battle Aftermath")
-clock = pygame.time.Clock()
+# Set by init(); importing main does not open a window
+screen = None
+clock = None
 
 # --- Revival & progression flags ---
 # Set to True once the 5-blood quest is finished
@@ -42,34 +58,11 @@ last_checkpoint = None  # dict with keys: level, x, y, angle
 # Counts how many times scientist has revived the hero (for varied dialogue)
 revival_count = 0
 
-# Timers for global visual effects (in seconds)
-flash_timer = 0.0  # remaining white flash duration
-shake_timer = 0.0  # remaining screen shake duration
-
 # --- Scene state management ---
 game_state = "START"
 
 throne_room_end_triggered = False
 
-try:
-    from settings import PELLET_SPRITE_SIZE
-    pellet_img = pygame.image.load('assets/sprites/shotgun_pellet.png').convert_alpha()
-    pellet_img = pygame.transform.scale(pellet_img, (PELLET_SPRITE_SIZE, PELLET_SPRITE_SIZE))
-except Exception:
-    pellet_img = None
-
-try:
-    game_over_sound = pygame.mixer.Sound("assets/music/game_over.ogg")
-    collect_sound = pygame.mixer.Sound("assets/music/reload.ogg")
-except Exception:
-    print("An unexpected error occurred:")
-    traceback.print_exc()
-    game_over_sound = None
-    collect_sound = None
-
-
-particles = []
-
 
 COLLECTIBLE_SIZE = 20
 collectibles = []
@@ -78,25 +71,55 @@ collectible_images = {}
 def load_collectible_images():
     global collectible_images
     collectible_images = {
-        '1': pygame.transform.scale(pygame.image.load('assets/sprites/collection1.png').convert_alpha(), (COLLECTIBLE_SIZE, COLLECTIBLE_SIZE)),
-        '2': pygame.transform.scale(pygame.image.load('assets/sprites/collection2.png').convert_alpha(), (COLLECTIBLE_SIZE, COLLECTIBLE_SIZE)),
-        '3': pygame.transform.scale(pygame.image.load('assets/sprites/collection3.png').convert_alpha(), (COLLECTIBLE_SIZE, COLLECTIBLE_SIZE)),
+        '1': load_image('assets/sprites/collection1.png', (COLLECTIBLE_SIZE, COLLECTIBLE_SIZE)),
+        '2': load_image('assets/sprites/collection2.png', (COLLECTIBLE_SIZE, COLLECTIBLE_SIZE)),
+        '3': load_image('assets/sprites/collection3.png', (COLLECTIBLE_SIZE, COLLECTIBLE_SIZE)),
     }
     # Try loading medkit sprite
     try:
-        med_img = pygame.image.load('assets/sprites/medkit.png').convert_alpha()
-        med_img = pygame.transform.scale(med_img, (COLLECTIBLE_SIZE, COLLECTIBLE_SIZE))
+        med_img = load_image('assets/sprites/medkit.png', (COLLECTIBLE_SIZE, COLLECTIBLE_SIZE))
     except FileNotFoundError:
         med_img = pygame.Surface((COLLECTIBLE_SIZE, COLLECTIBLE_SIZE))
         med_img.fill((200, 0, 0))
         pygame.draw.rect(med_img, (255, 255, 255), med_img.get_rect(), 2)
     collectible_images['medkit'] = med_img
-load_collectible_images()
 
 
 is_throne_room_level = True
 
-player = Player()
+player = None
+
+
+def init():
+    """Start pygame, open the window and load what every scene shares.
+
+    Importing main has no side effects, so the levels, headless.py and
+    benchmark.py can import it cheaply; whoever runs the game calls this
+    once first (later calls do nothing).  Sound effects and the menu
+    background are decoded on the prefetch thread instead of here, so
+    the menu can open while they load.
+    """
+    global screen, clock, player
+    if screen is not None:
+        return
+    timeline = startup.timeline
+    timeline.mark('imports')
+    # Mixer first, so pygame.init() does not open it with the defaults
+    pygame.mixer.init(frequency=44100, size=-16, channels=8)
+    pygame.init()
+    timeline.mark('pygame.init')
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Battle Aftermath")
+    clock = pygame.time.Clock()
+    timeline.mark('display')
+    # The bank claims each clip from the prefetcher the first time it plays
+    sound_bank.bank.preload(decode=False)
+    prefetch.prefetcher.pin(sound_key(clip['path']) for clip in sound_bank.bank.clips.values())
+    prefetch.prefetcher.enter("MAIN_MENU")
+    timeline.mark('sounds queued')
+    load_collectible_images()
+    player = Player()
+    timeline.mark('player')
 
 # God settings
 gods = [
@@ -105,7 +128,8 @@ gods = [
     {'x': 18 * TILE_SIZE, 'y': 2.5 * TILE_SIZE, 'color': GOD_BRONZE, 'radius': TILE_SIZE, 'aura_color': AURA_COLOR_BRONZE}
 ]
 
-bullets = []
+# Every projectile in the tutorial, boss fight and throne room
+bullets = Projectiles()
 
 throne_room_map = [
     "WWWWWWWWWWWWWWWWWWWWWWWWWWWWWWWW",
@@ -215,8 +239,6 @@ def maybe_spawn_medkit(zx, zy):
             'image': collectible_images['medkit']
         })
 
-background_music = {}
-
 def play_sound_effect(sound_name, volume=1.0):
     """Play a sound effect with proper channel management.
     
@@ -224,62 +246,29 @@ def play_sound_effect(sound_name, volume=1.0):
         sound_name (str): Name of the sound file in assets/music/
         volume (float): Volume level (0.0 to 1.0)
     """
-    try:
-        # Find an available channel
-        channel = pygame.mixer.find_channel(True)
-        if channel:
-            sound = pygame.mixer.Sound(f"assets/music/{sound_name}")
-            sound.set_volume(volume)
-            channel.play(sound)
-            return channel
-    except Exception as e:
-        print(f"Error playing sound effect {sound_name}: {e}")
-    return None
-
-def play_music(track_name, channel=0, volume=0.5, loop=True):
-    """Play a music track on a specific channel with volume control.
-    
+    # Clips are looked up by file name; unknown files get a default clip entry
+    clip_name = os.path.splitext(sound_name)[0]
+    if clip_name not in sound_bank.bank.clips:
+        sound_bank.bank.register(clip_name, sound_name)
+    return sound_bank.play(clip_name, volume)
+
+def play_music(track_name, volume=0.5, loop=True):
+    """Stream a music track, crossfading from the one playing now.
+
     Args:
         track_name (str): Name of the music file in assets/music/
-        channel (int): Channel number to play on (0-7)
         volume (float): Volume level (0.0 to 1.0)
         loop (bool): Whether to loop the track
     """
-    try:
-        # Stop any existing music on this channel
-        if channel in background_music:
-            background_music[channel].stop()
-            
-        # Load and play the new track
-        sound = pygame.mixer.Sound(f"assets/music/{track_name}")
-        sound.set_volume(volume)
-        if loop:
-            loops = -1  # Loop indefinitely
-        else:
-            loops = 0   # Play once
-            
-        channel_obj = pygame.mixer.Channel(channel)
-        channel_obj.play(sound, loops=loops, fade_ms=500)
-        background_music[channel] = channel_obj
-        return channel_obj
-    except pygame.error as e:
-        print(f"Warning: Could not play music file 'assets/music/{track_name}'. Error: {e}")
-        return None
+    music.jukebox.play(track_name, volume, loop)
+
+def stop_music(fade_out=500):
+    """Fade the music out.
 
-def stop_music(channel=None, fade_out=500):
-    """Stop music on a specific channel or all channels.
-    
     Args:
-        channel (int, optional): Channel number to stop. If None, stops all channels.
         fade_out (int): Fade out duration in milliseconds.
     """
-    if channel is not None and channel in background_music:
-        background_music[channel].fadeout(fade_out)
-        del background_music[channel]
-    elif channel is None:
-        for ch in list(background_music.keys()):
-            background_music[ch].fadeout(fade_out)
-            del background_music[ch]
+    music.jukebox.stop(fade_out)
 
 def draw_floor_details():
     # Draw red carpet
@@ -291,38 +280,26 @@ def draw_floor_details():
         pygame.draw.rect(screen, CARPET_COLOR, (carpet_x, carpet_y_start, carpet_width, carpet_y_end))
 
 def create_collect_effect(x, y):
-    for _ in range(20):  # Number of particles
-        particles.append({
-            'x': x,
-            'y': y,
-            'vx': random.uniform(-150, 150),
-            'vy': random.uniform(-150, 150),
-            'timer': random.uniform(0.2, 0.5),  # Lifetime in seconds
-            'color': random.choice([WHITE, GOD_GOLD, DIALOGUE_TEXT_COLOR])
-        })
+    particle_engine.engine.emit('collect', x, y)
 
 def update_and_draw_particles(dt):
-    for p in particles[:]:
-        p['x'] += p['vx'] * dt
-        p['y'] += p['vy'] * dt
-        p['timer'] -= dt
-        if p['timer'] <= 0:
-            particles.remove(p)
-        else:
-            # Simple square particle
-            pygame.draw.rect(screen, p['color'], (p['x'], p['y'], 3, 3))
+    particle_engine.engine.update(dt)
+    particle_engine.engine.draw(screen)
 
 def draw_collectibles():
     for collectible in collectibles:
         screen.blit(collectible['image'], (collectible['x'] - COLLECTIBLE_SIZE // 2, collectible['y'] - COLLECTIBLE_SIZE // 2))
 
+def _draw_map_tile(surface, x, y, tile):
+    if tile == 'W':
+        pygame.draw.rect(surface, WALL_COLOR, (x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+    elif tile == 'P':
+        pygame.draw.circle(surface, PILLAR_COLOR, (x * TILE_SIZE + TILE_SIZE // 2, y * TILE_SIZE + TILE_SIZE // 2), TILE_SIZE // 2)
+
 def draw_map():
-    for y, row in enumerate(game_map):
-        for x, tile in enumerate(row):
-            if tile == 'W':
-                pygame.draw.rect(screen, WALL_COLOR, (x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
-            elif tile == 'P':
-                pygame.draw.circle(screen, PILLAR_COLOR, (x * TILE_SIZE + TILE_SIZE // 2, y * TILE_SIZE + TILE_SIZE // 2), TILE_SIZE // 2)
+    # Walls and pillars are pre-rendered once per map and blitted over the floor
+    layer = get_layer(game_map, lambda: BackgroundLayer(game_map, _draw_map_tile, colorkey=MAP_LAYER_COLORKEY))
+    layer.blit(screen)
 
 def draw_gods():
     current_time = pygame.time.get_ticks()
@@ -389,36 +366,16 @@ def draw_gods():
         pygame.draw.circle(screen, (255, 200, 100), (staff_x, staff_y_start - 10), 12)
         pygame.draw.circle(screen, (255, 255, 200), (staff_x, staff_y_start - 10), 6)
 
-def draw_bullets():
-    for bullet in bullets:
-        if bullet.get('type') == 'shield':
-            # Draw trail
-            from settings import SHIELD_TRAIL_COLOR
-            for i in range(len(bullet['trail'])-1):
-                start = bullet['trail'][i]
-                end = bullet['trail'][i+1]
-                pygame.draw.line(screen, SHIELD_TRAIL_COLOR[:3], start, end, 3)
-            img = None
-            if bullet.get('owner'):
-                img = getattr(bullet['owner'], 'shield_image', None)
-            if img:
-                rect = img.get_rect(center=(bullet['x'], bullet['y']))
-                screen.blit(img, rect)
-            else:
-                # fallback circle if sprite missing
-                pygame.draw.circle(screen, (0, 180, 255), (int(bullet['x']), int(bullet['y'])), bullet.get('radius',12))
-        else:
-            if bullet.get('sprite') == 'pellet' and pellet_img:
-                rect = pellet_img.get_rect(center=(bullet['x'], bullet['y']))
-                screen.blit(pellet_img, rect)
-            else:
-                pygame.draw.circle(screen, BULLET_COLOR, (int(bullet['x']), int(bullet['y'])), BULLET_RADIUS)
+def draw_bullets(alpha=1.0):
+    bullets.draw(screen, alpha)
 
 def draw_ui_if_needed():
     if not is_throne_room_level:
         draw_ui(screen, player)
 
 def show_dialogue(lines):
+    if headless.active():
+        return  # nobody to press ENTER
     dialogue_font = pygame.font.Font(None, 36)
     small_font = pygame.font.Font(None, 24)
     
@@ -488,14 +445,7 @@ def show_dialogue(lines):
         pygame.display.flip()
 
         # Wait for player to continue
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    quit_game()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        waiting = False
+        idle.wait_for_key(on_quit=quit_game)
     
 def power_up_effect():
     start_time = pygame.time.get_ticks()
@@ -563,10 +513,8 @@ def fade_in_from_black(surface, duration=2000):
 
 def show_scientist_revival_scene():
     """Show the lab scene where the scientist revives the player."""
-    from levels.revive_lab_scene import show_lab_scene
-    
     # Show the dedicated revival lab scene with new dialogue and receive game objects
-    return show_lab_scene()
+    return levels.get('revive_lab')()
 
 def show_scientist_after_blood():
     """ Show the scene after player collects enough zombie blood. """
@@ -623,20 +571,14 @@ def show_game_over_screen(show_revival=False, allow_revival=False, show_restart_
     global current_level_runner
     
     # Play background music if not already playing
-    if not background_music:  # If no music is playing
+    if music.jukebox.playing is None:
         play_music("bgm.ogg")
     
     # Play sound
-    if game_over_sound:
-        game_over_sound.play()
+    sound_bank.play('game_over')
         
     # Rest of the function...
 
-    # Create a semi-transparent surface for the overlay
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    screen.blit(overlay, (0, 0))
-
     title_font = pygame.font.Font(None, 82)
     button_font = pygame.font.Font(None, 52)
     small_font = pygame.font.Font(None, 36)
@@ -695,98 +637,113 @@ def show_game_over_screen(show_revival=False, allow_revival=False, show_restart_
                 'speed': random.uniform(0.5, 2)
             })
 
-    clock = pygame.time.Clock()
-    running = True
-    
-    while running:
-        dt = clock.tick(60) / 1000.0
-        mouse_pos = pygame.mouse.get_pos()
-        
-        # Update revival button particles (only if they exist)
-        if revival_particles:
-            for p in revival_particles:
-                p['y'] -= p['speed']
-                p['alpha'] -= 1
-                if p['alpha'] <= 0 and revival_rect:
-                    p['y'] = random.randint(revival_rect.bottom - 10, revival_rect.bottom)
-                    p['x'] = random.randint(revival_rect.left, revival_rect.right)
-                    p['alpha'] = random.randint(100, 200)
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if show_revival and revival_rect and revival_rect.collidepoint(mouse_pos):
-                    return "REVIVE"
-                elif restart_level_rect and restart_level_rect.collidepoint(mouse_pos):
-                    # Restart the current level
-                    # Let main loop handle level restart logic
-                    return "RESTART_LEVEL"
-                elif restart_game_rect and restart_game_rect.collidepoint(mouse_pos):
-                    # Return to main menu
-                    return "MAIN_MENU"
+    # The map behind the dimmed overlay never changes; draw it once
+    screen.fill(BG_COLOR)
+    draw_map()
+    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+    overlay.fill((0, 0, 0, 200))
+    screen.blit(overlay, (0, 0))
+    backdrop = screen.copy()
+
+    hint_text = small_font.render("Seek the scientist's help for another chance...", True, (200, 200, 200))
+    buttons = [rect for rect in (revival_rect, restart_level_rect, restart_game_rect) if rect]
+    hovered = None
+
+    # Button colors
+    button_color = (80, 0, 0, 200)  # Darker red
+    button_hover = (120, 0, 0, 230)  # Brighter red
+    border_color = (200, 0, 0, 200)  # Red border
+
+    def draw(surface):
+        surface.blit(backdrop, (0, 0))
 
-        # Drawing
-        screen.fill(BG_COLOR)
-        
-        # Draw map in background (semi-visible)
-        draw_map()
-        
-        # Draw overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        screen.blit(overlay, (0, 0))
-        
         # Draw title and subtitle
-        screen.blit(title_text, title_rect)
-        screen.blit(sub_text, sub_rect)
+        surface.blit(title_text, title_rect)
+        surface.blit(sub_text, sub_rect)
 
         # Draw revival button with particles if shown
         if show_revival and revival_rect:
             # Draw button background
-            is_hovered = revival_rect.collidepoint(mouse_pos)
-            pygame.draw.rect(screen, (0, 80, 0, 200) if not is_hovered else (0, 120, 0, 230), revival_rect, 0, 10)
-            pygame.draw.rect(screen, (0, 255, 0, 200) if is_hovered else (0, 200, 0, 200), revival_rect, 3, 10)
-            
+            is_hovered = hovered == revival_rect
+            pygame.draw.rect(surface, (0, 80, 0, 200) if not is_hovered else (0, 120, 0, 230), revival_rect, 0, 10)
+            pygame.draw.rect(surface, (0, 255, 0, 200) if is_hovered else (0, 200, 0, 200), revival_rect, 3, 10)
+
             # Draw particles for revival button
             for p in revival_particles:
                 if p['alpha'] > 0:
                     s = pygame.Surface((p['size'], p['size']), pygame.SRCALPHA)
-                    pygame.draw.circle(s, (100, 255, 100, p['alpha']), (p['size']//2, p['size']//2), p['size']//2)
-                    screen.blit(s, (p['x'], p['y']))
-            
+                    pygame.draw.circle(s, (100, 255, 100, int(p['alpha'])), (p['size']//2, p['size']//2), p['size']//2)
+                    surface.blit(s, (p['x'], p['y']))
+
             # Draw button text
-            screen.blit(revival_text, revival_text_rect)
-            
-            # Add hint text
-            hint_text = small_font.render("Seek the scientist's help for another chance...", True, (200, 200, 200))
+            surface.blit(revival_text, revival_text_rect)
+
             # Position the hint text ABOVE the Seek Revival button to ensure it isn't obscured.
             hint_y = revival_rect.top - hint_text.get_height() - 10
-            screen.blit(hint_text, (SCREEN_WIDTH // 2 - hint_text.get_width() // 2, hint_y))
+            surface.blit(hint_text, (SCREEN_WIDTH // 2 - hint_text.get_width() // 2, hint_y))
 
-        # Button colors
-        button_color = (80, 0, 0, 200)  # Darker red
-        button_hover = (120, 0, 0, 230)  # Brighter red
-        border_color = (200, 0, 0, 200)  # Red border
-        
         # Draw Restart Level button if shown
         if restart_level_rect:
-            is_hovered = restart_level_rect.collidepoint(mouse_pos)
-            pygame.draw.rect(screen, button_hover if is_hovered else button_color, restart_level_rect, 0, 10)
-            pygame.draw.rect(screen, border_color, restart_level_rect, 3, 10)
-            screen.blit(restart_level_text, restart_level_text_rect)
-        
+            is_hovered = hovered == restart_level_rect
+            pygame.draw.rect(surface, button_hover if is_hovered else button_color, restart_level_rect, 0, 10)
+            pygame.draw.rect(surface, border_color, restart_level_rect, 3, 10)
+            surface.blit(restart_level_text, restart_level_text_rect)
+
         # Draw Main Menu button
         if restart_game_rect:
-            is_hovered = restart_game_rect.collidepoint(mouse_pos)
-            pygame.draw.rect(screen, button_hover if is_hovered else button_color, restart_game_rect, 0, 10)
-            pygame.draw.rect(screen, border_color, restart_game_rect, 3, 10)
-            screen.blit(restart_game_text, restart_game_text_rect)
+            is_hovered = hovered == restart_game_rect
+            pygame.draw.rect(surface, button_hover if is_hovered else button_color, restart_game_rect, 0, 10)
+            pygame.draw.rect(surface, border_color, restart_game_rect, 3, 10)
+            surface.blit(restart_game_text, restart_game_text_rect)
 
-        pygame.display.flip()
-    
-    return False
+    def particle_area():
+        return pygame.Rect(0, 0, 0, 0).unionall(
+            [pygame.Rect(p['x'], p['y'], p['size'], p['size']) for p in revival_particles])
+
+    # Drawn once, then only the particles and hover changes are redrawn
+    view = idle.IdleScreen(screen, draw)
+    last_step = pygame.time.get_ticks()
+
+    while True:
+        now = pygame.time.get_ticks()
+
+        # Update revival button particles (only if they exist); speeds are per 1/60 s
+        if revival_particles and view.animate(now):
+            step = (now - last_step) * 0.06
+            last_step = now
+            before = particle_area()
+            for p in revival_particles:
+                p['y'] -= p['speed'] * step
+                p['alpha'] -= step
+                if p['alpha'] <= 0 and revival_rect:
+                    p['y'] = random.randint(revival_rect.bottom - 10, revival_rect.bottom)
+                    p['x'] = random.randint(revival_rect.left, revival_rect.right)
+                    p['alpha'] = random.randint(100, 200)
+            view.invalidate(before.union(particle_area()))
+
+        view.present()
+
+        for event in view.wait():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.MOUSEMOTION:
+                mouse_pos = pygame.mouse.get_pos()
+                now_hovered = next((rect for rect in buttons if rect.collidepoint(mouse_pos)), None)
+                if now_hovered != hovered:
+                    view.invalidate(hovered, now_hovered)
+                    hovered = now_hovered
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                mouse_pos = pygame.mouse.get_pos()
+                if show_revival and revival_rect and revival_rect.collidepoint(mouse_pos):
+                    return "REVIVE"
+                elif restart_level_rect and restart_level_rect.collidepoint(mouse_pos):
+                    # Restart the current level
+                    # Let main loop handle level restart logic
+                    return "RESTART_LEVEL"
+                elif restart_game_rect and restart_game_rect.collidepoint(mouse_pos):
+                    # Return to main menu
+                    return "MAIN_MENU"
         
 # -------------------------------------------------------
 # Fake death cut-scene shown after the gods strike you down
@@ -798,8 +755,7 @@ def show_fake_death_screen():
     small_font = pygame.font.Font(None, 36)
 
     # Play the existing game-over sound
-    if game_over_sound:
-        game_over_sound.play()
+    sound_bank.play('game_over')
 
     start_time = pygame.time.get_ticks()
     phase = 0  # 0 = show death for 3s, 1 = overlay quip for 2s
@@ -886,14 +842,7 @@ def show_teleport_and_vision_scene():
     pygame.display.flip()
     
     # Wait for key press to end
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                quit_game()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    waiting = False
+    idle.wait_for_key(on_quit=quit_game)
 
 def show_level_complete():
     font = pygame.font.Font(None, 72)
@@ -908,14 +857,7 @@ def show_level_complete():
     
     pygame.display.flip()
     
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                quit_game()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    waiting = False
+    idle.wait_for_key(on_quit=quit_game)
 
 def show_intro():
     intro_font = pygame.font.Font(None, 42)
@@ -987,14 +929,7 @@ def show_intro():
                     return show_god_dialogue(god_dialogue)
     
     # Wait for player to continue to god dialogue
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                quit_game()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    waiting = False
+    idle.wait_for_key(on_quit=quit_game)
     
     # Show god dialogue
     show_god_dialogue(god_dialogue)
@@ -1056,33 +991,17 @@ def show_god_dialogue(lines):
         pygame.display.flip()
         
         # Wait for player to continue
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    quit_game()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        waiting = False
+        idle.wait_for_key(on_quit=quit_game)
 def run_tutorial():
     # These are used in the function
-    global bullets, player, game_map, current_level_runner, is_throne_room_level, flash_timer, shake_timer
+    global bullets, player, game_map, current_level_runner, is_throne_room_level
     current_level_runner = run_tutorial
+    decals.clear_floor()
     
-    # Initialize sounds with error handling
-    try:
-        shield_hit_sound = pygame.mixer.Sound("assets/music/shield_hit.ogg")
-    except:
-        shield_hit_sound = None
-        print("Warning: Could not load shield_hit.ogg")
-    
-    try:
-        damage_sound = pygame.mixer.Sound("assets/music/player_hurt.ogg")
-    except:
-        damage_sound = None
-        print("Warning: Could not load player_hurt.ogg")
 
     player.reset()
+    bullets.clear()
+    particle_engine.engine.clear()
     game_map = tutorial_map
     spawn_collectibles(game_map)
     is_throne_room_level = False
@@ -1092,8 +1011,12 @@ def run_tutorial():
     player.angle = -math.pi / 2
 
     zombie = Zombie(MAP_WIDTH / 2 * TILE_SIZE, 2 * TILE_SIZE)
-    # Wrap single tutorial zombie into a list so shared shield logic can damage it
-    zombies = [zombie]
+    # The tutorial is the shared combat step with a single zombie
+    world = World(player=player, projectiles=bullets, game_map=game_map)
+    world.add_systems(systems.COMBAT)
+    world.spawn(body=zombie, brain=True, target={},
+                contact={'damage': 1, 'cooldown': 1000, 'shield_drain': 2},
+                loot=lambda world, body: maybe_spawn_medkit(body.x, body.y))
 
     tutorial_font = pygame.font.Font(None, 32)
     
@@ -1105,145 +1028,31 @@ def run_tutorial():
         for event in events:
             if event.type == pygame.QUIT:
                 quit_game()
+        perf_hud.hud.handle(events)
         
-        handle_player_input(player, bullets, events)
+        world.step(dt, events)
 
-        keys = pygame.key.get_pressed()
-        update_player_state(player, keys, game_map, dt)
-        
         # Check for collectible collision
         for collectible in collectibles[:]:
             dist_to_player = math.hypot(player.x - collectible['x'], player.y - collectible['y'])
             if dist_to_player < player.radius + COLLECTIBLE_SIZE / 2:
                 create_collect_effect(collectible['x'], collectible['y'])
-                if collect_sound:
-                    collect_sound.play()
+                sound_bank.play('collect')
                 collectibles.remove(collectible)
-
-        # Update tutorial zombie
-        for z in zombies[:]:
-            if z.is_alive:
-                z.update(player.x, player.y, game_map, dt)
-            else:
-                zombies.remove(z)
-            
-            # Zombie attacks player with damage over time
-            dist_to_player = math.hypot(player.x - zombie.x, player.y - zombie.y)
-            current_time = pygame.time.get_ticks()
-            attack_cooldown = 1000  # 1 second between damage ticks
-            
-            if dist_to_player < player.radius + zombie.radius:
-                if player.is_shielding and player.shield_energy > 0:
-                    # Shield blocks damage but still drains energy
-                    if current_time - zombie.last_attack_time > attack_cooldown:
-                        player.shield_energy = max(0, player.shield_energy - 2)  # Reduced shield drain
-                        zombie.last_attack_time = current_time
-                        if shield_hit_sound is not None:
-                            shield_hit_sound.play()
-                elif current_time - zombie.last_attack_time > attack_cooldown:
-                    # Deal damage over time when not shielding
-                    player.take_damage(1)  # Small amount of damage per tick
-                    zombie.last_attack_time = current_time
-                    if damage_sound is not None:
-                        damage_sound.play()
-
-        # Update bullets and check for hits
-        for bullet in bullets[:]:
-            proj_speed = bullet.get('speed', BULLET_SPEED)
-            bullet['x'] += math.cos(bullet['angle']) * proj_speed * dt
-            # Use per-projectile speed
-            proj_speed = bullet.get('speed', BULLET_SPEED)
-            bullet['y'] += math.sin(bullet['angle']) * proj_speed * dt
-
-            # Shield boomerang behaviour (delegated)
-            if bullet.get('type') == 'shield':
-                from shield_bullet import update_shield_bullet
-                update_shield_bullet(bullet, bullets, dt, game_map, player, zombies if 'zombies' in locals() else None)
-                continue
-            # old shield logic below will be skipped for shield bullets
-            if bullet.get('type') == 'shield':
-                # Record trail
-                trail = bullet['trail']
-                trail.append((bullet['x'], bullet['y']))
-                from settings import SHIELD_TRAIL_MAX_POINTS
-                if len(trail) > SHIELD_TRAIL_MAX_POINTS:
-                    trail.pop(0)
-
-                # Bounce on wall (safe indexing)
-                map_x = int(bullet['x'] / TILE_SIZE)
-                map_y = int(bullet['y'] / TILE_SIZE)
-                if 0 <= map_y < len(game_map) and 0 <= map_x < len(game_map[0]):
-                    map_tile = game_map[map_y][map_x]
-                    if map_tile in ['W', 'P']:
-                        bullet['angle'] = math.atan2(-math.sin(bullet['angle']), -math.cos(bullet['angle']))
-                else:
-                    if bullet.get('type') == 'shield' and bullet.get('owner'):
-                        bullet['owner'].active_shield_throw = False
-                    if bullet in bullets:
-                        bullets.remove(bullet)
-                    continue
-
-                # Bounce off zombies list if available
-                if 'zombies' in locals():
-                    for z in zombies:
-                        if z.is_alive and math.hypot(z.x - bullet['x'], z.y - bullet['y']) < z.radius:
-                            bullet['angle'] = math.atan2(-math.sin(bullet['angle']), -math.cos(bullet['angle']))
-                            bullet['bounces'] = bullet.get('bounces', 0) + 1
-                            if bullet['bounces'] >= 4:
-                                bullet['returning'] = True
-                            if z.take_damage(bullet['damage']):
-                                if player.health <= player.max_health * 0.2:
-                                    collectibles.append({'x': z.x, 'y': z.y, 'type': 'medkit', 'image': collectible_images['medkit']})
-                            break
-                owner = bullet.get('owner')
-                if not owner:
-                    bullets.remove(bullet)
-                    continue
-                if (not bullet.get('returning') and math.hypot(bullet['x'] - bullet['start_x'], bullet['y'] - bullet['start_y']) >= bullet['max_distance']):
-                    bullet['returning'] = True
-                if bullet.get('returning'):
-                    dx = owner.x - bullet['x']
-                    dy = owner.y - bullet['y']
-                    bullet['angle'] = math.atan2(dy, dx)
-                # Catch when close enough – expand radius by distance bullet can travel this frame to avoid tunnelling
-                catch_radius = owner.radius + bullet.get('radius', 10) + bullet.get('speed', BULLET_SPEED) * dt
-                if bullet.get('returning') and math.hypot(owner.x - bullet['x'], owner.y - bullet['y']) < catch_radius:
-                    owner.active_shield_throw = False
-                    bullets.remove(bullet)
-                    continue
-
-            if (bullet['x'] < 0 or bullet['x'] > SCREEN_WIDTH or
-                    bullet['y'] < 0 or bullet['y'] > SCREEN_HEIGHT or
-                    game_map[int(bullet['y'] / TILE_SIZE)][int(bullet['x'] / TILE_SIZE)] in ['W', 'P']):
-                if bullet.get('type') == 'shield' and bullet.get('owner'):
-                     bullet['owner'].active_shield_throw = False
-                bullets.remove(bullet)
-                continue
-
-            if zombie.is_alive:
-                dist_to_zombie = math.hypot(zombie.x - bullet['x'], zombie.y - bullet['y'])
-                if dist_to_zombie < z.radius:
-                    if bullet.get('type') == 'shield':
-                        bullet['angle'] = math.atan2(-math.sin(bullet['angle']), -math.cos(bullet['angle']))
-                    elif hasattr(zombie, 'take_damage'):
-                        if zombie.take_damage(bullet.get('damage', 20)):
-                            # Spawn medkit if player low health
-                            if player.health <= player.max_health * 0.2:
-                                collectibles.append({'x': z.x, 'y': z.y, 'type': 'medkit', 'image': collectible_images['medkit']})
-                            zombie.is_alive = False
-                        if bullet.get('type') == 'shield' and 'owner' in bullet and bullet['owner']:
-                            bullet['owner'].active_shield_throw = False
-                        bullets.remove(bullet)
+        perf_hud.hud.mark('collisions')
 
         # Drawing
         screen.fill(BG_COLOR)
         draw_map()
+        decals.draw_floor(screen)
+        perf_hud.hud.mark('map_draw')
         player.draw(screen)
         draw_collectibles()
         update_and_draw_particles(dt)
         if zombie.is_alive:
             zombie.draw(screen)
         draw_bullets()
+        perf_hud.hud.mark('entity_draw')
         draw_ui_if_needed()
 
         # Tutorial Text - show all controls with styled overlay
@@ -1280,6 +1089,7 @@ def run_tutorial():
         for ts in text_surfs:
             screen.blit(ts, (SCREEN_WIDTH / 2 - ts.get_width() / 2, current_y))
             current_y += line_h + 6
+        perf_hud.hud.mark('ui')
 
         # Win/Loss Condition
         if not zombie.is_alive:
@@ -1290,15 +1100,17 @@ def run_tutorial():
         if player.health <= 0:
             stop_music(fade_out=500)
             # Special ending for dying to tutorial zombie
-            from levels.death_endings import show_tutorial_death_ending
-            show_tutorial_death_ending()
+            levels.get('tutorial_death')()
             # Show standard Game Over screen afterwards
             result = show_game_over_screen(show_restart_level=False)
             running = False
             if result == "MAIN_MENU":
                 return "MAIN_MENU"
 
+        perf_hud.hud.count(entities=world.count('body') + 1, projectiles=len(bullets), particles=len(particle_engine.engine))
+        perf_hud.hud.draw(screen)
         pygame.display.flip()
+        perf_hud.hud.end_frame()
 
     return "COMPLETE"
 
@@ -1310,12 +1122,9 @@ def show_opening_cinematic():
 
     # Load title image
     try:
-        title_img = pygame.image.load('assets/sprites/Battle Aftermath.png').convert_alpha()
-        # Scale down if larger than screen
-        if title_img.get_width() > SCREEN_WIDTH * 0.9 or title_img.get_height() > SCREEN_HEIGHT * 0.9:
-            scale_factor = min((SCREEN_WIDTH * 0.9) / title_img.get_width(), (SCREEN_HEIGHT * 0.9) / title_img.get_height())
-            new_size = (int(title_img.get_width() * scale_factor), int(title_img.get_height() * scale_factor))
-            title_img = pygame.transform.smoothscale(title_img, new_size)
+        # Scaled down to fit 90% of the screen
+        title_img = load_image('assets/sprites/Battle Aftermath.png',
+                               fit=(int(SCREEN_WIDTH * 0.9), int(SCREEN_HEIGHT * 0.9)))
     except Exception:
         # Fallback to simple text if image missing
         title_font = pygame.font.Font(None, 96)
@@ -1324,16 +1133,8 @@ def show_opening_cinematic():
     title_rect = title_img.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
 
     # Play opening sound (non-looping)
-    opening_channel = None
-    opening_sound = None
-    try:
-        opening_sound = pygame.mixer.Sound('assets/music/opening.ogg')
-        opening_sound.set_volume(0.8)
-        opening_channel = pygame.mixer.find_channel(True)
-        if opening_channel:
-            opening_channel.play(opening_sound)
-    except Exception as e:
-        print(f"Warning: Could not play opening sound: {e}")
+    opening_channel = sound_bank.play('opening')
+    opening_sound = sound_bank.bank.get('opening')
 
     start_time = pygame.time.get_ticks()
     # Use length of opening sound; default to 4 s
@@ -1460,10 +1261,12 @@ def run_post_tutorial_scene():
 
 def run_boss_level():
     # These are used in the function
-    global bullets, player, game_map, current_level_runner, is_throne_room_level, flash_timer, shake_timer
+    global bullets, player, game_map, current_level_runner, is_throne_room_level
     current_level_runner = run_boss_level
 
     player.reset()
+    bullets.clear()
+    particle_engine.engine.clear()
     game_map = boss_level_map
     spawn_collectibles(game_map)
     is_throne_room_level = False
@@ -1477,9 +1280,8 @@ def run_boss_level():
 
     # Lists & timers for new boss mechanics
     zombies.clear()  # reset snake minion list
-    # Ground Pound visual timers
-    shake_timer = 0.0
-    flash_timer = 0.0
+    # Ground Pound visual effects
+    postfx.fx.reset()
     poison_timer = 0.0  # time until next poison puddle
 
     # Show the boss tutorial dialogue
@@ -1491,65 +1293,21 @@ def run_boss_level():
 
     play_music("boss_fight.ogg")
     
-    running = True
-    while running:
-        dt = clock.tick(60) / 1000.0
-        
-        events = pygame.event.get()
-        for event in events:
-            if event.type == pygame.QUIT:
-                quit_game()
-        
-        handle_player_input(player, bullets, events)
-
-        keys = pygame.key.get_pressed()
-        update_player_state(player, keys, game_map, dt)
-        boss.update(player.x, player.y, game_map, dt)
-
-        # Decay Ground-Pound visual timers
-        if shake_timer > 0:
-            shake_timer -= dt
-        if flash_timer > 0:
-            flash_timer -= dt
-
-        # ---- Ground Pound impact ----
-        if player.gp_triggered:
-            player.gp_triggered = False
-            GP_RADIUS = 250
-            for zb in zombies:
-                dist = math.hypot(zb.x - player.x, zb.y - player.y)
-                if dist <= GP_RADIUS:
-                    zb.stun_timer = 2.0
-                    if dist > 0:
-                        kx = (zb.x - player.x)/dist * 60
-                        ky = (zb.y - player.y)/dist * 60
-                        zb.x += kx
-                        zb.y += ky
-            shake_timer = 0.4
-            flash_timer = 0.15
-
-        # --- Boss poison trail mechanic ---
+    def python(world, dt):
+        """The python's moves and the poison puddles it leaves behind."""
+        nonlocal poison_timer
+        boss.update(player.x, player.y, world.resources['game_map'], dt)
         poison_timer -= dt
         if poison_timer <= 0:
-            boss.poison_trail.append({'x': boss.segments[0]['x'], 'y': boss.segments[0]['y'], 'timer': boss.max_trail_duration})
+            boss.drop_puddle()
             poison_timer = 0.4  # spawn puddle every 0.4s
 
-        # Damage player if standing in poison puddle
-        for puddle in boss.poison_trail:
-            if math.hypot(player.x - puddle['x'], player.y - puddle['y']) < TILE_SIZE:
-                # Poison puddle inflicts 20 damage per second
-                player.take_damage(20 * dt)
-
-
-
-        # Check for collectible collision
-        for collectible in collectibles[:]:
-            dist_to_player = math.hypot(player.x - collectible['x'], player.y - collectible['y'])
-            if dist_to_player < player.radius + COLLECTIBLE_SIZE / 2:
-                create_collect_effect(collectible['x'], collectible['y'])
-                if collect_sound:
-                    collect_sound.play()
-                collectibles.remove(collectible)
+    def python_hits(world, dt):
+        """Bites, charges and poison on the player; player shots on the python's head."""
+        # Damage player if standing in poison puddles (they stack)
+        poison = boss.poison_trail.damage_at(player.x, player.y)
+        if poison:
+            player.take_damage(poison * dt)
 
         # Boss attacks player
         if boss.state in ['ATTACKING', 'ROAMING']:
@@ -1565,123 +1323,69 @@ def run_boss_level():
                     player.take_damage(PYTHON_CHARGE_DAMAGE)
                     boss.trigger_retreat(player.x, player.y) # Also retreat after a charge hit
                     break
-        
-        # Update bullets and check for hits on boss
-        for bullet in bullets[:]:
-            proj_speed = bullet.get('speed', BULLET_SPEED)
-            bullet['x'] += math.cos(bullet['angle']) * proj_speed * dt
-            # Use per-projectile speed
-            proj_speed = bullet.get('speed', BULLET_SPEED)
-            bullet['y'] += math.sin(bullet['angle']) * proj_speed * dt
-
-            # Shield boomerang behaviour (delegated)
-            if bullet.get('type') == 'shield':
-                from shield_bullet import update_shield_bullet
-                update_shield_bullet(bullet, bullets, dt, game_map, player, zombies if 'zombies' in locals() else None)
-                continue
-            # old shield logic below will be skipped for shield bullets
-            if bullet.get('type') == 'shield':
-                # Record trail
-                trail = bullet['trail']
-                trail.append((bullet['x'], bullet['y']))
-                from settings import SHIELD_TRAIL_MAX_POINTS
-                if len(trail) > SHIELD_TRAIL_MAX_POINTS:
-                    trail.pop(0)
-
-                # Bounce on wall (safe indexing)
-                map_x = int(bullet['x'] / TILE_SIZE)
-                map_y = int(bullet['y'] / TILE_SIZE)
-                if 0 <= map_y < len(game_map) and 0 <= map_x < len(game_map[0]):
-                    map_tile = game_map[map_y][map_x]
-                    if map_tile in ['W', 'P']:
-                        bullet['angle'] = math.atan2(-math.sin(bullet['angle']), -math.cos(bullet['angle']))
-                else:
-                    if bullet.get('type') == 'shield' and bullet.get('owner'):
-                        bullet['owner'].active_shield_throw = False
-                    if bullet in bullets:
-                        bullets.remove(bullet)
-                    continue
-
-                # Bounce off zombies list if available
-                if 'zombies' in locals():
-                    for z in zombies:
-                        if z.is_alive and math.hypot(z.x - bullet['x'], z.y - bullet['y']) < z.radius:
-                            bullet['angle'] = math.atan2(-math.sin(bullet['angle']), -math.cos(bullet['angle']))
-                            bullet['bounces'] = bullet.get('bounces', 0) + 1
-                            if bullet['bounces'] >= 4:
-                                bullet['returning'] = True
-                            if z.take_damage(bullet['damage']):
-                                if player.health <= player.max_health * 0.2:
-                                    collectibles.append({'x': z.x, 'y': z.y, 'type': 'medkit', 'image': collectible_images['medkit']})
-                            break
-                owner = bullet.get('owner')
-                if not owner:
-                    bullets.remove(bullet)
-                    continue
-                if (not bullet.get('returning') and math.hypot(bullet['x'] - bullet['start_x'], bullet['y'] - bullet['start_y']) >= bullet['max_distance']):
-                    bullet['returning'] = True
-                if bullet.get('returning'):
-                    dx = owner.x - bullet['x']
-                    dy = owner.y - bullet['y']
-                    bullet['angle'] = math.atan2(dy, dx)
-                # Catch when close enough – expand radius by distance bullet can travel this frame to avoid tunnelling
-                catch_radius = owner.radius + bullet.get('radius', 10) + bullet.get('speed', BULLET_SPEED) * dt
-                if bullet.get('returning') and math.hypot(owner.x - bullet['x'], owner.y - bullet['y']) < catch_radius:
-                    owner.active_shield_throw = False
-                    bullets.remove(bullet)
-                    continue
-            
-            # Check for collision with walls
-            if (bullet['x'] < 0 or bullet['x'] > SCREEN_WIDTH or
-                bullet['y'] < 0 or bullet['y'] > SCREEN_HEIGHT or
-                game_map[int(bullet['y'] / TILE_SIZE)][int(bullet['x'] / TILE_SIZE)] in ['W', 'P']):
-                if bullet.get('type') == 'shield' and bullet.get('owner'):
-                     bullet['owner'].active_shield_throw = False
-                bullets.remove(bullet)
-                continue
-
-        # --- After bullet loop: reset shield flag if no projectile owned by player ---
-        if player.active_shield_throw and not any(b.get('type')=='shield' and b.get('owner')==player for b in bullets):
-             player.active_shield_throw = False
-
-        # Check for collision with boss
-        # Boss collision with non-shield bullets
-        for bullet in bullets[:]:
-            if boss.state in ['EMERGING', 'ATTACKING', 'ROAMING', 'TELEGRAPHING_CHARGE', 'CHARGING']:
-                 dist_to_head = math.hypot(boss.segments[0]['x'] - bullet['x'], boss.segments[0]['y'] - bullet['y'])
-                 if dist_to_head < TILE_SIZE // 2:
-                     # Non-shield bullets damage boss and disappear
-                     boss.take_damage(PLAYER_BULLET_DAMAGE)
-                     bullets.remove(bullet)
+
+        # Only the head can be hurt, and only while it is above ground
+        if boss.state in ['EMERGING', 'ATTACKING', 'ROAMING', 'TELEGRAPHING_CHARGE', 'CHARGING']:
+            head = boss.segments[0]
+            for i in bullets.hits_circle(head['x'], head['y'], TILE_SIZE // 2, PLAYER).tolist():
+                if bullets.damage[i]:
+                    boss.take_damage(PLAYER_BULLET_DAMAGE)
+                    particle_engine.engine.emit_against('sparks', bullets.x[i], bullets.y[i],
+                                                        bullets.vx[i], bullets.vy[i])
+                bullets.hit(i, recall=True)  # a thrown shield flies home off the python
+
+    # The shared combat step, with the python moving before the shots and biting after them
+    world = World(player=player, projectiles=bullets, game_map=game_map)
+    world.add_systems(systems.COMBAT)
+    world.add_system('movement', python, before=systems.move_projectiles)
+    world.add_system('collision', python_hits)
+
+    # Fixed-rate simulation; the player and python are drawn interpolated (bullets blend themselves)
+    sim = FixedStep()
+    sim.track(lambda: [player, *boss.segments])
+
+    running = True
+    while running:
+        events = pygame.event.get()
+        for event in events:
+            if event.type == pygame.QUIT:
+                quit_game()
+        perf_hud.hud.handle(events)
+
+        for dt, step_events in sim.steps(events):
+            world.step(dt, step_events)
+
+            # Check for collectible collision
+            for collectible in collectibles[:]:
+                dist_to_player = math.hypot(player.x - collectible['x'], player.y - collectible['y'])
+                if dist_to_player < player.radius + COLLECTIBLE_SIZE / 2:
+                    create_collect_effect(collectible['x'], collectible['y'])
+                    sound_bank.play('collect')
+                    collectibles.remove(collectible)
+
+        # Decay Ground-Pound visual timers
+        dt = sim.frame_dt
+        postfx.fx.update(dt)
 
         # Drawing
         screen.fill(BG_COLOR)
         draw_map()
-        player.draw(screen)
-        draw_collectibles()
-        update_and_draw_particles(dt)
-        boss.draw(screen)
-        draw_bullets()
+        perf_hud.hud.mark('map_draw')
+        with sim.interpolated():
+            player.draw(screen)
+            draw_collectibles()
+            update_and_draw_particles(dt)
+            boss.draw(screen)
+            draw_bullets(sim.alpha)
+        perf_hud.hud.mark('entity_draw')
         draw_ui_if_needed()
 
-        # --- Ground-Pound visuals ---
-        if flash_timer > 0:
-            flash_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            flash_surf.fill(WHITE)
-            flash_surf.set_alpha(int(255 * (flash_timer / 0.15)))
-            screen.blit(flash_surf, (0, 0))
-
-        if shake_timer > 0:
-            offset = (random.randint(-6, 6), random.randint(-6, 6))
-            frame_copy = screen.copy()
-            screen.fill((0, 0, 0))
-            screen.blit(frame_copy, offset)
-
         # Boss Health Bar
         boss_health_bar_width = SCREEN_WIDTH - 40
         health_ratio = boss.health / PYTHON_HEALTH
         pygame.draw.rect(screen, BOSS_HEALTH_BAR_BG, (20, 20, boss_health_bar_width, 30))
         pygame.draw.rect(screen, BOSS_HEALTH_BAR_FG, (20, 20, boss_health_bar_width * health_ratio, 30))
+        perf_hud.hud.mark('ui')
 
         # Win/Loss Condition
         if not boss.is_alive:
@@ -1690,8 +1394,7 @@ def run_boss_level():
 
         if player.health <= 0:
             stop_music(fade_out=500)
-            from levels.death_endings import show_python_boss_death_ending
-            show_python_boss_death_ending()
+            levels.get('python_death')()
             # Standard Game Over screen without restart-level
             result = show_game_over_screen(show_restart_level=False)
             if result == "MAIN_MENU":
@@ -1699,20 +1402,13 @@ def run_boss_level():
             running = False
             return "GAME_OVER"
 
-        # --- Ground-Pound visuals (render after all other draws) ---
-        if flash_timer > 0:
-            flash_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            flash_surf.fill(WHITE)
-            flash_surf.set_alpha(int(255 * (flash_timer / 0.15)))
-            screen.blit(flash_surf, (0, 0))
-
-        if shake_timer > 0:
-            offset = (random.randint(-6, 6), random.randint(-6, 6))
-            frame_copy = screen.copy()
-            screen.fill((0, 0, 0))
-            screen.blit(frame_copy, offset)
+        # Flash + shake composited in one pass
+        postfx.fx.apply(screen)
 
+        perf_hud.hud.count(entities=len(boss.segments) + 1, projectiles=len(bullets), particles=len(particle_engine.engine))
+        perf_hud.hud.draw(screen)
         pygame.display.flip()
+        perf_hud.hud.end_frame()
 
 # State variable to track which level is active
 # This is used in the main game loop
@@ -1733,8 +1429,14 @@ def main_game():
     # Main game loop
     running = True
     prev_game_state = None
+    prefetched_state = None
     while running:
         dt = clock.tick(60) / 1000.0
+
+        # Decode what this state and the next ones load in the background
+        if game_state != prefetched_state:
+            prefetch.prefetcher.enter(game_state)
+            prefetched_state = game_state
         
         events = pygame.event.get()
         for event in events:
@@ -1766,7 +1468,7 @@ def main_game():
         
         elif game_state == "ENDLESS":
             game_objects = {'player': player, 'zombies': zombies}
-            result = run_endless_mode(game_objects)
+            result = levels.get('endless')(game_objects)
             player = Player()
             zombies = []
             game_state = "MAIN_MENU" if result == "MAIN_MENU" else result
@@ -1842,7 +1544,7 @@ def main_game():
             
         elif game_state == "SCIENTIST_SAVES":
             # Scientist saves the player in the lab
-            game_objects = show_lab_scene(revival_mode=False)
+            game_objects = levels.get('lab')(revival_mode=False)
             if game_objects and isinstance(game_objects, dict):
                 game_state = "ZOMBIE_BLOOD_QUEST"
             else:
@@ -1851,7 +1553,7 @@ def main_game():
         elif game_state == "ZOMBIE_BLOOD_QUEST":
             # Run the outside area with zombies for blood collection
             # Save level runner & checkpoint for future revivals
-            from levels.outside_area import run_outside_area as run_outside
+            run_outside = levels.get('outside')
             current_level_runner = lambda: run_outside(game_objects)
             last_checkpoint = {
                 "level": current_level_runner,
@@ -1875,7 +1577,7 @@ def main_game():
                 }
                 game_state = "GAME_OVER"
         elif game_state == "RUINED_SANCTUARY":
-            from levels.ruined_sanctuary import run_ruined_sanctuary
+            run_ruined_sanctuary = levels.get('sanctuary')
             # Save level runner & checkpoint for revival
             current_level_runner = run_ruined_sanctuary
             last_checkpoint = {
@@ -1891,7 +1593,7 @@ def main_game():
                 game_state = "GAME_OVER"
         
         elif game_state == "DIVINE_ARENA":
-            from levels.divine_arena import run_divine_arena
+            run_divine_arena = levels.get('arena')
             current_level_runner = run_divine_arena
             last_checkpoint = {
                 "level": current_level_runner,
@@ -1938,7 +1640,7 @@ def main_game():
                 # ----------------------------------------------------
                 # NEW: Dedicated revival flow – send player to scientist
                 # ----------------------------------------------------
-                from levels.outside_area import run_outside_area  # local import to avoid circular deps
+                run_outside_area = levels.get('outside')
 
                 game_objects = show_scientist_revival_scene()
                 if game_objects and isinstance(game_objects, dict):
@@ -2007,8 +1709,7 @@ def main_game():
                 dist_to_player = math.hypot(player.x - collectible['x'], player.y - collectible['y'])
                 if dist_to_player < player.radius + COLLECTIBLE_SIZE / 2:
                     create_collect_effect(collectible['x'], collectible['y'])
-                    if collect_sound:
-                        collect_sound.play()
+                    sound_bank.play('collect')
                     collectibles.remove(collectible)
             
             # Drawing code
@@ -2021,20 +1722,9 @@ def main_game():
             player.draw(screen)
             draw_ui_if_needed()
 
-            # White flash overlay if active
-            if flash_timer > 0:
-                flash_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                flash_surf.fill(WHITE)
-                alpha = int(255 * (flash_timer/0.15))
-                flash_surf.set_alpha(alpha)
-                screen.blit(flash_surf, (0,0))
-
-            # Apply screen shake by offsetting final frame
-            if shake_timer > 0:
-                offset = (random.randint(-6,6), random.randint(-6,6))
-                frame_copy = screen.copy()
-                screen.fill((0,0,0))
-                screen.blit(frame_copy, offset)
+            # Flash + shake composited in one pass
+            postfx.fx.update(dt)
+            postfx.fx.apply(screen)
             
             # Level end check
             dist_to_end = math.hypot(player.x - THRONE_ROOM_END_POS[0], player.y - THRONE_ROOM_END_POS[1])
@@ -2070,26 +1760,40 @@ def quit_game():
     pygame.quit()
     sys.exit()
 
+_menu_font_cache = None
+
+
+def _menu_fonts():
+    """(title, button) fonts for the main menu.
+
+    get_fonts() scans the system fonts (fc-list on Linux), so the lookup
+    runs once instead of twice on every visit to the menu.
+    """
+    global _menu_font_cache
+    if _menu_font_cache is None:
+        bloody = 'bloody' in pygame.font.get_fonts()
+        _menu_font_cache = tuple(pygame.font.Font('assets/fonts/Bloody.otf' if bloody else None, size)
+                                 for size in (100, 60))
+    return _menu_font_cache
+
+
 def show_main_menu():
     # Play background music
     play_music("bgm.ogg")
     
     # Load background image
     try:
-        background_img = pygame.image.load('assets/sprites/background.png').convert()
-        background_img = pygame.transform.scale(background_img, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        background_img = load_image('assets/sprites/background.png', (SCREEN_WIDTH, SCREEN_HEIGHT), convert='opaque')
     except pygame.error as e:
         print(f"Warning: Could not load background image. Error: {e}")
         background_img = None
     
     # Load fonts
-    title_font = pygame.font.Font('assets/fonts/Bloody.otf', 100) if pygame.font.get_fonts().count('bloody') else pygame.font.Font(None, 100)
-    button_font = pygame.font.Font('assets/fonts/Bloody.otf', 60) if pygame.font.get_fonts().count('bloody') else pygame.font.Font(None, 60)
+    title_font, button_font = _menu_fonts()
     
     # Load skull image for selection indicator
     try:
-        skull_img = pygame.image.load('assets/sprites/skull.png').convert_alpha()
-        skull_img = pygame.transform.scale(skull_img, (40, 40))
+        skull_img = load_image('assets/sprites/skull.png', (40, 40))
     except:
         skull_img = None
         print("Warning: Could not load skull image")
@@ -2126,22 +1830,78 @@ def show_main_menu():
         
         return final_surface
         
-    # Main menu loop
+    # Everything but the title and the selection is fixed; compose it once
+    backdrop = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    if background_img:
+        backdrop.blit(background_img, (0, 0))
+    backdrop.blit(overlay, (0, 0))
+    titles = (create_blood_text("ZOMBIE APOCALYPSE", title_font, BLOOD_RED),
+              create_blood_text("BATTLE AFTERMATH", title_font, (200, 0, 0)))
+    button_texts = [button_font.render(label, True, WHITE) for label in ("STORY MODE", "ENDLESS MODE", "EXIT")]
+    button_rects = (start_button_rect, endless_button_rect, exit_button_rect)
+    # The buttons plus the skulls beside the selected one
+    buttons_area = start_button_rect.unionall(button_rects).inflate(120, 0)
+
+    def place_title(now):
+        if not title_toggle:
+            return titles[0].get_rect(midtop=(SCREEN_WIDTH / 2, 100))
+        title_rect = titles[1].get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 3))
+        pulse = math.sin(now * 0.002) * 5
+        title_rect.y += int(pulse)
+        return title_rect
+
+    def draw(surface):
+        surface.blit(backdrop, (0, 0))
+
+        # Draw title with blood effect
+        surface.blit(titles[title_toggle], title_rect)
+
+        # Draw buttons
+        for i, (rect, text) in enumerate(zip(button_rects, button_texts)):
+            pygame.draw.rect(surface, HIGHLIGHT if selected_option == i else BLOOD_RED, rect, 0, 10)
+            surface.blit(text, (rect.centerx - text.get_width()/2, rect.centery - text.get_height()/2))
+
+        # Draw skull indicator if available
+        if skull_img:
+            target_rect = button_rects[selected_option]
+            surface.blit(skull_img, (target_rect.left - 50, target_rect.centery - 20))
+            surface.blit(pygame.transform.flip(skull_img, True, False), (target_rect.right + 10, target_rect.centery - 20))
+
+    def select(option):
+        nonlocal selected_option
+        if option != selected_option:
+            selected_option = option
+            view.invalidate(buttons_area)
+
+    # Main menu loop: drawn once, then only the title and the buttons are redrawn
+    view = idle.IdleScreen(screen, draw)
     title_toggle = False
     last_toggle_time = pygame.time.get_ticks()
     toggle_interval = 3000  # 3 seconds
+    title_rect = place_title(last_toggle_time)
     while True:
         current_time = pygame.time.get_ticks()
-        dt = clock.tick(60) / 1000.0
-        mouse_pos = pygame.mouse.get_pos()
 
-        # Toggle the title every 3 seconds
+        # Toggle the title every 3 seconds; the second one pulses
         if current_time - last_toggle_time > toggle_interval:
             title_toggle = not title_toggle
             last_toggle_time = current_time
+            view.invalidate(title_rect)
+            title_rect = place_title(current_time)
+            view.invalidate(title_rect)
+        if not title_toggle:
+            view.still()
+        elif view.animate(current_time):
+            moved = place_title(current_time)
+            if moved != title_rect:
+                view.invalidate(title_rect, moved)
+                title_rect = moved
+
+        view.present()
+        startup.timeline.menu_frame()
 
         # Event handling
-        for event in pygame.event.get():
+        for event in view.wait(deadline_ms=last_toggle_time + toggle_interval + 1):
             if event.type == pygame.QUIT:
                 return "QUIT"
                 
@@ -2157,74 +1917,29 @@ def show_main_menu():
                         return "QUIT"
                 elif event.key == pygame.K_DOWN or event.key == pygame.K_UP:
                     if event.key == pygame.K_DOWN:
-                        selected_option = (selected_option + 1) % 3
+                        select((selected_option + 1) % 3)
                     else:
-                        selected_option = (selected_option - 1) % 3
+                        select((selected_option - 1) % 3)
             
             # Mouse click handling
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                mouse_pos = pygame.mouse.get_pos()
                 if start_button_rect.collidepoint(mouse_pos):
                     return "START"
                 elif endless_button_rect.collidepoint(mouse_pos):
                     return "ENDLESS"
                 elif exit_button_rect.collidepoint(mouse_pos):
                     return "QUIT"
-        
-        # Update mouse hover only when the mouse actually moves, so arrow-key
-        # navigation is not immediately overridden each frame.
-        if pygame.mouse.get_rel() != (0, 0):
-            if start_button_rect.collidepoint(mouse_pos):
-                selected_option = 0
-            elif endless_button_rect.collidepoint(mouse_pos):
-                selected_option = 1
-            elif exit_button_rect.collidepoint(mouse_pos):
-                selected_option = 2
-        
-        # Draw everything
-        if background_img:
-            screen.blit(background_img, (0, 0))
-        screen.blit(overlay, (0, 0))
 
-        # Draw title with blood effect
-        if not title_toggle:
-            title_text = create_blood_text("ZOMBIE APOCALYPSE", title_font, BLOOD_RED)
-            screen.blit(title_text, (SCREEN_WIDTH/2 - title_text.get_width()/2, 100))
-        else:
-            title_text = create_blood_text("BATTLE AFTERMATH", title_font, (200, 0, 0))
-            title_rect = title_text.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 3))
-            pulse = math.sin(pygame.time.get_ticks() * 0.002) * 5
-            title_rect.y += int(pulse)
-            screen.blit(title_text, title_rect)
-        
-        # Draw buttons
-        pygame.draw.rect(screen, HIGHLIGHT if selected_option == 0 else BLOOD_RED, start_button_rect, 0, 10)
-        pygame.draw.rect(screen, HIGHLIGHT if selected_option == 1 else BLOOD_RED, endless_button_rect, 0, 10)
-        pygame.draw.rect(screen, HIGHLIGHT if selected_option == 2 else BLOOD_RED, exit_button_rect, 0, 10)
-        
-        # Draw button text
-        start_text = button_font.render("STORY MODE", True, WHITE)
-        endless_text = button_font.render("ENDLESS MODE", True, WHITE)
-        exit_text = button_font.render("EXIT", True, WHITE)
-        
-        screen.blit(start_text, (start_button_rect.centerx - start_text.get_width()/2, 
-                                start_button_rect.centery - start_text.get_height()/2))
-        screen.blit(endless_text, (endless_button_rect.centerx - endless_text.get_width()/2, 
-                                  endless_button_rect.centery - endless_text.get_height()/2))
-        screen.blit(exit_text, (exit_button_rect.centerx - exit_text.get_width()/2, 
-                               exit_button_rect.centery - exit_text.get_height()/2))
-        
-        # Draw skull indicator if available
-        if skull_img:
-            if selected_option == 0:
-                target_rect = start_button_rect
-            elif selected_option == 1:
-                target_rect = endless_button_rect
-            else:
-                target_rect = exit_button_rect
-            screen.blit(skull_img, (target_rect.left - 50, target_rect.centery - 20))
-            screen.blit(pygame.transform.flip(skull_img, True, False), (target_rect.right + 10, target_rect.centery - 20))
-        
-        pygame.display.flip()
+            # Update mouse hover only when the mouse actually moves, so arrow-key
+            # navigation is not overridden.
+            if event.type == pygame.MOUSEMOTION:
+                mouse_pos = pygame.mouse.get_pos()
+                for i, rect in enumerate(button_rects):
+                    if rect.collidepoint(mouse_pos):
+                        select(i)
 
 if __name__ == '__main__':
+    startup.timeline.print_on_menu = '--startup-timing' in sys.argv[1:]
+    init()
     main_game()
\ No newline at end of file
@@ -2,22 +2,24 @@ import pygame
 import math
 from settings import (
     PLAYER_SPEED, SPRINT_SPEED, STAMINA_COST, STAMINA_REGEN,
-    SHIELD_DRAIN, SHIELD_REGEN, TILE_SIZE, PLAYER_RADIUS
+    SHIELD_DRAIN, SHIELD_REGEN, TILE_SIZE, PLAYER_RADIUS,
+    GROUND_POUND_RADIUS, GROUND_POUND_STUN, GROUND_POUND_KNOCKBACK
 )
+from spatial_hash import SpatialHash
+from tile_map import compile_map, BLOCKS_PLAYER
 
-def handle_player_input(player, bullets_list, events):
-    """Handles player-specific input events like shooting and reloading."""
+def handle_player_input(player, projectiles, events):
+    """Handles player-specific input events like shooting and reloading.
+
+    Shots and thrown shields are spawned into ``projectiles`` (a Projectiles pool).
+    """
     for event in events:
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE and not player.is_reloading:
-                new_bullet = player.shoot()
-                if new_bullet:
-                    if isinstance(new_bullet, list):
-                        bullets_list.extend(new_bullet)
-                    else:
-                        bullets_list.append(new_bullet)
+                shot = player.shoot()
+                if shot:
+                    projectiles.spawn_volley(shot)
             elif event.key == pygame.K_q:
-                from settings import SHIELD_COOLDOWN_TIME
                 from settings import SHIELD_COOLDOWN_TIME, SHIELD_ENERGY_THROW_RATIO
                 if player.shield_cooldown == 0 and player.shield_energy >= player.max_shield_energy * SHIELD_ENERGY_THROW_RATIO:
                     proj = player.throw_shield()
@@ -25,16 +27,34 @@ def handle_player_input(player, bullets_list, events):
                         player.shield_cooldown = SHIELD_COOLDOWN_TIME
                         # Consume shield energy
                         player.shield_energy = max(0, player.shield_energy - player.max_shield_energy * SHIELD_ENERGY_THROW_RATIO)
-                        bullets_list.append(proj)
-                else:
-                    proj = None
-                if proj:
-                    bullets_list.append(proj)
+                        projectiles.spawn_volley(proj)
             elif event.key == pygame.K_r and not player.is_shielding:
                 player.start_reload()
 
-def update_player_state(player, keys, game_map, dt):
-    """Updates the player's state, including movement, stamina, and shield."""
+def apply_ground_pound(player, targets, grid=None):
+    """Stun and knock back every target within GROUND_POUND_RADIUS of the player.
+
+    `grid` is the level's SpatialHash of `targets` if it has one; otherwise
+    a throwaway grid is built (the ability only fires every 10 seconds).
+    """
+    if grid is None:
+        grid = SpatialHash()
+        grid.rebuild(targets)
+    for t in grid.query_circle(player.x, player.y, GROUND_POUND_RADIUS):
+        dist = math.hypot(t.x - player.x, t.y - player.y)
+        if dist <= GROUND_POUND_RADIUS:
+            t.stun_timer = GROUND_POUND_STUN
+            if dist > 0:
+                t.x += (t.x - player.x) / dist * GROUND_POUND_KNOCKBACK
+                t.y += (t.y - player.y) / dist * GROUND_POUND_KNOCKBACK
+                grid.move(t)
+
+def update_player_state(player, keys, game_map, dt, camera=None):
+    """Updates the player's state, including movement, stamina, and shield.
+
+    On a scrolling map pass the level's ``camera`` so the mouse (screen
+    coordinates) is aimed at in world coordinates.
+    """
     # --- Shield cooldown timer ---
     # --- Cooldowns ---
     if player.shield_cooldown > 0:
@@ -42,6 +62,8 @@ def update_player_state(player, keys, game_map, dt):
     # Shotgun cooldown
     if hasattr(player, 'shotgun_cooldown') and player.shotgun_cooldown > 0:
         player.shotgun_cooldown = max(0, player.shotgun_cooldown - dt)
+    # Blood splatters fade here rather than in Player.draw
+    player.update_blood(dt)
 
     # Movement
     dx, dy = 0, 0
@@ -75,29 +97,25 @@ def update_player_state(player, keys, game_map, dt):
         new_y = player.y + speed * dy * dt
         
         # ------- Safe collision handling with bounds checks -------
-        map_h = len(game_map)
-        map_w = len(game_map[0]) if map_h else 0
+        tiles = compile_map(game_map)
+        map_h, map_w = tiles.rows, tiles.cols
 
         # Check X movement
-        col = int(new_x / TILE_SIZE)
-        row = int(player.y / TILE_SIZE)
-        if 0 <= row < map_h and 0 <= col < map_w:
-            if game_map[row][col] not in ['W', 'P', 'T', 'R']:
-                player.x = new_x
+        if not tiles.blocked_at(new_x, player.y, BLOCKS_PLAYER):
+            player.x = new_x
         # Prevent moving beyond map borders horizontally
         player.x = max(player.radius, min(player.x, (map_w - 1) * TILE_SIZE))
 
         # Check Y movement
-        col = int(player.x / TILE_SIZE)
-        row = int(new_y / TILE_SIZE)
-        if 0 <= row < map_h and 0 <= col < map_w:
-            if game_map[row][col] not in ['W', 'P', 'T', 'R']:
-                player.y = new_y
+        if not tiles.blocked_at(player.x, new_y, BLOCKS_PLAYER):
+            player.y = new_y
         # Prevent moving beyond map borders vertically
         player.y = max(player.radius, min(player.y, (map_h - 1) * TILE_SIZE))
 
     # Update angle to face mouse
     mouse_x, mouse_y = pygame.mouse.get_pos()
+    if camera is not None:
+        mouse_x, mouse_y = camera.to_world(mouse_x, mouse_y)
     player.angle = math.atan2(mouse_y - player.y, mouse_x - player.x)
 
     # -------- Stamina management --------
@@ -0,0 +1,110 @@
+import os
+import threading
+
+import pygame
+
+from settings import MUSIC_FADE_OUT_MS, MUSIC_FADE_IN_MS
+
+
+class Jukebox:
+    """The one place background music is played from.
+
+    Tracks are streamed from disk through pygame.mixer.music, so only the
+    decoder's small buffer is ever resident instead of the whole track as
+    PCM (a three-minute track is ~30 MB decoded).  There is one music stream,
+    so switching tracks fades the old one out and the new one in; the
+    fade-out finishes on a daemon thread, so callers never wait for it.
+    Asking for the track that is already playing (or about to) only
+    changes its volume; it is never started a second time.
+    """
+
+    def __init__(self, directory=os.path.join('assets', 'music'),
+                 fade_out_ms=MUSIC_FADE_OUT_MS, fade_in_ms=MUSIC_FADE_IN_MS):
+        self.directory = directory
+        self.fade_out_ms = fade_out_ms
+        self.fade_in_ms = fade_in_ms
+        self.current = None   # track name streaming now, None when silent or fading out
+        self._pending = None  # (track, volume, loops) waiting for the fade-out
+        self._lock = threading.Condition()
+        self._thread = None
+        self.started = 0
+        self.kept = 0
+
+    # ---------------------- Public API ----------------------
+    def play(self, track, volume=0.5, loop=True):
+        """Stream ``track`` (a file in assets/music), fading from whatever plays now."""
+        if not pygame.mixer.get_init():
+            return
+        request = (track, volume, -1 if loop else 0)
+        with self._lock:
+            if self._pending is not None and self._pending[0] == track:
+                self._pending = request
+                return
+            if track == self.current and pygame.mixer.music.get_busy():
+                pygame.mixer.music.set_volume(volume)
+                self._pending = None
+                self.kept += 1
+                return
+            if not pygame.mixer.music.get_busy():
+                self._pending = None
+                self._start(request)
+                return
+            # Something else is playing (or still fading); swap once it is quiet
+            if self.current is not None:
+                pygame.mixer.music.fadeout(self.fade_out_ms)
+                self.current = None
+            self._pending = request
+            self._lock.notify_all()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='music-fade', daemon=True)
+            self._thread.start()
+
+    def stop(self, fade_out_ms=None):
+        """Fade the music out (and forget any track waiting to start)."""
+        with self._lock:
+            self._pending = None
+            self.current = None
+            if pygame.mixer.get_init():
+                pygame.mixer.music.fadeout(self.fade_out_ms if fade_out_ms is None else fade_out_ms)
+
+    @property
+    def playing(self):
+        """Track playing now or about to start, or None."""
+        pending = self._pending
+        return pending[0] if pending is not None else self.current
+
+    def stats(self):
+        return {'current': self.current, 'pending': self._pending and self._pending[0],
+                'started': self.started, 'kept': self.kept}
+
+    # ---------------------- Internals ----------------------
+    def _start(self, request):
+        track, volume, loops = request
+        path = os.path.join(self.directory, track)
+        try:
+            pygame.mixer.music.unload()  # close the old file and its decoder
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(loops, fade_ms=self.fade_in_ms)
+        except pygame.error as e:
+            print(f"Warning: Could not play music file '{path}'. Error: {e}")
+            self.current = None
+            return
+        self.current = track
+        self.started += 1
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while self._pending is None:
+                    self._lock.wait()
+                if pygame.mixer.get_init() and pygame.mixer.music.get_busy():
+                    self._lock.wait(0.02)
+                    continue
+                request, self._pending = self._pending, None
+                if pygame.mixer.get_init():
+                    self._start(request)
+
+
+# Shared instance; main.play_music() and the levels go through it
+jukebox = Jukebox()
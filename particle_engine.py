@@ -0,0 +1,243 @@
+import math
+
+import numpy as np
+import pygame
+
+from settings import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, GOD_GOLD, DIALOGUE_TEXT_COLOR, PARTICLE_CAPACITY,
+    PARTICLE_CULL_MARGIN
+)
+
+# Named emitters.  Velocities are either a box (``vx``/``vy`` ranges) or
+# polar (``speed`` range, ``angle`` +- ``spread``/2, radians); ``jitter``
+# scatters the spawn point by up to that many pixels on each axis.
+# ``size`` is the square's side or the dot's diameter.
+EMITTERS = {
+    # Sparkle burst when something is picked up
+    'collect': {'count': 20, 'vx': (-150, 150), 'vy': (-150, 150), 'life': (0.2, 0.5),
+                'size': (3, 3), 'shape': 'square', 'colors': (WHITE, GOD_GOLD, DIALOGUE_TEXT_COLOR)},
+    # Glowing ash drifting up from the bottom edge (endless mode)
+    'ember': {'count': 1, 'jitter': (SCREEN_WIDTH / 2, 0), 'vx': (0, 0), 'vy': (-120, -50),
+              'life': (1.5, 3.0), 'size': (2, 6), 'shape': 'dot',
+              'colors': ((255, 120, 0), (255, 180, 50), (255, 80, 0))},
+    # Ground Pound shockwave kicking up the floor
+    'dust': {'count': 60, 'speed': (80, 260), 'angle': 0.0, 'spread': 2 * math.pi, 'jitter': (12, 12),
+             'life': (0.3, 0.8), 'size': (2, 4), 'shape': 'square', 'drag': 3.0,
+             'colors': ((120, 105, 90), (150, 135, 115), (95, 85, 75))},
+    # Shot hitting something
+    'sparks': {'count': 8, 'speed': (120, 320), 'angle': 0.0, 'spread': 2 * math.pi,
+               'life': (0.08, 0.25), 'size': (2, 2), 'shape': 'square', 'drag': 6.0, 'gravity': 300.0,
+               'colors': ((255, 230, 120), (255, 170, 40), WHITE)},
+}
+
+_SHAPES = ('square', 'dot')
+
+
+class ParticleEngine:
+    """Fixed-capacity structure-of-arrays particle store.
+
+    Particles are purely cosmetic, so update() and draw() run once per
+    rendered frame with the frame time.  Integration, drag, gravity and
+    expiry are array operations over the live slots ``[0, n)``; dead
+    particles are squeezed out with one boolean mask per frame.  Drawing
+    writes the pixels of every particle of one size and shape with a
+    single array assignment (blits() of cached sprites on surfaces that
+    are not 32-bit).  Bursts that do not fit in the remaining capacity are cut
+    short rather than growing the arrays.
+
+    Positions are in screen coordinates unless a level scrolls: then they
+    are world coordinates, update() culls against the camera's ``bounds``
+    and draw() takes the camera.
+    """
+
+    FIELDS = (('x', np.float32), ('y', np.float32), ('vx', np.float32), ('vy', np.float32),
+              ('life', np.float32), ('drag', np.float32), ('gravity', np.float32), ('key', np.int64))
+
+    def __init__(self, capacity=PARTICLE_CAPACITY, emitters=EMITTERS):
+        self.capacity = capacity
+        self.emitters = emitters
+        self.n = 0
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self._sprites = {}  # key -> Surface, for _blit_sprites()
+        self._stamps = {}   # size/shape bits -> pixel offsets, for _stamp_pixels()
+        self._stream = {}   # emitter name -> fractional particles owed by stream()
+
+    def __len__(self):
+        return self.n
+
+    def clear(self):
+        self.n = 0
+        self._stream = {}
+
+    # ---------------------- Emitting ----------------------
+    def emit(self, name, x, y, count=None, angle=None):
+        """Spawn a burst from emitter ``name`` at (x, y); returns how many fit.
+
+        ``count`` overrides the emitter's count and ``angle`` its polar
+        direction (e.g. sparks flying back along a shot).
+        """
+        spec = self.emitters[name]
+        count = min(spec['count'] if count is None else count, self.capacity - self.n)
+        if count <= 0:
+            return 0
+        s = slice(self.n, self.n + count)
+        rand = np.random.random
+        jx, jy = spec.get('jitter', (0, 0))
+        self.x[s] = x + (rand(count) * 2 - 1) * jx
+        self.y[s] = y + (rand(count) * 2 - 1) * jy
+        if 'speed' in spec:
+            direction = spec['angle'] if angle is None else angle
+            a = direction + (rand(count) - 0.5) * spec['spread']
+            speed = _uniform(spec['speed'], count)
+            self.vx[s] = np.cos(a) * speed
+            self.vy[s] = np.sin(a) * speed
+        else:
+            self.vx[s] = _uniform(spec['vx'], count)
+            self.vy[s] = _uniform(spec['vy'], count)
+        self.life[s] = _uniform(spec['life'], count)
+        self.drag[s] = spec.get('drag', 0.0)
+        self.gravity[s] = spec.get('gravity', 0.0)
+        lo, hi = spec['size']
+        size = np.random.randint(lo, hi + 1, count)
+        colors = np.array([_pack(c) for c in spec['colors']], dtype=np.int64)
+        color = colors[np.random.randint(len(colors), size=count)]
+        self.key[s] = (color << 16) | (size << 1) | _SHAPES.index(spec['shape'])
+        self.n += count
+        return count
+
+    def emit_against(self, name, x, y, vx, vy, count=None):
+        """Burst from ``name`` thrown back against the velocity (vx, vy), e.g. a shot's impact."""
+        return self.emit(name, x, y, count, angle=math.atan2(-vy, -vx))
+
+    def stream(self, name, rate, dt, x, y):
+        """Emit ``rate`` particles per second from ``name``, carrying the
+        fraction over between frames so the density does not depend on fps."""
+        owed = self._stream.get(name, 0.0) + rate * dt
+        count = int(owed)
+        self._stream[name] = owed - count
+        for _ in range(count):
+            self.emit(name, x, y)
+
+    # ---------------------- Simulation ----------------------
+    def update(self, dt, bounds=None):
+        """Advance every particle by ``dt``; those past ``bounds`` (x0, y0, x1, y1,
+        the screen by default) by more than PARTICLE_CULL_MARGIN are dropped."""
+        n = self.n
+        if not n:
+            return
+        vx, vy = self.vx[:n], self.vy[:n]
+        drag = self.drag[:n]
+        if drag.any():
+            damp = np.maximum(0.0, 1.0 - drag * dt)
+            vx *= damp
+            vy *= damp
+        vy += self.gravity[:n] * dt
+        x, y = self.x[:n], self.y[:n]
+        x += vx * dt
+        y += vy * dt
+        life = self.life[:n]
+        life -= dt
+
+        x0, y0, x1, y1 = bounds or (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        m = PARTICLE_CULL_MARGIN
+        keep = (life > 0) & (x > x0 - m) & (x < x1 + m) & (y > y0 - m) & (y < y1 + m)
+        live = int(np.count_nonzero(keep))
+        if live < n:
+            for name, _ in self.FIELDS:
+                arr = getattr(self, name)
+                arr[:live] = arr[:n][keep]
+            self.n = live
+
+    # ---------------------- Drawing ----------------------
+    def draw(self, screen, camera=None):
+        n = self.n
+        if not n:
+            return
+        origin = (camera.x, camera.y) if camera is not None else (0, 0)
+        unique, inverse = np.unique(self.key[:n], return_inverse=True)
+        if screen.get_bytesize() == 4:
+            self._stamp_pixels(screen, unique, inverse, origin)
+        else:
+            self._blit_sprites(screen, unique, inverse, origin)
+
+    def _stamp_pixels(self, screen, unique, inverse, origin):
+        """Write every particle straight into the 32-bit surface: one fancy
+        assignment per size/shape, colours mapped once per key."""
+        n = self.n
+        color = np.array([screen.map_rgb(_unpack(key >> 16)) for key in unique.tolist()],
+                         dtype=np.uint32)[inverse]
+        stamp = self.key[:n] & 0xFFFF
+        x = self.x[:n].astype(np.intp) - origin[0]
+        y = self.y[:n].astype(np.intp) - origin[1]
+        w, h = screen.get_size()
+        pixels = pygame.surfarray.pixels2d(screen)
+        try:
+            for s in np.unique(unique & 0xFFFF).tolist():
+                sel = np.flatnonzero(stamp == s)
+                dx, dy = self._offsets(s)
+                px = (x[sel, None] + dx).ravel()
+                py = (y[sel, None] + dy).ravel()
+                c = np.repeat(color[sel], len(dx))
+                on = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+                pixels[px[on], py[on]] = c[on]
+        finally:
+            del pixels  # unlocks the surface
+
+    def _offsets(self, stamp):
+        """Pixel offsets from a particle's centre covering its square or dot."""
+        offsets = self._stamps.get(stamp)
+        if offsets is None:
+            size = max(1, stamp >> 1)
+            dy, dx = np.mgrid[0:size, 0:size]
+            dx, dy = dx.ravel() - size // 2, dy.ravel() - size // 2
+            if _SHAPES[stamp & 1] == 'dot':
+                r = size / 2
+                inside = (dx + 0.5 - size % 2 * 0.5) ** 2 + (dy + 0.5 - size % 2 * 0.5) ** 2 <= r * r
+                dx, dy = dx[inside], dy[inside]
+            offsets = self._stamps[stamp] = (dx, dy)
+        return offsets
+
+    def _blit_sprites(self, screen, unique, inverse, origin):
+        """Fallback for surfaces that are not 32-bit: one blits() call with
+        a pre-rendered sprite per key."""
+        n = self.n
+        sprites = [self._sprite(key) for key in unique.tolist()]
+        half = (unique >> 1 & 0x7FFF) // 2
+        px = (self.x[:n].astype(np.int64) - half[inverse] - origin[0]).tolist()
+        py = (self.y[:n].astype(np.int64) - half[inverse] - origin[1]).tolist()
+        screen.blits(zip(map(sprites.__getitem__, inverse.tolist()), zip(px, py)), doreturn=False)
+
+    def _sprite(self, key):
+        surf = self._sprites.get(key)
+        if surf is None:
+            rgb = _unpack(key >> 16)
+            size = max(1, (key >> 1) & 0x7FFF)
+            surf = pygame.Surface((size, size))
+            if _SHAPES[key & 1] == 'square':
+                surf.fill(rgb)
+            else:
+                # Colorkeyed dot; black never appears in the particle palettes
+                surf.fill((0, 0, 0))
+                surf.set_colorkey((0, 0, 0))
+                pygame.draw.circle(surf, rgb, (size // 2, size // 2), max(1, size // 2))
+            self._sprites[key] = surf
+        return surf
+
+
+def _uniform(bounds, count):
+    lo, hi = bounds
+    return lo + np.random.random(count) * (hi - lo)
+
+
+def _pack(color):
+    r, g, b = color[:3]
+    return (r << 16) | (g << 8) | b
+
+
+def _unpack(color):
+    return (color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF
+
+
+# Shared instance; levels emit into it and draw it once per frame
+engine = ParticleEngine()
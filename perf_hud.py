@@ -0,0 +1,187 @@
+import time
+from collections import deque
+
+import pygame
+
+import sound_bank
+from settings import PERF_HUD_HISTORY, PERF_HUD_AVERAGE, PERF_HUD_BUDGET_MS, WHITE
+
+# Sections every level loop reports, in display order
+SECTIONS = ('input', 'player', 'zombies', 'bullets', 'collisions',
+            'map_draw', 'entity_draw', 'ui', 'flip')
+
+_SECTION_COLORS = {
+    'input': (120, 120, 120), 'player': (80, 160, 255), 'zombies': (90, 200, 90),
+    'bullets': (255, 210, 60), 'collisions': (255, 130, 40), 'map_draw': (150, 100, 220),
+    'entity_draw': (230, 80, 160), 'ui': (80, 220, 220), 'flip': (200, 200, 200),
+}
+
+
+class PerfHUD:
+    """F3 overlay with a frame-time graph and per-section timings.
+
+    Level loops call the hooks in order each frame:
+
+        events = pygame.event.get()
+        perf_hud.hud.handle(events)        # F3 toggle; closes the 'input' lap
+        ...update...  hud.mark('player') / hud.mark('zombies') / ...
+        ...draw...    hud.mark('map_draw') / hud.mark('entity_draw') / hud.mark('ui')
+        hud.count(entities=..., projectiles=..., particles=...)
+        hud.draw(screen)
+        pygame.display.flip()
+        hud.end_frame()                    # closes the 'flip' lap
+
+    mark() is a lap timer: it charges the time since the previous hook to
+    ``name`` (summed when a section runs several times per frame, as in
+    fixed-step loops).  While the overlay is off every hook returns on its
+    first line.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.frames = deque(maxlen=PERF_HUD_HISTORY)  # total ms per frame
+        self.sections = {name: deque(maxlen=PERF_HUD_AVERAGE) for name in SECTIONS}
+        self.counters = {}
+        self._current = {}
+        self._lap = 0.0
+        self._frame_start = 0.0
+        self._sounds_at_start = 0
+        self._surfaces = 0
+        self._font = None
+        self._text = []     # cached rendered lines, refreshed a few times a second
+        self._text_age = 0
+        self._saved = []
+
+    # ---------------------- Hooks ----------------------
+    def handle(self, events):
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.toggle()
+        if not self.enabled:
+            return
+        self.mark('input')
+
+    def mark(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._current[name] = self._current.get(name, 0.0) + (now - self._lap) * 1000.0
+        self._lap = now
+
+    def count(self, **counters):
+        if not self.enabled:
+            return
+        self.counters.update(counters)
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.mark('flip')
+        now = time.perf_counter()
+        self.frames.append((now - self._frame_start) * 1000.0)
+        for name in SECTIONS:
+            self.sections[name].append(self._current.get(name, 0.0))
+        self.counters['surfaces'] = self._surfaces
+        self.counters['sounds'] = sound_bank.bank.played - self._sounds_at_start
+        self._start_frame(now)
+
+    # ---------------------- Toggle ----------------------
+    def toggle(self):
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.frames.clear()
+            for samples in self.sections.values():
+                samples.clear()
+            self._install_counters()
+            self._start_frame(time.perf_counter())
+        else:
+            self._remove_counters()
+
+    def _start_frame(self, now):
+        self._frame_start = self._lap = now
+        self._current = {}
+        self._surfaces = 0
+        self._sounds_at_start = sound_bank.bank.played
+
+    def _install_counters(self):
+        """Count Surfaces made by pygame.Surface(), Font.render and pygame.transform."""
+        hud = self
+
+        class CountedSurface(pygame.Surface):
+            def __init__(self, *args, **kwargs):
+                hud._surfaces += 1
+                super().__init__(*args, **kwargs)
+
+        class CountedFont(pygame.font.Font):
+            def render(self, *args, **kwargs):
+                hud._surfaces += 1
+                return super().render(*args, **kwargs)
+
+        def counted(fn):
+            def wrapper(*args, **kwargs):
+                hud._surfaces += 1
+                return fn(*args, **kwargs)
+            return wrapper
+
+        self._patch(pygame, 'Surface', CountedSurface)
+        self._patch(pygame.font, 'Font', CountedFont)
+        for name in ('rotate', 'rotozoom', 'scale', 'smoothscale', 'flip'):
+            self._patch(pygame.transform, name, counted(getattr(pygame.transform, name)))
+
+    def _remove_counters(self):
+        for owner, name, value in reversed(self._saved):
+            setattr(owner, name, value)
+        self._saved = []
+
+    def _patch(self, owner, name, value):
+        self._saved.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, value)
+
+    # ---------------------- Overlay ----------------------
+    def draw(self, screen):
+        if not self.enabled:
+            return
+        if self._font is None:
+            self._font = pygame.font.Font(None, 20)
+        x, y, w, h = 10, 10, 300, 90
+        panel = (x - 6, y - 6, w + 12, h + 24 + 16 * (len(SECTIONS) + 2))
+        pygame.draw.rect(screen, (0, 0, 0), panel)
+        pygame.draw.rect(screen, (90, 90, 90), panel, 1)
+
+        # Frame-time graph; the guide line is the 60 fps budget
+        scale = h / (PERF_HUD_BUDGET_MS * 3)
+        budget_y = y + h - PERF_HUD_BUDGET_MS * scale
+        pygame.draw.line(screen, (0, 120, 0), (x, budget_y), (x + w, budget_y))
+        if len(self.frames) > 1:
+            step = w / (PERF_HUD_HISTORY - 1)
+            points = [(x + i * step, y + h - min(ms * scale, h)) for i, ms in enumerate(self.frames)]
+            pygame.draw.lines(screen, WHITE, False, points)
+
+        # Stacked bar of the averaged sections under the graph
+        averages = {name: sum(s) / len(s) if s else 0.0 for name, s in self.sections.items()}
+        total = sum(averages.values()) or 1.0
+        bx = x
+        for name in SECTIONS:
+            bw = w * averages[name] / total
+            pygame.draw.rect(screen, _SECTION_COLORS[name], (bx, y + h + 6, bw, 10))
+            bx += bw
+
+        # Text is re-rendered a few times a second, not every frame
+        self._text_age -= 1
+        if self._text_age <= 0:
+            self._text_age = 15
+            frame_ms = sum(self.frames) / len(self.frames) if self.frames else 0.0
+            lines = [(f"frame {frame_ms:5.2f} ms  ({1000 / frame_ms if frame_ms else 0:4.0f} fps)", WHITE)]
+            lines += [(f"{name:<12}{averages[name]:6.2f} ms", _SECTION_COLORS[name]) for name in SECTIONS]
+            lines.append(("  ".join(f"{k} {v}" for k, v in sorted(self.counters.items())), WHITE))
+            self._text = [self._font.render(text, True, color) for text, color in lines]
+        ty = y + h + 22
+        for surf in self._text:
+            screen.blit(surf, (x, ty))
+            ty += 16
+        # The overlay's own cost is not charged to any section
+        self._lap = time.perf_counter()
+
+
+# Shared instance; toggled with F3 from any level
+hud = PerfHUD()
@@ -1,28 +1,20 @@
 import pygame
 import math
 import random
+from asset_cache import load_image
+import sound_bank
+from rotation_atlas import get_atlas
+import decals
+from tile_map import compile_map, BLOCKS_WALKERS
+from projectiles import volley, BULLET, SHIELD, PLAYER
 
-# Initialize mixer with more channels for simultaneous sounds
-pygame.mixer.init(frequency=44100, size=-16, channels=8)  # Increased channels from default 2 to 8
-
-# Load sounds (safe load)
-try:
-    hurt_sound = pygame.mixer.Sound("assets/music/player_hurt.ogg")
-    hurt_sound.set_volume(0.7)  # Adjust volume as needed
-except Exception:
-    hurt_sound = None
-try:
-    shield_hit_sound = pygame.mixer.Sound("assets/music/shield_hit.ogg")
-    shield_hit_sound.set_volume(0.7)  # Adjust volume as needed
-except Exception:
-    shield_hit_sound = None
 from settings import (
     PLAYER_START_X, PLAYER_START_Y, PLAYER_START_ANGLE, PLAYER_SPEED,
     PLAYER_SPRINT_SPEED, PLAYER_ROT_SPEED, MAX_HEALTH, MAX_STAMINA,
     PLAYER_RADIUS, PLAYER_MAX_AMMO, PLAYER_MAX_SHIELD_ENERGY, PLAYER_IMAGE_SIZE,
     PLAYER_RELOAD_TIME, PLAYER_BULLET_DAMAGE,
     STAMINA_DEPLETION_RATE, STAMINA_SPRINT_PENALTY_DURATION, STAMINA_REGEN_RATE,
-    TILE_SIZE, HERO_BLOOD_COLOR
+    HERO_BLOOD_COLOR
 )
 
 class Player:
@@ -69,41 +61,20 @@ class Player:
         import os
         try:
             img_path = os.path.join(os.path.dirname(__file__), 'assets', 'sprites', 'shield.png')
-            shield_img = pygame.image.load(img_path).convert_alpha()
             from settings import SHIELD_IMAGE_SIZE
-            self.shield_image = pygame.transform.scale(shield_img, (SHIELD_IMAGE_SIZE, SHIELD_IMAGE_SIZE))
+            self.shield_image = load_image(img_path, (SHIELD_IMAGE_SIZE, SHIELD_IMAGE_SIZE), owner=self)
         except Exception as e:
             print(f"[Shield] Failed to load shield image: {e}")
             self.shield_image = None
 
-        # Sound FX
-        try:
-            self.shotgun_sound = pygame.mixer.Sound("assets/music/shotgun.ogg")
-            self.shotgun_sound.set_volume(0.9)  # Louder for impact
-        except pygame.error as e:
-            print(f"Warning: Could not load shotgun sound. Error: {e}")
-            self.shotgun_sound = None
-        try:
-            self.reload_sound = pygame.mixer.Sound("assets/music/reload.ogg")
-            self.reload_sound.set_volume(0.6)  # Slightly quieter
-        except pygame.error as e:
-            print(f"Warning: Could not load reload sound. Error: {e}")
-            self.reload_sound = None
-
-        # Chainsaw sound for shield throw
-        try:
-            self.chainsaw_sound = pygame.mixer.Sound("assets/music/chainsaw.ogg")
-            self.chainsaw_sound.set_volume(0.8)
-        except pygame.error as e:
-            print(f"Warning: Could not load chainsaw sound. Error: {e}")
-            self.chainsaw_sound = None
+        # Sound FX are played through sound_bank; None keeps the clip's default volume
+        self.shotgun_volume = None
 
         # Blood splatters (for visual effects when player is hit)
         self.blood_splatters = []   # Each is {'x', 'y', 'r', 'timer'}
 
         try:
-            self.original_image = pygame.image.load('assets/sprites/hero.png').convert_alpha()
-            self.original_image = pygame.transform.scale(self.original_image, (PLAYER_IMAGE_SIZE, PLAYER_IMAGE_SIZE))
+            self.original_image = load_image('assets/sprites/hero.png', (PLAYER_IMAGE_SIZE, PLAYER_IMAGE_SIZE), owner=self)
         except pygame.error as e:
             print(f"Warning: Could not load player image. Error: {e}")
             self.original_image = None
@@ -136,7 +107,7 @@ class Player:
         self.sprint_speed *= 0.75
 
     def shoot(self):
-        """Fire the shotgun. Returns a list of pellet dictionaries or None if unable."""
+        """Fire the shotgun. Returns a volley of pellets or None if unable."""
         from settings import SHOTGUN_PELLETS, SHOTGUN_SPREAD_DEGREES, SHOTGUN_PELLET_DAMAGE, BULLET_SPEED
         if self.shotgun_cooldown > 0:
             return None
@@ -144,28 +115,11 @@ class Player:
             self.ammo -= 1
             self.shotgun_cooldown = self.shotgun_cooldown_time
             # Play sound
-            if self.shotgun_sound:
-                try:
-                    channel = pygame.mixer.find_channel(True)
-                    if channel:
-                        channel.play(self.shotgun_sound)
-                    else:
-                        self.shotgun_sound.stop(); self.shotgun_sound.play()
-                except Exception:
-                    pass
-            pellets = []
+            sound_bank.play('shotgun', self.shotgun_volume)
             spread_rad = math.radians(SHOTGUN_SPREAD_DEGREES)
-            for _ in range(SHOTGUN_PELLETS):
-                offset = random.uniform(-spread_rad, spread_rad)
-                pellets.append({
-                    'x': self.x,
-                    'y': self.y,
-                    'angle': self.angle + offset,
-                    'damage': SHOTGUN_PELLET_DAMAGE,
-                    'speed': BULLET_SPEED,
-                    'sprite': 'pellet',
-                })
-            return pellets
+            angles = [self.angle + random.uniform(-spread_rad, spread_rad) for _ in range(SHOTGUN_PELLETS)]
+            return volley(self.x, self.y, angles, BULLET_SPEED, kind=BULLET, owner=PLAYER,
+                          damage=SHOTGUN_PELLET_DAMAGE)
         elif self.ammo == 0 and not self.is_reloading:
             self.start_reload()
         return None
@@ -174,8 +128,7 @@ class Player:
         if not self.is_reloading and self.ammo < PLAYER_MAX_AMMO:
             self.is_reloading = True
             self.reload_timer = PLAYER_RELOAD_TIME
-            if self.reload_sound:
-                self.reload_sound.play()
+            sound_bank.play('reload')
 
     def finish_reload(self):
         self.is_reloading = False
@@ -183,7 +136,7 @@ class Player:
 
     # ---------------- Shield Throw Ability -----------------
     def throw_shield(self):
-        """Launch the shield as a boomerang projectile. Returns dict or None if already active."""
+        """Launch the shield as a boomerang projectile. Returns a volley or None if already active."""
         if self.active_shield_throw or self.is_reloading:
             return None
         from settings import SHIELD_SPEED, SHIELD_MAX_DISTANCE, SHIELD_DAMAGE
@@ -191,34 +144,11 @@ class Player:
         self.active_shield_throw = True
 
         # Play chainsaw sound effect on shield throw
-        if hasattr(self, 'chainsaw_sound') and self.chainsaw_sound:
-            try:
-                channel = pygame.mixer.find_channel(True)
-                if channel:
-                    channel.play(self.chainsaw_sound)
-                else:
-                    # Fallback – stop and replay on existing channel
-                    self.chainsaw_sound.stop()
-                    self.chainsaw_sound.play()
-            except Exception as e:
-                print(f"Error playing chainsaw sound: {e}")
-        return {
-            'type': 'shield',
-            'x': self.x,
-            'y': self.y,
-            'start_x': self.x,
-            'start_y': self.y,
-            'angle': self.angle,
-            'speed': SHIELD_SPEED,
-            'radius': self.radius + 6,
-            'damage': SHIELD_DAMAGE,
-            'boomerang': True,
-            'returning': False,
-            'max_distance': SHIELD_MAX_DISTANCE,
-            'owner': self,
-            'trail': [],
-            'bounces': 0
-        }
+        sound_bank.play('chainsaw')
+        # The shield turns back once it has flown SHIELD_MAX_DISTANCE
+        return volley(self.x, self.y, self.angle, SHIELD_SPEED, kind=SHIELD, owner=PLAYER,
+                      damage=SHIELD_DAMAGE, radius=self.radius + 6,
+                      lifetime=SHIELD_MAX_DISTANCE / SHIELD_SPEED, holder=self)
 
 
 
@@ -258,58 +188,47 @@ class Player:
         dx = math.cos(self.angle) * speed
         dy = math.sin(self.angle) * speed
 
+        tiles = compile_map(game_map)
         # Check y movement
         new_y = self.y + dy
-        if 0 <= new_y < len(game_map) * TILE_SIZE:
-            target_row = int(new_y / TILE_SIZE)
-            col = int(self.x / TILE_SIZE)
-            if game_map[target_row][col] not in ['W', 'P']:
-                self.y += dy
+        if new_y >= 0 and not tiles.blocked_at(self.x, new_y, BLOCKS_WALKERS):
+            self.y += dy
         # Check x movement
         new_x = self.x + dx
-        if 0 <= new_x < len(game_map[0]) * TILE_SIZE:
-            target_col = int(new_x / TILE_SIZE)
-            row = int(self.y / TILE_SIZE)
-            if game_map[row][target_col] not in ['W', 'P']:
-                self.x += dx
+        if new_x >= 0 and not tiles.blocked_at(new_x, self.y, BLOCKS_WALKERS):
+            self.x += dx
 
     def take_damage(self, amount):
         if self.is_invincible:
             return
         if self.is_shielding:
-            if shield_hit_sound:
-                shield_hit_sound.play()
+            sound_bank.play('shield_hit')
             self.shield_energy -= amount * 2  # Shield takes more damage
             if self.shield_energy < 0:
                 self.health += self.shield_energy  # Overflow damage
                 self.shield_energy = 0
         else:
-            if hurt_sound:
-                hurt_sound.play()
+            sound_bank.play('player_hurt')
             self.health -= amount
         if self.health <= 0:
             self.health = 0
             # Player death is handled in the main game loop
 
+    def update_blood(self, dt):
+        """Fade hero blood splatters and drop expired ones."""
+        if self.blood_splatters:
+            for splat in self.blood_splatters:
+                splat['timer'] -= dt
+            self.blood_splatters = [s for s in self.blood_splatters if s['timer'] > 0]
+
     def draw(self, screen):
-        # Draw hero blood splatters first
-        for splat in self.blood_splatters[:]:
-            blood_surf = pygame.Surface((splat['r']*2, splat['r']*2), pygame.SRCALPHA)
-            color = HERO_BLOOD_COLOR[:3] + (int(HERO_BLOOD_COLOR[3] * (splat['timer']/0.5)),)
-            pygame.draw.circle(blood_surf, color, (splat['r'], splat['r']), splat['r'])
-            screen.blit(blood_surf, (splat['x']-splat['r'], splat['y']-splat['r']))
-            
-            # Update and remove old splatters
-            splat['timer'] -= 0.02
-            if splat['timer'] <= 0:
-                self.blood_splatters.remove(splat)
+        # Draw hero blood splatters first (faded in update_blood)
+        decals.draw_splatters(screen, self.blood_splatters, HERO_BLOOD_COLOR, 0.5)
 
         # Draw player image if it exists
         if self.original_image:
-            # The angle needs to be converted to degrees and inverted for pygame's rotation system
-            rotated_image = pygame.transform.rotate(self.original_image, -math.degrees(self.angle))
-            rotated_rect = rotated_image.get_rect(center=(self.x, self.y))
-            screen.blit(rotated_image, rotated_rect)
+            # Pre-rotated frames shared by every Player instance
+            get_atlas(self.original_image).blit(screen, self.angle, self.x, self.y)
             
             # Draw shield icon when active
             if self.is_shielding:
@@ -0,0 +1,102 @@
+import random
+
+import pygame
+
+from settings import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK,
+    FLASH_DURATION, SHAKE_DURATION, SHAKE_MAGNITUDE
+)
+
+
+class PostFX:
+    """Screen flash, tinted fog and screen shake shared by every level.
+
+    The full-screen overlays are allocated once and only their alpha
+    changes per frame.  Shake is a per-frame camera ``offset``; apply()
+    moves the finished frame in place with Surface.scroll instead of
+    copying it, so flash and shake together cost one blend and one scroll.
+
+    Levels call update(dt) once per frame, draw_fog() under the entities
+    if they want a tint, and apply() right before display.flip().
+    """
+
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.size = size
+        self._flash = None
+        self._fog = {}  # rgb -> Surface
+        self.offset = (0, 0)
+        self.reset()
+
+    def reset(self):
+        """Clear running effects; levels call this when they start."""
+        self.flash_timer = 0.0
+        self.flash_duration = FLASH_DURATION
+        self.shake_timer = 0.0
+        self.shake_magnitude = SHAKE_MAGNITUDE
+        self.offset = (0, 0)
+
+    # ---------------------- Triggers ----------------------
+    def flash(self, duration=FLASH_DURATION):
+        self.flash_timer = self.flash_duration = duration
+
+    def shake(self, duration=SHAKE_DURATION, magnitude=SHAKE_MAGNITUDE):
+        self.shake_timer = duration
+        self.shake_magnitude = magnitude
+
+    def ground_pound(self):
+        """Flash + shake used by the player's Ground Pound in every level."""
+        self.shake()
+        self.flash()
+
+    # ---------------------- Per frame ----------------------
+    def update(self, dt):
+        if self.flash_timer > 0:
+            self.flash_timer -= dt
+        if self.shake_timer > 0:
+            self.shake_timer -= dt
+        if self.shake_timer > 0:
+            m = self.shake_magnitude
+            self.offset = (random.randint(-m, m), random.randint(-m, m))
+        else:
+            self.offset = (0, 0)
+
+    def draw_fog(self, screen, color, alpha):
+        """Blend a full-screen ``color`` tint at ``alpha`` onto the frame."""
+        fog = self._fog.get(color)
+        if fog is None:
+            fog = self._fog[color] = self._overlay(color)
+        fog.set_alpha(alpha)
+        screen.blit(fog, (0, 0))
+
+    def apply(self, screen):
+        """Composite the flash and shift the frame by the shake offset."""
+        if self.flash_timer > 0:
+            if self._flash is None:
+                self._flash = self._overlay(WHITE)
+            self._flash.set_alpha(int(255 * (self.flash_timer / self.flash_duration)))
+            screen.blit(self._flash, (0, 0))
+
+        dx, dy = self.offset
+        if dx or dy:
+            screen.scroll(dx, dy)
+            w, h = screen.get_size()
+            # Fill the strips uncovered by the scroll
+            if dx > 0:
+                screen.fill(BLACK, (0, 0, dx, h))
+            elif dx < 0:
+                screen.fill(BLACK, (w + dx, 0, -dx, h))
+            if dy > 0:
+                screen.fill(BLACK, (0, 0, w, dy))
+            elif dy < 0:
+                screen.fill(BLACK, (0, h + dy, w, -dy))
+
+    def _overlay(self, color):
+        surf = pygame.Surface(self.size)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        surf.fill(color)
+        return surf
+
+
+# Shared instance; one post-processing pass per frame
+fx = PostFX()
@@ -0,0 +1,201 @@
+import threading
+from collections import deque
+
+import pygame
+
+from asset_cache import cache, image_key, decode_image
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_IMAGE_SIZE, ZOMBIE_IMAGE_SIZE, SHIELD_IMAGE_SIZE
+from special_zombies import ACID_SPITTER_SIZE, JUGGERNAUT_SIZE
+
+# Full-screen stills are fitted to the screen; the title leaves a margin
+_FULL_SCREEN = (SCREEN_WIDTH, SCREEN_HEIGHT)
+_TITLE = (int(SCREEN_WIDTH * 0.9), int(SCREEN_HEIGHT * 0.9))
+_COLLECTIBLE = (20, 20)  # COLLECTIBLE_SIZE in main.py and the levels
+
+
+def _image(name, size=None, convert='alpha', fit=None):
+    return image_key(f'assets/sprites/{name}', size, convert, fit)
+
+
+def _sprite(name, size):
+    return _image(name, (size, size))
+
+
+# Assets each game state (main.main_game) loads, exactly as its code asks
+# the cache for them, including the endings shown when the player dies there
+MANIFESTS = {
+    'MAIN_MENU': (
+        _image('background.png', _FULL_SCREEN, convert='opaque'),
+        _sprite('skull.png', 40),
+    ),
+    'TUTORIAL': (
+        _sprite('hero.png', PLAYER_IMAGE_SIZE),
+        _sprite('shield.png', SHIELD_IMAGE_SIZE),
+        _sprite('zombies.png', ZOMBIE_IMAGE_SIZE),
+        _image('collection1.png', _COLLECTIBLE),
+        _image('collection2.png', _COLLECTIBLE),
+        _image('collection3.png', _COLLECTIBLE),
+        _image('medkit.png', _COLLECTIBLE),
+        _image('Battle Aftermath.png', fit=_TITLE),
+        _image('ending4.png', fit=_FULL_SCREEN),
+    ),
+    'BOSS_FIGHT': (
+        _image('ending3.png', fit=_FULL_SCREEN),
+    ),
+    'SCIENTIST_SAVES': (
+        _sprite('scientist.png', 20),
+        _sprite('collection3.png', 20),
+    ),
+    'ZOMBIE_BLOOD_QUEST': (
+        _sprite('zombies.png', ZOMBIE_IMAGE_SIZE),
+        _image('collection4.png'),
+        _image('crate.png'),
+        _image('ending2.png', fit=_FULL_SCREEN),
+    ),
+    'RUINED_SANCTUARY': (
+        _sprite('dragon.png', 140),
+    ),
+    'DIVINE_ARENA': (
+        _sprite('corrupted_god.png', 160),
+        _image('medkit.png', _COLLECTIBLE),
+        _image('ending.png'),
+    ),
+    'ENDLESS': (
+        _sprite('zombies.png', ZOMBIE_IMAGE_SIZE),
+        _sprite('acid_spitter.png', ACID_SPITTER_SIZE),
+        _sprite('juggernaut.png', JUGGERNAUT_SIZE),
+        _image('collection5.png', _COLLECTIBLE),
+    ),
+}
+
+# States that usually follow each state; their assets are decoded while
+# the current one (often just dialogue) is on screen
+UPCOMING = {
+    'MAIN_MENU': ('TUTORIAL', 'ENDLESS'),
+    'FAMILY_STORY': ('TUTORIAL',),
+    'GOD_SUMMON': ('TUTORIAL',),
+    'TUTORIAL': ('BOSS_FIGHT',),
+    'BOSS_FIGHT': ('SCIENTIST_SAVES',),
+    'FAKE_DEATH': ('SCIENTIST_SAVES',),
+    'SCIENTIST_SAVES': ('ZOMBIE_BLOOD_QUEST',),
+    'ZOMBIE_BLOOD_QUEST': ('RUINED_SANCTUARY',),
+    'RUINED_SANCTUARY': ('DIVINE_ARENA',),
+    'DIVINE_ARENA': ('MAIN_MENU',),
+    'FINAL_SCENE': ('MAIN_MENU',),
+    'ENDLESS': ('MAIN_MENU',),
+    'GAME_OVER': ('ZOMBIE_BLOOD_QUEST', 'MAIN_MENU'),
+}
+
+
+class Prefetcher:
+    """Background thread that decodes the assets a scene is about to load.
+
+    enter() queues the manifest of the state being entered and of the
+    states after it; pin() adds assets wanted whatever the state (the
+    sound effects).  A daemon thread decodes (and scales) them one by one
+    and parks the results; when the scene asks the AssetCache for one,
+    the cache claims it here and only does the display-format conversion
+    on the main thread.  Asking for an asset that is being decoded waits
+    for it rather than decoding it twice; one still queued is dropped from
+    the queue and loaded the usual way.  Decoded assets nobody wanted by
+    the next enter() are thrown away, so at most a couple of scenes' worth
+    is ever held outside the cache.
+    """
+
+    def __init__(self, cache=cache, manifests=MANIFESTS, upcoming=UPCOMING):
+        self.cache = cache
+        self.manifests = manifests
+        self.upcoming = upcoming
+        self._lock = threading.Condition()
+        self._queue = deque()
+        self._busy = None    # key the thread is decoding
+        self._ready = {}     # key -> decoded Surface / Sound
+        self._thread = None
+        self._pinned = []    # keys wanted whatever the scene, until they reach the cache
+        self._scenes = ()
+        self.decoded = 0
+        self.claimed = 0
+        self.discarded = 0
+        cache.prefetcher = self
+
+    def enter(self, state):
+        """Prefetch what ``state`` and the states after it load."""
+        self.prefetch(state, *self.upcoming.get(state, ()))
+
+    def pin(self, keys):
+        """Keep decoding ``keys`` across scene changes until the cache has them.
+
+        They are queued right after the current scene's own manifest.
+        """
+        self._pinned.extend(key for key in keys if key not in self._pinned)
+        self.prefetch(*self._scenes)
+
+    def prefetch(self, *scenes):
+        """Queue the manifests of ``scenes``, in order, replacing the old queue."""
+        self._scenes = scenes
+        self._pinned = [key for key in self._pinned if key not in self.cache]
+        keys = [key for scene in scenes[:1] for key in self.manifests.get(scene, ())]
+        keys += self._pinned
+        keys += [key for scene in scenes[1:] for key in self.manifests.get(scene, ())]
+        wanted = []
+        for key in keys:
+            if key not in wanted and key not in self.cache:
+                wanted.append(key)
+        with self._lock:
+            for key in [k for k in self._ready if k not in wanted]:
+                del self._ready[key]
+                self.discarded += 1
+            self._queue = deque(k for k in wanted if k not in self._ready and k != self._busy)
+            self._lock.notify_all()
+        if self._queue and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='asset-prefetch', daemon=True)
+            self._thread.start()
+
+    def claim(self, key):
+        """Hand over the decoded asset for ``key``, or None if the caller should load it itself."""
+        with self._lock:
+            if key in self._queue:
+                self._queue.remove(key)
+                return None
+            while self._busy == key:
+                self._lock.wait()
+            asset = self._ready.pop(key, None)
+            if asset is not None:
+                self.claimed += 1
+            return asset
+
+    def stats(self):
+        with self._lock:
+            return {'queued': len(self._queue), 'ready': len(self._ready), 'decoded': self.decoded,
+                    'claimed': self.claimed, 'discarded': self.discarded}
+
+    # ---------------------- Worker ----------------------
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._queue:
+                    self._lock.wait()
+                key = self._busy = self._queue.popleft()
+            try:
+                asset = _decode(key)
+            except Exception:
+                asset = None  # the scene's own load reports the error
+            with self._lock:
+                self._busy = None
+                if asset is not None:
+                    self._ready[key] = asset
+                    self.decoded += 1
+                self._lock.notify_all()
+
+
+def _decode(key):
+    if key[0] == 'image':
+        _, path, size, _, fit = key
+        return decode_image(path, size, fit)
+    if pygame.mixer.get_init():
+        return pygame.mixer.Sound(key[1])
+    return None
+
+
+# Shared instance; main_game calls prefetcher.enter() on every state change
+prefetcher = Prefetcher()
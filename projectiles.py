@@ -0,0 +1,315 @@
+import math
+
+import numpy as np
+import pygame
+
+from asset_cache import load_image
+from tile_map import BLOCKS_PROJECTILES
+from settings import (
+    TILE_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT, BULLET_COLOR, BULLET_RADIUS, PLAYER_BULLET_DAMAGE,
+    SHIELD_DAMAGE, PELLET_SPRITE_SIZE
+)
+
+# Which side fired a projectile; hit tests only look at one side
+PLAYER, ENEMY = 0, 1
+
+# Flag bits
+DEAD = 1        # dropped by the next compact()
+RETURNING = 2   # shield flying back to its holder
+
+# Defaults per kind.  Only the shield behaves differently (shield_bullet.py);
+# every other kind flies straight and differs in looks and numbers only.
+# A kind with a ``sprite`` that loads is drawn with it instead of a circle.
+PROJECTILE_KINDS = (
+    {'name': 'bullet', 'color': BULLET_COLOR, 'radius': BULLET_RADIUS, 'damage': PLAYER_BULLET_DAMAGE,
+     'sprite': 'assets/sprites/shotgun_pellet.png', 'size': PELLET_SPRITE_SIZE},
+    {'name': 'acid', 'color': (0, 255, 0), 'radius': 4, 'damage': 10},
+    {'name': 'orb', 'color': (255, 50, 50), 'radius': 5, 'damage': 5},
+    {'name': 'shield', 'color': (0, 180, 255), 'radius': 12, 'damage': SHIELD_DAMAGE},
+)
+BULLET, ACID, ORB, SHIELD = range(len(PROJECTILE_KINDS))
+
+SCREEN_BOUNDS = (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+
+def volley(x, y, angles, speed, kind=ORB, owner=ENEMY, damage=None, radius=None, color=None,
+           lifetime=math.inf, holder=None):
+    """Describe a group of projectiles fired together, for Projectiles.spawn_volley().
+
+    Guns, spitters and bosses return one of these per shot instead of a
+    dict per projectile.  ``x``, ``y`` and ``angles`` may each be a number
+    or a sequence; they are broadcast against each other.  ``holder`` is
+    the object a shield flies back to.
+    """
+    return {'type': 'volley', 'x': x, 'y': y, 'angles': angles, 'speed': speed, 'kind': kind,
+            'owner': owner, 'damage': damage, 'radius': radius, 'color': color,
+            'lifetime': lifetime, 'holder': holder}
+
+
+class Projectiles:
+    """Pooled structure-of-arrays store for every projectile in a level.
+
+    Each projectile is one slot in a set of NumPy arrays (position,
+    velocity, radius, damage, owner, kind, flags, lifetime); update() moves
+    and culls the whole pool with a few array operations.  Slots ``[0, n)``
+    are live.  Hits only set the DEAD flag; compact() then swap-removes the
+    flagged slots once per step, so indices stay valid until then.
+
+    Shields keep a little per-projectile state (trail, bounces, holder) in
+    ``extra``, keyed by the slot's ``ident``, which survives the swaps.
+    """
+
+    FIELDS = (('x', np.float64), ('y', np.float64), ('prev_x', np.float64), ('prev_y', np.float64),
+              ('vx', np.float64), ('vy', np.float64), ('radius', np.float64), ('damage', np.float64),
+              ('lifetime', np.float64), ('owner', np.int8), ('kind', np.int8), ('flags', np.uint8),
+              ('color', np.int32), ('ident', np.int64))
+
+    def __init__(self, kinds=PROJECTILE_KINDS, capacity=256):
+        self.kinds = kinds
+        self.n = 0
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.extra = {}
+        self._next_ident = 0
+        self._sprites = {}  # (color << 8) | radius -> circle Surface; -1 - kind -> kind sprite
+        self._has_sprite = None
+
+    def __len__(self):
+        return self.n
+
+    def clear(self):
+        for state in self.extra.values():
+            _release(state)
+        self.n = 0
+        self.extra = {}
+
+    # ---------------------- Spawning ----------------------
+    def spawn_many(self, x, y, angles, speed, kind=ORB, owner=ENEMY, damage=None, radius=None, color=None,
+                   lifetime=math.inf):
+        """Add one projectile per element of the broadcast (x, y, angles); returns the first slot."""
+        x, y, angles = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64),
+                                           np.asarray(angles, dtype=np.float64))
+        x, y, angles = x.ravel(), y.ravel(), angles.ravel()
+        count = len(angles)
+        start = self.n
+        while start + count > len(self.x):
+            self._grow()
+        s = slice(start, start + count)
+        k = self.kinds[kind]
+        self.x[s] = self.prev_x[s] = x
+        self.y[s] = self.prev_y[s] = y
+        self.vx[s] = np.cos(angles) * speed
+        self.vy[s] = np.sin(angles) * speed
+        self.radius[s] = k['radius'] if radius is None else radius
+        self.damage[s] = k['damage'] if damage is None else damage
+        self.lifetime[s] = lifetime
+        self.owner[s] = owner
+        self.kind[s] = kind
+        self.flags[s] = 0
+        self.color[s] = _pack(k['color'] if color is None else color)
+        self.ident[s] = np.arange(self._next_ident, self._next_ident + count)
+        self._next_ident += count
+        self.n += count
+        return start
+
+    def spawn(self, x, y, angle, speed, **kwargs):
+        """spawn_many() for a single projectile; returns its slot."""
+        return self.spawn_many(x, y, angle, speed, **kwargs)
+
+    def spawn_volley(self, v):
+        """Spawn everything described by a volley() dict."""
+        start = self.spawn_many(v['x'], v['y'], v['angles'], v['speed'], v['kind'], v['owner'],
+                                v['damage'], v['radius'], v['color'], v['lifetime'])
+        if v['kind'] == SHIELD:
+            for ident in self.ident[start:self.n].tolist():
+                self.extra[ident] = {'holder': v['holder'], 'trail': [], 'bounces': 0}
+        return start
+
+    # ---------------------- Simulation ----------------------
+    def update(self, dt, tiles=None, bounds=SCREEN_BOUNDS):
+        """Move every projectile one step and flag the finished ones DEAD.
+
+        A projectile is finished when its lifetime runs out, it leaves
+        ``bounds`` (x0, y0, x1, y1) or it enters a BLOCKS_PROJECTILES tile of
+        ``tiles`` (a TileMap).  Shields are never culled here; they bounce
+        and fly home instead (shield_bullet.update_shield).
+        """
+        n = self.n
+        if not n:
+            return
+        x, y = self.x[:n], self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        x += self.vx[:n] * dt
+        y += self.vy[:n] * dt
+        life = self.lifetime[:n]
+        life -= dt
+
+        x0, y0, x1, y1 = bounds
+        done = (life <= 0) | (x < x0) | (x > x1) | (y < y0) | (y > y1)
+        if tiles is not None:
+            done |= tiles.blocked_cells((x // TILE_SIZE).astype(np.int64), (y // TILE_SIZE).astype(np.int64),
+                                        BLOCKS_PROJECTILES)
+        shields = self.kind[:n] == SHIELD
+        self.flags[:n][done & ~shields] |= DEAD
+
+        if shields.any():
+            from shield_bullet import update_shield
+            for i in np.flatnonzero(shields).tolist():
+                update_shield(self, i, dt, tiles)
+
+    # ---------------------- Hits ----------------------
+    def alive(self, owner=None):
+        """Slots not yet flagged DEAD, optionally only those fired by ``owner``."""
+        n = self.n
+        keep = (self.flags[:n] & DEAD) == 0
+        if owner is not None:
+            keep &= self.owner[:n] == owner
+        return np.flatnonzero(keep)
+
+    def hits_circle(self, x, y, radius, owner):
+        """Live slots fired by ``owner`` overlapping the circle at (x, y)."""
+        n = self.n
+        dx, dy = self.x[:n] - x, self.y[:n] - y
+        reach = self.radius[:n] + radius
+        touching = (dx * dx + dy * dy < reach * reach) & (self.owner[:n] == owner)
+        return np.flatnonzero(touching & ((self.flags[:n] & DEAD) == 0))
+
+    def kill(self, i):
+        """Flag slot(s) ``i`` DEAD; they are removed by compact()."""
+        self.flags[i] |= DEAD
+
+    def hit(self, i, recall=False):
+        """Spend slot ``i`` on a target: bullets are killed, shields bounce off.
+
+        With ``recall`` a shield instead heads home and deals no more damage,
+        for targets too big to bounce clear of (bosses).
+        """
+        if self.kind[i] != SHIELD:
+            self.flags[i] |= DEAD
+        elif recall:
+            self.flags[i] |= RETURNING
+            self.damage[i] = 0
+        else:
+            self.bounce(i)
+
+    def bounce(self, i):
+        """Reverse slot ``i``; a shield heads home after its fourth bounce."""
+        self.vx[i] = -self.vx[i]
+        self.vy[i] = -self.vy[i]
+        state = self.extra.get(int(self.ident[i]))
+        if state is not None:
+            state['bounces'] += 1
+            if state['bounces'] >= 4:
+                self.flags[i] |= RETURNING
+
+    def compact(self):
+        """Swap-remove every slot flagged DEAD; returns how many were removed."""
+        n = self.n
+        dead = (self.flags[:n] & DEAD) != 0
+        removed = int(np.count_nonzero(dead))
+        if not removed:
+            return 0
+        if self.extra:
+            for ident in self.ident[:n][dead].tolist():
+                state = self.extra.pop(ident, None)
+                if state is not None:
+                    _release(state)
+        live = n - removed
+        # Live slots past the new end fill the dead slots before it
+        holes = np.flatnonzero(dead[:live])
+        movers = live + np.flatnonzero(~dead[live:])
+        if len(holes):
+            for name, _ in self.FIELDS:
+                arr = getattr(self, name)
+                arr[holes] = arr[movers]
+        self.n = live
+        return removed
+
+    # ---------------------- Drawing ----------------------
+    def draw(self, screen, alpha=1.0, camera=None):
+        """Draw the pool ``alpha`` of the way from the last step's start to its end.
+
+        With a ``camera`` only the projectiles in its view are drawn.
+        """
+        n = self.n
+        if not n:
+            return
+        x, y = self.x[:n], self.y[:n]
+        if alpha < 1.0:
+            x = self.prev_x[:n] + (x - self.prev_x[:n]) * alpha
+            y = self.prev_y[:n] + (y - self.prev_y[:n]) * alpha
+        shields = self.kind[:n] == SHIELD
+        seen = np.ones(n, dtype=bool)
+        origin = (0, 0)
+        if camera is not None:
+            # Shields always draw: their trail can be on screen while they are not
+            seen = camera.visible(x, y) | shields
+            x, y = x - camera.x, y - camera.y
+            origin = (camera.x, camera.y)
+
+        # Everything else: one blits() call, with the kind's sprite or a cached circle per colour and size
+        plain = np.flatnonzero(~shields & seen)
+        if len(plain):
+            self._load_sprites()
+            kind = self.kind[plain].astype(np.int64)
+            keys = np.where(self._has_sprite[kind], -1 - kind,
+                            (self.color[plain].astype(np.int64) << 8) | self.radius[plain].astype(np.int64))
+            unique, inverse = np.unique(keys, return_inverse=True)
+            sprites = [self._sprite(key) for key in unique.tolist()]
+            half = np.array([surf.get_width() // 2 for surf in sprites], dtype=np.int64)[inverse]
+            px = (x[plain].astype(np.int64) - half).tolist()
+            py = (y[plain].astype(np.int64) - half).tolist()
+            screen.blits(zip(map(sprites.__getitem__, inverse.tolist()), zip(px, py)), doreturn=False)
+
+        if shields.any():
+            from shield_bullet import draw_shield
+            for i in np.flatnonzero(shields).tolist():
+                draw_shield(screen, self, i, x[i], y[i], origin)
+
+    def _load_sprites(self):
+        if self._has_sprite is not None:
+            return
+        has_sprite = []
+        for kind, k in enumerate(self.kinds):
+            image = None
+            if k.get('sprite'):
+                try:
+                    image = load_image(k['sprite'], (k['size'], k['size']), owner=self)
+                except Exception:
+                    pass
+            if image is not None:
+                self._sprites[-1 - kind] = image
+            has_sprite.append(image is not None)
+        self._has_sprite = np.array(has_sprite, dtype=bool)
+
+    def _sprite(self, key):
+        surf = self._sprites.get(key)
+        if surf is None:
+            r = key & 0xFF
+            c = key >> 8
+            surf = pygame.Surface((2 * r + 1, 2 * r + 1))
+            surf.fill((255, 0, 255))
+            surf.set_colorkey((255, 0, 255))
+            pygame.draw.circle(surf, ((c >> 16) & 0xFF, (c >> 8) & 0xFF, c & 0xFF), (r, r), r)
+            self._sprites[key] = surf
+        return surf
+
+    # ---------------------- Internals ----------------------
+    def _grow(self):
+        for name, _ in self.FIELDS:
+            arr = getattr(self, name)
+            grown = np.zeros(len(arr) * 2, dtype=arr.dtype)
+            grown[:len(arr)] = arr
+            setattr(self, name, grown)
+
+
+def _pack(color):
+    return (color[0] << 16) | (color[1] << 8) | color[2]
+
+
+def _release(state):
+    # A removed shield is back in its holder's hands
+    holder = state.get('holder')
+    if holder is not None:
+        holder.active_shield_throw = False
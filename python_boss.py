@@ -8,12 +8,69 @@ from settings import (
     PYTHON_ATTACK_TIME, CHANCE_TO_CHARGE, CHANCE_TO_BURROW,
     PYTHON_ROAMING_TIME_MIN, PYTHON_ROAMING_TIME_MAX,
     PYTHON_CHARGE_SPEED_MULTIPLIER, PYTHON_STUN_DURATION,
-    PYTHON_RETREAT_SPEED_MULTIPLIER, POISON_TRAIL_COLOR, DUST_COLOR,
+    PYTHON_RETREAT_SPEED_MULTIPLIER, POISON_PUDDLE_DPS, DUST_COLOR,
     PYTHON_TELEGRAPH_COLOR, SCREEN_WIDTH, SCREEN_HEIGHT, PYTHON_CHARGE_COLOR,
     PYTHON_SHADOW_COLOR, PYTHON_STRIPE_COLOR, PYTHON_BODY_COLOR,
     PYTHON_HEAD_COLOR, PYTHON_ENRAGED_HEAD_COLOR, PYTHON_STUN_EYE_COLOR,
-    PYTHON_EYE_COLOR, PYTHON_RETREAT_DURATION, PYTHON_CHARGE_TELEGRAPH_TIME
+    PYTHON_EYE_COLOR, PYTHON_RETREAT_DURATION, PYTHON_CHARGE_TELEGRAPH_TIME,
+    PYTHON_FX_ALPHA_STEPS, PYTHON_CHARGE_TRAIL_INTERVAL
 )
+from tile_map import compile_map, BLOCKS_BOSS, STUNS_BOSS
+from hazard_field import HazardField, POISON
+
+
+class _BossSprites:
+    """Pre-rendered dust, shadow, telegraph and eye-glow sprites.
+
+    Built once and shared by every PythonBoss; fading effects pick one of
+    PYTHON_FX_ALPHA_STEPS pre-faded copies instead of allocating a Surface.
+    """
+
+    def __init__(self):
+        dust = pygame.Surface((TILE_SIZE*1.3, TILE_SIZE*1.3), pygame.SRCALPHA)
+        pygame.draw.circle(dust, DUST_COLOR, (int(TILE_SIZE*0.65),int(TILE_SIZE*0.65)), int(TILE_SIZE*0.65))
+        self.dust = self._fades(dust)
+
+        self.shadow = pygame.Surface((TILE_SIZE, TILE_SIZE//2), pygame.SRCALPHA)
+        pygame.draw.ellipse(self.shadow, PYTHON_SHADOW_COLOR, (0, 0, TILE_SIZE, TILE_SIZE//2))
+
+        self.telegraph = pygame.Surface((TILE_SIZE * 2, TILE_SIZE * 2), pygame.SRCALPHA)
+        pygame.draw.circle(self.telegraph, PYTHON_TELEGRAPH_COLOR, (TILE_SIZE, TILE_SIZE), TILE_SIZE)
+
+        self.stun_glow = pygame.Surface((24,24), pygame.SRCALPHA)
+        pygame.draw.circle(self.stun_glow, PYTHON_STUN_EYE_COLOR, (12,12), 12)
+        self.stun_glow.set_alpha(120)
+        self.enraged_glow = pygame.Surface((22,22), pygame.SRCALPHA)
+        pygame.draw.circle(self.enraged_glow, (255,42,42), (11,11), 11)
+        self.enraged_glow.set_alpha(110)
+
+        # Scratch buffer for the charge line; only the line's bounding rect
+        # is cleared and blitted each frame
+        self.charge_line = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+
+    @staticmethod
+    def _fades(surface):
+        frames = []
+        for step in range(PYTHON_FX_ALPHA_STEPS + 1):
+            frame = surface.copy()
+            frame.set_alpha(255 * step // PYTHON_FX_ALPHA_STEPS)
+            frames.append(frame)
+        return frames
+
+    @staticmethod
+    def fade(frames, alpha):
+        step = round(alpha * PYTHON_FX_ALPHA_STEPS / 255)
+        return frames[max(0, min(PYTHON_FX_ALPHA_STEPS, step))]
+
+
+_sprites = None
+
+
+def _boss_sprites():
+    global _sprites
+    if _sprites is None:
+        _sprites = _BossSprites()
+    return _sprites
 
 class PythonBoss:
     def __init__(self):
@@ -30,9 +87,10 @@ class PythonBoss:
         self.charge_target_angle = 0
         self.is_enraged = False
 
-        self.poison_trail = []   # List of dicts {x, y, timer}
+        self.poison_trail = HazardField()  # Poison puddles; the level hurts the player from it
         self.dust_effects = []   # List of dicts {x, y, timer}
         self.max_trail_duration = 2.5 # seconds poison puddle lasts
+        self.charge_trail_timer = 0.0  # time until the enraged charge drops its next puddle
         self.max_dust_duration = 0.6  # seconds
         self.consecutive_charges = 0  # For multi-charge
         self.max_consecutive_charges = 1  # Start with 1, increase if enraged
@@ -52,7 +110,7 @@ class PythonBoss:
             if self.state != 'DEFEATED':
                 self.state = 'DEFEATED'
                 # Clear any active effects when defeated
-                self.poison_trail = []
+                self.poison_trail.clear()
                 self.dust_effects = []
             return  # Don't update anything if not alive
 
@@ -64,11 +122,8 @@ class PythonBoss:
             self.speed *= PYTHON_ENRAGE_SPEED_MULTIPLIER
             self.max_consecutive_charges = 3
 
-        # Clean old poison puddles
-        self.poison_trail = [p for p in self.poison_trail if p['timer'] > 0]
-        # Decay their timers
-        for p in self.poison_trail:
-            p['timer'] -= dt
+        # Age poison puddles
+        self.poison_trail.update(dt)
 
         # Clean dust effects
         self.dust_effects = [d for d in self.dust_effects if d['timer'] > 0]
@@ -141,9 +196,7 @@ class PythonBoss:
             next_y = self.segments[0]['y'] + math.sin(self.angle) * self.speed * dt
 
             # Check for collision with walls
-            map_x = int(next_x / TILE_SIZE)
-            map_y = int(next_y / TILE_SIZE)
-            if (map_y < 0 or map_y >= len(game_map) or map_x < 0 or map_x >= len(game_map[0])) or game_map[map_y][map_x] == 'W':
+            if compile_map(game_map).blocked_at(next_x, next_y, BLOCKS_BOSS):
                 self.angle += math.pi
             else:
                 self.segments[0]['x'] = next_x
@@ -178,25 +231,26 @@ class PythonBoss:
                 next_x = self.segments[0]['x'] + math.cos(self.angle) * charge_speed * dt
                 next_y = self.segments[0]['y'] + math.sin(self.angle) * charge_speed * dt
 
-                # Drop poison trail while charging (if enraged)
+                # Drop poison trail while charging (if enraged), at a fixed
+                # rate however often update() runs; puddles stack
                 if self.is_enraged:
-                    self.poison_trail.append({
-                        'x': self.segments[0]['x'],
-                        'y': self.segments[0]['y'],
-                        'timer': self.max_trail_duration
-                    })
+                    self.charge_trail_timer -= dt
+                    if self.charge_trail_timer <= 0:
+                        self.drop_puddle()
+                        self.charge_trail_timer += PYTHON_CHARGE_TRAIL_INTERVAL
 
                 # Check for collision with pillars and walls
+                tiles = compile_map(game_map)
                 map_x = int(next_x / TILE_SIZE)
                 map_y = int(next_y / TILE_SIZE)
 
-                if map_y < 0 or map_y >= len(game_map) or map_x < 0 or map_x >= len(game_map[0]):
+                if not tiles.in_bounds(map_x, map_y):
                     self.state = 'ROAMING'
                     self.timer = random.uniform(1, 2)
-                elif game_map[map_y][map_x] == 'P':
+                elif tiles.blocked(map_x, map_y, STUNS_BOSS):
                     self.state = 'STUNNED'
                     self.timer = PYTHON_STUN_DURATION
-                elif game_map[map_y][map_x] == 'W':
+                elif tiles.blocked(map_x, map_y, BLOCKS_BOSS):
                     self.state = 'ROAMING'
                     self.timer = random.uniform(1, 2)
                 else:
@@ -216,9 +270,7 @@ class PythonBoss:
             retreat_speed = self.speed * PYTHON_RETREAT_SPEED_MULTIPLIER
             next_x = self.segments[0]['x'] + math.cos(self.angle) * retreat_speed * dt
             next_y = self.segments[0]['y'] + math.sin(self.angle) * retreat_speed * dt
-            map_x = int(next_x / TILE_SIZE)
-            map_y = int(next_y / TILE_SIZE)
-            if (map_y < 0 or map_y >= len(game_map) or map_x < 0 or map_x >= len(game_map[0])) or game_map[map_y][map_x] == 'W':
+            if compile_map(game_map).blocked_at(next_x, next_y, BLOCKS_BOSS):
                 self.state = 'ROAMING'
                 self.timer = random.uniform(1, 2)
             else:
@@ -237,6 +289,11 @@ class PythonBoss:
                 follower['x'] += math.cos(angle) * self.speed * dt
                 follower['y'] += math.sin(angle) * self.speed * dt
 
+    def drop_puddle(self):
+        """Leave a poison puddle under the head for ``max_trail_duration`` seconds."""
+        head = self.segments[0]
+        self.poison_trail.add(head['x'], head['y'], POISON_PUDDLE_DPS, self.max_trail_duration, kind=POISON)
+
     def take_damage(self, amount):
         # Only process damage if boss is alive
         if not self.is_alive:
@@ -259,7 +316,7 @@ class PythonBoss:
             # Stop any ongoing actions
             self.state = 'DEFEATED'
             # Clear any active effects
-            self.poison_trail = []
+            self.poison_trail.clear()
             self.dust_effects = []
             return True  # Return True if this damage killed the boss
             
@@ -269,44 +326,39 @@ class PythonBoss:
         if not self.is_alive:
             return
 
+        sprites = _boss_sprites()
+
         # Draw poison trail
-        for p in self.poison_trail:
-            surf = pygame.Surface((TILE_SIZE*1.1, TILE_SIZE*1.1), pygame.SRCALPHA)
-            pygame.draw.circle(surf, POISON_TRAIL_COLOR,
-                (int(TILE_SIZE*1.1/2), int(TILE_SIZE*1.1/2)), int(TILE_SIZE*0.55))
-            alpha = max(20, int(180 * (p['timer'] / self.max_trail_duration)))
-            surf.set_alpha(alpha)
-            screen.blit(surf, (p['x']-TILE_SIZE*0.55, p['y']-TILE_SIZE*0.55))
+        self.poison_trail.draw(screen)
 
         # Draw dust effects
         for d in self.dust_effects:
-            surf = pygame.Surface((TILE_SIZE*1.3, TILE_SIZE*1.3), pygame.SRCALPHA)
-            pygame.draw.circle(surf, DUST_COLOR, (int(TILE_SIZE*0.65),int(TILE_SIZE*0.65)), int(TILE_SIZE*0.65))
-            alpha = int(255 * (d['timer'] / self.max_dust_duration))
-            surf.set_alpha(alpha)
-            screen.blit(surf, (d['x']-TILE_SIZE*0.65,d['y']-TILE_SIZE*0.65))
+            alpha = max(0, int(255 * (d['timer'] / self.max_dust_duration)))
+            screen.blit(sprites.fade(sprites.dust, alpha), (d['x']-TILE_SIZE*0.65,d['y']-TILE_SIZE*0.65))
 
         if self.state == 'TELEGRAPHING':
-            telegraph_surface = pygame.Surface((TILE_SIZE * 2, TILE_SIZE * 2), pygame.SRCALPHA)
-            pygame.draw.circle(telegraph_surface, PYTHON_TELEGRAPH_COLOR, (TILE_SIZE, TILE_SIZE), TILE_SIZE)
-            screen.blit(telegraph_surface, (self.telegraph_pos[0] - TILE_SIZE, self.telegraph_pos[1] - TILE_SIZE))
+            screen.blit(sprites.telegraph, (self.telegraph_pos[0] - TILE_SIZE, self.telegraph_pos[1] - TILE_SIZE))
 
         if self.state == 'TELEGRAPHING_CHARGE':
-            line_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            start = (self.segments[0]['x'], self.segments[0]['y'])
             end_x = self.segments[0]['x'] + math.cos(self.angle) * SCREEN_WIDTH
             end_y = self.segments[0]['y'] + math.sin(self.angle) * SCREEN_HEIGHT
-            pygame.draw.line(line_surface, PYTHON_CHARGE_COLOR,
-                             (self.segments[0]['x'], self.segments[0]['y']), (end_x, end_y), 30)
-            screen.blit(line_surface, (0, 0))
+            line_surface = sprites.charge_line
+            # Bounding rect of the 30px line, clipped to the screen
+            rect = pygame.Rect(min(start[0], end_x), min(start[1], end_y),
+                               abs(end_x - start[0]), abs(end_y - start[1])).inflate(32, 32)
+            rect = rect.clip(line_surface.get_rect())
+            if rect.width and rect.height:
+                line_surface.fill((0, 0, 0, 0), rect)
+                pygame.draw.line(line_surface, PYTHON_CHARGE_COLOR, start, (end_x, end_y), 30)
+                screen.blit(line_surface, rect.topleft, rect)
 
         if self.state in ['EMERGING', 'ATTACKING', 'ROAMING', 'TELEGRAPHING_CHARGE', 'CHARGING', 'STUNNED', 'RETREATING']:
             # Draw shadow under each segment for depth
             for i in range(len(self.segments)):
                 seg = self.segments[i]
-                shadow_surf = pygame.Surface((TILE_SIZE, TILE_SIZE//2), pygame.SRCALPHA)
-                pygame.draw.ellipse(shadow_surf, PYTHON_SHADOW_COLOR, (0, 0, TILE_SIZE, TILE_SIZE//2))
                 # Lower the shadow a bit under the segment
-                screen.blit(shadow_surf, (seg['x']-TILE_SIZE//2, seg['y']-TILE_SIZE//4 + TILE_SIZE//2))
+                screen.blit(sprites.shadow, (seg['x']-TILE_SIZE//2, seg['y']-TILE_SIZE//4 + TILE_SIZE//2))
 
             # Draw body with stripes effect
             for i in range(len(self.segments) - 1, 0, -1):
@@ -333,15 +385,11 @@ class PythonBoss:
             if self.state == 'STUNNED':
                 eye_color = PYTHON_STUN_EYE_COLOR
                 eye_radius = 8
-                glow_surf = pygame.Surface((24,24), pygame.SRCALPHA)
-                pygame.draw.circle(glow_surf, PYTHON_STUN_EYE_COLOR, (12,12), 12)
-                glow_surf.set_alpha(120)
+                glow_surf = sprites.stun_glow
             elif self.is_enraged:
                 eye_color = (255,32,32)
                 eye_radius = 7
-                glow_surf = pygame.Surface((22,22), pygame.SRCALPHA)
-                pygame.draw.circle(glow_surf, (255,42,42), (11,11), 11)
-                glow_surf.set_alpha(110)
+                glow_surf = sprites.enraged_glow
             else:
                 eye_color = PYTHON_EYE_COLOR
                 eye_radius = 4
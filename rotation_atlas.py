@@ -0,0 +1,59 @@
+import math
+import weakref
+
+import pygame
+
+from settings import ROTATION_BUCKETS
+
+
+class RotationAtlas:
+    """All rotations of one sprite, quantised to ``buckets`` angles.
+
+    Frames are rendered once with pygame.transform.rotate and drawing
+    becomes a table lookup plus a blit.  ``offset_deg`` is added to every
+    rotation for sprites that do not face right (zombie art faces up).
+    """
+
+    def __init__(self, surface, buckets=ROTATION_BUCKETS, offset_deg=0):
+        self.buckets = buckets
+        self.step = 2 * math.pi / buckets
+        self.frames = []  # (surface, half width, half height)
+        self.nbytes = 0
+        for i in range(buckets):
+            frame = pygame.transform.rotate(surface, -math.degrees(i * self.step) - offset_deg)
+            self.frames.append((frame, frame.get_width() / 2, frame.get_height() / 2))
+            self.nbytes += frame.get_pitch() * frame.get_height()
+
+    def frame(self, angle):
+        """Return (surface, half width, half height) closest to ``angle`` radians."""
+        return self.frames[round(angle / self.step) % self.buckets]
+
+    def blit(self, screen, angle, x, y):
+        """Draw the frame for ``angle`` centred on (x, y)."""
+        surf, hw, hh = self.frames[round(angle / self.step) % self.buckets]
+        screen.blit(surf, (x - hw, y - hh))
+
+
+# surface -> {(buckets, offset): RotationAtlas}; dropped with the surface
+_atlases = weakref.WeakKeyDictionary()
+
+
+def get_atlas(surface, offset_deg=0, buckets=None):
+    """Return the shared atlas for ``surface``, building it on first use.
+
+    Sprites come from the asset cache, so every Zombie of a kind passes the
+    same Surface and shares one atlas.
+    """
+    buckets = buckets or ROTATION_BUCKETS
+    per_surface = _atlases.get(surface)
+    if per_surface is None:
+        per_surface = _atlases[surface] = {}
+    atlas = per_surface.get((buckets, offset_deg))
+    if atlas is None:
+        atlas = per_surface[(buckets, offset_deg)] = RotationAtlas(surface, buckets, offset_deg)
+    return atlas
+
+
+def stats():
+    atlases = [a for per_surface in _atlases.values() for a in per_surface.values()]
+    return {'atlases': len(atlases), 'bytes': sum(a.nbytes for a in atlases)}
@@ -112,6 +112,7 @@ PYTHON_ROAMING_TIME_MAX = 6 # seconds
 PYTHON_RETREAT_DURATION = 0.5 # seconds
 PYTHON_RETREAT_SPEED_MULTIPLIER = 1.5
 PYTHON_DAMAGE = 25
+PYTHON_CHARGE_TRAIL_INTERVAL = 1 / 60  # seconds between poison puddles dropped by an enraged charge
 CHANCE_TO_BURROW = 0.2
 CHANCE_TO_CHARGE = 0.3
 
@@ -127,6 +128,7 @@ PYTHON_STRIPE_COLOR = (180, 210, 80)        # Lighter olive drab
 PYTHON_SHADOW_COLOR = (0, 0, 0, 80)         # Soft shadow
 PYTHON_ENRAGED_HEAD_COLOR = (220, 60, 60)   # Red-tinted for enraged head
 DUST_COLOR = (160, 140, 50, 128)            # Brownish dust circle
+PYTHON_FX_ALPHA_STEPS = 16                  # Pre-rendered fade levels for puddles/dust
 SHIELD_BAR_FG = (0, 191, 255)
 
 # --- Shield Boomerang (Q ability) ---
@@ -152,4 +154,123 @@ SPRINT_SPEED = 350
 STAMINA_COST = 30  # per second
 STAMINA_REGEN = 15  # per second
 SHIELD_DRAIN = 40  # per second
-SHIELD_REGEN = 20  # per second 
\ No newline at end of file
+SHIELD_REGEN = 20  # per second 
+
+# --- Asset cache ---
+# Bytes of decoded images/sounds kept around once nothing references them
+ASSET_CACHE_BUDGET_BYTES = 64 * 1024 * 1024
+
+# --- Sprite pack (python sprite_pack.py) ---
+SPRITE_PACK_PATH = 'assets/sprites.pack'
+SPRITE_PACK_INDEX = 'assets/sprites.pack.json'
+
+# --- Rotation atlas ---
+# Pre-rotated angles per entity sprite (hero, zombies, shield). More buckets
+# give smoother turning at roughly 8 KB per bucket per 30 px sprite.
+ROTATION_BUCKETS = 64
+
+# --- Background layers ---
+# Pre-rendered map backgrounds kept at once (about 3.7 MB each at 1280x720;
+# scrolling maps hold their whole area, 7.7 MB for the 40x30 outside map)
+BACKGROUND_LAYER_CACHE_SIZE = 4
+# Transparent key for layers drawn over other scenery (never used by tiles)
+MAP_LAYER_COLORKEY = (255, 0, 255)
+
+# --- Blood decals ---
+# Splatter stamps are pre-rendered for radii 1..DECAL_MAX_RADIUS at
+# DECAL_ALPHA_STEPS fade levels per blood colour
+DECAL_MAX_RADIUS = 16
+DECAL_ALPHA_STEPS = 8
+# Leave a faint permanent stain on the floor for every splatter
+DECAL_FLOOR_ENABLED = True
+DECAL_FLOOR_ALPHA = 70
+
+# --- Sound bank ---
+# Total mixing channels; sound effects use SFX_FIRST_CHANNEL and up
+# (music streams separately, see music.py)
+SFX_MIXER_CHANNELS = 16
+SFX_FIRST_CHANNEL = 0
+# name: (file in assets/music, volume, priority, max concurrent voices, cooldown ms)
+# Higher priority clips may steal a channel from lower priority ones.
+SFX_CLIPS = {
+    'shotgun':       ('shotgun.ogg',       0.9, 100, 2, 0),
+    'player_hurt':   ('player_hurt.ogg',   0.7, 90,  1, 150),
+    'shield_hit':    ('shield_hit.ogg',    0.7, 80,  1, 100),
+    'game_over':     ('game_over.ogg',     1.0, 100, 1, 0),
+    'opening':       ('opening.ogg',       0.8, 100, 1, 0),
+    'chainsaw':      ('chainsaw.ogg',      0.8, 70,  1, 0),
+    'reload':        ('reload.ogg',        0.6, 60,  1, 0),
+    'collect':       ('reload.ogg',        1.0, 60,  2, 50),
+    'door':          ('door.ogg',          1.0, 60,  1, 0),
+    'dragon_roar':   ('dragon_roar.ogg',   0.8, 75,  1, 500),
+    'explosion_big': ('explosion_big.ogg', 0.8, 75,  1, 0),
+    'impact_hit':    ('impact_hit.ogg',    0.7, 50,  2, 100),
+    'fire_sweep':    ('fire_sweep.ogg',    0.6, 40,  2, 150),
+    'wing_flap':     ('wing_flap.ogg',     0.5, 30,  1, 250),
+    'juggernaut':    ('juggernaut.ogg',    1.0, 20,  2, 600),
+    'acid':          ('acid.ogg',          1.0, 15,  2, 400),
+    'zombie':        ('zombie.ogg',        1.0, 10,  3, 250),
+}
+
+# --- Post-processing (flash / shake) ---
+FLASH_DURATION = 0.15  # seconds of white flash after a Ground Pound
+SHAKE_DURATION = 0.4   # seconds of screen shake after a Ground Pound
+SHAKE_MAGNITUDE = 6    # max shake offset in pixels
+
+# --- Ground Pound (F ability) ---
+GROUND_POUND_RADIUS = 250     # pixels around the player
+GROUND_POUND_STUN = 2.0       # seconds enemies stay stunned
+GROUND_POUND_KNOCKBACK = 60   # pixels enemies are pushed away
+
+# --- Endless horde ---
+ENDLESS_HORDE_CAP = 2000  # most zombies alive at once in endless mode
+ENDLESS_MAP_WIDTH = 64    # tiles; the arena scrolls with the player (two screens each way)
+ENDLESS_MAP_HEIGHT = 36
+
+# --- Flow field (zombie routing) ---
+# Sweeps per FlowField.update when the player changes tile; each costs about
+# 0.1 ms on the 64x36 endless arena, and a new field needs about 16
+FLOW_FIELD_PASSES_PER_UPDATE = 4
+
+# --- Camera (maps larger than the screen) ---
+# Sprites are drawn from their centre, so keep drawing them this far past the screen edge
+CAMERA_CULL_MARGIN = 2 * TILE_SIZE
+OUTSIDE_MAP_WIDTH = 40    # tiles in the outside area (revival quest)
+OUTSIDE_MAP_HEIGHT = 30
+
+# --- Fixed timestep ---
+SIM_HZ = 120             # simulation steps per second in the level loops
+SIM_MAX_STEPS = 8        # most steps run per rendered frame; the rest of a long hitch is dropped
+RENDER_FPS_CAP = 0       # 0 = draw as fast as possible (vsync, if any, still applies)
+
+# --- Performance HUD (F3) ---
+PERF_HUD_HISTORY = 240   # frames kept for the frame-time graph
+PERF_HUD_AVERAGE = 60    # frames averaged for the per-section timings
+PERF_HUD_BUDGET_MS = 1000 / 60  # guide line drawn on the graph
+
+# --- Idle screens (menus, dialogue, game over) ---
+# How often their few moving parts redraw; nothing else does until input
+IDLE_ANIMATION_FPS = 30
+
+# --- Particles ---
+PARTICLE_CAPACITY = 20000    # most particles alive at once; bursts past this are cut short
+PARTICLE_CULL_MARGIN = 16    # pixels past the screen edge before a particle is dropped
+
+# --- Hazard field (poison puddles, flame trails) ---
+HAZARD_CAPACITY = 4096       # hazards alive at once; the oldest is overwritten past this
+HAZARD_CELL_SIZE = TILE_SIZE // 2  # damage grid resolution in pixels
+HAZARD_ALPHA_STEPS = 16      # pre-rendered fade levels per hazard sprite
+POISON_PUDDLE_DPS = 20       # damage per second per puddle the player stands in
+FLAME_TRAIL_DPS = 15
+FLAME_TRAIL_DURATION = 2.0   # seconds a dragon dash scorch burns
+FLAME_TRAIL_COLOR = (255, 110, 20, 140)
+
+# --- Music ---
+# Switching tracks fades the old one out, then the new one in
+MUSIC_FADE_OUT_MS = 500
+MUSIC_FADE_IN_MS = 500
+
+# --- Startup ---
+# pygame.init to the first main menu frame (python startup.py --budget); importing
+# pygame itself is left out, it depends on the machine rather than the game
+STARTUP_BUDGET_MS = 300
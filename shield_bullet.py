@@ -1,88 +1,80 @@
 import math
 import pygame
-from settings import TILE_SIZE, SHIELD_TRAIL_COLOR, SHIELD_MAX_TRAIL_POINTS
+from settings import TILE_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT, SHIELD_TRAIL_COLOR, SHIELD_TRAIL_MAX_POINTS
+from rotation_atlas import get_atlas
+from tile_map import BLOCKS_PROJECTILES
+from projectiles import DEAD, RETURNING
 
 
-def update_shield_bullet(bullet: dict, bullets: list, dt: float, game_map, owner_player, zombies=None):
-    """Update physics & boomerang behaviour for a shield projectile.
-    Removes the bullet from list when it is caught. Expects keys created in Player.throw_shield().
-    `game_map` 2-D tile list, `owner_player` is the player object.
-    `zombies` optional list to apply bounce & damage.
+def update_shield(proj, i, dt, tiles=None):
+    """Boomerang behaviour for the shield in slot ``i`` of the Projectiles pool ``proj``.
+
+    Called by Projectiles.update() after the move.  The shield bounces off
+    the first wall it meets, turns back once its lifetime (max distance)
+    runs out, after four bounces or when it leaves the map, then homes in
+    on its holder and is caught there.  Hits on enemies are the level's
+    job (Projectiles.hit / bounce).
     """
-    # ----- Trail -----
-    trail = bullet['trail']
-    trail.append((bullet['x'], bullet['y']))
-    try:
-        from settings import SHIELD_TRAIL_MAX_POINTS as _MAX
-    except ImportError:
-        from settings import SHIELD_MAX_TRAIL_POINTS as _MAX
-    if len(trail) > _MAX:
-        trail.pop(0)
+    state = proj.extra.get(int(proj.ident[i]))
+    holder = state['holder'] if state else None
+    x, y = float(proj.x[i]), float(proj.y[i])
 
-    # ----- Wall bounce with bounds check (only while heading out) -----
-    if not bullet.get('returning'):
-        map_x = int(bullet['x'] / TILE_SIZE)
-        map_y = int(bullet['y'] / TILE_SIZE)
-        if 0 <= map_y < len(game_map) and 0 <= map_x < len(game_map[0]):
-            tile = game_map[map_y][map_x]
-            if tile in ['W', 'P']:
-                bullet['angle'] = math.atan2(-math.sin(bullet['angle']), -math.cos(bullet['angle']))
-                bullet['bounces'] = bullet.get('bounces',0)+1
-                bullet['returning'] = True
-        else:
-            # Went off-map: trigger immediate return instead of deleting.
-            bullet['returning'] = True
-            # Recompute angle toward player so it heads back.
-            dx = owner_player.x - bullet['x']
-            dy = owner_player.y - bullet['y']
-            bullet['angle'] = math.atan2(dy, dx)
+    # ----- Trail -----
+    if state is not None:
+        trail = state['trail']
+        trail.append((x, y))
+        if len(trail) > SHIELD_TRAIL_MAX_POINTS:
+            trail.pop(0)
 
-    # ----- Zombie bounce + damage -----
-    if zombies is not None:
-        for z in zombies:
-            if getattr(z, 'is_alive', True) and math.hypot(z.x - bullet['x'], z.y - bullet['y']) < z.radius:
-                bullet['angle'] = math.atan2(-math.sin(bullet['angle']), -math.cos(bullet['angle']))
-                bullet['bounces'] = bullet.get('bounces',0)+1
-                if hasattr(z, 'take_damage'):
-                    died = z.take_damage(bullet.get('damage', 20))
-                    if died and hasattr(owner_player, 'zombie_blood_collected'):
-                        owner_player.zombie_blood_collected += 1
-                break
+    # ----- Wall bounce (only while heading out) -----
+    if not proj.flags[i] & RETURNING:
+        col, row = int(x / TILE_SIZE), int(y / TILE_SIZE)
+        if tiles is not None and tiles.in_bounds(col, row):
+            if tiles.blocked(col, row, BLOCKS_PROJECTILES):
+                proj.bounce(i)
+                proj.flags[i] |= RETURNING
+        elif tiles is not None or not (0 <= x <= SCREEN_WIDTH and 0 <= y <= SCREEN_HEIGHT):
+            # Went off-map: come straight back instead of disappearing
+            proj.flags[i] |= RETURNING
 
-    # ----- Turn back after distance -----
-    # Auto-return if bounce count exceeded
-    if bullet.get('bounces',0) >= 4:
-        bullet['returning'] = True
-    # Return after max distance
-    if (not bullet.get('returning') and math.hypot(bullet['x'] - bullet['start_x'], bullet['y'] - bullet['start_y']) >= bullet['max_distance']):
-        bullet['returning'] = True
+    # ----- Turn back after max distance -----
+    if proj.lifetime[i] <= 0:
+        proj.flags[i] |= RETURNING
 
     # ----- Returning behaviour -----
-    if bullet.get('returning'):
-        dx = owner_player.x - bullet['x']
-        dy = owner_player.y - bullet['y']
-        bullet['angle'] = math.atan2(dy, dx)
-        # Expanded catch radius to compensate for per–frame movement (prevents bounce when player is idle)
-        catch_radius = owner_player.radius + bullet.get('radius', 10) + bullet.get('speed', 300) * dt
-        if math.hypot(dx, dy) < catch_radius:
-            owner_player.active_shield_throw = False
-            if bullet in bullets:
-                bullets.remove(bullet)
-            return True
+    if proj.flags[i] & RETURNING:
+        if holder is None:
+            proj.flags[i] |= DEAD
+            return
+        speed = math.hypot(proj.vx[i], proj.vy[i])
+        dx, dy = holder.x - x, holder.y - y
+        dist = math.hypot(dx, dy)
+        # Catch radius grows with the step length so a still holder is not overshot
+        if dist < holder.radius + proj.radius[i] + speed * dt:
+            proj.flags[i] |= DEAD
+            return
+        proj.vx[i] = dx / dist * speed
+        proj.vy[i] = dy / dist * speed
 
-    return False
 
+def draw_shield(screen, proj, i, x, y, origin=(0, 0)):
+    """Render the shield in slot ``i`` at (x, y) with its trail and sprite fallback.
 
-def draw_shield_bullet(screen, bullet):
-    """Render the shield bullet with trail and sprite fallback."""
-    # Draw trail
-    for i in range(len(bullet['trail']) - 1):
-        pygame.draw.line(screen, SHIELD_TRAIL_COLOR[:3], bullet['trail'][i], bullet['trail'][i + 1], 3)
+    The trail is kept in world coordinates; ``origin`` is the camera's
+    top-left corner on a scrolling map.
+    """
+    state = proj.extra.get(int(proj.ident[i]))
+    if state is not None:
+        trail = state['trail']
+        ox, oy = origin
+        if ox or oy:
+            trail = [(tx - ox, ty - oy) for tx, ty in trail]
+        for a, b in zip(trail, trail[1:]):
+            pygame.draw.line(screen, SHIELD_TRAIL_COLOR[:3], a, b, 3)
 
-    owner = bullet.get('owner')
-    img = getattr(owner, 'shield_image', None) if owner else None
+    img = getattr(state['holder'], 'shield_image', None) if state else None
     if img:
-        rect = img.get_rect(center=(bullet['x'], bullet['y']))
-        screen.blit(img, rect)
+        # Face the direction of flight
+        get_atlas(img).blit(screen, math.atan2(proj.vy[i], proj.vx[i]), x, y)
     else:
-        pygame.draw.circle(screen, (0, 180, 255), (int(bullet['x']), int(bullet['y'])), bullet.get('radius', 12))
+        pygame.draw.circle(screen, (0, 180, 255), (int(x), int(y)), int(proj.radius[i]))
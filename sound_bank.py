@@ -0,0 +1,176 @@
+import os
+
+import pygame
+
+from asset_cache import load_sound
+from settings import SFX_CLIPS, SFX_MIXER_CHANNELS, SFX_FIRST_CHANNEL
+
+
+class SoundBank:
+    """Decoded sound effects plus the rules for when they may play.
+
+    Every clip is decoded once (through the asset cache) and played on a
+    mixer channel picked by the bank.  A play request is dropped when the
+    clip is still cooling down or already has ``max_voices`` channels, so a
+    crowd of zombies in range cannot queue up a groan per frame.  When every
+    channel is busy, the request steals the channel of the lowest priority
+    voice below its own; otherwise it is dropped.
+
+    Volumes are applied per channel, so clips that share a file (reload /
+    collect) keep their own loudness.
+    """
+
+    def __init__(self, clips=SFX_CLIPS, num_channels=SFX_MIXER_CHANNELS, first_channel=SFX_FIRST_CHANNEL):
+        self.clips = {}
+        for name, (filename, volume, priority, max_voices, cooldown_ms) in clips.items():
+            self.register(name, filename, volume, priority, max_voices, cooldown_ms)
+        self.num_channels = num_channels
+        self.first_channel = first_channel
+        self._channels = []
+        self._sounds = {}
+        self._last_played = {}
+        self._voices = {}  # channel index -> (clip name, priority, start ticks)
+        self.played = 0
+        self.dropped = 0
+        self.stolen = 0
+        self.dropped_by_reason = {'cooldown': 0, 'voices': 0, 'channels': 0}
+
+    # ---------------------- Setup ----------------------
+    def register(self, name, filename, volume=1.0, priority=50, max_voices=1, cooldown_ms=0):
+        self.clips[name] = {
+            'path': os.path.join('assets', 'music', filename),
+            'volume': volume,
+            'priority': priority,
+            'max_voices': max_voices,
+            'cooldown_ms': cooldown_ms,
+        }
+
+    def preload(self, decode=True):
+        """Size the mixer channel pool and decode every registered clip.
+
+        With ``decode=False`` clips are decoded on first play instead
+        (or handed over by the prefetcher, see main.init).
+        """
+        if not pygame.mixer.get_init():
+            return
+        if pygame.mixer.get_num_channels() < self.num_channels:
+            pygame.mixer.set_num_channels(self.num_channels)
+        self._init_channels()
+        if decode:
+            for name in self.clips:
+                self.get(name)
+
+    def get(self, name):
+        """Return the decoded Sound for ``name`` or None if it cannot load."""
+        if not pygame.mixer.get_init():
+            return None  # not cached: it may load once the mixer is up
+        if name in self._sounds:
+            return self._sounds[name]
+        clip = self.clips.get(name)
+        sound = None
+        if clip is not None:
+            try:
+                sound = load_sound(clip['path'])
+            except Exception as e:
+                print(f"Could not load sound {name}: {e}")
+        self._sounds[name] = sound
+        return sound
+
+    # ---------------------- Playback ----------------------
+    def play(self, name, volume=None):
+        """Play clip ``name``. Returns the Channel used, or None if dropped."""
+        if not pygame.mixer.get_init():
+            return None
+        clip = self.clips.get(name)
+        sound = self.get(name)
+        if clip is None or sound is None:
+            return None
+
+        now = pygame.time.get_ticks()
+        last = self._last_played.get(name)
+        if last is not None and now - last < clip['cooldown_ms']:
+            return self._drop('cooldown')
+
+        self._reap()
+        if sum(1 for v in self._voices.values() if v[0] == name) >= clip['max_voices']:
+            return self._drop('voices')
+
+        index = self._free_channel()
+        if index is None:
+            index = self._steal(clip['priority'])
+            if index is None:
+                return self._drop('channels')
+        channel = self._channels[index]
+
+        try:
+            channel.play(sound)
+            channel.set_volume(clip['volume'] if volume is None else volume)
+        except Exception as e:
+            print(f"Error playing sound {name}: {e}")
+            return None
+        self._voices[index] = (name, clip['priority'], now)
+        self._last_played[name] = now
+        self.played += 1
+        return channel
+
+    def stop(self, name):
+        """Stop every voice currently playing ``name``."""
+        for index, voice in list(self._voices.items()):
+            if voice[0] == name:
+                self._channels[index].stop()
+                del self._voices[index]
+
+    def stats(self):
+        self._reap()
+        return {
+            'played': self.played,
+            'dropped': self.dropped,
+            'stolen': self.stolen,
+            'active': len(self._voices),
+            **{f'dropped_{k}': v for k, v in self.dropped_by_reason.items()},
+        }
+
+    # ---------------------- Internals ----------------------
+    def _init_channels(self):
+        count = pygame.mixer.get_num_channels()
+        if len(self._channels) != count:
+            self._channels = [pygame.mixer.Channel(i) for i in range(count)]
+            self._voices.clear()
+
+    def _free_channel(self):
+        self._init_channels()
+        for index in range(self.first_channel, len(self._channels)):
+            if not self._channels[index].get_busy():
+                return index
+        return None
+
+    def _reap(self):
+        """Forget voices whose channel finished or was taken over."""
+        for index, (name, _, _) in list(self._voices.items()):
+            channel = self._channels[index]
+            if not channel.get_busy() or channel.get_sound() is not self._sounds.get(name):
+                del self._voices[index]
+
+    def _steal(self, priority):
+        # Lowest priority first, oldest within the same priority
+        victims = [(v[1], v[2], index) for index, v in self._voices.items() if v[1] < priority]
+        if not victims:
+            return None
+        _, _, index = min(victims)
+        self._channels[index].stop()
+        del self._voices[index]
+        self.stolen += 1
+        return index
+
+    def _drop(self, reason):
+        self.dropped += 1
+        self.dropped_by_reason[reason] += 1
+        return None
+
+
+# Shared instance used by the player, enemies and levels
+bank = SoundBank()
+
+
+def play(name, volume=None):
+    return bank.play(name, volume)
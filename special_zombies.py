@@ -2,7 +2,10 @@ import math
 import random
 import pygame
 
+from asset_cache import load_image
+import sound_bank
 from zombie import Zombie
+from projectiles import volley, ACID, ENEMY
 from settings import TILE_SIZE, ZOMBIE_HEALTH, ZOMBIE_SPEED
 
 # Default pixel sizes for special zombies (recommendation for sprite designers)
@@ -21,16 +24,12 @@ class AcidSpitter(Zombie):
         self.speed = ZOMBIE_SPEED * 1.1
         self.radius = ACID_SPITTER_SIZE // 2
         
-        # Load sound effect
-        try:
-            self.attack_sound = pygame.mixer.Sound('assets/music/acid.ogg')
-        except Exception:
-            self.attack_sound = None
+        # Attack clip played through sound_bank
+        self.attack_sound = 'acid'
             
         # Load dedicated sprite if available
         try:
-            img = pygame.image.load('assets/sprites/acid_spitter.png').convert_alpha()
-            self.image = pygame.transform.scale(img, (ACID_SPITTER_SIZE, ACID_SPITTER_SIZE))
+            self.image = load_image('assets/sprites/acid_spitter.png', (ACID_SPITTER_SIZE, ACID_SPITTER_SIZE), owner=self)
         except Exception:
             # Fallback to existing zombie sprite size change handled in parent
             pass
@@ -38,10 +37,7 @@ class AcidSpitter(Zombie):
     def attack(self):
         """Play attack sound if available."""
         if hasattr(self, 'attack_sound') and self.attack_sound:
-            try:
-                self.attack_sound.play()
-            except Exception:
-                pass
+            sound_bank.play(self.attack_sound)
 
     def update(self, player_x, player_y, game_map, dt):
         """Move like normal zombie and occasionally spit acid projectile."""
@@ -52,7 +48,7 @@ class AcidSpitter(Zombie):
         if current_time >= self._next_spit and self.is_alive:
             angle = math.atan2(player_y - self.y, player_x - self.x)
             speed = 300
-            proj = {'x': self.x, 'y': self.y, 'angle': angle, 'speed': speed, 'damage': 10, 'acid': True, 'radius': 4}
+            proj = volley(self.x, self.y, angle, speed, kind=ACID, owner=ENEMY, damage=10, radius=4)
             self._next_spit = current_time + self.spit_cooldown_ms
             return proj
         return None
@@ -69,25 +65,18 @@ class Juggernaut(Zombie):
         self.speed = ZOMBIE_SPEED * 0.6
         self.radius = JUGGERNAUT_SIZE // 2
         
-        # Load sound effect
-        try:
-            self.attack_sound = pygame.mixer.Sound('assets/music/juggernaut.ogg')
-        except Exception:
-            self.attack_sound = None
+        # Attack clip played through sound_bank
+        self.attack_sound = 'juggernaut'
             
         try:
-            img = pygame.image.load('assets/sprites/juggernaut.png').convert_alpha()
-            self.image = pygame.transform.scale(img, (JUGGERNAUT_SIZE, JUGGERNAUT_SIZE))
+            self.image = load_image('assets/sprites/juggernaut.png', (JUGGERNAUT_SIZE, JUGGERNAUT_SIZE), owner=self)
         except Exception:
             pass
             
     def attack(self):
         """Play attack sound if available."""
         if hasattr(self, 'attack_sound') and self.attack_sound:
-            try:
-                self.attack_sound.play()
-            except Exception:
-                pass
+            sound_bank.play(self.attack_sound)
 
     def update(self, player_x, player_y, game_map, dt):
         """Move and trigger quake when near player."""
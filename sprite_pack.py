@@ -0,0 +1,187 @@
+"""Pre-scaled sprites in one memory-mapped file, so loading them decodes nothing.
+
+    python sprite_pack.py           # (re)build the pack after changing a sprite or its size
+    python sprite_pack.py --check   # list stale or missing entries, exit 1 if any
+
+The build decodes and scales every image the game asks the AssetCache
+for (the prefetch manifests plus EXTRA_IMAGES) and writes the raw pixels
+into SPRITE_PACK_PATH, with SPRITE_PACK_INDEX (JSON) giving each entry's
+size, offset and the SHA-1 of the PNG it came from.  At run time
+asset_cache.decode_image() asks the shared ``pack`` first: a hit is a
+Surface over the mapped bytes, stored as 32-bit ARGB (the usual display
+format), so the cache's convert() is a plain copy.  An entry whose PNG
+no longer matches its hash, a size the pack was not built for, or no
+pack at all falls back to decoding the PNG.
+"""
+import hashlib
+import json
+import mmap
+import os
+import sys
+
+import pygame
+
+from settings import SPRITE_PACK_PATH, SPRITE_PACK_INDEX, TILE_SIZE
+
+FORMAT = 'BGRA'  # byte order of ARGB8888 on little-endian machines
+VERSION = 1
+_ALIGN = 64
+_HUMAN = (TILE_SIZE // 2 - 4) * 2  # Human.radius * 2
+
+# Images loaded outside the scene manifests
+EXTRA_IMAGES = (
+    ('assets/sprites/human.png', (_HUMAN, _HUMAN), None),
+)
+
+
+class SpritePack:
+    """Read side of the pack; opened on first lookup."""
+
+    def __init__(self, path=SPRITE_PACK_PATH, index_path=SPRITE_PACK_INDEX):
+        self.path = path
+        self.index_path = index_path
+        self._entries = None  # (path, size, fit) -> index entry
+        self._map = None
+        self._hashes = {}     # source path -> SHA-1 of the PNG on disk
+        self.hits = 0
+        self.stale = 0
+
+    def surface(self, path, size=None, fit=None):
+        """Surface for ``path`` scaled as asked, or None if the pack does not have it up to date."""
+        if self._entries is None:
+            self._open()
+        entry = self._entries.get(_entry_key(path, size, fit))
+        if entry is None:
+            return None
+        if self._source_hash(entry['path']) != entry['sha1']:
+            self.stale += 1
+            if self.stale == 1:
+                print(f"Warning: sprite pack is out of date ({entry['path']} changed); "
+                      f"loading PNGs instead. Run python sprite_pack.py to rebuild it.")
+            return None
+        self.hits += 1
+        w, h = entry['width'], entry['height']
+        start = entry['offset']
+        return pygame.image.frombuffer(memoryview(self._map)[start:start + w * h * 4], (w, h), FORMAT)
+
+    def stats(self):
+        return {'entries': len(self._entries or ()), 'hits': self.hits, 'stale': self.stale}
+
+    def _open(self):
+        # Filled in one assignment: the prefetch thread may look up at the same time
+        entries = {}
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+            if index.get('version') == VERSION and index.get('byteorder') == sys.byteorder:
+                with open(self.path, 'rb') as f:
+                    # Copy-on-write: the pages are shared until someone draws on a Surface
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+                entries = {_entry_key(e['path'], e['size'], e['fit']): e for e in index['entries']}
+        except (OSError, ValueError):
+            pass  # no pack built; every image comes from its PNG
+        self._entries = entries
+
+    def _source_hash(self, path):
+        digest = self._hashes.get(path)
+        if digest is None:
+            try:
+                digest = _sha1(path)
+            except OSError:
+                digest = ''
+            self._hashes[path] = digest
+        return digest
+
+
+def _entry_key(path, size, fit):
+    return (os.path.relpath(os.path.abspath(path)).replace(os.sep, '/'),
+            tuple(size) if size else None, tuple(fit) if fit else None)
+
+
+def _sha1(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+# ---------------------- Build ----------------------
+def wanted_images():
+    """(path, size, fit) for every image the game loads through the cache."""
+    import prefetch
+    wanted = []
+    keys = [key for manifest in prefetch.MANIFESTS.values() for key in manifest if key[0] == 'image']
+    for _, path, size, _, fit in keys:
+        wanted.append(_entry_key(path, size, fit))
+    wanted += [_entry_key(path, size, fit) for path, size, fit in EXTRA_IMAGES]
+    return list(dict.fromkeys(wanted))
+
+
+def build(path=SPRITE_PACK_PATH, index_path=SPRITE_PACK_INDEX, images=None):
+    """Decode, scale and write every image; returns the index written."""
+    from asset_cache import decode_png
+    entries, offset = [], 0
+    with open(path, 'wb') as out:
+        for source, size, fit in wanted_images() if images is None else images:
+            try:
+                surf = decode_png(source, size, fit)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Skipping {source}: {e}")
+                continue
+            # Through a 32-bit alpha surface, so palette and colorkey images come out right
+            full = pygame.Surface(surf.get_size(), pygame.SRCALPHA, 32)
+            full.blit(surf, (0, 0))
+            pixels = pygame.image.tobytes(full, FORMAT)
+            pad = -offset % _ALIGN
+            out.write(b'\0' * pad)
+            offset += pad
+            out.write(pixels)
+            entries.append({'path': source, 'size': size, 'fit': fit, 'width': surf.get_width(),
+                            'height': surf.get_height(), 'offset': offset, 'sha1': _sha1(source)})
+            offset += len(pixels)
+    index = {'version': VERSION, 'byteorder': sys.byteorder, 'format': FORMAT, 'entries': entries}
+    with open(index_path, 'w') as f:
+        json.dump(index, f, indent=1)
+    return index
+
+
+def check(index_path=SPRITE_PACK_INDEX):
+    """Entries that are stale or missing from the pack, as printable strings."""
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return ['no sprite pack built']
+    built = {_entry_key(e['path'], e['size'], e['fit']): e for e in index['entries']}
+    problems = []
+    for key in wanted_images():
+        entry = built.get(key)
+        if entry is None:
+            if os.path.exists(key[0]):
+                problems.append(f"missing {key}")
+        elif _sha1(entry['path']) != entry['sha1']:
+            problems.append(f"stale {key}")
+    return problems
+
+
+def _cli(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the pre-scaled sprite pack.")
+    parser.add_argument('--check', action='store_true', help="only report stale or missing entries")
+    args = parser.parse_args(argv)
+    if args.check:
+        problems = check()
+        for problem in problems:
+            print(problem)
+        return 1 if problems else 0
+    index = build()
+    size = os.path.getsize(SPRITE_PACK_PATH)
+    print(f"Wrote {len(index['entries'])} sprites ({size / 1e6:.1f} MB) to {SPRITE_PACK_PATH}")
+    return 0
+
+
+# Shared instance; asset_cache.decode_image() reads from it
+pack = SpritePack()
+
+
+if __name__ == '__main__':
+    sys.exit(_cli())
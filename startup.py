@@ -0,0 +1,129 @@
+"""Cold-start timing: where the time goes before the main menu is on screen.
+
+main imports this module first, so ``timeline`` starts with main itself.
+main.init() marks each phase as it finishes and show_main_menu() marks
+the first frame it flips; the report lists every phase, the total and
+the levels imported along the way (levels.import_ms).
+
+    python main.py --startup-timing   # play as usual; print the report once the menu shows
+    python startup.py                 # cold start without a window, print the report
+    python startup.py --budget 300    # also exit 1 if the game's own start took longer than 300 ms
+
+The budget covers the phases after 'imports' (pygame.init through the
+first menu frame) and defaults to STARTUP_BUDGET_MS.  Importing pygame
+and its dependencies is most of a cold start and depends on the machine
+and the installed packages rather than on the game, so it is reported
+but not budgeted.
+"""
+import sys
+import time
+
+if __name__ == '__main__':
+    # main imports 'startup'; make that this module so there is one timeline
+    sys.modules.setdefault('startup', sys.modules[__name__])
+
+
+class Timeline:
+    """Named time marks from process start to the first menu frame."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks = []            # (phase, perf_counter at its end)
+        self.print_on_menu = False
+        self.menu_shown = False
+
+    def mark(self, phase):
+        self.marks.append((phase, time.perf_counter()))
+
+    def menu_frame(self):
+        """Called after each menu redraw; only the first one counts."""
+        if self.menu_shown:
+            return
+        self.menu_shown = True
+        self.mark('menu')
+        if self.print_on_menu:
+            print(self.report())
+
+    def phases(self):
+        """[(phase, milliseconds)] in the order they finished."""
+        out, last = [], self.start
+        for phase, t in self.marks:
+            out.append((phase, (t - last) * 1000))
+            last = t
+        return out
+
+    def total_ms(self):
+        return (self.marks[-1][1] - self.start) * 1000 if self.marks else 0.0
+
+    def since_ms(self, phase):
+        """Milliseconds from the end of ``phase`` to the last mark (the total if it never ran)."""
+        for name, t in self.marks:
+            if name == phase:
+                return (self.marks[-1][1] - t) * 1000
+        return self.total_ms()
+
+    def report(self):
+        import levels
+        lines = ["Startup timing:"]
+        lines += [f"  {phase:<16}{ms:8.1f} ms" for phase, ms in self.phases()]
+        lines.append(f"  {'total':<16}{self.total_ms():8.1f} ms")
+        lines.append(f"  {'after imports':<16}{self.since_ms('imports'):8.1f} ms")
+        for module, ms in levels.import_ms.items():
+            lines.append(f"  (imported {module} in {ms:.1f} ms)")
+        return "\n".join(lines)
+
+
+# Shared instance; main and the menu mark it
+timeline = Timeline()
+
+
+class _MenuShown(Exception):
+    pass
+
+
+def measure():
+    """Import and start main without a window and stop at the first menu frame.
+
+    Returns the Timeline.  Must run in a fresh interpreter to be a cold start.
+    """
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import main
+    main.init()
+
+    real_menu_frame = timeline.menu_frame
+
+    def menu_frame():
+        real_menu_frame()
+        raise _MenuShown()
+    timeline.menu_frame = menu_frame
+    try:
+        main.show_main_menu()
+    except _MenuShown:
+        pass
+    finally:
+        del timeline.menu_frame
+    return timeline
+
+
+def _cli(argv=None):
+    import argparse
+    from settings import STARTUP_BUDGET_MS
+
+    parser = argparse.ArgumentParser(description="Time a cold start up to the first main menu frame.")
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET_MS,
+                        help=f"milliseconds allowed from the end of the imports until the menu shows "
+                             f"(default {STARTUP_BUDGET_MS})")
+    args = parser.parse_args(argv)
+    result = measure()
+    print(result.report())
+    game_ms = result.since_ms('imports')
+    if game_ms > args.budget:
+        print(f"Over budget: {game_ms:.1f} ms after imports > {args.budget:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(_cli())
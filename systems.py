@@ -0,0 +1,283 @@
+"""Shared systems for ecs.World levels.
+
+Every system is ``system(world, dt)`` (render systems take
+``(world, screen, alpha)``) and only touches the components and resources
+named in its docstring.  Resources the combat systems expect:
+
+    player       the Player
+    projectiles  the level's Projectiles pool
+    game_map     the level's map rows (tiles is compiled from it)
+    bounds       optional culling rectangle for projectiles
+    grid         optional SpatialHash reused for the shot broad phase
+    hazards      optional HazardField for hazards() / draw_hazards()
+    camera       optional Camera for maps larger than the screen: the
+                 player aims through it and the render systems draw only
+                 what it sees (set ``bounds`` to the whole map as well)
+
+Components:
+
+    body     the game object (x, y, radius, draw(); update() for brains)
+    brain    True: body.update(player.x, player.y, game_map, dt) each step;
+             a returned volley is fired, a returned quake shakes the screen
+    contact  {'damage', 'cooldown' (ms), 'shield_drain'} or {'dps'}:
+             hurts the player on touch
+    target   {'recall': bool}: player shots hit it through
+             body.take_damage(); with ``recall`` a thrown shield flies home
+             instead of bouncing
+    loot     loot(world, body), called once when the body dies
+    layer    draw order for draw_layer()
+    pickup   {'x', 'y', 'image', 'on_collect'}: collected on touch
+    lifetime seconds left before the entity is destroyed
+"""
+import math
+
+import pygame
+
+import particle_engine
+import postfx
+import sound_bank
+from mechanics import handle_player_input, update_player_state, apply_ground_pound
+from camera import splatters_of
+from projectiles import PLAYER, ENEMY, SCREEN_BOUNDS
+from spatial_hash import SpatialHash
+from tile_map import compile_map
+
+
+# ---------------------- Input ----------------------
+def player_control(world, dt):
+    """Shooting, shield throws and movement for ``player`` from this step's input."""
+    r = world.resources
+    handle_player_input(r['player'], r['projectiles'], world.step_events)
+    update_player_state(r['player'], pygame.key.get_pressed(), r['game_map'], dt, r.get('camera'))
+
+
+def ground_pound(world, dt):
+    """Land a charged Ground Pound on every 'brain' body."""
+    player = world.resources['player']
+    if not player.gp_triggered:
+        return
+    player.gp_triggered = False
+    apply_ground_pound(player, [body for _, body, _ in world.query('body', 'brain')])
+    postfx.fx.ground_pound()
+    particle_engine.engine.emit('dust', player.x, player.y)
+
+
+# ---------------------- Movement ----------------------
+def brains(world, dt):
+    """Run body.update() for every 'brain' and act on what it returns."""
+    r = world.resources
+    player, projectiles = r['player'], r['projectiles']
+    for _, body, _ in world.query('body', 'brain'):
+        info = body.update(player.x, player.y, r['game_map'], dt)
+        if isinstance(info, dict):
+            if info.get('quake'):
+                postfx.fx.shake(info.get('duration', 500) / 1000.0)
+            else:
+                projectiles.spawn_volley(info)
+
+
+def move_projectiles(world, dt):
+    """Move the pool; walls of ``game_map`` and ``bounds`` stop projectiles."""
+    r = world.resources
+    r['projectiles'].update(dt, compile_map(r['game_map']), r.get('bounds', SCREEN_BOUNDS))
+
+
+# ---------------------- Collision ----------------------
+def contact_damage(world, dt):
+    """Hurt the player while a living 'contact' body touches them.
+
+    With a ``shield_drain`` an active shield loses that much energy instead
+    of the player losing health; ``cooldown`` spaces the hits out.
+    """
+    player = world.resources['player']
+    now = pygame.time.get_ticks()
+    for _, body, contact in world.query('body', 'contact'):
+        if not body.is_alive:
+            continue
+        reach = player.radius + body.radius
+        if (player.x - body.x) ** 2 + (player.y - body.y) ** 2 >= reach * reach:
+            continue
+        if 'dps' in contact:
+            player.take_damage(contact['dps'] * dt)
+            continue
+        if now - contact.get('last', -math.inf) < contact.get('cooldown', 0):
+            continue
+        contact['last'] = now
+        drain = contact.get('shield_drain')
+        if drain is not None and player.is_shielding and player.shield_energy > 0:
+            player.shield_energy = max(0, player.shield_energy - drain)
+            sound_bank.play('shield_hit')
+        else:
+            player.take_damage(contact['damage'])
+
+
+def enemy_fire(world, dt):
+    """ENEMY projectiles touching the player.
+
+    With the ``shot_shield_drain`` resource set, a raised shield soaks each
+    hit for that much energy and unshielded hits skip take_damage's shield
+    maths; otherwise take_damage handles it.
+    """
+    r = world.resources
+    player, projectiles = r['player'], r['projectiles']
+    drain = r.get('shot_shield_drain')
+    hits = projectiles.hits_circle(player.x, player.y, player.radius, ENEMY)
+    for i in hits.tolist():
+        if drain is None:
+            player.take_damage(float(projectiles.damage[i]))
+        elif player.is_shielding and player.shield_energy > 0:
+            player.shield_energy = max(0, player.shield_energy - drain)
+            sound_bank.play('shield_hit')
+        else:
+            player.health -= float(projectiles.damage[i])
+    projectiles.kill(hits)
+
+
+def player_fire(world, dt):
+    """Sweep PLAYER projectiles from last step's position against 'target' bodies.
+
+    The first living target on a shot's path takes its damage; a target
+    killed this way gets ``is_alive = False`` for reap().
+    """
+    r = world.resources
+    projectiles = r['projectiles']
+    shots = projectiles.alive(PLAYER)
+    if not len(shots):
+        return
+    grid = r.setdefault('grid', SpatialHash())
+    grid.rebuild(body for _, body, _ in world.query('body', 'target') if body_alive(body))
+    for i in shots.tolist():
+        for body in grid.query_segment(projectiles.prev_x[i], projectiles.prev_y[i],
+                                       projectiles.x[i], projectiles.y[i], projectiles.radius[i]):
+            if not body_alive(body):
+                continue
+            target = world.get(world.entity_of(body), 'target')
+            damage = float(projectiles.damage[i])
+            particle_engine.engine.emit_against('sparks', projectiles.x[i], projectiles.y[i],
+                                                projectiles.vx[i], projectiles.vy[i])
+            if damage and body.take_damage(damage):
+                body.is_alive = False
+                grid.remove(body)
+            projectiles.hit(i, recall=target.get('recall', False))
+            break
+
+
+# ---------------------- Damage ----------------------
+def reap(world, dt):
+    """Destroy dead bodies (not the player), drop their loot and emit ('killed', entity, body)."""
+    player = world.resources['player']
+    for entity, body in world.query('body'):
+        if body is player or body_alive(body):
+            continue
+        loot = world.get(entity, 'loot')
+        if loot is not None:
+            loot(world, body)
+        world.emit('killed', entity, body)
+        world.destroy(entity)
+
+
+def medkit_loot(world, body):
+    """'loot' that leaves a full-heal medkit where ``body`` died while the player is below 20% health."""
+    player = world.resources['player']
+    if player.health <= player.max_health * 0.2:
+        world.spawn(pickup={'x': body.x, 'y': body.y, 'image': world.resources['medkit_image'],
+                            'on_collect': _heal_fully})
+
+
+def _heal_fully(world, pickup):
+    player = world.resources['player']
+    player.health = player.max_health
+
+
+# ---------------------- Lifetime ----------------------
+def pickups(world, dt):
+    """Collect every 'pickup' the player touches."""
+    player = world.resources['player']
+    for entity, pickup in world.query('pickup'):
+        reach = player.radius + pickup['image'].get_width() / 2
+        if math.hypot(player.x - pickup['x'], player.y - pickup['y']) < reach:
+            pickup['on_collect'](world, pickup)
+            world.destroy(entity)
+
+
+def expire(world, dt):
+    """Count down 'lifetime' components and destroy entities that run out."""
+    store = world.store('lifetime')
+    for entity in list(store):
+        store[entity] -= dt
+        if store[entity] <= 0:
+            world.destroy(entity)
+
+
+def hazards(world, dt):
+    """Age the ``hazards`` field and hurt the player standing in it."""
+    r = world.resources
+    field, player = r['hazards'], r['player']
+    field.update(dt)
+    damage = field.damage_at(player.x, player.y)
+    if damage:
+        player.take_damage(damage * dt)
+
+
+def compact_projectiles(world, dt):
+    world.resources['projectiles'].compact()
+
+
+# ---------------------- Render ----------------------
+def draw_layer(layer):
+    """Render system drawing the bodies whose 'layer' is ``layer``."""
+    def draw(world, screen, alpha):
+        camera = world.resources.get('camera')
+        if camera is None:
+            for _, body, body_layer in world.query('body', 'layer'):
+                if body_layer == layer:
+                    body.draw(screen)
+            return
+        bodies = [body for _, body, body_layer in world.query('body', 'layer')
+                  if body_layer == layer and camera.sees(body.x, body.y)]
+        # Bodies draw their own blood splatters, so those move to the screen with them
+        with camera.applied(bodies + splatters_of(bodies)):
+            for body in bodies:
+                body.draw(screen)
+    return draw
+
+
+def draw_projectiles(world, screen, alpha):
+    r = world.resources
+    r['projectiles'].draw(screen, alpha, r.get('camera'))
+
+
+def draw_hazards(world, screen, alpha):
+    world.resources['hazards'].draw(screen)
+
+
+def draw_pickups(world, screen, alpha):
+    camera = world.resources.get('camera')
+    for _, pickup in world.query('pickup'):
+        x, y = pickup['x'], pickup['y']
+        if camera is not None:
+            if not camera.sees(x, y):
+                continue
+            x, y = camera.to_screen(x, y)
+        image = pickup['image']
+        screen.blit(image, (x - image.get_width() // 2, y - image.get_height() // 2))
+
+
+def body_alive(body):
+    return getattr(body, 'is_alive', True)
+
+
+# The usual combat step for a level with a player, brains and a projectile pool
+COMBAT = (
+    ('input', player_control),
+    ('input', ground_pound),
+    ('movement', brains),
+    ('movement', move_projectiles),
+    ('collision', contact_damage),
+    ('collision', enemy_fire),
+    ('collision', player_fire),
+    ('damage', reap),
+    ('lifetime', pickups),
+    ('lifetime', expire),
+    ('lifetime', compact_projectiles),
+)
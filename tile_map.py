@@ -0,0 +1,109 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from settings import TILE_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT
+
+# Flag bits stored per tile
+BLOCKS_WALKERS = 1      # zombies and other ground enemies
+BLOCKS_PLAYER = 2       # the player also bumps into trees and rocks
+BLOCKS_PROJECTILES = 4  # bullets stop / shields bounce
+BLOCKS_BOSS = 8         # python boss turns around
+STUNS_BOSS = 16         # python boss is stunned when it charges into it
+SPAWNABLE = 32          # open ground enemies may spawn on
+
+# Tile character -> flags; unknown characters are open ground without spawning
+TILE_FLAGS = {
+    'W': BLOCKS_WALKERS | BLOCKS_PLAYER | BLOCKS_PROJECTILES | BLOCKS_BOSS,
+    'P': BLOCKS_WALKERS | BLOCKS_PLAYER | BLOCKS_PROJECTILES | STUNS_BOSS,
+    'T': BLOCKS_PLAYER,
+    'R': BLOCKS_PLAYER,
+    ' ': SPAWNABLE,
+}
+
+
+class TileMap:
+    """Tile flags compiled once from a list-of-strings (or list-of-lists) map.
+
+    Collision code asks ``blocked(col, row, BLOCKS_PLAYER)`` instead of
+    testing characters against its own list, so the rules live in
+    TILE_FLAGS.  Lookups outside the map count as blocked.  ``grid`` is the
+    same data as a rows x cols NumPy array for vectorised queries.
+    """
+
+    def __init__(self, map_data):
+        self.map_data = map_data
+        self.rows = len(map_data)
+        self.cols = len(map_data[0]) if self.rows else 0
+        self._flags = bytearray(TILE_FLAGS.get(cell, 0) for row in map_data for cell in row)
+        self.grid = np.frombuffer(self._flags, dtype=np.uint8).reshape(self.rows, self.cols)
+
+    # ---------------------- Single tiles ----------------------
+    def in_bounds(self, col, row):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def blocked(self, col, row, mask):
+        """True if tile (col, row) has any of ``mask`` or lies outside the map."""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return bool(self._flags[row * self.cols + col] & mask)
+        return True
+
+    def has(self, col, row, mask):
+        """True if tile (col, row) is inside the map and has any of ``mask``."""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return bool(self._flags[row * self.cols + col] & mask)
+        return False
+
+    def blocked_at(self, x, y, mask):
+        """blocked() for a pixel position, truncating like the old int(x / TILE_SIZE)."""
+        return self.blocked(int(x / TILE_SIZE), int(y / TILE_SIZE), mask)
+
+    # ---------------------- Vectorised ----------------------
+    def layer(self, mask):
+        """Bool array, True where a tile has any of ``mask``."""
+        return (self.grid & mask) != 0
+
+    def blocked_cells(self, cols, rows, mask):
+        """blocked() for arrays of tile coordinates."""
+        cols = np.asarray(cols, dtype=np.int64)
+        rows = np.asarray(rows, dtype=np.int64)
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        result = np.ones(cols.shape, dtype=bool)
+        result[inside] = (self.grid[rows[inside], cols[inside]] & mask) != 0
+        return result
+
+
+# id(map) -> (map, TileMap), most recently used last
+_compiled = OrderedDict()
+_CACHE_SIZE = 8
+
+
+def compile_map(map_data):
+    """Return the TileMap for ``map_data``, compiling it on first use.
+
+    Maps are built once per level and not edited afterwards, so the
+    compiled flags are cached per map object.
+    """
+    if isinstance(map_data, TileMap):
+        return map_data
+    key = id(map_data)
+    entry = _compiled.get(key)
+    if entry is not None and entry[0] is map_data:
+        _compiled.move_to_end(key)
+        return entry[1]
+    tiles = TileMap(map_data)
+    _compiled[key] = (map_data, tiles)
+    while len(_compiled) > _CACHE_SIZE:
+        _compiled.popitem(last=False)
+    return tiles
+
+
+_open_area = None
+
+
+def open_area_map():
+    """Shared empty screen-sized map for levels without walls."""
+    global _open_area
+    if _open_area is None:
+        _open_area = [' ' * (SCREEN_WIDTH // TILE_SIZE + 1)] * (SCREEN_HEIGHT // TILE_SIZE + 1)
+    return _open_area
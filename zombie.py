@@ -1,6 +1,12 @@
 import pygame
 import math
-from settings import ZOMBIE_HEALTH, ZOMBIE_SPEED, ZOMBIE_IMAGE_SIZE, TILE_SIZE, ZOMBIE_COLOR, ZOMBIE_BLOOD_COLOR
+from asset_cache import load_image
+import sound_bank
+from rotation_atlas import get_atlas
+import decals
+from tile_map import compile_map, BLOCKS_WALKERS
+from flow_field import field_for
+from settings import ZOMBIE_HEALTH, ZOMBIE_SPEED, ZOMBIE_IMAGE_SIZE, ZOMBIE_COLOR, ZOMBIE_BLOOD_COLOR
 
 class Zombie:
     def __init__(self, x, y):
@@ -16,24 +22,15 @@ class Zombie:
         # Stun state (in seconds). When >0, zombie is stunned and cannot move.
         self.stun_timer = 0
 
-        # Initialize attack sound (can be overridden by subclasses)
-        try:
-            self.attack_sound = pygame.mixer.Sound("assets/music/zombie.ogg")
-        except Exception:
-            self.attack_sound = None
-
-        # Sounds
-        try:
-            self.damage_sound = pygame.mixer.Sound("assets/music/zombie.ogg")
-        except Exception:
-            self.damage_sound = None
+        # Sound bank clip names (attack clip can be overridden by subclasses)
+        self.attack_sound = 'zombie'
+        self.damage_sound = 'zombie'
 
         # Blood splat effect as [{'x': int, 'y': int, 'r': int, 'timer': float}]
         self.blood_splatters = []   # Each fades out over time
 
         try:
-            self.image = pygame.image.load('assets/sprites/zombies.png').convert_alpha()
-            self.image = pygame.transform.scale(self.image, (ZOMBIE_IMAGE_SIZE, ZOMBIE_IMAGE_SIZE))
+            self.image = load_image('assets/sprites/zombies.png', (ZOMBIE_IMAGE_SIZE, ZOMBIE_IMAGE_SIZE), owner=self)
         except pygame.error:
             self.image = None
 
@@ -53,60 +50,48 @@ class Zombie:
         # Clean up expired
         self.blood_splatters = [s for s in self.blood_splatters if s['timer'] > 0]
 
-        # Move towards player
+        # Move towards player, around walls via the shared flow field
         self.angle = math.atan2(player_y - self.y, player_x - self.x)
+        tiles = compile_map(game_map)
+        if tiles.rows == 0:
+            return
+        flow = field_for(tiles)
+        flow.update(player_x, player_y)
+        heading = flow.angle_at(self.x, self.y)
+        if heading is not None:
+            self.angle = heading
+
+        # Stunned (Ground Pound): keep facing the player but hold still, like the Horde
+        if self.stun_timer > 0:
+            self.stun_timer = max(0, self.stun_timer - dt)
+            if self.stun_timer > 0:
+                return False
         dx = math.cos(self.angle) * self.speed * dt
         dy = math.sin(self.angle) * self.speed * dt
 
-        # Get map dimensions
-        map_height = len(game_map)
-        if map_height == 0:
-            return
-        map_width = len(game_map[0])
-
         # Calculate potential new positions
         new_x = self.x + dx
         new_y = self.y + dy
 
-        # Check x movement
-        if 0 <= new_x < map_width * TILE_SIZE:
-            target_col = int(new_x / TILE_SIZE)
-            row = int(self.y / TILE_SIZE)
-            if 0 <= row < map_height and 0 <= target_col < map_width:
-                if game_map[row][target_col] not in ['W', 'P']:
-                    self.x = new_x
-            else:
-                # If we're at the map edge, stop horizontal movement
-                pass
+        # Check x movement; tiles outside the map count as blocked
+        if new_x >= 0 and not tiles.blocked_at(new_x, self.y, BLOCKS_WALKERS):
+            self.x = new_x
 
         # Check y movement
-        if 0 <= new_y < map_height * TILE_SIZE:
-            target_row = int(new_y / TILE_SIZE)
-            col = int(self.x / TILE_SIZE)
-            if 0 <= target_row < map_height and 0 <= col < map_width:
-                if game_map[target_row][col] not in ['W', 'P']:
-                    self.y = new_y
-            else:
-                # If we're at the map edge, stop vertical movement
-                pass
+        if new_y >= 0 and not tiles.blocked_at(self.x, new_y, BLOCKS_WALKERS):
+            self.y = new_y
         return False
 
     def attack(self):
         """Play attack sound if available. Can be overridden by subclasses."""
         if hasattr(self, 'attack_sound') and self.attack_sound:
-            try:
-                self.attack_sound.play()
-            except Exception:
-                pass
+            sound_bank.play(self.attack_sound)
                 
     def take_damage(self, amount):
         self.health -= amount
         # Play sound if available
         if hasattr(self, 'damage_sound') and self.damage_sound:
-            try:
-                self.damage_sound.play()
-            except Exception:
-                pass
+            sound_bank.play(self.damage_sound)
         import random
         # Add blood splatter with small random offset
         offset_angle = random.uniform(0, 2 * math.pi)
@@ -120,6 +105,7 @@ class Zombie:
             'r': rad,
             'timer': 0.4
         })
+        decals.bake(bx, by, rad, ZOMBIE_BLOOD_COLOR)
 
         if self.health <= 0:
             self.health = 0
@@ -139,18 +125,11 @@ class Zombie:
             return
 
         # Draw green blood splatters beneath zombie (with fade)
-        for splat in self.blood_splatters:
-            blood_surf = pygame.Surface((splat['r']*2, splat['r']*2), pygame.SRCALPHA)
-            color = ZOMBIE_BLOOD_COLOR[:3] + (int(ZOMBIE_BLOOD_COLOR[3] * (splat['timer'] / 0.4)),) # fade alpha
-            pygame.draw.circle(blood_surf, color, (splat['r'], splat['r']), splat['r'])
-            screen.blit(blood_surf, (splat['x']-splat['r'], splat['y']-splat['r']))
+        decals.draw_splatters(screen, self.blood_splatters, ZOMBIE_BLOOD_COLOR, 0.4)
 
         if self.image:
-            # The angle needs to be converted to degrees and inverted for pygame's rotation system
-            # We also add 90 degrees because the sprite might be facing upwards by default.
-            rotated_image = pygame.transform.rotate(self.image, -math.degrees(self.angle) - 90)
-            rotated_rect = rotated_image.get_rect(center=(self.x, self.y))
-            screen.blit(rotated_image, rotated_rect)
+            # Shared pre-rotated frames; the sprite faces upwards by default, hence the 90 degrees
+            get_atlas(self.image, 90).blit(screen, self.angle, self.x, self.y)
         else:
             # Fallback to drawing a circle if image failed to load
             pygame.draw.circle(screen, ZOMBIE_COLOR, (int(self.x), int(self.y)), self.radius)
\ No newline at end of file